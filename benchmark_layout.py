@@ -0,0 +1,193 @@
+"""
+Benchmark LandingAI layout reconstruction on dense synthetic pages.
+
+Times reconstruct_layout() (chunks held as parallel NumPy arrays, columns
+found through a spatial index) against the original implementation, which
+built a TextChunk and BoundingBox per chunk and sorted with Python lambdas
+over their properties, and checks no chunk text is lost. Pages are
+form-like: a full-width header, then a grid of short fields in several
+columns. The original split the header into a column of its own and read
+the grid column by column; the current code reads the header first and
+the grid row by row, so the texts differ in order only.
+
+With --crossover, times serial against parallel reconstruction
+(reconstruct_layout(workers=N)) for doubling page counts and reports the
+smallest page count from which the worker pool is consistently faster -
+the value for PARALLEL_PAGE_THRESHOLD on this machine.
+
+Usage:
+    python benchmark_layout.py [--pages 20] [--chunks 2000] [--repeat 3]
+    python benchmark_layout.py --crossover [--chunks 200] [--workers N]
+        [--max-pages 512]
+"""
+
+import argparse
+import logging
+import os
+import random
+import re
+import time
+from collections import defaultdict
+
+from src.utils.layout_reconstructor import (CELL_BREAK, COLUMN_BREAK, PAGE_BREAK,
+                                            PARAGRAPH_GAP_THRESHOLD, PARALLEL_PAGE_THRESHOLD,
+                                            BoundingBox, TextChunk, logger, reconstruct_layout)
+
+# Center distance that started a new column in the original implementation
+OBJECT_COLUMN_GAP_THRESHOLD = 0.2
+
+
+def make_chunks(pages, chunks_per_page, seed=0):
+    """Form-like chunks: a header and a grid of fields in four columns."""
+    rng = random.Random(seed)
+    chunks = []
+    for page in range(pages):
+        chunks.append({'text': f'Form page {page + 1}', 'grounding': {
+            'page': page, 'box': {'left': 0.05, 'top': 0.01, 'right': 0.95, 'bottom': 0.03}}})
+        rows = max(1, (chunks_per_page - 1) // 4)
+        for n in range(chunks_per_page - 1):
+            column, row = n % 4, n // 4
+            left = 0.05 + column * 0.24 + rng.uniform(0, 0.01)
+            top = 0.05 + 0.9 * row / rows + rng.uniform(0, 0.002)
+            chunks.append({'text': f'field {row}.{column}', 'grounding': {
+                'page': page, 'box': {'left': left, 'top': top,
+                                      'right': left + 0.2, 'bottom': top + 0.9 / rows / 2}}})
+    rng.shuffle(chunks)
+    return chunks
+
+
+def object_reconstruct_layout(chunks):
+    """The original per-chunk object implementation of reconstruct_layout()."""
+    parsed = []
+    for idx, chunk in enumerate(chunks):
+        text = chunk.get('text', '').strip()
+        if not text:
+            continue
+        grounding = chunk.get('grounding', {})
+        box = grounding.get('box', {})
+        chunk = TextChunk(text=text, page=grounding.get('page', 0), box=BoundingBox(
+            left=box.get('left', 0.0), top=box.get('top', 0.0),
+            right=box.get('right', 1.0), bottom=box.get('bottom', 1.0)))
+        parsed.append(chunk)
+        # Formatted eagerly, as it was, even with debug logging off
+        logger.debug(f"Parsed chunk {idx}: page={chunk.page}, "
+                     f"box=({chunk.box.left:.2f},{chunk.box.top:.2f},"
+                     f"{chunk.box.right:.2f},{chunk.box.bottom:.2f})")
+
+    pages = defaultdict(list)
+    for chunk in parsed:
+        pages[chunk.page].append(chunk)
+
+    def single_column(column):
+        lines, prev_bottom = [], 0
+        for chunk in column:
+            gap = chunk.box.top - prev_bottom
+            if gap > PARAGRAPH_GAP_THRESHOLD:
+                lines.append("")
+                logger.debug(f"Paragraph break detected: gap={gap:.2f}")
+            lines.append(chunk.text)
+            prev_bottom = chunk.box.bottom
+        return '\n'.join(lines)
+
+    page_texts = []
+    for page_num in sorted(pages):
+        ordered = sorted(pages[page_num], key=lambda c: (c.box.top, c.box.left))
+        columns, current = [], []
+        for chunk in sorted(ordered, key=lambda c: c.box.center_x):
+            if current and abs(chunk.box.center_x - current[0].box.center_x) > OBJECT_COLUMN_GAP_THRESHOLD:
+                columns.append(current)
+                current = []
+            current.append(chunk)
+        if current:
+            columns.append(current)
+        if len(columns) > 1:
+            page_texts.append(COLUMN_BREAK.join(
+                single_column(sorted(column, key=lambda c: c.box.top)) for column in columns))
+        else:
+            page_texts.append(single_column(ordered))
+    return PAGE_BREAK.join(page_texts)
+
+
+def chunk_texts(text):
+    """Chunk texts of reconstructed output, without separators, sorted."""
+    separators = '|'.join(re.escape(s.strip()) for s in (PAGE_BREAK, COLUMN_BREAK))
+    pieces = re.split(rf'\n|{re.escape(CELL_BREAK)}|{separators}', text)
+    return sorted(piece for piece in pieces if piece)
+
+
+def best_time(function, chunks, repeat):
+    """Return (fastest seconds, result) over several runs."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function(chunks)
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def find_crossover(chunks_per_page, workers, max_pages, repeat):
+    """Return the page count from which parallel reconstruction stays faster, or None."""
+    print(f"{chunks_per_page} chunks per page, {workers} workers, "
+          f"{os.cpu_count()} CPUs (current threshold: {PARALLEL_PAGE_THRESHOLD} pages)")
+    print(f"{'pages':>6} {'serial s':>9} {'parallel s':>11} {'speedup':>8}")
+
+    crossover = None
+    pages = 1
+    while pages <= max_pages:
+        chunks = make_chunks(pages, chunks_per_page)
+        serial, expected = best_time(reconstruct_layout, chunks, repeat)
+        parallel, result = best_time(
+            lambda c: reconstruct_layout(c, workers=workers, parallel_threshold=1),
+            chunks, repeat)
+        assert result == expected, "parallel output differs from serial"
+        print(f"{pages:>6} {serial:>9.4f} {parallel:>11.4f} {serial / parallel:>7.2f}x")
+
+        if parallel < serial:
+            crossover = crossover or pages
+        else:
+            crossover = None
+        pages *= 2
+    return crossover
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--pages', type=int, default=20)
+    parser.add_argument('--chunks', type=int, default=None,
+                        help='chunks per page (default: 2000, 200 with --crossover)')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--crossover', action='store_true',
+                        help='find the page count where parallel reconstruction pays off')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--max-pages', type=int, default=512)
+    args = parser.parse_args()
+
+    # Time the processing, not log output
+    logging.getLogger('EmailReader').setLevel(logging.WARNING)
+
+    if args.crossover:
+        crossover = find_crossover(args.chunks or 200, args.workers,
+                                   args.max_pages, args.repeat)
+        if crossover is None:
+            print(f"parallel reconstruction never faster up to {args.max_pages} pages")
+        else:
+            print(f"parallel reconstruction faster from {crossover} pages")
+        return
+
+    args.chunks = args.chunks or 2000
+
+    chunks = make_chunks(args.pages, args.chunks)
+    print(f"{len(chunks)} chunks on {args.pages} pages")
+
+    object_seconds, expected = best_time(object_reconstruct_layout, chunks, args.repeat)
+    array_seconds, result = best_time(reconstruct_layout, chunks, args.repeat)
+
+    print(f"{'implementation':<16} {'seconds':>8} {'chunks/s':>12}")
+    for name, seconds in (('objects', object_seconds), ('arrays', array_seconds)):
+        print(f"{name:<16} {seconds:>8.3f} {len(chunks) / seconds:>12,.0f}")
+    print(f"speedup: {object_seconds / array_seconds:.1f}x, "
+          f"same chunk texts: {chunk_texts(result) == chunk_texts(expected)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""
+Benchmark page preprocessing with adaptive DPI.
+
+OCRs each PDF twice: the plain path (300 DPI, no preprocessing) and the
+preprocessing path (base DPI, deskew, binarization, re-render only pages
+with small text). Reports seconds per page for both, the preprocessing
+overhead alone, and how similar the recognized text is to the 300 DPI
+baseline, so speed-ups can be checked against accuracy loss.
+
+Usage:
+    python benchmark_preprocessing.py [pdf ...] [--workers N]
+        [--lang eng+rus] [--base-dpi 200] [--max-dpi 400]
+        [--min-text-height 28]
+"""
+
+import argparse
+import difflib
+import glob
+import os
+import time
+
+from src.ocr.image_preprocessing import (DEFAULT_BASE_DPI, DEFAULT_MAX_DPI,
+                                         DEFAULT_MIN_TEXT_HEIGHT, PagePreprocessor)
+from src.ocr.rasterizer import get_rasterizer
+from src.ocr.tesseract_engine import ParallelTesseractEngine
+
+
+def run_ocr(pdf_path, lang, workers, dpi, preprocess=None):
+    """Return (seconds, page texts) for OCR of a PDF."""
+    engine = ParallelTesseractEngine(lang=lang, max_workers=workers,
+                                     preprocess=preprocess)
+    start = time.perf_counter()
+    pages = get_rasterizer().iter_pages(pdf_path, dpi=dpi)
+    texts = [text for _, text in engine.ocr_stream(
+        (page.page_number, page) for page in pages)]
+    return time.perf_counter() - start, texts
+
+
+def time_preprocessing(pdf_path, preprocess):
+    """Return seconds spent rendering and preprocessing alone."""
+    start = time.perf_counter()
+    for page in get_rasterizer().iter_pages(pdf_path, dpi=preprocess.base_dpi):
+        preprocess(page)
+    return time.perf_counter() - start
+
+
+def similarity(baseline, candidate):
+    """Character-level similarity of two texts (0-1)."""
+    return difflib.SequenceMatcher(None, ' '.join(baseline.split()),
+                                   ' '.join(candidate.split())).ratio()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('pdfs', nargs='*',
+                        default=sorted(glob.glob('test_docs/*scanned*.pdf')))
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--lang', default='rus+eng')
+    parser.add_argument('--base-dpi', type=int, default=DEFAULT_BASE_DPI)
+    parser.add_argument('--max-dpi', type=int, default=DEFAULT_MAX_DPI)
+    parser.add_argument('--min-text-height', type=float, default=DEFAULT_MIN_TEXT_HEIGHT)
+    args = parser.parse_args()
+
+    print(f"{'PDF':<32} {'path':<12} {'pages':>5} {'s/page':>8} {'similarity':>10}")
+    for pdf_path in args.pdfs:
+        label = os.path.basename(pdf_path)[:32]
+        preprocess = PagePreprocessor(
+            pdf_path=pdf_path, base_dpi=args.base_dpi, max_dpi=args.max_dpi,
+            min_text_height=args.min_text_height)
+
+        prep_seconds = time_preprocessing(pdf_path, preprocess)
+        try:
+            base_seconds, base_texts = run_ocr(pdf_path, args.lang, args.workers, 300)
+            prep_ocr_seconds, prep_texts = run_ocr(
+                pdf_path, args.lang, args.workers, args.base_dpi, preprocess)
+        except Exception as e:
+            pages = sum(1 for _ in get_rasterizer().iter_pages(pdf_path, dpi=72))
+            print(f"{label:<32} {'preprocess':<12} {pages:>5} "
+                  f"{prep_seconds / max(pages, 1):>8.3f} {'-':>10}")
+            print(f"{label:<32} OCR unavailable ({type(e).__name__}: {e})")
+            continue
+
+        pages = len(base_texts)
+        score = similarity(''.join(base_texts), ''.join(prep_texts))
+        print(f"{label:<32} {'300dpi':<12} {pages:>5} "
+              f"{base_seconds / max(pages, 1):>8.3f} {1.0:>10.3f}")
+        print(f"{label:<32} {'adaptive':<12} {pages:>5} "
+              f"{prep_ocr_seconds / max(pages, 1):>8.3f} {score:>10.3f}")
+        print(f"{label:<32} {'preprocess':<12} {pages:>5} "
+              f"{prep_seconds / max(pages, 1):>8.3f} {'-':>10}")
+
+
+if __name__ == '__main__':
+    main()
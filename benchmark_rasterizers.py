@@ -0,0 +1,53 @@
+"""
+Benchmark PDF rasterizer backends.
+
+Renders every page of each PDF with each available backend at OCR
+resolution and reports wall time per backend.
+
+Usage:
+    python benchmark_rasterizers.py [pdf ...] [--dpi 300] [--repeat 3]
+"""
+
+import argparse
+import glob
+import os
+import time
+
+from src.ocr.rasterizer import RASTERIZER_BACKENDS, get_rasterizer
+
+
+def time_backend(name, pdf_path, dpi, repeat):
+    """Return (best seconds, page count) for rendering a PDF with a backend."""
+    best = None
+    pages = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        pages = sum(1 for _ in get_rasterizer(name).iter_pages(pdf_path, dpi=dpi))
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, pages
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('pdfs', nargs='*',
+                        default=sorted(glob.glob('test_docs/*.pdf')))
+    parser.add_argument('--dpi', type=int, default=300)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'PDF':<32} {'backend':<9} {'pages':>5} {'seconds':>8} {'s/page':>7}")
+    for pdf_path in args.pdfs:
+        for name in RASTERIZER_BACKENDS:
+            label = os.path.basename(pdf_path)[:32]
+            try:
+                seconds, pages = time_backend(name, pdf_path, args.dpi, args.repeat)
+            except Exception as e:
+                print(f"{label:<32} {name:<9} unavailable ({type(e).__name__})")
+                continue
+            per_page = seconds / pages if pages else 0.0
+            print(f"{label:<32} {name:<9} {pages:>5} {seconds:>8.3f} {per_page:>7.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""
+Benchmark Tesseract backends.
+
+Renders the pages of each PDF once, then OCRs them with every available
+backend and reports pages per second. Each backend runs twice in a row:
+the first (cold) run includes starting workers and loading language
+models, the second (warm) run shows steady-state throughput, where the
+resident tesserocr workers no longer reload models per page.
+
+Usage:
+    python benchmark_tesseract_backends.py [pdf ...] [--workers N]
+        [--lang eng+rus] [--dpi 300]
+"""
+
+import argparse
+import glob
+import os
+import time
+
+from src.ocr.rasterizer import get_rasterizer
+from src.ocr.tesseract_engine import (DEFAULT_LANGUAGES, TESSERACT_BACKENDS,
+                                      TESSEROCR_AVAILABLE, ParallelTesseractEngine,
+                                      shutdown_resident_pools)
+
+
+def time_backend(backend, pages, lang, workers):
+    """Return seconds to OCR pre-rendered pages with a backend."""
+    engine = ParallelTesseractEngine(lang=lang, max_workers=workers, backend=backend)
+    start = time.perf_counter()
+    for _ in engine.ocr_stream((page.page_number, page) for page in pages):
+        pass
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('pdfs', nargs='*',
+                        default=sorted(glob.glob('test_docs/*scanned*.pdf')))
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--lang', default=DEFAULT_LANGUAGES)
+    parser.add_argument('--dpi', type=int, default=300)
+    args = parser.parse_args()
+
+    backends = [b for b in TESSERACT_BACKENDS
+                if b != 'tesserocr' or TESSEROCR_AVAILABLE]
+    if not TESSEROCR_AVAILABLE:
+        print("tesserocr not installed - benchmarking pytesseract only")
+
+    print(f"{'PDF':<32} {'backend':<12} {'run':<5} {'pages':>5} "
+          f"{'seconds':>8} {'pages/s':>8}")
+    for pdf_path in args.pdfs:
+        label = os.path.basename(pdf_path)[:32]
+        pages = list(get_rasterizer().iter_pages(pdf_path, dpi=args.dpi))
+        for backend in backends:
+            for run in ('cold', 'warm'):
+                try:
+                    seconds = time_backend(backend, pages, args.lang, args.workers)
+                except Exception as e:
+                    print(f"{label:<32} {backend:<12} unavailable ({type(e).__name__}: {e})")
+                    break
+                rate = len(pages) / seconds if seconds else 0.0
+                print(f"{label:<32} {backend:<12} {run:<5} {len(pages):>5} "
+                      f"{seconds:>8.3f} {rate:>8.2f}")
+        shutdown_resident_pools()
+
+
+if __name__ == '__main__':
+    main()
@@ -3,6 +3,7 @@ Start point for the application.
 """
 import os
 import time
+import multiprocessing
 from datetime import datetime
 
 import schedule
@@ -11,6 +12,7 @@ from src.logger import logger
 from src.process_google_drive import process_google_drive
 from src.process_files_for_translation import process_files_for_translation
 from src.config import load_config
+from src.ocr import OCRProviderFactory
 
 
 def select_program_mode() -> str:
@@ -135,6 +137,9 @@ def run_and_log() -> None:
 
 
 if __name__ == "__main__":
+    # Required for OCR worker processes in the frozen (PyInstaller) build
+    multiprocessing.freeze_support()
+
     logger.info("="*80)
     logger.info("EmailReader main process starting")
     logger.debug("Python process started")
@@ -143,6 +148,9 @@ if __name__ == "__main__":
         logger.debug("Ensuring runtime directories exist")
         ensure_runtime_dirs()
 
+        logger.debug("Warming up OCR providers")
+        OCRProviderFactory.warm_up(load_config())
+
         logger.debug("Loading configuration")
         interval = load_interval_minutes()
         logger.info("Configured Google Drive interval: %d minute(s)", interval)
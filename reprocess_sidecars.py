@@ -0,0 +1,55 @@
+"""
+Rebuild DOCX files from saved OCR sidecars.
+
+Runs the current layout reconstruction and DOCX formatting over the raw
+LandingAI/Azure output saved when documents were processed (see
+src/ocr/sidecar.py), without calling any OCR service. Use it to check the
+effect of layout threshold or formatting changes on real documents.
+
+Usage:
+    python reprocess_sidecars.py [sidecar or directory ...] [--output-dir DIR]
+"""
+
+import argparse
+import glob
+import os
+import time
+
+from src.ocr.sidecar import DEFAULT_SIDECAR_DIR, SIDECAR_SUFFIX, rebuild_docx
+
+
+def find_sidecars(paths):
+    """Expand directories into the sidecars they contain."""
+    sidecars = []
+    for path in paths:
+        if os.path.isdir(path):
+            sidecars.extend(sorted(glob.glob(os.path.join(path, f'*{SIDECAR_SUFFIX}'))))
+        else:
+            sidecars.append(path)
+    return sidecars
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('sidecars', nargs='*', default=[DEFAULT_SIDECAR_DIR])
+    parser.add_argument('--output-dir', default=os.path.join('data', 'reprocessed'))
+    args = parser.parse_args()
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    print(f"{'sidecar':<48} {'provider':<22} {'seconds':>8}  output")
+    for sidecar_path in find_sidecars(args.sidecars):
+        label = os.path.basename(sidecar_path)[:48]
+        name = os.path.basename(sidecar_path)[:-len(SIDECAR_SUFFIX)]
+        output_path = os.path.join(args.output_dir, f'{name}.docx')
+        start = time.perf_counter()
+        try:
+            record = rebuild_docx(sidecar_path, output_path)
+        except Exception as e:
+            print(f"{label:<48} failed: {e}")
+            continue
+        seconds = time.perf_counter() - start
+        print(f"{label:<48} {record['provider']:<22} {seconds:>8.3f}  {output_path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,13 +1,18 @@
 """
 Convert docs to docx
 """
+import io
 import os
 import logging
 import re
-from typing import Optional
+import zipfile
+from typing import Dict, List, Optional
+from xml.sax.saxutils import escape
 import pdfplumber
 from docx import Document
 
+from src.utils.spool import Spool
+
 # Optional library for advanced mojibake fixing
 try:
     import ftfy
@@ -24,6 +29,12 @@ CONTROL_PATTERN = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]')  # Control cha
 C1_CONTROL_PATTERN = re.compile(r'[\u0080-\u009f]')  # C1 control chars
 NONCHAR_PATTERN = re.compile(r'[\ufffe\uffff\ufdd0-\ufdef]')  # Unicode non-chars
 
+# Blank lines separate paragraphs in OCR output
+PARAGRAPH_BREAK_PATTERN = re.compile(r'\n[ \t]*\n+')
+
+# WordprocessingML for a paragraph holding only a page break
+PAGE_BREAK_XML = '<w:p><w:r><w:br w:type="page"/></w:r></w:p>'
+
 
 def sanitize_text_for_xml(text: str) -> str:
     """
@@ -162,6 +173,200 @@ def convert_txt_to_docx(paragraph: str, docx_file_path: str) -> None:
         raise
 
 
+class DocxPageWriter:
+    """
+    Write a DOCX file one page at a time.
+
+    Pages are sanitized, converted to WordprocessingML and appended to a
+    temporary file as they are added, so memory stays bounded by the size
+    of a single page rather than the whole document. Blank lines in a
+    page's text start a new paragraph, other line breaks are kept, and
+    pages are separated by page breaks. close() packages the body with
+    python-docx's default template into the final DOCX.
+
+    A page whose text isn't final yet can hold its place with
+    reserve_page() and be supplied with fill_page() later, while the
+    pages after it are added as usual.
+
+    Used as a context manager the document is saved on a clean exit and
+    discarded if an exception is raised:
+
+        with DocxPageWriter('out.docx') as writer:
+            for text in page_texts:
+                writer.add_page(text)
+    """
+
+    def __init__(self, docx_file_path: str, font_size: Optional[float] = None):
+        """
+        Start a new document.
+
+        Args:
+            docx_file_path: Path to save the output Word document
+            font_size: Optional font size in points for all text;
+                the template's default style is used if None
+        """
+        self.docx_file_path = docx_file_path
+        self.pages = 0
+        self.characters = 0
+        self._run_properties = ''
+        if font_size:
+            # Font sizes are stored in half-points
+            self._run_properties = f'<w:rPr><w:sz w:val="{round(font_size * 2)}"/></w:rPr>'
+        self._body: Optional[Spool] = Spool()
+        # Reserved page number -> Spool slot
+        self._reserved: Dict[int, int] = {}
+        logger.debug("Started DOCX page writer for: %s", docx_file_path)
+
+    def add_page(self, text: str) -> None:
+        """
+        Append a page to the document.
+
+        Args:
+            text: Text of the page; may be empty for blank pages
+
+        Raises:
+            ValueError: If the writer is already closed
+        """
+        self._start_page()
+        self._body.write(self._page_xml(text, self.pages))
+
+    def reserve_page(self) -> int:
+        """
+        Hold the place of a page whose text is added later with fill_page().
+
+        Returns:
+            Page number (1-based) to pass to fill_page()
+
+        Raises:
+            ValueError: If the writer is already closed
+        """
+        self._start_page()
+        self._reserved[self.pages] = self._body.reserve()
+        logger.debug("Reserved page %d in DOCX", self.pages)
+        return self.pages
+
+    def fill_page(self, number: int, text: str) -> None:
+        """
+        Supply the text of a reserved page.
+
+        Args:
+            number: Page number from reserve_page()
+            text: Text of the page
+
+        Raises:
+            ValueError: If the page isn't reserved or the writer is closed
+        """
+        if self._body is None:
+            raise ValueError("DocxPageWriter is closed")
+        if number not in self._reserved:
+            raise ValueError(f"Page {number} is not reserved")
+        self._body.fill(self._reserved.pop(number), self._page_xml(text, number))
+
+    @property
+    def reserved_pages(self) -> List[int]:
+        """Reserved pages still waiting for fill_page()."""
+        return sorted(self._reserved)
+
+    def _start_page(self) -> None:
+        """Count a new page, separating it from the previous one."""
+        if self._body is None:
+            raise ValueError("DocxPageWriter is closed")
+        if self.pages:
+            self._body.write(PAGE_BREAK_XML.encode('utf-8'))
+        self.pages += 1
+
+    def _page_xml(self, text: str, number: int) -> bytes:
+        """Encoded WordprocessingML for the paragraphs of a page."""
+        # Tesseract ends pages with a form feed; page breaks replace it
+        text = (text or '').rstrip('\f\n')
+        sanitized = sanitize_text_for_xml(text)
+        if len(sanitized) != len(text):
+            logger.warning("Page %d: removed %d invalid XML characters",
+                           number, len(text) - len(sanitized))
+
+        paragraphs = PARAGRAPH_BREAK_PATTERN.split(sanitized.replace('\r', '').strip('\n'))
+        self.characters += len(sanitized)
+        logger.debug("Added page %d to DOCX (%d characters, %d paragraphs)",
+                     number, len(sanitized), len(paragraphs))
+        return ''.join(self._paragraph_xml(paragraph)
+                       for paragraph in paragraphs).encode('utf-8')
+
+    def _paragraph_xml(self, paragraph: str) -> str:
+        """WordprocessingML for one paragraph; lines become line breaks."""
+        if not paragraph:
+            return '<w:p/>'
+        content = '<w:br/>'.join(
+            '<w:tab/>'.join(f'<w:t xml:space="preserve">{escape(part)}</w:t>' if part else ''
+                            for part in line.split('\t'))
+            for line in paragraph.split('\n'))
+        return f'<w:p><w:r>{self._run_properties}{content}</w:r></w:p>'
+
+    def close(self) -> None:
+        """
+        Save the document and release the temporary page buffer.
+
+        The DOCX is written next to its destination and moved into place,
+        so a partially written file never appears at docx_file_path.
+
+        Raises:
+            ValueError: If a reserved page hasn't been filled; nothing is
+                saved
+        """
+        if self._body is None:
+            return
+        if self._reserved:
+            self._discard()
+            raise ValueError(f"Reserved pages never filled: {sorted(self._reserved)}")
+
+        temp_path = f"{self.docx_file_path}.part"
+        try:
+            template = io.BytesIO()
+            Document().save(template)
+            with zipfile.ZipFile(template) as source, \
+                    zipfile.ZipFile(temp_path, 'w', zipfile.ZIP_DEFLATED) as target:
+                for item in source.infolist():
+                    if item.filename == 'word/document.xml':
+                        self._write_document_xml(source.read(item).decode('utf-8'), target)
+                    else:
+                        target.writestr(item, source.read(item))
+            os.replace(temp_path, self.docx_file_path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        finally:
+            self._discard()
+
+        file_size = os.path.getsize(self.docx_file_path) / 1024  # KB
+        logger.info('Pages converted to Word: %s (%d pages, %d characters, %.2f KB)',
+                    os.path.basename(self.docx_file_path), self.pages,
+                    self.characters, file_size)
+
+    def _write_document_xml(self, template_xml: str, target: zipfile.ZipFile) -> None:
+        """Stream the template's document.xml with the page buffer as its body."""
+        # Pages go before the section properties closing the empty body
+        body_end = template_xml.index('<w:sectPr')
+        with target.open('word/document.xml', 'w') as xml:
+            xml.write(template_xml[:body_end].encode('utf-8'))
+            self._body.copy_to(xml)
+            xml.write(template_xml[body_end:].encode('utf-8'))
+
+    def _discard(self) -> None:
+        """Release the page buffer without saving."""
+        if self._body is not None:
+            self._body.close()
+            self._body = None
+
+    def __enter__(self) -> 'DocxPageWriter':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self._discard()
+
+
 def convert_txt_file_to_docx(txt_file_path: str, docx_file_path: str) -> None:
     """
     Converts a plain text file to a Word document.
@@ -218,9 +423,18 @@ def convert_txt_file_to_docx(txt_file_path: str, docx_file_path: str) -> None:
         raise
 
 
-def convert_pdf_to_docx(pdf_path: str, docx_path: str):
+def convert_pdf_to_docx(
+        pdf_path: str,
+        docx_path: str,
+        page_texts: Optional[List[str]] = None):
     """
     Converts a PDF file to a DOCX file, preserving text formatting.
+
+    Args:
+        pdf_path: Path to the PDF file.
+        docx_path: Path to save the output Word document.
+        page_texts: Optional per-page text already extracted from the PDF
+            (e.g. PdfAnalysis.page_texts); skips re-parsing the file.
     """
     logger.debug("Entering convert_pdf_to_docx()")
     logger.debug("Input PDF: %s", pdf_path)
@@ -234,39 +448,43 @@ def convert_pdf_to_docx(pdf_path: str, docx_path: str):
         input_size = os.path.getsize(pdf_path) / 1024  # KB
         logger.debug("Input PDF size: %.2f KB", input_size)
 
-        logger.debug("Opening PDF with pdfplumber")
         document = Document()
         total_text_length = 0
 
-        with pdfplumber.open(pdf_path) as pdf:
-            num_pages = len(pdf.pages)
-            logger.info("PDF has %d pages", num_pages)
+        if page_texts is None:
+            logger.debug("Opening PDF with pdfplumber")
+            with pdfplumber.open(pdf_path) as pdf:
+                page_texts = [page.extract_text() for page in pdf.pages]
+        else:
+            logger.debug("Using %d pre-extracted pages", len(page_texts))
+
+        num_pages = len(page_texts)
+        logger.info("PDF has %d pages", num_pages)
 
-            for page_num, page in enumerate(pdf.pages, 1):
-                logger.debug("Processing page %d/%d", page_num, num_pages)
-                text = page.extract_text()
+        for page_num, text in enumerate(page_texts, 1):
+            logger.debug("Processing page %d/%d", page_num, num_pages)
 
-                if text:
-                    text_length = len(text)
-                    total_text_length += text_length
-                    logger.debug("Page %d: extracted %d characters", page_num, text_length)
+            if text:
+                text_length = len(text)
+                total_text_length += text_length
+                logger.debug("Page %d: extracted %d characters", page_num, text_length)
 
-                    # Sanitize text to remove XML-incompatible characters
-                    sanitized_text = sanitize_text_for_xml(text)
+                # Sanitize text to remove XML-incompatible characters
+                sanitized_text = sanitize_text_for_xml(text)
 
-                    if len(sanitized_text) != text_length:
-                        removed = text_length - len(sanitized_text)
-                        logger.warning("Page %d: removed %d invalid XML characters", page_num, removed)
+                if len(sanitized_text) != text_length:
+                    removed = text_length - len(sanitized_text)
+                    logger.warning("Page %d: removed %d invalid XML characters", page_num, removed)
 
-                    document.add_paragraph(sanitized_text)
-                else:
-                    logger.debug("Page %d: no text extracted", page_num)
+                document.add_paragraph(sanitized_text)
+            else:
+                logger.debug("Page %d: no text extracted", page_num)
 
-            logger.info("Total text extracted: %d characters from %d pages",
-                        total_text_length, num_pages)
+        logger.info("Total text extracted: %d characters from %d pages",
+                    total_text_length, num_pages)
 
-            logger.debug("Saving DOCX file")
-            document.save(docx_path)
+        logger.debug("Saving DOCX file")
+        document.save(docx_path)
 
         if os.path.exists(docx_path):
             output_size = os.path.getsize(docx_path) / 1024  # KB
@@ -2,10 +2,14 @@
 
 import os
 import logging
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Literal, Optional
+from typing import List, Literal, Optional
 
-from src.pdf_image_ocr import is_pdf_searchable_pypdf
+import pdfplumber
+from pdfminer.pdfdocument import PDFPasswordIncorrect
+
+from src.pdf_image_ocr import is_pdf_searchable_pypdf, validate_pdf_file
 
 
 def get_logger(name: str) -> logging.Logger:
@@ -34,7 +38,122 @@ DocumentType = Literal[
 ]
 
 
-def requires_ocr(file_path: str) -> bool:
+# Minimum characters for a single page to count as searchable
+SEARCHABLE_PAGE_MIN_CHARS = 50
+
+
+@dataclass
+class PdfAnalysis:
+    """
+    Result of a single pass over a PDF.
+
+    Computed once by analyze_pdf() and handed to every consumer
+    (OCR requirement check, OCR providers) so the file is parsed only once.
+    """
+    path: str
+    is_valid: bool
+    is_encrypted: bool = False
+    page_texts: List[str] = field(default_factory=list)
+    page_image_coverage: List[float] = field(default_factory=list)
+    error: Optional[str] = None
+
+    @property
+    def page_count(self) -> int:
+        """Number of pages in the PDF."""
+        return len(self.page_texts)
+
+    @property
+    def page_text_lengths(self) -> List[int]:
+        """Stripped text length of each page."""
+        return [len(text.strip()) for text in self.page_texts]
+
+    @property
+    def searchable_pages(self) -> List[bool]:
+        """Per-page flag: True when the page has enough text to skip OCR."""
+        return [length > SEARCHABLE_PAGE_MIN_CHARS
+                for length in self.page_text_lengths]
+
+    @property
+    def searchable_ratio(self) -> float:
+        """Fraction of pages that are searchable (0.0 for empty PDFs)."""
+        if not self.page_count:
+            return 0.0
+        return sum(self.searchable_pages) / self.page_count
+
+    @property
+    def is_searchable(self) -> bool:
+        """True if text can be extracted from any page."""
+        return any(length > 0 for length in self.page_text_lengths)
+
+
+def analyze_pdf(pdf_path: str) -> PdfAnalysis:
+    """
+    Analyze a PDF in one pass.
+
+    Validates the file header, then opens the PDF once with pdfplumber and
+    collects per-page text and image coverage. Errors are recorded on the
+    result instead of raised, so callers decide how to handle invalid files.
+
+    Args:
+        pdf_path: Path to PDF file
+
+    Returns:
+        PdfAnalysis for the file
+
+    Raises:
+        FileNotFoundError: If file doesn't exist
+    """
+    try:
+        validate_pdf_file(pdf_path)
+    except ValueError as e:
+        logger.warning(f"PDF validation failed for {pdf_path}: {e}")
+        return PdfAnalysis(path=pdf_path, is_valid=False, error=str(e))
+
+    analysis = PdfAnalysis(path=pdf_path, is_valid=True)
+
+    try:
+        with pdfplumber.open(pdf_path) as pdf:
+            analysis.is_encrypted = pdf.doc.encryption is not None
+
+            for page_num, page in enumerate(pdf.pages, 1):
+                text = page.extract_text() or ""
+                page_area = float(page.width * page.height) or 1.0
+                image_area = sum(
+                    max(0.0, img['x1'] - img['x0']) *
+                    max(0.0, img['bottom'] - img['top'])
+                    for img in page.images
+                )
+                coverage = min(1.0, image_area / page_area)
+
+                analysis.page_texts.append(text)
+                analysis.page_image_coverage.append(coverage)
+                logger.debug(
+                    f"Page {page_num}: {len(text.strip())} characters, "
+                    f"image coverage {coverage:.2f}"
+                )
+
+    except Exception as e:
+        cause = e.args[0] if e.args else None
+        if isinstance(cause, PDFPasswordIncorrect):
+            analysis.is_encrypted = True
+            analysis.error = "PDF is password protected"
+        else:
+            analysis.is_valid = False
+            analysis.error = f"Failed to read PDF file: {e}"
+        logger.error(f"Error analyzing PDF {pdf_path}: {analysis.error}")
+        return analysis
+
+    logger.info(
+        f"PDF analysis for {Path(pdf_path).name}: {analysis.page_count} pages, "
+        f"{sum(analysis.searchable_pages)} searchable, "
+        f"encrypted: {analysis.is_encrypted}"
+    )
+    return analysis
+
+
+def requires_ocr(
+        file_path: str,
+        analysis: Optional[PdfAnalysis] = None) -> bool:
     """
     Determine if a document requires OCR processing.
 
@@ -45,6 +164,7 @@ def requires_ocr(file_path: str) -> bool:
 
     Args:
         file_path: Absolute path to the document file
+        analysis: Optional precomputed PdfAnalysis for PDF files
 
     Returns:
         True if document requires OCR, False otherwise
@@ -65,7 +185,7 @@ def requires_ocr(file_path: str) -> bool:
     if not os.path.exists(file_path):
         raise FileNotFoundError(f"File not found: {file_path}")
 
-    doc_type = get_document_type(file_path)
+    doc_type = get_document_type(file_path, analysis)
 
     ocr_required = doc_type in ('pdf_scanned', 'image')
     logger.debug(f"OCR required for {file_path}: {ocr_required} (type: {doc_type})")
@@ -73,12 +193,15 @@ def requires_ocr(file_path: str) -> bool:
     return ocr_required
 
 
-def get_document_type(file_path: str) -> DocumentType:
+def get_document_type(
+        file_path: str,
+        analysis: Optional[PdfAnalysis] = None) -> DocumentType:
     """
     Classify document type based on file extension and content.
 
     Args:
         file_path: Path to the document
+        analysis: Optional precomputed PdfAnalysis for PDF files
 
     Returns:
         DocumentType classification
@@ -97,7 +220,7 @@ def get_document_type(file_path: str) -> DocumentType:
 
     # PDF files require content analysis
     if ext == '.pdf':
-        return get_pdf_type(file_path)
+        return get_pdf_type(file_path, analysis)
 
     # Image files always need OCR
     if ext in {'.jpg', '.jpeg', '.png', '.tiff', '.tif', '.gif', '.bmp'}:
@@ -118,15 +241,20 @@ def get_document_type(file_path: str) -> DocumentType:
     return 'unknown'
 
 
-def get_pdf_type(pdf_path: str) -> Literal['pdf_searchable', 'pdf_scanned']:
+def get_pdf_type(
+        pdf_path: str,
+        analysis: Optional[PdfAnalysis] = None
+) -> Literal['pdf_searchable', 'pdf_scanned']:
     """
     Determine if PDF is searchable or scanned.
 
-    Uses the existing is_pdf_searchable_pypdf() function to detect
-    if the PDF contains extractable text.
+    Uses a precomputed PdfAnalysis when given, otherwise the existing
+    is_pdf_searchable_pypdf() function to detect if the PDF contains
+    extractable text.
 
     Args:
         pdf_path: Path to PDF file
+        analysis: Optional precomputed PdfAnalysis for the file
 
     Returns:
         'pdf_searchable' if text can be extracted,
@@ -138,6 +266,17 @@ def get_pdf_type(pdf_path: str) -> Literal['pdf_searchable', 'pdf_scanned']:
         >>> get_pdf_type('scan.pdf')
         'pdf_scanned'
     """
+    if analysis is not None:
+        if not analysis.is_valid or analysis.error:
+            logger.warning(
+                f"PDF analysis failed for {pdf_path} ({analysis.error}), "
+                f"defaulting to 'pdf_scanned' for safety"
+            )
+            return 'pdf_scanned'
+        pdf_type = 'pdf_searchable' if analysis.is_searchable else 'pdf_scanned'
+        logger.debug(f"PDF type for {pdf_path}: {pdf_type} (from analysis)")
+        return pdf_type
+
     try:
         is_searchable = is_pdf_searchable_pypdf(pdf_path)
         pdf_type = 'pdf_searchable' if is_searchable else 'pdf_scanned'
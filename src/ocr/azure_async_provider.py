@@ -0,0 +1,449 @@
+"""
+Async Azure OCR Provider
+
+Azure Document Intelligence provider built on the asyncio client, so many
+analyses can be in flight at once while Azure queues and processes them.
+Concurrency is bounded by a semaphore and submissions are spaced to stay
+under the resource's transactions-per-second limit.
+
+Every analysis runs on one event loop owned by the provider, in a
+background thread, whatever loop or thread it was requested from. The
+limits therefore apply across all documents processed by the provider,
+not per call.
+"""
+
+import os
+import time
+import asyncio
+import logging
+import threading
+from typing import Any, Awaitable, Dict, List, Optional, Sequence, Tuple, TypeVar
+
+from azure.ai.formrecognizer.aio import DocumentAnalysisClient as AsyncDocumentAnalysisClient
+from azure.core.credentials import AzureKeyCredential
+from azure.core.exceptions import HttpResponseError
+
+from src.document_analyzer import PdfAnalysis, analyze_pdf
+from src.ocr.azure_provider import AzureOCRProvider
+from src.ocr.cancellation import OCRCancelledError, wait_for
+
+logger = logging.getLogger('EmailReader.OCR.AzureAsync')
+
+# Analyses in flight at once, across all documents
+DEFAULT_MAX_CONCURRENCY = 8
+# Standard (S0) Document Intelligence resources allow 15 requests/second
+DEFAULT_MAX_TPS = 15.0
+
+T = TypeVar('T')
+
+
+class AsyncRateLimiter:
+    """
+    Spaces calls evenly so no more than ``rate`` start per second.
+    """
+
+    def __init__(self, rate: float):
+        """
+        Args:
+            rate: Maximum calls per second
+        """
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next_slot = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Wait until the next call slot is available."""
+        if not self.interval:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+class AsyncAzureOCRProvider(AzureOCRProvider):
+    """
+    Azure Document Intelligence OCR provider with an awaitable API.
+
+    ``process_document_async`` and ``process_documents_async`` can be
+    awaited from any event loop; ``process_document`` keeps the
+    synchronous BaseOCRProvider contract. All of them run on the
+    provider's own event loop and share one client, one concurrency
+    semaphore and one rate limiter.
+    """
+
+    def __init__(self, config: Dict[str, Any]):
+        """
+        Initialize the async Azure OCR provider.
+
+        Args:
+            config: Configuration dictionary with 'endpoint' and 'api_key',
+                and optional 'max_concurrency' (analyses in flight) and
+                'max_tps' (Azure requests per second)
+
+        Raises:
+            ValueError: If required config values are missing
+        """
+        super().__init__(config)
+        self.max_concurrency = max(1, int(config.get('max_concurrency', DEFAULT_MAX_CONCURRENCY)))
+        self.max_tps = float(config.get('max_tps', DEFAULT_MAX_TPS))
+        # Started on first use; the client and limits are bound to it
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_lock = threading.Lock()
+        self._client: Optional[AsyncDocumentAnalysisClient] = None
+        self._shared_limits: Optional[Tuple[asyncio.Semaphore, AsyncRateLimiter]] = None
+        logger.info("Async Azure OCR: max_concurrency=%d, max_tps=%.1f",
+                    self.max_concurrency, self.max_tps)
+
+    def _create_async_client(self) -> AsyncDocumentAnalysisClient:
+        """Create an asyncio Document Analysis client."""
+        return AsyncDocumentAnalysisClient(
+            endpoint=self.endpoint,
+            credential=AzureKeyCredential(self.api_key)
+        )
+
+    def warm_up(self) -> None:
+        """Start the provider's event loop and open its client."""
+        start_time = time.monotonic()
+        self._run(self._get_client())
+        logger.info("Async Azure client ready in %.2fs", time.monotonic() - start_time)
+
+    def close(self) -> None:
+        """Close the clients and stop the provider's event loop."""
+        super().close()
+        with self._loop_lock:
+            loop, self._loop = self._loop, None
+        if loop is None:
+            return
+        if self._client is not None:
+            asyncio.run_coroutine_threadsafe(self._close_client(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+
+    def _event_loop(self) -> asyncio.AbstractEventLoop:
+        """Return the provider's event loop, starting it on first use."""
+        with self._loop_lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name='azure-async-ocr',
+                                 daemon=True).start()
+                self._loop = loop
+            return self._loop
+
+    def _run(self, coro: Awaitable[T], cancel: Optional[threading.Event] = None) -> T:
+        """
+        Run a coroutine on the provider's loop and wait for its result.
+
+        With ``cancel``, the coroutine's task is cancelled once the event
+        is set, which aborts its requests to Azure.
+        """
+        future = asyncio.run_coroutine_threadsafe(coro, self._event_loop())
+        try:
+            return wait_for(future, cancel)
+        except OCRCancelledError:
+            future.cancel()
+            raise
+
+    async def _run_async(self, coro: Awaitable[T]) -> T:
+        """Run a coroutine on the provider's loop and await its result."""
+        return await asyncio.wrap_future(
+            asyncio.run_coroutine_threadsafe(coro, self._event_loop()))
+
+    async def _get_client(self) -> AsyncDocumentAnalysisClient:
+        """Return the shared client, opening it on first use."""
+        if self._client is None:
+            client = self._create_async_client()
+            await client.__aenter__()
+            self._client = client
+        return self._client
+
+    async def _close_client(self) -> None:
+        """Close the shared client."""
+        client, self._client = self._client, None
+        if client is not None:
+            await client.__aexit__(None, None, None)
+
+    def _limits(self) -> Tuple[asyncio.Semaphore, AsyncRateLimiter]:
+        """Return the concurrency semaphore and rate limiter."""
+        # Only called on the provider's loop, so creation doesn't race
+        if self._shared_limits is None:
+            self._shared_limits = (asyncio.Semaphore(self.max_concurrency),
+                                 AsyncRateLimiter(self.max_tps))
+        return self._shared_limits
+
+    def process_document(
+            self,
+            input_path: str,
+            output_path: str,
+            analysis: Optional[PdfAnalysis] = None,
+            source_language: Optional[str] = None,
+            cancel: Optional[threading.Event] = None) -> None:
+        """
+        Process a document with Azure OCR and save the result.
+
+        Blocks until the document is done on the provider's event loop,
+        so documents processed from several threads share its limits.
+
+        Args:
+            input_path: Path to input PDF file
+            output_path: Path to save output DOCX file
+            analysis: Optional precomputed PdfAnalysis
+            source_language: Optional source language code (unused)
+            cancel: Optional event that cancels the document's task, and
+                its requests to Azure, once set
+
+        Raises:
+            FileNotFoundError: If input file doesn't exist
+            RuntimeError: If OCR processing fails
+            OCRCancelledError: If cancelled
+        """
+        self._run(self._process_document(input_path, output_path, analysis), cancel)
+
+    async def process_document_async(
+            self,
+            input_path: str,
+            output_path: str,
+            analysis: Optional[PdfAnalysis] = None,
+            source_language: Optional[str] = None) -> None:
+        """
+        Process a document with Azure OCR and save the result.
+
+        Args:
+            input_path: Path to input PDF file
+            output_path: Path to save output DOCX file
+            analysis: Optional precomputed PdfAnalysis
+            source_language: Optional source language code (unused)
+
+        Raises:
+            FileNotFoundError: If input file doesn't exist
+            RuntimeError: If OCR processing fails
+        """
+        await self._run_async(self._process_document(input_path, output_path, analysis))
+
+    async def process_documents_async(
+            self,
+            jobs: Sequence[Tuple[str, str]]) -> List[Optional[BaseException]]:
+        """
+        Process several documents concurrently.
+
+        Args:
+            jobs: (input_path, output_path) pairs
+
+        Returns:
+            For each job, None on success or the exception it raised
+        """
+        logger.info("Processing %d documents with async Azure OCR", len(jobs))
+
+        async def process_all() -> List[Any]:
+            return await asyncio.gather(
+                *(self._process_document(input_path, output_path)
+                  for input_path, output_path in jobs),
+                return_exceptions=True)
+
+        results = await self._run_async(process_all())
+        return [r if isinstance(r, BaseException) else None for r in results]
+
+    async def _process_document(
+            self,
+            input_path: str,
+            output_path: str,
+            analysis: Optional[PdfAnalysis] = None) -> None:
+        """Run the Azure OCR pipeline for one document with the shared client."""
+        await self._process_async(await self._get_client(), input_path, output_path, analysis)
+
+    async def _process_async(
+            self,
+            client: AsyncDocumentAnalysisClient,
+            input_path: str,
+            output_path: str,
+            analysis: Optional[PdfAnalysis] = None) -> None:
+        """Run the Azure OCR pipeline for one document."""
+        logger.info("Processing document with async Azure OCR: %s",
+                    os.path.basename(input_path))
+
+        if not os.path.exists(input_path):
+            logger.error("Input file not found: %s", input_path)
+            raise FileNotFoundError(f"File not found: {input_path}")
+
+        try:
+            if analysis is None:
+                logger.info("Analyzing PDF pages for searchability")
+                analysis = await asyncio.to_thread(analyze_pdf, input_path)
+            if analysis.error:
+                raise ValueError(f"Cannot process PDF: {analysis.error}")
+
+            pages_content, ocr_pages = self._split_pages(analysis)
+
+            if ocr_pages:
+                logger.info("Submitting %d/%d scanned pages to Azure OCR: %s",
+                            len(ocr_pages), len(pages_content),
+                            self._format_page_ranges(ocr_pages))
+
+                layout = {} if self.sidecars is not None else None
+                key, cached = self._cache_lookup(input_path, {'pages': ocr_pages})
+                if cached is None:
+                    with open(input_path, 'rb') as f:
+                        pdf_bytes = f.read()
+                    cached = {'pages': await self._ocr_pages_async(
+                        client, pdf_bytes, ocr_pages, layout)}
+                    self._cache_store(key, cached, {'pages': ocr_pages})
+
+                # Merge OCR text back in original page order
+                for page_num, page_text in zip(ocr_pages, cached['pages']):
+                    pages_content[page_num - 1] = page_text
+
+                if layout:
+                    await asyncio.to_thread(
+                        self._save_sidecar, input_path,
+                        self._sidecar_payload(pages_content, layout))
+            else:
+                logger.info("All pages are searchable - saving without OCR")
+
+            await asyncio.to_thread(self._save_as_docx, pages_content, output_path)
+
+            if not os.path.exists(output_path):
+                raise RuntimeError("OCR processing failed to create output file")
+            logger.info("Async Azure OCR completed: %s (%.2f KB)",
+                        os.path.basename(output_path),
+                        os.path.getsize(output_path) / 1024)
+
+        except FileNotFoundError:
+            raise
+        except Exception as e:
+            logger.error("Error during async Azure OCR processing: %s", e, exc_info=True)
+            raise RuntimeError(f"Azure OCR processing failed: {e}") from e
+
+    async def _ocr_pages_async(
+            self,
+            client: AsyncDocumentAnalysisClient,
+            pdf_bytes: bytes,
+            pages: List[int],
+            layout: Optional[Dict[int, Dict[str, Any]]] = None) -> List[str]:
+        """
+        OCR the given pages, analyzing shards of large documents concurrently.
+
+        See AzureOCRProvider._ocr_pages(); shards share the provider's
+        concurrency and rate limits.
+
+        Args:
+            client: Async Document Analysis client
+            pdf_bytes: PDF file content as bytes
+            pages: 1-based page numbers to OCR
+            layout: Optional dictionary that receives the lines of each
+                page, keyed by page number
+
+        Returns:
+            Text for each page, aligned with ``pages``
+
+        Raises:
+            RuntimeError: If a shard still fails after its retry
+        """
+        shards = self._make_shards(pages, self.shard_size)
+        if len(shards) <= 1:
+            return await self._ocr_with_azure_async(
+                client, pdf_bytes, pages=pages, layout=layout)
+
+        logger.info("Splitting %d pages into %d shards of up to %d pages",
+                    len(pages), len(shards), self.shard_size)
+
+        async def ocr_shard(shard: List[int]) -> List[str]:
+            shard_bytes = await asyncio.to_thread(
+                self._extract_pdf_pages, pdf_bytes, shard)
+            shard_layout = {} if layout is not None else None
+            texts = await self._ocr_with_azure_async(
+                client, shard_bytes, pages=list(range(1, len(shard) + 1)),
+                layout=shard_layout)
+            if shard_layout:
+                self._merge_shard_layout(layout, shard_layout, shard)
+            return texts
+
+        results = await asyncio.gather(
+            *(ocr_shard(shard) for shard in shards), return_exceptions=True)
+
+        for index, result in enumerate(results):
+            if not isinstance(result, Exception):
+                continue
+            shard = shards[index]
+            logger.warning("Shard %d (pages %s) failed: %s - retrying",
+                           index + 1, self._format_page_ranges(shard), result)
+            try:
+                results[index] = await ocr_shard(shard)
+            except Exception as e:
+                raise RuntimeError(
+                    f"Azure OCR failed for pages "
+                    f"{self._format_page_ranges(shard)}: {e}") from e
+
+        return [text for result in results for text in result]
+
+    async def _ocr_with_azure_async(
+            self,
+            client: AsyncDocumentAnalysisClient,
+            pdf_bytes: bytes,
+            max_retries: int = 3,
+            pages: Optional[List[int]] = None,
+            layout: Optional[Dict[int, Dict[str, Any]]] = None) -> List[str]:
+        """
+        Call the Azure Read API without blocking the event loop.
+
+        Holds a concurrency slot while the analysis is in flight and waits
+        for a rate-limit slot before each submission.
+
+        Args:
+            client: Async Document Analysis client
+            pdf_bytes: PDF file content as bytes
+            max_retries: Maximum number of retry attempts
+            pages: Optional 1-based page numbers to analyze
+            layout: Optional dictionary that receives the lines of each
+                analyzed page
+
+        Returns:
+            List of text content for each page, aligned with ``pages``
+            when given
+
+        Raises:
+            RuntimeError: If OCR fails after retries
+        """
+        analyze_kwargs: Dict[str, Any] = {}
+        if pages:
+            analyze_kwargs['pages'] = self._format_page_ranges(pages)
+
+        semaphore, rate_limiter = self._limits()
+
+        for attempt in range(1, max_retries + 1):
+            try:
+                async with semaphore:
+                    await rate_limiter.acquire()
+                    start_time = time.monotonic()
+                    logger.debug("Azure async analysis attempt %d/%d (pages: %s)",
+                                 attempt, max_retries,
+                                 analyze_kwargs.get('pages', 'all'))
+                    poller = await client.begin_analyze_document(
+                        "prebuilt-read",
+                        document=pdf_bytes,
+                        **analyze_kwargs
+                    )
+                    result = await poller.result()
+
+                logger.info("Azure analysis completed in %.2f seconds",
+                            time.monotonic() - start_time)
+                return self._extract_pages(result, pages, layout)
+
+            except HttpResponseError as e:
+                logger.error("Azure API HTTP error (attempt %d/%d): %s",
+                             attempt, max_retries, e)
+
+                if attempt < max_retries:
+                    wait_time = 2 ** attempt  # Exponential backoff
+                    logger.info("Retrying in %d seconds...", wait_time)
+                    await asyncio.sleep(wait_time)
+                else:
+                    logger.error("Max retries reached, giving up")
+                    raise RuntimeError(f"Azure OCR failed after {max_retries} attempts: {e}")
+
+            except Exception as e:
+                logger.error("Unexpected error during Azure OCR: %s", e, exc_info=True)
+                raise RuntimeError(f"Azure OCR failed: {e}")
+
+        raise RuntimeError("Azure OCR failed: max retries exceeded")
+
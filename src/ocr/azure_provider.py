@@ -7,21 +7,30 @@ Implements Azure Document Intelligence Read API integration for OCR.
 import os
 import time
 import logging
-from typing import Dict, Any, List, Tuple
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple
 from pathlib import Path
 
-import pdfplumber
-from docx import Document
-from docx.shared import Pt
-from docx.enum.text import WD_BREAK
 from azure.ai.formrecognizer import DocumentAnalysisClient
 from azure.core.credentials import AzureKeyCredential
 from azure.core.exceptions import HttpResponseError
+from azure.core.rest import HttpRequest
 
+from src.convert_to_docx import DocxPageWriter
+from src.document_analyzer import PdfAnalysis, analyze_pdf
 from src.ocr.base_provider import BaseOCRProvider
+from src.ocr.cancellation import (CANCEL_POLL_INTERVAL, OCRCancelledError,
+                                  raise_if_cancelled)
+from src.utils.pdf_pages import extract_pdf_pages
 
 logger = logging.getLogger('EmailReader.OCR.Azure')
 
+# Documents with more scanned pages than this are split into shards
+DEFAULT_SHARD_SIZE = 50
+# Shards analyzed concurrently
+DEFAULT_SHARD_WORKERS = 4
+
 
 class AzureOCRProvider(BaseOCRProvider):
     """
@@ -36,7 +45,10 @@ class AzureOCRProvider(BaseOCRProvider):
         Initialize the Azure OCR provider.
 
         Args:
-            config: Configuration dictionary with 'endpoint' and 'api_key'
+            config: Configuration dictionary with 'endpoint' and 'api_key',
+                and optional 'shard_size' (pages per Azure analysis for
+                large documents, 0 disables sharding) and 'shard_workers'
+                (shards analyzed concurrently)
 
         Raises:
             ValueError: If required config values are missing
@@ -45,6 +57,8 @@ class AzureOCRProvider(BaseOCRProvider):
 
         self.endpoint = config.get('endpoint')
         self.api_key = config.get('api_key')
+        self.shard_size = int(config.get('shard_size', DEFAULT_SHARD_SIZE))
+        self.shard_workers = max(1, int(config.get('shard_workers', DEFAULT_SHARD_WORKERS)))
 
         if not self.endpoint or not self.api_key:
             raise ValueError(
@@ -64,19 +78,33 @@ class AzureOCRProvider(BaseOCRProvider):
             logger.error("Failed to initialize Azure client: %s", e)
             raise
 
-    def process_document(self, input_path: str, output_path: str) -> None:
+    def process_document(
+            self,
+            input_path: str,
+            output_path: str,
+            analysis: Optional[PdfAnalysis] = None,
+            source_language: Optional[str] = None,
+            cancel: Optional[threading.Event] = None) -> None:
         """
         Process a document with Azure OCR and save the result.
 
-        Detects searchable vs scanned pages and processes accordingly.
+        Detects searchable vs scanned pages and processes accordingly:
+        searchable pages are extracted locally and only the scanned pages
+        are sent to Azure. Results are merged back in page order.
 
         Args:
             input_path: Path to input PDF file
             output_path: Path to save output DOCX file
+            analysis: Optional precomputed PdfAnalysis; computed here
+                when not provided
+            source_language: Optional source language code (unused,
+                the Azure read model detects languages itself)
+            cancel: Optional event that stops waiting for Azure once set
 
         Raises:
             FileNotFoundError: If input file doesn't exist
             RuntimeError: If OCR processing fails
+            OCRCancelledError: If cancelled
         """
         logger.info("Processing document with Azure OCR: %s", os.path.basename(input_path))
         logger.debug("Input: %s", input_path)
@@ -88,54 +116,48 @@ class AzureOCRProvider(BaseOCRProvider):
 
         try:
             # Detect which pages need OCR
-            logger.info("Analyzing PDF pages for searchability")
-            page_searchability = self._detect_page_searchability(input_path)
-            total_pages = len(page_searchability)
-            searchable_count = sum(1 for is_searchable in page_searchability if is_searchable)
-            ocr_count = total_pages - searchable_count
-
-            logger.info("PDF analysis: %d total pages, %d searchable, %d need OCR",
-                       total_pages, searchable_count, ocr_count)
-
-            # Extract all pages content
-            pages_content: List[str] = []
-
-            with pdfplumber.open(input_path) as pdf:
-                for page_num, (page, is_searchable) in enumerate(zip(pdf.pages, page_searchability), 1):
-                    logger.debug("Processing page %d/%d (searchable: %s)",
-                               page_num, total_pages, is_searchable)
-
-                    if is_searchable:
-                        # Extract text directly
-                        text = page.extract_text() or ""
-                        logger.debug("Page %d: extracted %d characters directly",
-                                   page_num, len(text))
-                        pages_content.append(text)
-                    else:
-                        # This page needs OCR - we'll OCR the entire document
-                        # Break out and use Azure for all pages
-                        logger.info("Found non-searchable page %d - using Azure OCR for entire document",
-                                  page_num)
-                        break
-                else:
-                    # All pages are searchable, save directly
-                    logger.info("All pages are searchable - saving without OCR")
-                    self._save_as_docx(pages_content, output_path)
-                    return
-
-            # At least one page needs OCR - use Azure for entire document
-            logger.info("Reading PDF file for Azure OCR")
+            if analysis is None:
+                logger.info("Analyzing PDF pages for searchability")
+                analysis = analyze_pdf(input_path)
+            if analysis.error:
+                raise ValueError(f"Cannot process PDF: {analysis.error}")
+
+            pages_content, ocr_pages = self._split_pages(analysis)
+            total_pages = len(pages_content)
+
+            if not ocr_pages:
+                # All pages are searchable, save directly
+                logger.info("All pages are searchable - saving without OCR")
+                self._save_as_docx(pages_content, output_path)
+                return
+
+            # Only the scanned pages are submitted to Azure
+            logger.info("Submitting %d/%d scanned pages to Azure OCR: %s",
+                       len(ocr_pages), total_pages,
+                       self._format_page_ranges(ocr_pages))
             with open(input_path, 'rb') as f:
                 pdf_bytes = f.read()
 
             file_size_kb = len(pdf_bytes) / 1024
             logger.debug("PDF file size: %.2f KB", file_size_kb)
 
-            # Perform OCR with Azure
-            ocr_result = self._ocr_with_azure(pdf_bytes)
+            # Perform OCR with Azure on the scanned pages only; the page
+            # lines are kept for the sidecar when sidecars are enabled
+            layout = {} if self.sidecars is not None else None
+            ocr_result = self._cached_ocr(
+                input_path,
+                lambda: {'pages': self._ocr_pages(pdf_bytes, ocr_pages, layout, cancel)},
+                pages=ocr_pages)['pages']
+
+            # Merge OCR text back in original page order
+            for page_num, page_text in zip(ocr_pages, ocr_result):
+                pages_content[page_num - 1] = page_text
+
+            if layout:
+                self._save_sidecar(input_path, self._sidecar_payload(pages_content, layout))
 
             # Save result as DOCX
-            self._save_as_docx(ocr_result, output_path)
+            self._save_as_docx(pages_content, output_path)
 
             if os.path.exists(output_path):
                 output_size = os.path.getsize(output_path) / 1024
@@ -144,17 +166,94 @@ class AzureOCRProvider(BaseOCRProvider):
             else:
                 raise RuntimeError("OCR processing failed to create output file")
 
-        except FileNotFoundError:
+        except (FileNotFoundError, OCRCancelledError):
             raise
         except Exception as e:
             logger.error("Error during Azure OCR processing: %s", e, exc_info=True)
             raise RuntimeError(f"Azure OCR processing failed: {e}")
 
+    @staticmethod
+    def _split_pages(analysis: PdfAnalysis) -> Tuple[List[str], List[int]]:
+        """
+        Split a PDF into locally extracted pages and pages needing OCR.
+
+        Args:
+            analysis: PdfAnalysis of the input
+
+        Returns:
+            Tuple of (text per page, with searchable pages filled in;
+            1-based numbers of the scanned pages to send to Azure)
+        """
+        page_searchability = analysis.searchable_pages
+        total_pages = analysis.page_count
+        searchable_count = sum(1 for is_searchable in page_searchability if is_searchable)
+        ocr_count = total_pages - searchable_count
+
+        logger.info("PDF analysis: %d total pages, %d searchable, %d need OCR",
+                   total_pages, searchable_count, ocr_count)
+
+        # Use text of searchable pages, collect the scanned ones
+        pages_content: List[str] = [""] * total_pages
+        ocr_pages: List[int] = []
+
+        for page_num, is_searchable in enumerate(page_searchability, 1):
+            if is_searchable:
+                pages_content[page_num - 1] = analysis.page_texts[page_num - 1]
+                logger.debug("Page %d: using %d extracted characters",
+                           page_num, len(pages_content[page_num - 1]))
+            else:
+                logger.debug("Page %d queued for Azure OCR", page_num)
+                ocr_pages.append(page_num)
+
+        return pages_content, ocr_pages
+
+    def ocr_pages(self, input_path: str, pages: List[int]) -> List[str]:
+        """
+        OCR selected pages of a PDF with Azure.
+
+        Args:
+            input_path: Path to the PDF file
+            pages: 1-based page numbers
+
+        Returns:
+            Text for each page, aligned with ``pages``
+        """
+        logger.info("Submitting pages %s of %s to Azure OCR",
+                    self._format_page_ranges(pages), os.path.basename(input_path))
+        with open(input_path, 'rb') as f:
+            pdf_bytes = f.read()
+        return self._ocr_pages(pdf_bytes, pages)
+
+    def warm_up(self) -> None:
+        """
+        Open the client's TLS connection to the Azure endpoint.
+
+        Sends a lightweight resource-info request; any response leaves a
+        pooled connection behind for the first analysis.
+        """
+        start_time = time.time()
+        try:
+            response = self.client.send_request(HttpRequest(
+                "GET", "info?api-version=2023-07-31"))
+            logger.info("Azure client warmed up in %.2f seconds (HTTP %d)",
+                        time.time() - start_time, response.status_code)
+        except Exception as e:
+            logger.warning("Azure client warm-up failed: %s", e)
+
+    def close(self) -> None:
+        """Close the Azure client and its connection pool."""
+        self.client.close()
+
+    def _cache_settings(self) -> Dict[str, Any]:
+        """Azure model used for OCR."""
+        return {'model': 'prebuilt-read'}
+
     def is_pdf_searchable(self, pdf_path: str) -> bool:
         """
         Check if a PDF contains searchable text.
 
-        Uses pdfplumber to check if >50% of pages have >50 characters.
+        Uses the single-pass PDF analysis to check if >50% of pages
+        have >50 characters.
 
         Args:
             pdf_path: Path to PDF file
@@ -164,67 +263,169 @@ class AzureOCRProvider(BaseOCRProvider):
         """
         logger.debug("Checking if PDF is searchable: %s", os.path.basename(pdf_path))
 
-        try:
-            with pdfplumber.open(pdf_path) as pdf:
-                pages_with_text = 0
-                total_pages = len(pdf.pages)
+        analysis = analyze_pdf(pdf_path)
+        if analysis.error:
+            logger.error("Error checking PDF searchability: %s", analysis.error)
+            raise ValueError(f"Cannot process PDF: {analysis.error}")
+
+        pages_with_text = sum(analysis.searchable_pages)
+        is_searchable = pages_with_text > (analysis.page_count * 0.5)
+        logger.debug("PDF searchable: %s (%d/%d pages with text)",
+                   is_searchable, pages_with_text, analysis.page_count)
+        return is_searchable
+
+    def _ocr_pages(
+            self,
+            pdf_bytes: bytes,
+            pages: List[int],
+            layout: Optional[Dict[int, Dict[str, Any]]] = None,
+            cancel: Optional[threading.Event] = None) -> List[str]:
+        """
+        OCR the given pages, sharding large documents.
 
-                for page_num, page in enumerate(pdf.pages, 1):
-                    text = page.extract_text()
-                    if text and len(text.strip()) > 50:
-                        pages_with_text += 1
-                        logger.debug("Page %d has sufficient text", page_num)
+        Up to ``shard_size`` pages go to Azure as one analysis. Larger page
+        sets are split into shards that are analyzed concurrently, so a
+        long document isn't one long serial job and a failure only costs
+        its shard. Failed shards are retried individually once.
 
-                is_searchable = pages_with_text > (total_pages * 0.5)
-                logger.debug("PDF searchable: %s (%d/%d pages with text)",
-                           is_searchable, pages_with_text, total_pages)
-                return is_searchable
+        Args:
+            pdf_bytes: PDF file content as bytes
+            pages: 1-based page numbers to OCR
+            layout: Optional dictionary that receives the lines of each
+                page, keyed by page number (see _page_layout())
+            cancel: Optional event that stops every shard once set
 
-        except Exception as e:
-            logger.error("Error checking PDF searchability: %s", e)
-            raise
+        Returns:
+            Text for each page, aligned with ``pages``
 
-    def _detect_page_searchability(self, pdf_path: str) -> List[bool]:
+        Raises:
+            RuntimeError: If a shard still fails after its retry
+            OCRCancelledError: If cancelled
         """
-        Analyze each page individually to determine if it needs OCR.
+        shards = self._make_shards(pages, self.shard_size)
+        if len(shards) <= 1:
+            return self._ocr_with_azure(pdf_bytes, pages=pages, layout=layout,
+                                        cancel=cancel)
+
+        logger.info("Splitting %d pages into %d shards of up to %d pages "
+                    "(%d concurrent)", len(pages), len(shards),
+                    self.shard_size, self.shard_workers)
+
+        results: Dict[int, List[str]] = {}
+        errors: Dict[int, Exception] = {}
+
+        with ThreadPoolExecutor(max_workers=self.shard_workers) as executor:
+            futures = {
+                index: executor.submit(self._ocr_shard, pdf_bytes, shard, layout, cancel)
+                for index, shard in enumerate(shards)
+            }
+            for index, future in futures.items():
+                try:
+                    results[index] = future.result()
+                except Exception as e:
+                    logger.warning("Shard %d (pages %s) failed: %s", index + 1,
+                                   self._format_page_ranges(shards[index]), e)
+                    errors[index] = e
+
+        # Shards stopped by a cancellation aren't retried
+        raise_if_cancelled(cancel)
+        for index in sorted(errors):
+            shard = shards[index]
+            logger.info("Retrying shard %d (pages %s)",
+                        index + 1, self._format_page_ranges(shard))
+            try:
+                results[index] = self._ocr_shard(pdf_bytes, shard, layout, cancel)
+            except Exception as e:
+                raise RuntimeError(
+                    f"Azure OCR failed for pages "
+                    f"{self._format_page_ranges(shard)}: {e}") from e
+
+        # Shards were cut from ``pages`` in order, so concatenating keeps it
+        return [text for index in range(len(shards)) for text in results[index]]
+
+    def _ocr_shard(
+            self,
+            pdf_bytes: bytes,
+            shard: List[int],
+            layout: Optional[Dict[int, Dict[str, Any]]] = None,
+            cancel: Optional[threading.Event] = None) -> List[str]:
+        """OCR one shard as a standalone PDF holding only its pages."""
+        logger.debug("Analyzing shard with pages %s", self._format_page_ranges(shard))
+        shard_layout = {} if layout is not None else None
+        # Request every page of the shard PDF so results stay aligned
+        texts = self._ocr_with_azure(
+            self._extract_pdf_pages(pdf_bytes, shard),
+            pages=list(range(1, len(shard) + 1)), layout=shard_layout, cancel=cancel)
+        if shard_layout:
+            self._merge_shard_layout(layout, shard_layout, shard)
+        return texts
+
+    @staticmethod
+    def _merge_shard_layout(
+            layout: Dict[int, Dict[str, Any]],
+            shard_layout: Dict[int, Dict[str, Any]],
+            shard: List[int]) -> None:
+        """Add a shard's page lines to ``layout`` under document page numbers."""
+        # Shard PDFs number their pages from 1
+        for number, page in shard_layout.items():
+            layout[shard[number - 1]] = page
+
+    @staticmethod
+    def _make_shards(pages: List[int], shard_size: int) -> List[List[int]]:
+        """
+        Split page numbers into consecutive shards.
 
         Args:
-            pdf_path: Path to PDF file
+            pages: 1-based page numbers
+            shard_size: Maximum pages per shard (0 or less: no sharding)
 
         Returns:
-            List of booleans indicating if each page is searchable
+            List of page number lists
         """
-        logger.debug("Detecting searchability for each page")
+        if shard_size <= 0 or len(pages) <= shard_size:
+            return [list(pages)]
+        return [pages[i:i + shard_size] for i in range(0, len(pages), shard_size)]
 
-        try:
-            page_searchability: List[bool] = []
-
-            with pdfplumber.open(pdf_path) as pdf:
-                for page_num, page in enumerate(pdf.pages, 1):
-                    text = page.extract_text()
-                    char_count = len(text.strip()) if text else 0
-                    is_searchable = char_count > 50
-
-                    logger.debug("Page %d: %d characters, searchable: %s",
-                               page_num, char_count, is_searchable)
-                    page_searchability.append(is_searchable)
+    @staticmethod
+    def _extract_pdf_pages(pdf_bytes: bytes, pages: List[int]) -> bytes:
+        """
+        Build a PDF containing only the given pages.
 
-            return page_searchability
+        Uploading a shard's pages alone keeps each request small instead of
+        sending the whole document once per shard.
 
-        except Exception as e:
-            logger.error("Error detecting page searchability: %s", e)
-            raise
+        Args:
+            pdf_bytes: PDF file content as bytes
+            pages: 1-based page numbers to keep, in order
 
-    def _ocr_with_azure(self, pdf_bytes: bytes, max_retries: int = 3) -> List[str]:
+        Returns:
+            PDF bytes
+        """
+        return extract_pdf_pages(pdf_bytes, pages)
+
+    def _ocr_with_azure(
+            self,
+            pdf_bytes: bytes,
+            max_retries: int = 3,
+            pages: Optional[List[int]] = None,
+            layout: Optional[Dict[int, Dict[str, Any]]] = None,
+            cancel: Optional[threading.Event] = None) -> List[str]:
         """
         Call Azure Read API to perform OCR.
 
         Args:
             pdf_bytes: PDF file content as bytes
             max_retries: Maximum number of retry attempts
+            pages: Optional 1-based page numbers to analyze. When given,
+                only these pages are analyzed (and billed) by Azure.
+            layout: Optional dictionary that receives the lines of each
+                analyzed page
+            cancel: Optional event that stops waiting for the analysis
+                once set
 
         Returns:
-            List of text content for each page
+            List of text content for each page. When ``pages`` is given
+            the list is aligned with it, otherwise it covers every page.
 
         Raises:
             RuntimeError: If OCR fails after retries
@@ -232,6 +433,12 @@ class AzureOCRProvider(BaseOCRProvider):
         logger.info("Starting Azure Document Intelligence Read API call")
         logger.debug("Document size: %d bytes", len(pdf_bytes))
 
+        analyze_kwargs: Dict[str, Any] = {}
+        if pages:
+            analyze_kwargs['pages'] = self._format_page_ranges(pages)
+            logger.debug("Restricting analysis to pages: %s",
+                         analyze_kwargs['pages'])
+
         for attempt in range(1, max_retries + 1):
             try:
                 logger.debug("Azure API attempt %d/%d", attempt, max_retries)
@@ -242,44 +449,19 @@ class AzureOCRProvider(BaseOCRProvider):
                 logger.debug("Calling begin_analyze_document with prebuilt-read model")
                 poller = self.client.begin_analyze_document(
                     "prebuilt-read",
-                    document=pdf_bytes
+                    document=pdf_bytes,
+                    **analyze_kwargs
                 )
 
                 logger.info("Azure analysis started, waiting for completion...")
 
                 # Wait for completion
-                result = poller.result()
+                result = self._poller_result(poller, cancel)
 
                 duration = time.time() - start_time
                 logger.info("Azure analysis completed in %.2f seconds", duration)
-                logger.debug("Result contains %d pages", len(result.pages))
-
-                # Extract text from each page
-                pages_content: List[str] = []
-
-                for page_num, page in enumerate(result.pages, 1):
-                    logger.debug("Extracting text from page %d/%d",
-                               page_num, len(result.pages))
-
-                    # Get all lines on this page
-                    page_lines = [
-                        line.content
-                        for line in result.pages[page_num - 1].lines
-                    ]
 
-                    page_text = "\n".join(page_lines)
-                    char_count = len(page_text)
-
-                    logger.debug("Page %d: extracted %d characters",
-                               page_num, char_count)
-
-                    pages_content.append(page_text)
-
-                total_chars = sum(len(p) for p in pages_content)
-                logger.info("Azure OCR extracted %d characters from %d pages",
-                           total_chars, len(pages_content))
-
-                return pages_content
+                return self._extract_pages(result, pages, layout)
 
             except HttpResponseError as e:
                 logger.error("Azure API HTTP error (attempt %d/%d): %s",
@@ -293,13 +475,183 @@ class AzureOCRProvider(BaseOCRProvider):
                     logger.error("Max retries reached, giving up")
                     raise RuntimeError(f"Azure OCR failed after {max_retries} attempts: {e}")
 
+            except OCRCancelledError:
+                logger.info("Azure analysis abandoned: job cancelled")
+                raise
+
             except Exception as e:
                 logger.error("Unexpected error during Azure OCR: %s", e, exc_info=True)
                 raise RuntimeError(f"Azure OCR failed: {e}")
 
         raise RuntimeError("Azure OCR failed: max retries exceeded")
 
-    def _save_as_docx(self, pages_content: List[str], output_path: str) -> None:
+    @staticmethod
+    def _poller_result(poller: Any, cancel: Optional[threading.Event]) -> Any:
+        """
+        Wait for an analysis to finish, giving up once the job is cancelled.
+
+        Azure has no way to cancel a Read analysis, so a cancelled one is
+        left to finish on the service and its result is never fetched.
+        """
+        if cancel is not None:
+            while not poller.done():
+                raise_if_cancelled(cancel)
+                poller.wait(CANCEL_POLL_INTERVAL)
+        return poller.result()
+
+    @classmethod
+    def _extract_pages(
+            cls,
+            result: Any,
+            pages: Optional[List[int]] = None,
+            layout: Optional[Dict[int, Dict[str, Any]]] = None) -> List[str]:
+        """
+        Extract the text of each page from an Azure analyze result.
+
+        Args:
+            result: Azure AnalyzeResult
+            pages: 1-based page numbers that were requested, if a subset
+            layout: Optional dictionary that receives each page's lines
+                with their polygons (see _page_layout()), keyed by page
+                number
+
+        Returns:
+            Text per page, aligned with ``pages`` when given, otherwise
+            covering every page in order
+        """
+        logger.debug("Result contains %d pages", len(result.pages))
+        pages_by_number: Dict[int, str] = {}
+
+        for page_num, page in enumerate(result.pages, 1):
+            logger.debug("Extracting text from page %d/%d",
+                       page_num, len(result.pages))
+
+            # Get all lines on this page
+            page_lines = [line.content for line in page.lines]
+
+            page_text = cls._page_text(page_lines)
+            char_count = len(page_text)
+
+            # Azure reports original page numbers for page subsets
+            number = getattr(page, 'page_number', None) or page_num
+            if layout is not None:
+                layout[number] = cls._page_layout(page)
+            logger.debug("Page %d: extracted %d characters",
+                       number, char_count)
+
+            pages_by_number[number] = page_text
+
+        if pages:
+            pages_content = [pages_by_number.get(p, "") for p in pages]
+        else:
+            pages_content = [pages_by_number[p] for p in sorted(pages_by_number)]
+
+        total_chars = sum(len(p) for p in pages_content)
+        logger.info("Azure OCR extracted %d characters from %d pages",
+                   total_chars, len(pages_content))
+
+        return pages_content
+
+    @staticmethod
+    def _format_page_ranges(pages: List[int]) -> str:
+        """
+        Format 1-based page numbers as an Azure ``pages`` expression.
+
+        Consecutive pages are collapsed into ranges, e.g.
+        ``[1, 2, 3, 7, 9, 10]`` becomes ``"1-3,7,9-10"``.
+
+        Args:
+            pages: Page numbers in any order
+
+        Returns:
+            Comma separated page ranges
+        """
+        ranges: List[Tuple[int, int]] = []
+        for page in sorted(set(pages)):
+            if ranges and page == ranges[-1][1] + 1:
+                ranges[-1] = (ranges[-1][0], page)
+            else:
+                ranges.append((page, page))
+
+        return ",".join(
+            str(start) if start == end else f"{start}-{end}"
+            for start, end in ranges
+        )
+
+    @staticmethod
+    def _page_text(lines: List[str]) -> str:
+        """Join the lines Azure recognized on a page into the page's text."""
+        return "\n".join(lines)
+
+    @staticmethod
+    def _page_layout(page: Any) -> Dict[str, Any]:
+        """
+        Raw lines of an Azure result page, in JSON-serializable form.
+
+        Args:
+            page: Azure DocumentPage
+
+        Returns:
+            Page size and unit, and each line's content and polygon as a
+            flat [x1, y1, x2, y2, ...] list in that unit
+        """
+        return {
+            'width': page.width,
+            'height': page.height,
+            'unit': page.unit,
+            'angle': page.angle,
+            'lines': [
+                {'content': line.content,
+                 'polygon': [coord for point in line.polygon or []
+                             for coord in (point.x, point.y)]}
+                for line in page.lines
+            ],
+        }
+
+    @staticmethod
+    def _sidecar_payload(
+            pages_content: List[str],
+            layout: Dict[int, Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Sidecar contents for a processed document.
+
+        Args:
+            pages_content: Text of every page, including pages extracted
+                locally
+            layout: Lines of the pages Azure OCR'd, keyed by page number
+
+        Returns:
+            Payload with the page texts and the OCR'd pages' lines
+        """
+        return {
+            'pages': pages_content,
+            'layout': [{'page': number, **layout[number]} for number in sorted(layout)],
+        }
+
+    @classmethod
+    def rebuild_from_sidecar(cls, record: Dict[str, Any], output_path: str) -> None:
+        """
+        Build a document's DOCX from saved Azure page lines, without
+        calling Azure.
+
+        Pages extracted locally keep their saved text; OCR'd pages are
+        rebuilt from their lines.
+
+        Args:
+            record: Sidecar record with 'pages' and 'layout'
+            output_path: Path to save the DOCX file
+        """
+        pages_content = list(record.get('pages', []))
+        layout = record.get('layout', [])
+        logger.info("Rebuilding %s from %d saved OCR pages",
+                    record.get('document'), len(layout))
+        for page in layout:
+            pages_content[page['page'] - 1] = cls._page_text(
+                [line['content'] for line in page['lines']])
+        cls._save_as_docx(pages_content, output_path)
+
+    @staticmethod
+    def _save_as_docx(pages_content: List[str], output_path: str) -> None:
         """
         Save extracted text as a DOCX file with page breaks.
 
@@ -311,29 +663,13 @@ class AzureOCRProvider(BaseOCRProvider):
                     len(pages_content), os.path.basename(output_path))
 
         try:
-            document = Document()
-
-            for page_num, page_text in enumerate(pages_content, 1):
-                logger.debug("Adding page %d to document (%d characters)",
-                           page_num, len(page_text))
-
-                # Add page content
-                if page_text.strip():
-                    paragraph = document.add_paragraph(page_text)
-                    # Set font size
-                    for run in paragraph.runs:
-                        run.font.size = Pt(11)
-                else:
-                    logger.debug("Page %d is empty", page_num)
-                    document.add_paragraph("")
-
-                # Add page break (except after last page)
-                if page_num < len(pages_content):
-                    document.add_paragraph().add_run().add_break(WD_BREAK.PAGE)
-                    logger.debug("Added page break after page %d", page_num)
-
-            logger.debug("Saving DOCX file to: %s", output_path)
-            document.save(output_path)
+            with DocxPageWriter(output_path, font_size=11) as writer:
+                for page_num, page_text in enumerate(pages_content, 1):
+                    logger.debug("Adding page %d to document (%d characters)",
+                               page_num, len(page_text))
+                    if not page_text.strip():
+                        logger.debug("Page %d is empty", page_num)
+                    writer.add_page(page_text)
 
             logger.info("DOCX file saved successfully: %s", os.path.basename(output_path))
 
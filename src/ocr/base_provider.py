@@ -4,10 +4,19 @@ Base OCR Provider Interface
 Defines the abstract interface that all OCR providers must implement.
 """
 
+import asyncio
+import threading
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from typing import (Callable, Dict, Any, Iterable, Iterator, List, Optional, Tuple,
+                    TYPE_CHECKING)
 import logging
 
+from src.ocr.ocr_cache import CacheEntryWriter, OCRCache, hash_file
+from src.ocr.sidecar import SidecarStore
+
+if TYPE_CHECKING:
+    from src.document_analyzer import PdfAnalysis
+
 logger = logging.getLogger('EmailReader.OCR')
 
 
@@ -27,24 +36,66 @@ class BaseOCRProvider(ABC):
             config: Provider-specific configuration dictionary
         """
         self.config = config
+        # Optional OCR result cache, attached by OCRProviderFactory
+        self.cache: Optional[OCRCache] = None
+        # Optional store for raw provider output, attached by OCRProviderFactory
+        self.sidecars: Optional[SidecarStore] = None
         logger.debug("Initialized %s with config keys: %s",
                     self.__class__.__name__, list(config.keys()))
 
     @abstractmethod
-    def process_document(self, input_path: str, output_path: str) -> None:
+    def process_document(
+            self,
+            input_path: str,
+            output_path: str,
+            analysis: Optional['PdfAnalysis'] = None,
+            source_language: Optional[str] = None,
+            cancel: Optional[threading.Event] = None) -> None:
         """
         Process a document with OCR and save the result.
 
         Args:
             input_path: Path to input file (PDF or image)
             output_path: Path to save output DOCX file
+            analysis: Optional precomputed PdfAnalysis for PDF inputs,
+                so providers don't parse the file again
+            source_language: Optional source language code from file
+                metadata (e.g. 'ru'), used as a recognition hint
+            cancel: Optional event that stops the job once set, e.g. when
+                a hedged call has lost (see cancellation)
 
         Raises:
             FileNotFoundError: If input file doesn't exist
-            RuntimeError: If OCR processing fails
+            RuntimeError: If OCR processing fails or is cancelled
         """
         pass
 
+    async def process_document_async(
+            self,
+            input_path: str,
+            output_path: str,
+            analysis: Optional['PdfAnalysis'] = None,
+            source_language: Optional[str] = None) -> None:
+        """
+        Awaitable variant of process_document().
+
+        Runs process_document() in a worker thread so the event loop is not
+        blocked. Providers with a native async client override this.
+
+        Args:
+            input_path: Path to input file (PDF or image)
+            output_path: Path to save output DOCX file
+            analysis: Optional precomputed PdfAnalysis for PDF inputs
+            source_language: Optional source language code
+
+        Raises:
+            FileNotFoundError: If input file doesn't exist
+            RuntimeError: If OCR processing fails
+        """
+        await asyncio.to_thread(
+            self.process_document, input_path, output_path,
+            analysis=analysis, source_language=source_language)
+
     @abstractmethod
     def is_pdf_searchable(self, pdf_path: str) -> bool:
         """
@@ -57,3 +108,362 @@ class BaseOCRProvider(ABC):
             True if PDF has extractable text, False otherwise
         """
         pass
+
+    def ocr_pages(self, input_path: str, pages: List[int]) -> List[str]:
+        """
+        OCR selected pages of a PDF and return their text.
+
+        Used to escalate pages Tesseract recognized poorly. Providers that
+        can only process whole documents keep this default.
+
+        Args:
+            input_path: Path to the PDF file
+            pages: 1-based page numbers
+
+        Returns:
+            Text for each page, aligned with ``pages``
+
+        Raises:
+            NotImplementedError: If the provider has no page-level OCR
+        """
+        raise NotImplementedError(
+            f"{self.__class__.__name__} does not support page-level OCR")
+
+    @classmethod
+    def rebuild_from_sidecar(cls, record: Dict[str, Any], output_path: str) -> None:
+        """
+        Build the DOCX for a document from its saved raw provider output,
+        without calling the OCR service.
+
+        Providers that save sidecars override this.
+
+        Args:
+            record: Sidecar record from sidecar.load_sidecar()
+            output_path: Path to save the DOCX file
+
+        Raises:
+            NotImplementedError: If the provider doesn't save sidecars
+        """
+        raise NotImplementedError(
+            f"{cls.__name__} cannot rebuild documents from sidecars")
+
+    def warm_up(self) -> None:
+        """
+        Prepare the provider for its first document, e.g. by opening
+        connections to the OCR service.
+
+        Called once at startup by OCRProviderFactory.warm_up(). Providers
+        without anything to prepare keep this no-op.
+        """
+
+    def close(self) -> None:
+        """
+        Release the provider's clients, connections and background threads.
+
+        Called by OCRProviderFactory when it drops an instance from its
+        cache. Providers without anything to release keep this no-op.
+        """
+
+    def _cache_settings(self) -> Dict[str, Any]:
+        """
+        Provider settings that affect OCR output, part of the cache key.
+
+        Returns:
+            JSON-serializable settings dictionary
+        """
+        return {}
+
+    def _cached_ocr(
+            self,
+            input_path: str,
+            run_ocr: Callable[[], Dict[str, Any]],
+            **settings: Any) -> Dict[str, Any]:
+        """
+        Return the cached OCR result for a file, running OCR on a miss.
+
+        Cache errors are logged and never fail OCR.
+
+        Args:
+            input_path: Path to the input file
+            run_ocr: Performs OCR and returns a JSON-serializable result
+            **settings: Per-call settings that affect the result
+                (e.g. source_language), added to the cache key
+
+        Returns:
+            OCR result from the cache or from run_ocr
+        """
+        key, cached = self._cache_lookup(input_path, settings)
+        if cached is not None:
+            return cached
+
+        result = run_ocr()
+        self._cache_store(key, result, settings)
+        return result
+
+    def _cached_pages(
+            self,
+            input_path: str,
+            run_ocr: Callable[[Any], Optional[Dict[str, Any]]],
+            writer: Any,
+            **settings: Any) -> bool:
+        """
+        Write a file's OCR pages from the cache, running OCR on a miss.
+
+        Like _cached_ocr() for results produced page by page. On a hit the
+        cached pages are added to ``writer`` one at a time; on a miss
+        ``run_ocr`` adds them to a writer that also appends each page to a
+        new cache entry. Neither path holds the document's pages in memory.
+        Cache errors are logged and never fail OCR.
+
+        Args:
+            input_path: Path to the input file
+            run_ocr: Performs OCR, adding each page in page order to the
+                writer it is given; returns JSON-serializable fields stored
+                with the pages (e.g. a quality report), or None
+            writer: Receives the pages through add_page(), e.g. a
+                DocxPageWriter; reserve_page() and fill_page() are passed
+                through to it when run_ocr uses them
+            **settings: Per-call settings that affect the result, added
+                to the cache key
+
+        Returns:
+            True if the pages came from the cache
+        """
+        key = self._cache_key(input_path, settings)
+        if key is not None:
+            try:
+                pages = self.cache.get_pages(key)
+            except Exception as e:
+                logger.warning("OCR cache lookup failed: %s", e)
+                pages = None
+            if pages is not None:
+                logger.info("Using cached OCR pages for %s (%s)",
+                            input_path, self.__class__.__name__)
+                for page in pages:
+                    writer.add_page(page)
+                return True
+
+        entry = None
+        if key is not None:
+            try:
+                entry = self.cache.open_entry(
+                    key, provider=self.__class__.__name__,
+                    settings={**self._cache_settings(), **settings})
+            except Exception as e:
+                logger.warning("Failed to start OCR cache entry: %s", e)
+
+        if entry is None:
+            run_ocr(writer)
+            return False
+
+        caching_writer = _CachingPageWriter(writer, entry)
+        try:
+            fields = run_ocr(caching_writer)
+        except BaseException:
+            caching_writer.discard()
+            raise
+        caching_writer.commit(fields or {})
+        return False
+
+    def _cache_key(self, input_path: str, settings: Dict[str, Any]) -> Optional[str]:
+        """
+        Cache key of a file's OCR result.
+
+        Args:
+            input_path: Path to the input file
+            settings: Per-call settings added to the cache key
+
+        Returns:
+            Cache key, or None if caching is unavailable
+        """
+        if self.cache is None:
+            return None
+        try:
+            return self.cache.make_key(
+                hash_file(input_path), self.__class__.__name__,
+                {**self._cache_settings(), **settings})
+        except Exception as e:
+            logger.warning("OCR cache lookup failed: %s", e)
+            return None
+
+    def _cache_lookup(
+            self,
+            input_path: str,
+            settings: Dict[str, Any]) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+        """
+        Look up a file's OCR result in the cache.
+
+        Args:
+            input_path: Path to the input file
+            settings: Per-call settings added to the cache key
+
+        Returns:
+            Tuple of (cache key or None if caching is unavailable,
+            cached result or None on a miss)
+        """
+        key = self._cache_key(input_path, settings)
+        if key is None:
+            return None, None
+
+        try:
+            cached = self.cache.get(key)
+        except Exception as e:
+            logger.warning("OCR cache lookup failed: %s", e)
+            return None, None
+
+        if cached is not None:
+            logger.info("Using cached OCR result for %s (%s)",
+                        input_path, self.__class__.__name__)
+        return key, cached
+
+    def _cache_store(
+            self,
+            key: Optional[str],
+            result: Dict[str, Any],
+            settings: Dict[str, Any]) -> None:
+        """
+        Store an OCR result under a key from _cache_lookup().
+
+        Args:
+            key: Cache key, or None to skip storing
+            result: JSON-serializable OCR result
+            settings: Per-call settings, stored for inspection
+        """
+        if self.cache is None or key is None:
+            return
+        try:
+            self.cache.put(key, result, provider=self.__class__.__name__,
+                           settings={**self._cache_settings(), **settings})
+        except Exception as e:
+            logger.warning("Failed to store OCR result in cache: %s", e)
+
+    def _save_sidecar(self, input_path: str, payload: Dict[str, Any]) -> None:
+        """
+        Save raw provider output for a document, if sidecars are enabled.
+
+        Sidecar errors are logged and never fail OCR.
+
+        Args:
+            input_path: Path to the input file
+            payload: JSON-serializable raw output
+        """
+        if self.sidecars is None:
+            return
+        try:
+            self.sidecars.save(input_path, self.__class__.__name__,
+                               self._cache_settings(), payload)
+        except Exception as e:
+            logger.warning("Failed to save OCR sidecar for %s: %s", input_path, e)
+
+    def _tee_to_sidecar(
+            self,
+            input_path: str,
+            items: Iterable[Any],
+            items_key: str,
+            **fields: Any) -> Iterator[Any]:
+        """
+        Pass raw provider output through, saving it to a sidecar on the way.
+
+        Like _save_sidecar() for output parsed incrementally: each item is
+        appended to the sidecar as it is yielded, and the sidecar is saved
+        once the items are exhausted. If iteration stops early the sidecar
+        is dropped. Sidecar errors are logged and never fail OCR.
+
+        Args:
+            input_path: Path to the input file
+            items: Raw output items, e.g. streamed chunks
+            items_key: Sidecar record key of the items, e.g. 'chunks'
+            **fields: Other JSON-serializable record fields
+
+        Yields:
+            The items, unchanged
+        """
+        writer = None
+        if self.sidecars is not None:
+            try:
+                writer = self.sidecars.open(input_path, self.__class__.__name__,
+                                            self._cache_settings(), items_key, **fields)
+            except Exception as e:
+                logger.warning("Failed to save OCR sidecar for %s: %s", input_path, e)
+
+        completed = False
+        try:
+            for item in items:
+                if writer is not None:
+                    try:
+                        writer.add(item)
+                    except Exception as e:
+                        logger.warning("Failed to save OCR sidecar for %s: %s", input_path, e)
+                        writer.discard()
+                        writer = None
+                yield item
+            completed = True
+        finally:
+            if writer is not None:
+                if completed:
+                    try:
+                        writer.commit()
+                    except Exception as e:
+                        logger.warning("Failed to save OCR sidecar for %s: %s", input_path, e)
+                else:
+                    writer.discard()
+
+
+class _CachingPageWriter:
+    """
+    Page writer that also appends every page to a cache entry.
+
+    Failures of the cache entry are logged and stop caching; the pages
+    still reach the wrapped writer.
+    """
+
+    def __init__(self, writer: Any, entry: CacheEntryWriter):
+        self._writer = writer
+        self._entry: Optional[CacheEntryWriter] = entry
+
+    def add_page(self, page: Any) -> None:
+        """Add a page to the writer and the cache entry."""
+        self._writer.add_page(page)
+        self._cache(lambda entry: entry.add_page(page))
+
+    def reserve_page(self) -> int:
+        """Reserve a page in the writer and the cache entry."""
+        number = self._writer.reserve_page()
+        self._cache(lambda entry: entry.reserve_page())
+        return number
+
+    def fill_page(self, number: int, page: Any) -> None:
+        """Fill a reserved page in the writer and the cache entry."""
+        self._writer.fill_page(number, page)
+        self._cache(lambda entry: entry.fill_page(number, page))
+
+    @property
+    def reserved_pages(self) -> List[int]:
+        """Reserved pages of the writer still waiting to be filled."""
+        return self._writer.reserved_pages
+
+    def _cache(self, action: Callable[[CacheEntryWriter], Any]) -> None:
+        """Apply a page action to the cache entry, if still caching."""
+        if self._entry is None:
+            return
+        try:
+            action(self._entry)
+        except Exception as e:
+            logger.warning("Failed to cache OCR page, not caching this result: %s", e)
+            self.discard()
+
+    def commit(self, fields: Dict[str, Any]) -> None:
+        """Complete the cache entry."""
+        if self._entry is None:
+            return
+        try:
+            self._entry.commit(**fields)
+        except Exception as e:
+            logger.warning("Failed to store OCR result in cache: %s", e)
+        self._entry = None
+
+    def discard(self) -> None:
+        """Drop the cache entry."""
+        if self._entry is not None:
+            self._entry.discard()
+            self._entry = None
@@ -0,0 +1,59 @@
+"""
+Cancellation of running OCR jobs.
+
+A caller that no longer needs a provider's result, such as the losing
+call of a hedged job (see fallback), sets a threading.Event it passed to
+process_document(). Providers check it between units of work - pages,
+page batches, polls of a remote analysis - and stop with
+OCRCancelledError, so worker processes and HTTP connections are released
+instead of running the job to completion in the background.
+"""
+
+import threading
+from concurrent.futures import Future, wait
+from typing import Optional, TypeVar
+
+T = TypeVar('T')
+
+# How often blocking waits check whether their job was cancelled, in seconds
+CANCEL_POLL_INTERVAL = 0.5
+
+
+class OCRCancelledError(RuntimeError):
+    """Raised when an OCR job stops because it was cancelled."""
+
+
+def raise_if_cancelled(cancel: Optional[threading.Event]) -> None:
+    """
+    Stop a job whose cancellation event is set.
+
+    Args:
+        cancel: Cancellation event, or None for a job that can't be cancelled
+
+    Raises:
+        OCRCancelledError: If the event is set
+    """
+    if cancel is not None and cancel.is_set():
+        raise OCRCancelledError("OCR job cancelled")
+
+
+def wait_for(future: 'Future[T]', cancel: Optional[threading.Event]) -> T:
+    """
+    Wait for a future's result, giving up once the job is cancelled.
+
+    The future itself is left alone; callers cancel or discard it.
+
+    Args:
+        future: Future to wait for
+        cancel: Cancellation event, or None to wait without checking
+
+    Returns:
+        The future's result
+
+    Raises:
+        OCRCancelledError: If the event is set before the future is done
+    """
+    if cancel is not None:
+        while not wait([future], timeout=CANCEL_POLL_INTERVAL).done:
+            raise_if_cancelled(cancel)
+    return future.result()
@@ -0,0 +1,272 @@
+"""
+OCR Provider Circuit Breaker
+
+Stops sending documents to a degraded OCR provider. After a run of
+consecutive failures (or calls slower than the latency threshold) the
+circuit opens and documents go straight to the fallback provider instead
+of waiting through the provider's retries. Once the reset timeout has
+passed, a limited number of trial requests are let through (half-open);
+a successful trial closes the circuit again, a failed one re-opens it.
+
+State transitions are logged as structured ``CIRCUIT | key=value`` lines
+and every breaker exposes a metrics snapshot.
+"""
+
+import time
+import logging
+import threading
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger('EmailReader.OCR.CircuitBreaker')
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+DEFAULT_FAILURE_THRESHOLD = 3
+DEFAULT_RESET_TIMEOUT = 120.0
+DEFAULT_HALF_OPEN_MAX_CALLS = 1
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised when a request is rejected because the circuit is open."""
+
+
+class CircuitBreaker:
+    """
+    Thread-safe circuit breaker for one OCR provider.
+
+    Callers ask allow_request() before using the provider and report the
+    outcome with record_success() or record_failure().
+    """
+
+    def __init__(
+            self,
+            name: str,
+            failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+            latency_threshold: Optional[float] = None,
+            reset_timeout: float = DEFAULT_RESET_TIMEOUT,
+            half_open_max_calls: int = DEFAULT_HALF_OPEN_MAX_CALLS):
+        """
+        Initialize the breaker in the closed state.
+
+        Args:
+            name: Provider name used in logs and metrics
+            failure_threshold: Consecutive failures that open the circuit
+            latency_threshold: Calls slower than this many seconds count
+                as failures (None disables the latency check)
+            reset_timeout: Seconds the circuit stays open before trial
+                requests are allowed
+            half_open_max_calls: Trial requests allowed at once while
+                half-open
+        """
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.latency_threshold = latency_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_max_calls = max(1, half_open_max_calls)
+
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._state_since = time.monotonic()
+        self._consecutive_failures = 0
+        self._trial_calls = 0
+
+        self._calls = 0
+        self._failures = 0
+        self._slow_calls = 0
+        self._rejected = 0
+        self._times_opened = 0
+
+    @classmethod
+    def from_config(
+            cls,
+            name: str,
+            breaker_config: Dict[str, Any]) -> 'CircuitBreaker':
+        """
+        Create a breaker from the 'ocr.circuit_breaker' configuration section.
+
+        Args:
+            name: Provider name
+            breaker_config: Dictionary with optional 'failure_threshold',
+                'latency_threshold_seconds', 'reset_timeout_seconds' and
+                'half_open_max_calls'
+
+        Returns:
+            CircuitBreaker instance
+        """
+        latency_threshold = breaker_config.get('latency_threshold_seconds')
+        return cls(
+            name,
+            failure_threshold=int(breaker_config.get(
+                'failure_threshold', DEFAULT_FAILURE_THRESHOLD)),
+            latency_threshold=float(latency_threshold) if latency_threshold else None,
+            reset_timeout=float(breaker_config.get(
+                'reset_timeout_seconds', DEFAULT_RESET_TIMEOUT)),
+            half_open_max_calls=int(breaker_config.get(
+                'half_open_max_calls', DEFAULT_HALF_OPEN_MAX_CALLS)))
+
+    @property
+    def state(self) -> str:
+        """Current state: 'closed', 'open' or 'half_open'."""
+        with self._lock:
+            self._check_reset_timeout()
+            return self._state
+
+    def allow_request(self) -> bool:
+        """
+        Check whether a request may be sent to the provider.
+
+        While half-open, an allowed request takes a trial slot that is
+        released by record_success() or record_failure().
+
+        Returns:
+            True if the provider should be called, False to skip it
+        """
+        with self._lock:
+            self._check_reset_timeout()
+
+            if self._state == CLOSED:
+                return True
+
+            if self._state == HALF_OPEN and self._trial_calls < self.half_open_max_calls:
+                self._trial_calls += 1
+                logger.info("Circuit %s half-open: sending trial request", self.name)
+                return True
+
+            self._rejected += 1
+            return False
+
+    def record_success(self, duration: float) -> None:
+        """
+        Report a completed call.
+
+        A call slower than the latency threshold counts as a failure.
+
+        Args:
+            duration: Call duration in seconds
+        """
+        if self.latency_threshold is not None and duration > self.latency_threshold:
+            logger.warning("Circuit %s: call took %.2fs (threshold %.2fs)",
+                           self.name, duration, self.latency_threshold)
+            self._record(failed=True, slow=True)
+        else:
+            self._record(failed=False)
+
+    def record_failure(self) -> None:
+        """Report a failed call."""
+        self._record(failed=True)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Snapshot of the breaker's state and counters.
+
+        Returns:
+            Dictionary of metrics
+        """
+        with self._lock:
+            self._check_reset_timeout()
+            return {
+                'provider': self.name,
+                'state': self._state,
+                'state_age_seconds': round(time.monotonic() - self._state_since, 3),
+                'consecutive_failures': self._consecutive_failures,
+                'calls': self._calls,
+                'failures': self._failures,
+                'slow_calls': self._slow_calls,
+                'rejected': self._rejected,
+                'times_opened': self._times_opened,
+            }
+
+    def _record(self, failed: bool, slow: bool = False) -> None:
+        """Update counters and state after a call."""
+        with self._lock:
+            self._calls += 1
+            if self._state == HALF_OPEN:
+                self._trial_calls = max(0, self._trial_calls - 1)
+
+            if not failed:
+                self._consecutive_failures = 0
+                if self._state != CLOSED:
+                    self._transition(CLOSED)
+                return
+
+            self._failures += 1
+            self._slow_calls += slow
+            self._consecutive_failures += 1
+
+            if self._state == HALF_OPEN:
+                self._transition(OPEN)
+            elif (self._state == CLOSED
+                  and self._consecutive_failures >= self.failure_threshold):
+                self._transition(OPEN)
+
+    def _check_reset_timeout(self) -> None:
+        """Move from open to half-open once the reset timeout has passed."""
+        if (self._state == OPEN
+                and time.monotonic() - self._state_since >= self.reset_timeout):
+            self._transition(HALF_OPEN)
+
+    def _transition(self, new_state: str) -> None:
+        """Change state and log the transition. Caller holds the lock."""
+        old_state = self._state
+        now = time.monotonic()
+        duration = now - self._state_since
+
+        self._state = new_state
+        self._state_since = now
+        self._trial_calls = 0
+        if new_state == OPEN:
+            self._times_opened += 1
+
+        level = logging.WARNING if new_state == OPEN else logging.INFO
+        logger.log(
+            level,
+            "CIRCUIT | provider=%s | state=%s | previous=%s | previous_duration=%.2fs | "
+            "consecutive_failures=%d | times_opened=%d",
+            self.name, new_state, old_state, duration,
+            self._consecutive_failures, self._times_opened)
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(
+        name: str,
+        breaker_config: Optional[Dict[str, Any]] = None) -> CircuitBreaker:
+    """
+    Get the shared breaker for a provider, creating it on first use.
+
+    Args:
+        name: Provider name (e.g. 'azure')
+        breaker_config: 'ocr.circuit_breaker' configuration section,
+            used when the breaker is created
+
+    Returns:
+        CircuitBreaker instance
+    """
+    with _breakers_lock:
+        breaker = _breakers.get(name)
+        if breaker is None:
+            breaker = CircuitBreaker.from_config(name, breaker_config or {})
+            _breakers[name] = breaker
+        return breaker
+
+
+def get_circuit_metrics() -> Dict[str, Dict[str, Any]]:
+    """
+    Metrics of every provider breaker.
+
+    Returns:
+        Mapping of provider name to its metrics snapshot
+    """
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return {breaker.name: breaker.get_metrics() for breaker in breakers}
+
+
+def reset_circuit_breakers() -> None:
+    """Discard all breakers, e.g. after a configuration change."""
+    with _breakers_lock:
+        _breakers.clear()
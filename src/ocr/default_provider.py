@@ -6,11 +6,30 @@ Wraps existing Tesseract OCR logic from pdf_image_ocr.py
 
 import os
 import logging
-from typing import Dict, Any
+import threading
+from dataclasses import asdict
+from typing import Dict, Any, Optional
 
+from src.config import load_config
+from src.document_analyzer import PdfAnalysis
 from src.ocr.base_provider import BaseOCRProvider
-from src.pdf_image_ocr import is_pdf_searchable_pypdf, ocr_pdf_image_to_doc
-from src.convert_to_docx import convert_pdf_to_docx
+from src.ocr.cancellation import OCRCancelledError, raise_if_cancelled
+from src.ocr.image_frames import is_image_file
+from src.ocr.image_preprocessing import DEFAULT_BASE_DPI
+from src.ocr.language_selector import (ALL_LANGUAGES, MIN_SCRIPT_CONFIDENCE,
+                                       MIN_WORD_CONFIDENCE, SCRIPT_LANGUAGES,
+                                       languages_for_source_language)
+from src.ocr.page_quality import (DEFAULT_QUALITY_LOG, build_report,
+                                  escalate_weak_pages, min_confidence,
+                                  record_report)
+from src.ocr.rasterizer import DEFAULT_RASTERIZER
+from src.ocr.tesseract_engine import (DEFAULT_TESSERACT_BACKEND,
+                                      TESSEROCR_AVAILABLE)
+from src.pdf_image_ocr import (is_pdf_searchable_pypdf, log_ocr_output,
+                               ocr_image_to_doc, ocr_pdf_image_pages_scored,
+                               ocr_pdf_image_to_doc, stream_image_pages,
+                               stream_pdf_image_pages)
+from src.convert_to_docx import DocxPageWriter, convert_pdf_to_docx
 
 logger = logging.getLogger('EmailReader.OCR.Default')
 
@@ -28,25 +47,45 @@ class DefaultOCRProvider(BaseOCRProvider):
         Initialize the default OCR provider.
 
         Args:
-            config: Configuration dictionary (currently unused for Tesseract)
+            config: Configuration dictionary with optional 'workers'
+                (number of parallel OCR processes, default: CPU count),
+                'rasterizer' ('pdfium', 'pymupdf' or 'poppler'),
+                'tesseract_backend' ('pytesseract' or 'tesserocr') and
+                'preprocessing' (adaptive DPI, deskew and binarization;
+                used when its 'enabled' flag is set) and 'quality'
+                (per-page confidence checks with re-OCR or escalation of
+                weak pages; used when its 'enabled' flag is set)
         """
         super().__init__(config)
         logger.info("Initialized DefaultOCRProvider (Tesseract)")
 
-    def process_document(self, input_path: str, output_path: str) -> None:
+    def process_document(
+            self,
+            input_path: str,
+            output_path: str,
+            analysis: Optional[PdfAnalysis] = None,
+            source_language: Optional[str] = None,
+            cancel: Optional[threading.Event] = None) -> None:
         """
         Process a document with OCR and save the result.
 
-        Uses Tesseract OCR for scanned PDFs, or direct text extraction
-        for searchable PDFs.
+        Uses Tesseract OCR for scanned PDFs and images (JPEG, PNG,
+        multi-frame TIFF, ...), or direct text extraction for searchable
+        PDFs.
 
         Args:
             input_path: Path to input file (PDF or image)
             output_path: Path to save output DOCX file
+            analysis: Optional precomputed PdfAnalysis for the input
+            source_language: Optional source language code, narrows the
+                Tesseract models loaded for OCR
+            cancel: Optional event that stops OCR once set; pages not yet
+                submitted to the Tesseract workers are dropped
 
         Raises:
             FileNotFoundError: If input file doesn't exist
             RuntimeError: If OCR processing fails
+            OCRCancelledError: If cancelled
         """
         logger.info("Processing document with Tesseract: %s", os.path.basename(input_path))
         logger.debug("Input: %s", input_path)
@@ -57,16 +96,61 @@ class DefaultOCRProvider(BaseOCRProvider):
             raise FileNotFoundError(f"File not found: {input_path}")
 
         try:
-            # Check if PDF is searchable
-            logger.debug("Checking if PDF is searchable")
-            is_searchable = self.is_pdf_searchable(input_path)
+            is_image = is_image_file(input_path)
+            if is_image:
+                # Images always need OCR; the searchability check is PDF-only
+                is_searchable = False
+            elif analysis is not None:
+                if analysis.error:
+                    raise ValueError(f"Cannot process PDF: {analysis.error}")
+                is_searchable = analysis.is_searchable
+                logger.debug("Using precomputed PDF analysis (searchable: %s)",
+                             is_searchable)
+            else:
+                logger.debug("Checking if PDF is searchable")
+                is_searchable = self.is_pdf_searchable(input_path)
 
             if is_searchable:
                 logger.info("PDF is searchable - using text extraction")
-                convert_pdf_to_docx(input_path, output_path)
+                convert_pdf_to_docx(
+                    input_path, output_path,
+                    page_texts=analysis.page_texts if analysis else None)
             else:
-                logger.info("PDF is not searchable - using OCR")
-                ocr_pdf_image_to_doc(input_path, output_path)
+                logger.info("%s - using OCR",
+                            "Input is an image" if is_image else "PDF is not searchable")
+
+                ocr_options: Dict[str, Any] = {
+                    'max_workers': self.config.get('workers'),
+                    'source_language': source_language,
+                    'tesseract_backend': self.config.get('tesseract_backend'),
+                    'preprocessing': self._preprocessing(),
+                    'cancel': cancel,
+                }
+                if not is_image:
+                    ocr_options['rasterizer'] = self.config.get('rasterizer')
+                # Images have no PDF pages to re-render for quality retries
+                quality = None if is_image else self._quality()
+
+                if self.cache is None and quality is None:
+                    # Nothing to cache, OCR straight into the DOCX
+                    to_doc = ocr_image_to_doc if is_image else ocr_pdf_image_to_doc
+                    to_doc(input_path, output_path, **ocr_options)
+                else:
+                    def run_ocr(writer: Any) -> Optional[Dict[str, Any]]:
+                        if quality is not None:
+                            return self._ocr_with_quality(
+                                input_path, writer, quality, source_language, cancel)
+                        stream = stream_image_pages if is_image else stream_pdf_image_pages
+                        stream(input_path, writer.add_page, **ocr_options)
+                        return None
+
+                    # Pages go to the DOCX and the cache as they are
+                    # recognized, or straight from the cache on a hit
+                    with DocxPageWriter(output_path) as writer:
+                        self._cached_pages(
+                            input_path, run_ocr, writer, source_language=source_language,
+                            languages=languages_for_source_language(source_language))
+                    log_ocr_output(writer)
 
             if os.path.exists(output_path):
                 file_size = os.path.getsize(output_path) / 1024  # KB
@@ -76,12 +160,116 @@ class DefaultOCRProvider(BaseOCRProvider):
                 logger.error("Processing failed - output file not created")
                 raise RuntimeError("OCR processing failed to create output file")
 
-        except FileNotFoundError:
+        except (FileNotFoundError, OCRCancelledError):
             raise
         except Exception as e:
             logger.error("Error processing document: %s", e, exc_info=True)
             raise RuntimeError(f"OCR processing failed: {e}")
 
+    def _ocr_with_quality(
+            self,
+            input_path: str,
+            writer: Any,
+            quality: Dict[str, Any],
+            source_language: Optional[str],
+            cancel: Optional[threading.Event] = None) -> Dict[str, Any]:
+        """
+        OCR a scanned PDF with per-page confidence checks.
+
+        Weak pages are OCR'd again with stronger settings and, if
+        'escalate_to' is configured, pages still weak afterwards are sent
+        to that cloud provider. The document's confidence is recorded in
+        the quality log.
+
+        Pages that aren't weak are written as soon as they are recognized;
+        only weak pages are held in memory, in a place reserved in the
+        writer, until their final text is known.
+
+        Args:
+            input_path: Path to the PDF file
+            writer: Receives the final text of each page, in page order
+                (add_page(), reserve_page() and fill_page())
+            quality: The 'ocr.default.quality' configuration section
+            source_language: Optional source language code
+            cancel: Optional event that stops OCR, retries and escalation
+                once set
+
+        Returns:
+            Fields stored with the cached pages: the quality report
+        """
+        results, retried = ocr_pdf_image_pages_scored(
+            input_path,
+            max_workers=self.config.get('workers'),
+            rasterizer=self.config.get('rasterizer'),
+            source_language=source_language,
+            tesseract_backend=self.config.get('tesseract_backend'),
+            preprocessing=self._preprocessing(),
+            quality=quality,
+            writer=writer,
+            cancel=cancel)
+
+        # Confidences are reported for Tesseract's text, before escalation
+        scored = list(results)
+        escalated = []
+        if quality.get('escalate_to'):
+            raise_if_cancelled(cancel)
+            escalated = escalate_weak_pages(input_path, results, quality, load_config())
+
+        report = build_report(input_path, scored, retried, escalated,
+                              min_confidence(quality))
+        record_report(report, quality.get('log', DEFAULT_QUALITY_LOG))
+
+        for num in writer.reserved_pages:
+            writer.fill_page(num, results[num - 1].text)
+        return {'quality': asdict(report)}
+
+    def _quality(self) -> Optional[Dict[str, Any]]:
+        """Page quality settings, or None when disabled."""
+        quality = self.config.get('quality') or {}
+        if not quality.get('enabled', False):
+            return None
+        return quality
+
+    def _preprocessing(self) -> Optional[Dict[str, Any]]:
+        """Page preprocessing settings, or None when disabled."""
+        preprocessing = self.config.get('preprocessing') or {}
+        if not preprocessing.get('enabled', False):
+            return None
+        return preprocessing
+
+    def _cache_settings(self) -> Dict[str, Any]:
+        """Rendering and recognition settings that affect Tesseract output."""
+        preprocessing = self._preprocessing()
+        backend = (self.config.get('tesseract_backend') or DEFAULT_TESSERACT_BACKEND).lower()
+        if backend == 'tesserocr' and not TESSEROCR_AVAILABLE:
+            # ParallelTesseractEngine falls back the same way
+            backend = DEFAULT_TESSERACT_BACKEND
+        settings = {
+            'engine': 'tesseract',
+            'tesseract_backend': backend,
+            'dpi': 300,
+            'rasterizer': self.config.get('rasterizer') or DEFAULT_RASTERIZER,
+            # Without a source language the models are chosen by script
+            # detection, whose outcome is fixed by the file and this policy
+            'language_detection': {
+                'scripts': SCRIPT_LANGUAGES,
+                'min_confidence': MIN_SCRIPT_CONFIDENCE,
+                'min_word_confidence': MIN_WORD_CONFIDENCE,
+                'fallback': ALL_LANGUAGES,
+            },
+        }
+        if preprocessing is not None:
+            settings['dpi'] = preprocessing.get('base_dpi', DEFAULT_BASE_DPI)
+            settings['preprocessing'] = {
+                key: value for key, value in preprocessing.items()
+                if not key.startswith('_')}
+        quality = self._quality()
+        if quality is not None:
+            settings['quality'] = {
+                key: value for key, value in quality.items()
+                if not key.startswith('_') and key != 'log'}
+        return settings
+
     def is_pdf_searchable(self, pdf_path: str) -> bool:
         """
         Check if a PDF contains searchable text.
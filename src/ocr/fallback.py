@@ -0,0 +1,358 @@
+"""
+OCR With Fallback
+
+Runs a document through the OCR provider for its translation mode and
+falls back to the default (Tesseract) provider when the primary fails.
+Primary providers are guarded by a circuit breaker, so while a provider
+is degraded documents go straight to the fallback.
+
+With routing enabled, the provider is chosen per document by
+RoutingPolicy rather than from the translation mode alone.
+
+Optionally, jobs are hedged: if the primary has not finished within a
+deadline derived from its recent latency percentile, a secondary provider
+starts in parallel and the first successful result is kept.
+"""
+
+import os
+import time
+import logging
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Dict, Optional
+
+from src.config import load_config
+from src.document_analyzer import PdfAnalysis
+from src.ocr.base_provider import BaseOCRProvider
+from src.ocr.cancellation import OCRCancelledError
+from src.ocr.circuit_breaker import CircuitBreaker, CircuitOpenError, get_circuit_breaker
+from src.ocr.ocr_factory import OCRProviderFactory
+from src.ocr.provider_stats import ProviderStats, get_provider_stats
+from src.ocr.routing_policy import RoutingDecision, RoutingPolicy
+
+logger = logging.getLogger('EmailReader.OCR.Fallback')
+
+DEFAULT_HEDGE_MODES = ('human', 'formats')
+DEFAULT_HEDGE_PERCENTILE = 95
+DEFAULT_HEDGE_MIN_SAMPLES = 20
+# Deadline used until enough latency samples have been collected
+DEFAULT_HEDGE_DEADLINE = 120.0
+DEFAULT_HEDGE_MIN_DEADLINE = 10.0
+
+
+class HedgedOCRError(RuntimeError):
+    """Raised when both the primary and the hedged provider failed."""
+
+    def __init__(self, message: str, fallback_attempted: bool):
+        super().__init__(message)
+        # True if the hedge already was the fallback provider
+        self.fallback_attempted = fallback_attempted
+
+
+def process_with_fallback(
+        input_file: str,
+        output_file: str,
+        translation_mode: str = 'default',
+        analysis: Optional[PdfAnalysis] = None,
+        source_language: Optional[str] = None) -> None:
+    """
+    Process a document with the configured OCR provider, with automatic fallback.
+
+    Args:
+        input_file: Path to input file (PDF or image)
+        output_file: Path to save output DOCX file
+        translation_mode: Translation mode from file metadata
+            ('human', 'formats', 'default')
+        analysis: Optional precomputed PdfAnalysis shared with the providers
+        source_language: Source language from file metadata, if known
+
+    Raises:
+        RuntimeError: If both the primary and the fallback provider fail
+    """
+    # Shared with the fallback; stays empty if loading the config fails
+    config: Dict[str, Any] = {}
+    provider_type = OCRProviderFactory.provider_type_for_mode(translation_mode)
+    policy: Optional[RoutingPolicy] = None
+    decision: Optional[RoutingDecision] = None
+
+    try:
+        config = load_config()
+        if config.get('ocr', {}).get('routing', {}).get('enabled', False):
+            policy = RoutingPolicy(config)
+            decision = policy.decide(translation_mode, input_file, analysis)
+            provider_type = decision.provider
+    except Exception as e:
+        logger.warning("OCR provider routing failed: %s", e)
+
+    start_time = time.monotonic()
+    try:
+        provider_used = _run_with_fallback(
+            config, provider_type, translation_mode,
+            input_file, output_file, analysis, source_language)
+    except Exception as e:
+        if decision is not None:
+            policy.record(decision, None, time.monotonic() - start_time, error=e)
+        raise
+
+    if decision is not None:
+        policy.record(decision, provider_used, time.monotonic() - start_time)
+
+
+def _run_with_fallback(
+        config: Dict[str, Any],
+        provider_type: str,
+        translation_mode: str,
+        input_file: str,
+        output_file: str,
+        analysis: Optional[PdfAnalysis],
+        source_language: Optional[str]) -> str:
+    """
+    Run the primary provider, falling back to Tesseract on failure.
+
+    Returns:
+        Provider type that produced the output
+
+    Raises:
+        RuntimeError: If both the primary and the fallback provider fail
+    """
+    try:
+        ocr_config = config.get('ocr', {})
+        ocr_provider = OCRProviderFactory.get_provider_by_type(config, provider_type)
+
+        # The default provider is the fallback itself, nothing to route around
+        breaker = None
+        breaker_config = ocr_config.get('circuit_breaker', {})
+        if provider_type != 'default' and breaker_config.get('enabled', True):
+            breaker = get_circuit_breaker(provider_type, breaker_config)
+            if not breaker.allow_request():
+                raise CircuitOpenError(
+                    f"Circuit open for {provider_type} OCR provider")
+
+        logger.info("Using OCR provider for translation_mode='%s': %s",
+                    translation_mode, ocr_provider.__class__.__name__)
+
+        hedge_config = ocr_config.get('hedging', {})
+        if _should_hedge(hedge_config, translation_mode, provider_type):
+            provider_used = _process_hedged(
+                config, hedge_config, ocr_provider, provider_type, breaker,
+                input_file, output_file, analysis, source_language)
+        else:
+            _timed_call(ocr_provider, provider_type, breaker,
+                        input_file, output_file, analysis, source_language)
+            provider_used = provider_type
+        logger.info("OCR completed successfully with %s", provider_used)
+        return provider_used
+
+    except CircuitOpenError as e:
+        primary_error: Exception = e
+        logger.warning("%s. Using default Tesseract OCR", e)
+
+    except HedgedOCRError as e:
+        if e.fallback_attempted:
+            logger.error("Hedged OCR failed: %s", e)
+            raise RuntimeError(
+                f"Both primary and fallback OCR failed. {e}") from e
+        primary_error = e
+        logger.warning("%s. Falling back to default Tesseract OCR", e)
+
+    except Exception as e:
+        primary_error = e
+        logger.warning(
+            "Primary OCR provider failed: %s. Falling back to default Tesseract OCR", e)
+
+    try:
+        fallback_provider = OCRProviderFactory.get_fallback_provider(config)
+        _timed_call(fallback_provider, 'default', None,
+                    input_file, output_file, analysis, source_language)
+        logger.info("Fallback OCR completed successfully")
+        return 'default'
+    except Exception as fallback_error:
+        logger.error("Fallback OCR also failed: %s", fallback_error)
+        raise RuntimeError(
+            f"Both primary and fallback OCR failed. "
+            f"Primary: {primary_error}, Fallback: {fallback_error}"
+        ) from fallback_error
+
+
+def _timed_call(
+        provider: BaseOCRProvider,
+        provider_type: str,
+        breaker: Optional[CircuitBreaker],
+        input_file: str,
+        output_file: str,
+        analysis: Optional[PdfAnalysis],
+        source_language: Optional[str],
+        cancel: Optional[threading.Event] = None) -> None:
+    """
+    Run one provider and report its latency and outcome.
+
+    A call stopped through ``cancel`` is not the provider's failure and
+    is not recorded.
+    """
+    stats = get_provider_stats(provider_type)
+    options = {} if cancel is None else {'cancel': cancel}
+    start_time = time.monotonic()
+    try:
+        provider.process_document(
+            input_file, output_file, analysis=analysis,
+            source_language=source_language, **options)
+    except OCRCancelledError:
+        raise
+    except Exception:
+        if cancel is not None and cancel.is_set():
+            raise
+        stats.record(time.monotonic() - start_time, success=False)
+        if breaker is not None:
+            breaker.record_failure()
+        raise
+
+    duration = time.monotonic() - start_time
+    stats.record(duration, success=True)
+    if breaker is not None:
+        breaker.record_success(duration)
+
+
+def _should_hedge(
+        hedge_config: Dict[str, Any],
+        translation_mode: str,
+        provider_type: str) -> bool:
+    """Check whether a job should be hedged."""
+    if not hedge_config.get('enabled', False):
+        return False
+    if translation_mode not in hedge_config.get('modes', DEFAULT_HEDGE_MODES):
+        return False
+    return hedge_config.get('secondary', 'default') != provider_type
+
+
+def hedge_deadline(stats: ProviderStats, hedge_config: Dict[str, Any]) -> float:
+    """
+    Seconds to wait for the primary provider before firing a hedge.
+
+    Uses the configured latency percentile of the provider's recent
+    successful calls, or a fixed deadline until enough samples exist.
+
+    Args:
+        stats: Primary provider statistics
+        hedge_config: The 'ocr.hedging' configuration section
+
+    Returns:
+        Deadline in seconds
+    """
+    min_samples = int(hedge_config.get('min_samples', DEFAULT_HEDGE_MIN_SAMPLES))
+    if stats.sample_count < max(1, min_samples):
+        return float(hedge_config.get('default_deadline_seconds', DEFAULT_HEDGE_DEADLINE))
+
+    latency = stats.percentile(float(hedge_config.get('percentile', DEFAULT_HEDGE_PERCENTILE)))
+    return max(float(hedge_config.get('min_deadline_seconds', DEFAULT_HEDGE_MIN_DEADLINE)),
+               latency or 0.0)
+
+
+def _process_hedged(
+        config: Dict[str, Any],
+        hedge_config: Dict[str, Any],
+        primary: BaseOCRProvider,
+        primary_type: str,
+        breaker: Optional[CircuitBreaker],
+        input_file: str,
+        output_file: str,
+        analysis: Optional[PdfAnalysis],
+        source_language: Optional[str]) -> str:
+    """
+    Run the primary provider, hedging with a secondary after a deadline.
+
+    Each provider writes to its own temporary output; the first successful
+    one is moved to ``output_file``. The losing call is cancelled if it has
+    not started; otherwise its cancellation event is set so the provider
+    stops at its next page, batch or poll, and its output is discarded.
+
+    Returns:
+        Provider type whose output was kept
+
+    Raises:
+        Exception: The primary's error if it failed before the deadline
+        HedgedOCRError: If both providers failed
+    """
+    primary_stats = get_provider_stats(primary_type)
+    secondary_type = hedge_config.get('secondary', 'default')
+    deadline = hedge_deadline(primary_stats, hedge_config)
+
+    base, ext = os.path.splitext(output_file)
+    outputs = {primary_type: f"{base}.{primary_type}{ext}",
+               secondary_type: f"{base}.{secondary_type}{ext}"}
+
+    cancels = {primary_type: threading.Event(), secondary_type: threading.Event()}
+    futures: Dict[Future, str] = {}
+    executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='ocr-hedge')
+    try:
+        futures[executor.submit(
+            _timed_call, primary, primary_type, breaker, input_file,
+            outputs[primary_type], analysis, source_language,
+            cancels[primary_type])] = primary_type
+
+        done, _ = wait(futures, timeout=deadline)
+        if done:
+            next(iter(done)).result()
+            os.replace(outputs[primary_type], output_file)
+            return primary_type
+
+        logger.info("Primary %s OCR still running after %.1fs - hedging with %s",
+                    primary_type, deadline, secondary_type)
+        secondary = OCRProviderFactory.get_provider_by_type(config, secondary_type)
+        futures[executor.submit(
+            _timed_call, secondary, secondary_type, None, input_file,
+            outputs[secondary_type], analysis, source_language,
+            cancels[secondary_type])] = secondary_type
+
+        errors: Dict[str, Exception] = {}
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = futures[future]
+                error = future.exception()
+                if error is not None:
+                    logger.warning("Hedged OCR: %s failed: %s", name, error)
+                    errors[name] = error
+                    continue
+
+                os.replace(outputs[name], output_file)
+                for loser in pending:
+                    loser.cancel()
+                    cancels[futures[loser]].set()
+                    loser.add_done_callback(
+                        lambda _, path=outputs[futures[loser]]: _discard(path))
+                primary_stats.record_hedge(won=name == secondary_type)
+                logger.info(
+                    "HEDGE | document=%s | primary=%s | secondary=%s | "
+                    "deadline=%.2fs | winner=%s",
+                    os.path.basename(input_file), primary_type, secondary_type,
+                    deadline, name)
+                return name
+
+        primary_stats.record_hedge(won=False)
+        raise HedgedOCRError(
+            f"Primary ({primary_type}): {errors.get(primary_type)}, "
+            f"Hedge ({secondary_type}): {errors.get(secondary_type)}",
+            fallback_attempted=secondary_type == 'default')
+    finally:
+        # Nothing is waiting for a call still running here any more
+        for cancel in cancels.values():
+            cancel.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+        for path in outputs.values():
+            if os.path.exists(path) and not _is_running(futures, outputs, path):
+                _discard(path)
+
+
+def _is_running(futures: Dict[Future, str], outputs: Dict[str, str], path: str) -> bool:
+    """Check whether the provider writing ``path`` is still running."""
+    return any(outputs[name] == path and not future.done()
+               for future, name in futures.items())
+
+
+def _discard(path: str) -> None:
+    """Delete a losing provider's output."""
+    try:
+        os.remove(path)
+    except OSError:
+        pass
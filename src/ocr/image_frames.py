@@ -0,0 +1,64 @@
+"""
+Image Frame Reader
+
+Reads image uploads (JPEG, PNG, TIFF, ...) as grayscale PageImage buffers
+for OCR, the image counterpart of the PDF rasterizers. Multi-frame TIFFs
+are read one frame at a time: Pillow decodes a frame only when it is
+seeked to, so frames stream from disk and peak memory does not grow with
+the number of pages.
+"""
+
+import os
+import logging
+from typing import Iterator
+
+from PIL import Image, ImageOps
+
+from src.ocr.rasterizer import PageImage
+
+logger = logging.getLogger('EmailReader.OCR.Images')
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.tiff', '.tif', '.gif', '.bmp')
+
+# Formats whose extra frames are document pages; in other formats (e.g.
+# animated GIFs) only the first frame is a page
+MULTI_PAGE_FORMATS = {'TIFF'}
+
+
+def is_image_file(file_path: str) -> bool:
+    """
+    Check whether a file is an image by its extension.
+
+    Args:
+        file_path: Path to the file
+
+    Returns:
+        True for supported image extensions
+    """
+    return os.path.splitext(file_path)[1].lower() in IMAGE_EXTENSIONS
+
+
+def iter_image_frames(image_path: str) -> Iterator[PageImage]:
+    """
+    Lazily read the pages of an image file as grayscale buffers.
+
+    EXIF orientation is applied, so photos taken sideways are upright.
+
+    Args:
+        image_path: Path to the image
+
+    Yields:
+        PageImage for each page, numbered from 1
+    """
+    with Image.open(image_path) as image:
+        frames = 1
+        if image.format in MULTI_PAGE_FORMATS:
+            frames = getattr(image, 'n_frames', 1)
+        logger.info("Reading %d page(s) from %s image %s",
+                    frames, image.format, os.path.basename(image_path))
+
+        for index in range(frames):
+            image.seek(index)
+            frame = ImageOps.exif_transpose(image).convert('L')
+            logger.debug("Read frame %d (%dx%d)", index + 1, frame.width, frame.height)
+            yield PageImage(index + 1, frame.width, frame.height, frame.tobytes())
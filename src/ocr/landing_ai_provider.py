@@ -3,13 +3,28 @@
 import os
 import time
 import logging
-from typing import Dict, List, Any, Optional
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import islice
+from typing import Dict, Iterator, List, Any, Optional
 import requests
+from requests.adapters import HTTPAdapter
 from pathlib import Path
 
 from .base_provider import BaseOCRProvider
+from src.ocr.cancellation import OCRCancelledError, raise_if_cancelled, wait_for
+from src.document_analyzer import PdfAnalysis
 from src.pdf_image_ocr import is_pdf_searchable_pypdf
-from src.convert_to_docx import convert_txt_to_docx
+from src.convert_to_docx import DocxPageWriter
+from src.utils.pdf_pages import count_pdf_pages, extract_pdf_pages
+
+# Optional incremental JSON parser for large responses
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
 
 
 def get_logger(name: str) -> logging.Logger:
@@ -27,6 +42,9 @@ def get_logger(name: str) -> logging.Logger:
 
 logger = get_logger('EmailReader.OCR.LandingAI')
 
+# Document text used when nothing could be extracted
+NO_TEXT_PLACEHOLDER = "[No text content extracted from document]"
+
 
 class LandingAIOCRProvider(BaseOCRProvider):
     """LandingAI OCR provider using ADE Parse API with layout preservation."""
@@ -44,8 +62,21 @@ class LandingAIOCRProvider(BaseOCRProvider):
                 - preserve_layout: Enable layout preservation (default: True)
                 - chunk_processing: Grounding configuration
                 - retry: Retry configuration
+                - batch_pages: Pages per request for large PDFs
+                  (default: 20, 0 sends the whole document at once)
+                - batch_workers: Page batches submitted concurrently
+                  (default: 4)
+                - stream_response: Parse responses incrementally and
+                  reconstruct each page as soon as it has arrived, when
+                  ijson is installed (default: True)
+                - layout_workers: Processes reconstructing the pages of
+                  a response parsed in full in parallel (default: 1,
+                  serial and streamed)
+                - layout_parallel_pages: Fewest pages worth reconstructing
+                  in parallel (default: the layout reconstructor's
+                  PARALLEL_PAGE_THRESHOLD)
         """
-        self.config = config
+        super().__init__(config)
         self.api_key = config.get('api_key')
         self.base_url = config.get('base_url', 'https://api.va.landing.ai/v1')
         self.model = config.get('model', 'dpt-2-latest')
@@ -63,10 +94,25 @@ class LandingAIOCRProvider(BaseOCRProvider):
         self.backoff_factor = retry_config.get('backoff_factor', 2)
         self.timeout = retry_config.get('timeout', 30)
 
+        # Page batching config
+        self.batch_pages = int(config.get('batch_pages', 20))
+        self.batch_workers = max(1, int(config.get('batch_workers', 4)))
+
+        # Parallel layout reconstruction
+        self.layout_workers = max(1, int(config.get('layout_workers', 1)))
+        self.layout_parallel_pages = config.get('layout_parallel_pages')
+
+        # Incremental response parsing
+        self.stream_response = config.get('stream_response', True) and IJSON_AVAILABLE
+        if config.get('stream_response') and not IJSON_AVAILABLE:
+            logger.warning("stream_response requires ijson; parsing responses in full")
+
         if not self.api_key:
             logger.error("LandingAI API key is required")
             raise ValueError("LandingAI API key is required")
 
+        self.session = self._create_session()
+
         logger.info(
             f"Initialized LandingAIOCRProvider "
             f"(model: {self.model}, layout: {self.preserve_layout}, "
@@ -74,21 +120,55 @@ class LandingAIOCRProvider(BaseOCRProvider):
         )
         logger.debug(
             f"Configuration: base_url={self.base_url}, split_mode={self.split_mode}, "
-            f"timeout={self.timeout}s, max_attempts={self.max_attempts}"
+            f"timeout={self.timeout}s, max_attempts={self.max_attempts}, "
+            f"batch_pages={self.batch_pages}, batch_workers={self.batch_workers}"
         )
 
-    def process_document(self, ocr_file: str, out_doc_file_path: str) -> None:
+    def _create_session(self) -> requests.Session:
+        """
+        Create a keep-alive HTTP session for API calls.
+
+        The connection pool is sized for concurrent page batches. Retries
+        are handled by _post_with_retry, not by the adapter.
+
+        Returns:
+            Configured requests Session
+        """
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=self.batch_workers,
+            max_retries=0)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        session.headers.update({"Authorization": f"Bearer {self.api_key}"})
+        return session
+
+    def process_document(
+            self,
+            ocr_file: str,
+            out_doc_file_path: str,
+            analysis: Optional[PdfAnalysis] = None,
+            source_language: Optional[str] = None,
+            cancel: Optional[threading.Event] = None) -> None:
         """
         Process document using LandingAI OCR with layout preservation.
 
         Args:
             ocr_file: Path to input file (PDF or image)
             out_doc_file_path: Path where DOCX output should be saved
+            analysis: Optional precomputed PdfAnalysis (unused, the whole
+                document is sent to LandingAI)
+            source_language: Optional source language code (unused,
+                LandingAI detects languages itself)
+            cancel: Optional event that stops the job once set: batches
+                not yet sent are dropped and open responses are closed
 
         Raises:
             FileNotFoundError: If input file doesn't exist
             ValueError: If file format is invalid
             RuntimeError: If OCR processing fails
+            OCRCancelledError: If cancelled
         """
         if not os.path.exists(ocr_file):
             logger.error(f"Input file not found: {ocr_file}")
@@ -102,26 +182,19 @@ class LandingAIOCRProvider(BaseOCRProvider):
         try:
             # Call LandingAI API
             logger.debug("Calling LandingAI API")
-            api_response = self._call_api_with_retry(ocr_file)
-
-            # Extract text using layout preservation
-            logger.debug("Extracting text with layout preservation")
-            extracted_text = self._extract_with_positions(api_response)
-
-            if not extracted_text or extracted_text.strip() == "":
-                logger.warning("No text extracted from document")
-                extracted_text = "[No text content extracted from document]"
-
-            # Convert to DOCX format
-            logger.debug("Converting to DOCX format")
-            self._save_as_docx(extracted_text, out_doc_file_path)
+            # Pages are reconstructed, written and cached one at a time
+            characters = self._write_docx(ocr_file, out_doc_file_path, cancel)
 
             elapsed = time.time() - start_time
             logger.info(
                 f"LandingAI OCR completed in {elapsed:.2f}s: {out_doc_file_path} "
-                f"({len(extracted_text)} characters)"
+                f"({characters} characters)"
             )
 
+        except OCRCancelledError:
+            logger.info(f"LandingAI OCR cancelled for {ocr_file}")
+            raise
+
         except Exception as e:
             elapsed = time.time() - start_time
             logger.error(
@@ -130,23 +203,183 @@ class LandingAIOCRProvider(BaseOCRProvider):
             )
             raise RuntimeError(f"LandingAI OCR processing failed: {e}") from e
 
-    def _call_api_with_retry(self, file_path: str) -> Dict[str, Any]:
+    def warm_up(self) -> None:
+        """Open a keep-alive connection to the LandingAI API."""
+        start_time = time.time()
+        try:
+            response = self.session.head(self.base_url, timeout=10)
+            logger.info(
+                f"LandingAI session warmed up in {time.time() - start_time:.2f}s "
+                f"(HTTP {response.status_code})"
+            )
+        except requests.exceptions.RequestException as e:
+            logger.warning(f"LandingAI session warm-up failed: {e}")
+
+    def close(self) -> None:
+        """Close the keep-alive HTTP session."""
+        self.session.close()
+
+    def _cache_settings(self) -> Dict[str, Any]:
+        """LandingAI request options that affect the parse result."""
+        return {
+            'model': self.model,
+            'split_mode': self.split_mode,
+            'preserve_layout': self.preserve_layout,
+        }
+
+    def _call_api_with_retry(
+            self,
+            file_path: str,
+            cancel: Optional[threading.Event] = None) -> Dict[str, Any]:
         """
-        Call LandingAI API with retry logic.
+        Parse a document with the LandingAI API.
+
+        The file is read once. PDFs with more than ``batch_pages`` pages are
+        split into page batches that are submitted concurrently, and their
+        chunks merged with grounding page numbers shifted to the original
+        document's pages. Requests run in worker threads, so a failed or
+        cancelled parse returns without waiting for the other batches.
 
         Args:
             file_path: Path to document file
+            cancel: Optional event that stops waiting for the API once set
+
+        Returns:
+            API response dictionary with the document's 'chunks'
+
+        Raises:
+            RuntimeError: If all retry attempts fail
+            OCRCancelledError: If cancelled
+        """
+        with open(file_path, 'rb') as f:
+            document = f.read()
+        filename = os.path.basename(file_path)
+
+        batches = self._make_page_batches(document, filename)
+        executor = ThreadPoolExecutor(max_workers=self.batch_workers)
+        try:
+            if len(batches) <= 1:
+                return wait_for(executor.submit(self._post_with_retry, document, filename),
+                                cancel)
+            return self._parse_batches(document, filename, batches, executor, cancel)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _parse_batches(
+            self,
+            document: bytes,
+            filename: str,
+            batches: List[List[int]],
+            executor: ThreadPoolExecutor,
+            cancel: Optional[threading.Event]) -> Dict[str, Any]:
+        """Parse page batches concurrently and merge their chunks."""
+        logger.info(
+            f"Splitting {filename} into {len(batches)} batches of up to "
+            f"{self.batch_pages} pages ({self.batch_workers} concurrent)"
+        )
+
+        def parse_batch(pages: List[int]) -> List[Dict[str, Any]]:
+            batch_bytes = extract_pdf_pages(document, pages)
+            batch_name = f"{Path(filename).stem}_p{pages[0]}-{pages[-1]}.pdf"
+            response = self._post_with_retry(batch_bytes, batch_name)
+            # Batch pages are numbered from 0; shift to document pages
+            return [self._offset_chunk_page(chunk, pages[0] - 1)
+                    for chunk in response.get('chunks', [])]
+
+        futures = [executor.submit(parse_batch, pages) for pages in batches]
+        batch_chunks = [wait_for(future, cancel) for future in futures]
+
+        chunks = [chunk for batch in batch_chunks for chunk in batch]
+        logger.info(f"Merged {len(chunks)} chunks from {len(batches)} batches")
+        return {'chunks': chunks}
+
+    def _make_page_batches(self, document: bytes, filename: str) -> List[List[int]]:
+        """
+        Split a PDF's pages into batches of ``batch_pages``.
+
+        Args:
+            document: File content as bytes
+            filename: File name, used to recognize PDFs
+
+        Returns:
+            List of 1-based page number lists; a single batch when the
+            document is not a PDF or is small enough
+        """
+        if self.batch_pages <= 0 or not filename.lower().endswith('.pdf'):
+            return [[]]
+
+        try:
+            page_count = count_pdf_pages(document)
+        except Exception as e:
+            logger.warning(f"Could not count PDF pages, sending whole document: {e}")
+            return [[]]
+
+        if page_count <= self.batch_pages:
+            return [list(range(1, page_count + 1))]
+
+        return [
+            list(range(start, min(start + self.batch_pages, page_count + 1)))
+            for start in range(1, page_count + 1, self.batch_pages)
+        ]
+
+    @staticmethod
+    def _offset_chunk_page(chunk: Dict[str, Any], offset: int) -> Dict[str, Any]:
+        """
+        Shift the grounding page number of a chunk by ``offset``.
+
+        Args:
+            chunk: Chunk from one page batch
+            offset: Number of document pages before the batch
+
+        Returns:
+            Chunk with its grounding page relative to the whole document
+        """
+        if not offset:
+            return chunk
+        grounding = dict(chunk.get('grounding') or {})
+        grounding['page'] = grounding.get('page', 0) + offset
+        return {**chunk, 'grounding': grounding}
+
+    def _post_with_retry(self, document: bytes, filename: str) -> Dict[str, Any]:
+        """
+        Send one document to the ADE Parse endpoint and parse the full
+        response (see _iter_document_chunks() for the streamed path).
+
+        Args:
+            document: Document content as bytes
+            filename: File name sent with the upload
 
         Returns:
             API response dictionary
 
+        Raises:
+            RuntimeError: If all retry attempts fail
+        """
+        response = self._request_with_retry(document, filename)
+        response_data = response.json()
+        logger.info(f"Received {len(response_data.get('chunks', []))} chunks from API")
+        return response_data
+
+    def _request_with_retry(
+            self,
+            document: bytes,
+            filename: str,
+            stream: bool = False) -> requests.Response:
+        """
+        POST one document to the ADE Parse endpoint, retrying failures.
+
+        Args:
+            document: Document content as bytes
+            filename: File name sent with the upload
+            stream: Leave the response body unread for incremental parsing
+
+        Returns:
+            Successful (200) response
+
         Raises:
             RuntimeError: If all retry attempts fail
         """
         url = f"{self.base_url}/tools/ade-parse"
-        headers = {
-            "Authorization": f"Bearer {self.api_key}"
-        }
 
         logger.debug(f"API endpoint: {url}")
 
@@ -154,33 +387,27 @@ class LandingAIOCRProvider(BaseOCRProvider):
             try:
                 logger.debug(f"LandingAI API call attempt {attempt}/{self.max_attempts}")
 
-                with open(file_path, 'rb') as f:
-                    files = {'document': f}
-                    data = {
-                        'model': self.model,
-                        'split_mode': self.split_mode,
-                        'preserve_layout': str(self.preserve_layout).lower()
-                    }
-
-                    logger.debug(f"Request data: {data}")
-
-                    response = requests.post(
-                        url,
-                        headers=headers,
-                        files=files,
-                        data=data,
-                        timeout=self.timeout
-                    )
+                files = {'document': (filename, document)}
+                data = {
+                    'model': self.model,
+                    'split_mode': self.split_mode,
+                    'preserve_layout': str(self.preserve_layout).lower()
+                }
+
+                logger.debug(f"Request data: {data}")
+
+                request_kwargs = {'stream': True} if stream else {}
+                response = self.session.post(
+                    url,
+                    files=files,
+                    data=data,
+                    timeout=self.timeout,
+                    **request_kwargs
+                )
 
                 if response.status_code == 200:
                     logger.info(f"LandingAI API call successful (attempt {attempt})")
-                    response_data = response.json()
-
-                    # Log response summary
-                    chunks = response_data.get('chunks', [])
-                    logger.info(f"Received {len(chunks)} chunks from API")
-
-                    return response_data
+                    return response
 
                 else:
                     logger.warning(
@@ -230,35 +457,267 @@ class LandingAIOCRProvider(BaseOCRProvider):
         logger.error(error_msg)
         raise RuntimeError(error_msg)
 
-    def _extract_with_positions(self, api_response: Dict[str, Any]) -> str:
+    def _can_stream_pages(self) -> bool:
         """
-        Extract text from API response using grounding data for layout preservation.
+        Check whether the response can be reconstructed page by page.
+
+        Requires incremental parsing and layout reconstruction. Parallel
+        layout_workers reconstruct whole responses, so they turn it off.
+        """
+        return (self.stream_response and self.use_grounding and self.maintain_positions
+                and self.layout_workers == 1)
+
+    @staticmethod
+    def _compact_chunk(chunk: Dict[str, Any]) -> Dict[str, Any]:
+        """Keep only the chunk fields used for layout reconstruction."""
+        compact: Dict[str, Any] = {'text': chunk.get('text', '')}
+        grounding = chunk.get('grounding')
+        if grounding:
+            compact['grounding'] = {
+                'page': grounding.get('page', 0),
+                'box': grounding.get('box', {}),
+            }
+        return compact
+
+    def _iter_response_chunks(self, response: requests.Response) -> Iterator[Dict[str, Any]]:
+        """
+        Incrementally parse the chunks of a streamed API response.
+
+        Only one chunk is materialized at a time; the rest of the response
+        (e.g. the full-document markdown) is skipped without being built.
+
+        Args:
+            response: Streamed response from _request_with_retry
+
+        Yields:
+            Compact chunks in response order
+        """
+        response.raw.decode_content = True
+        for chunk in ijson.items(response.raw, 'chunks.item', use_float=True):
+            yield self._compact_chunk(chunk)
+
+    def _iter_document_chunks(
+            self,
+            file_path: str,
+            cancel: Optional[threading.Event] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Parse a document with the LandingAI API, streaming its chunks.
+
+        Page batches (see _call_api_with_retry()) are submitted up to
+        ``batch_workers`` at a time, as in a full parse, while the chunks
+        of the earliest outstanding batch are parsed and passed on with
+        grounding pages shifted to the original document's pages. The
+        next batch is submitted once a batch's response has been read.
+
+        Args:
+            file_path: Path to document file
+            cancel: Optional event that stops the stream once set
+
+        Yields:
+            Compact chunks in document order
+
+        Raises:
+            OCRCancelledError: If cancelled
+        """
+        with open(file_path, 'rb') as f:
+            document = f.read()
+        filename = os.path.basename(file_path)
+
+        batches = self._make_page_batches(document, filename)
+        if len(batches) > 1:
+            logger.info(
+                f"Streaming {filename} in {len(batches)} batches of up to "
+                f"{self.batch_pages} pages ({self.batch_workers} concurrent)"
+            )
+
+        def request_batch(pages: List[int]) -> requests.Response:
+            if len(batches) <= 1:
+                return self._request_with_retry(document, filename, stream=True)
+            batch_bytes = extract_pdf_pages(document, pages)
+            batch_name = f"{Path(filename).stem}_p{pages[0]}-{pages[-1]}.pdf"
+            return self._request_with_retry(batch_bytes, batch_name, stream=True)
+
+        executor = ThreadPoolExecutor(max_workers=self.batch_workers)
+        remaining = iter(batches)
+        pending = deque((pages, executor.submit(request_batch, pages))
+                        for pages in islice(remaining, self.batch_workers))
+        try:
+            while pending:
+                pages, future = pending[0]
+                response = wait_for(future, cancel)
+                pending.popleft()
+                # Batch pages are numbered from 0; shift to document pages
+                offset = pages[0] - 1 if len(batches) > 1 else 0
+                try:
+                    for chunk in self._iter_response_chunks(response):
+                        raise_if_cancelled(cancel)
+                        yield self._offset_chunk_page(chunk, offset)
+                finally:
+                    response.close()
+                next_pages = next(remaining, None)
+                if next_pages is not None:
+                    pending.append((next_pages, executor.submit(request_batch, next_pages)))
+        finally:
+            # Abandoned, failed or cancelled: don't wait for requests still
+            # in flight, but release their connections once they answer
+            for _, future in pending:
+                future.cancel()
+                future.add_done_callback(self._close_response_future)
+            executor.shutdown(wait=False)
+
+    @staticmethod
+    def _close_response_future(future: Future) -> None:
+        """Close the response of a batch request that won't be read."""
+        if not future.cancelled() and future.exception() is None:
+            future.result().close()
+
+    def _iter_streamed_pages(
+            self,
+            file_path: str,
+            cancel: Optional[threading.Event] = None) -> Iterator[str]:
+        """
+        Parse a document and reconstruct its layout page by page.
+
+        Chunks are read from the response stream and each page is
+        reconstructed as soon as it is complete, so peak memory scales
+        with one page rather than the whole response. With sidecars
+        enabled, the chunks are saved as they pass.
+
+        Args:
+            file_path: Path to document file
+            cancel: Optional event that stops the stream once set
+
+        Yields:
+            Text of each page with preserved layout, in order
+        """
+        from src.utils.layout_reconstructor import iter_reconstructed_pages
+
+        chunks = self._tee_to_sidecar(file_path, self._iter_document_chunks(file_path, cancel),
+                                      'chunks', use_layout=True)
+        for _, page_text in iter_reconstructed_pages(chunks):
+            yield page_text
+
+    def _iter_parsed_pages(
+            self,
+            file_path: str,
+            cancel: Optional[threading.Event] = None) -> Iterator[str]:
+        """
+        Parse a document's full response and reconstruct it page by page.
+
+        Used when pages can't be streamed (see _can_stream_pages()). With
+        sidecars enabled, the chunks are saved once parsed.
+
+        Args:
+            file_path: Path to document file
+            cancel: Optional event that stops waiting for the API once set
+
+        Yields:
+            Text of each page, in order
+        """
+        chunks = self._call_api_with_retry(file_path, cancel).get('chunks', [])
+        # Keep the raw chunks for rebuilding the layout offline
+        self._save_sidecar(file_path, {
+            'chunks': chunks,
+            'use_layout': self.use_grounding and self.maintain_positions})
+        yield from self._extract_with_positions({'chunks': chunks})
+
+    def _write_docx(
+            self,
+            file_path: str,
+            output_path: str,
+            cancel: Optional[threading.Event] = None) -> int:
+        """
+        Write a document's pages to DOCX one at a time.
+
+        Pages come from the streamed response when possible, while later
+        pages are still being received, and from a full parse otherwise.
+        Either way each page is sanitized and written separated from the
+        next by a page break, so the DOCX doesn't depend on the parsing
+        settings. The pages are cached the same way, so a cache hit writes
+        them without calling the API.
+
+        Args:
+            file_path: Path to document file
+            output_path: Path to save DOCX file
+            cancel: Optional event that stops the job once set
+
+        Returns:
+            Number of characters written
+        """
+        def run_ocr(pages: Any) -> None:
+            if self._can_stream_pages():
+                page_texts = self._iter_streamed_pages(file_path, cancel)
+            else:
+                page_texts = self._iter_parsed_pages(file_path, cancel)
+            for page_text in page_texts:
+                pages.add_page(page_text)
+
+        with DocxPageWriter(output_path) as writer:
+            self._cached_pages(file_path, run_ocr, writer,
+                               use_layout=self.use_grounding and self.maintain_positions)
+            if not writer.pages:
+                logger.warning("No text extracted from document")
+                writer.add_page(NO_TEXT_PLACEHOLDER)
+
+        logger.info(f"Wrote {writer.pages} pages, {writer.characters} characters")
+        return writer.characters
+
+    def _extract_with_positions(self, api_response: Dict[str, Any]) -> List[str]:
+        """
+        Extract page texts from API response using grounding data for layout preservation.
 
         Args:
             api_response: LandingAI API response
 
         Returns:
-            Extracted text with preserved layout
+            Text of each page with preserved layout
         """
         chunks = api_response.get('chunks', [])
 
         if not chunks:
             logger.warning("No chunks in API response")
-            return ""
+            return []
 
         logger.info(
             f"Processing {len(chunks)} chunks "
             f"(grounding: {self.use_grounding}, positions: {self.maintain_positions})"
         )
+        return self._chunks_to_pages(chunks, self.use_grounding and self.maintain_positions,
+                                     self.layout_workers, self.layout_parallel_pages)
+
+    @staticmethod
+    def _chunks_to_pages(
+            chunks: List[Dict[str, Any]],
+            use_layout: bool,
+            layout_workers: int = 1,
+            layout_parallel_pages: Optional[int] = None) -> List[str]:
+        """
+        Turn API chunks into page texts.
 
-        if self.use_grounding and self.maintain_positions:
+        Args:
+            chunks: Chunks from the API response
+            use_layout: Reconstruct the layout of each page from the
+                grounding data instead of concatenating chunks
+            layout_workers: Processes reconstructing pages in parallel
+            layout_parallel_pages: Fewest pages worth reconstructing in
+                parallel, or None for the reconstructor's default
+
+        Returns:
+            Text of each page with text; without layout, all chunks as a
+            single page
+        """
+        if use_layout:
             # Use layout reconstructor for spatial positioning
             try:
-                from src.utils.layout_reconstructor import reconstruct_layout
+                from src.utils.layout_reconstructor import iter_reconstructed_pages
                 logger.debug("Using layout reconstructor for spatial positioning")
-                result = reconstruct_layout(chunks)
-                logger.info(f"Layout reconstruction produced {len(result)} characters")
-                return result
+                parallel = {'workers': layout_workers}
+                if layout_parallel_pages is not None:
+                    parallel['parallel_threshold'] = int(layout_parallel_pages)
+                pages = [page_text for _, page_text
+                         in iter_reconstructed_pages(chunks, **parallel)]
+                logger.info(f"Layout reconstruction produced {len(pages)} pages")
+                return pages
 
             except ImportError as e:
                 logger.warning(
@@ -279,53 +738,29 @@ class LandingAIOCRProvider(BaseOCRProvider):
         logger.debug("Using simple concatenation (no layout preservation)")
         result = '\n'.join(chunk.get('text', '') for chunk in chunks)
         logger.info(f"Simple concatenation produced {len(result)} characters")
-        return result
+        return [result] if result.strip() else []
 
-    def _save_as_docx(self, text: str, output_path: str) -> None:
+    @classmethod
+    def rebuild_from_sidecar(cls, record: Dict[str, Any], output_path: str) -> None:
         """
-        Save extracted text as DOCX file.
+        Build a document's DOCX from saved API chunks, without calling
+        the API.
+
+        Pages are written one at a time with page breaks, as
+        process_document() writes them.
 
         Args:
-            text: Extracted text content
-            output_path: Path to save DOCX file
+            record: Sidecar record with the document's 'chunks'
+            output_path: Path to save the DOCX file
         """
-        logger.debug(f"Saving text to DOCX: {output_path}")
-        logger.debug(f"Text length: {len(text)} characters")
-
-        # Create temp text file
-        temp_txt = output_path.replace('.docx', '.tmp.txt')
-        logger.debug(f"Using temporary file: {temp_txt}")
-
-        try:
-            # Write text to temp file
-            with open(temp_txt, 'w', encoding='utf-8') as f:
-                f.write(text)
-
-            logger.debug(f"Temporary text file created: {temp_txt}")
-
-            # Convert to DOCX using existing function
-            convert_txt_to_docx(text, output_path)
-
-            # Verify output file
-            if os.path.exists(output_path):
-                output_size = os.path.getsize(output_path) / 1024  # KB
-                logger.info(f"DOCX file saved: {output_path} ({output_size:.2f} KB)")
-            else:
-                logger.error(f"DOCX file was not created: {output_path}")
-                raise RuntimeError(f"Failed to create DOCX file: {output_path}")
-
-        except Exception as e:
-            logger.error(f"Error saving DOCX file: {e}", exc_info=True)
-            raise
-
-        finally:
-            # Clean up temp file
-            if os.path.exists(temp_txt):
-                try:
-                    os.remove(temp_txt)
-                    logger.debug(f"Temporary file cleaned up: {temp_txt}")
-                except Exception as e:
-                    logger.warning(f"Failed to clean up temp file {temp_txt}: {e}")
+        chunks = record.get('chunks', [])
+        logger.info(f"Rebuilding {record.get('document')} from {len(chunks)} saved chunks")
+        with DocxPageWriter(output_path) as writer:
+            for page_text in cls._chunks_to_pages(chunks, record.get('use_layout', True)):
+                writer.add_page(page_text)
+            if not writer.pages:
+                logger.warning("No text in saved chunks")
+                writer.add_page(NO_TEXT_PLACEHOLDER)
 
     def is_pdf_searchable(self, pdf_path: str) -> bool:
         """
@@ -0,0 +1,181 @@
+"""
+Tesseract Language Selection
+
+Chooses which Tesseract language models to load for a document instead of
+scoring every supported language on every line. The Drive
+``source_language`` property is used when present; otherwise the script of
+a downscaled first page is detected with Tesseract OSD, and the models
+chosen for it are checked by OCR'ing the first page with them. Anything
+uncertain - a weak script detection or low word confidence on the first
+page - falls back to the full language set.
+"""
+
+import logging
+from typing import Dict, Optional
+
+import pytesseract
+
+from src.ocr.rasterizer import PageImage
+from src.ocr.tesseract_engine import (DEFAULT_LANGUAGES, DEFAULT_TESSERACT_CONFIG,
+                                      page_result_from_data)
+
+logger = logging.getLogger('EmailReader.OCR.Language')
+
+# Every language the OCR pipeline supports
+ALL_LANGUAGES = DEFAULT_LANGUAGES
+
+# ISO 639-1 codes (as set on Drive files) to Tesseract models
+SOURCE_LANGUAGE_MODELS: Dict[str, str] = {
+    'en': 'eng',
+    'ru': 'rus',
+    'az': 'aze',
+    'uz': 'uzb',
+    'de': 'deu',
+}
+
+# Script reported by Tesseract OSD to the models worth loading for it.
+# Every supported language written in that script is included: OSD can't
+# tell German from Azerbaijani, and without the aze/uzb models letters
+# such as ə, ş, ğ and oʻ are misread
+SCRIPT_LANGUAGES: Dict[str, str] = {
+    'Cyrillic': 'rus+eng',
+    'Latin': 'eng+deu+aze+uzb',
+}
+
+# OSD script confidence below which the full language set is used
+MIN_SCRIPT_CONFIDENCE = 2.0
+
+# Mean word confidence of the first page, OCR'd with the models chosen by
+# script, below which the full language set is used
+MIN_WORD_CONFIDENCE = 60.0
+
+# OSD only needs glyph shapes; a smaller image is much faster to analyze
+OSD_MAX_DIMENSION = 1200
+
+
+def languages_for_source_language(source_language: Optional[str]) -> Optional[str]:
+    """
+    Map a Drive source_language property to Tesseract models.
+
+    English is always added alongside the hinted language, since names,
+    addresses and codes in non-English documents are usually Latin script.
+
+    Args:
+        source_language: Language code such as 'ru' or 'de-DE'
+
+    Returns:
+        Tesseract language string, or None if the language is not supported
+    """
+    if not source_language:
+        return None
+
+    code = source_language.strip().lower().replace('_', '-').split('-')[0]
+    model = SOURCE_LANGUAGE_MODELS.get(code)
+    if model is None:
+        logger.debug("No Tesseract model for source language '%s'", source_language)
+        return None
+    return model if model == 'eng' else f"{model}+eng"
+
+
+def detect_script(page: PageImage) -> Optional[Dict[str, object]]:
+    """
+    Detect the dominant script of a page with Tesseract OSD.
+
+    Args:
+        page: Rendered page
+
+    Returns:
+        Dict with 'script' and 'script_conf', or None if OSD failed
+    """
+    image = page.to_pil()
+    scale = OSD_MAX_DIMENSION / max(page.width, page.height)
+    if scale < 1:
+        image = image.resize((max(1, int(page.width * scale)),
+                              max(1, int(page.height * scale))))
+    # Hand the image to Tesseract as raw PGM instead of encoding a PNG
+    image.format = 'PPM'
+
+    try:
+        osd = pytesseract.image_to_osd(
+            image, output_type=pytesseract.Output.DICT)
+    except pytesseract.TesseractError as e:
+        # OSD refuses pages with too little text to judge
+        logger.debug("Script detection failed: %s", e)
+        return None
+
+    return {'script': osd.get('script'), 'script_conf': float(osd.get('script_conf', 0))}
+
+
+def word_confidence(page: PageImage, lang: str) -> Optional[float]:
+    """
+    OCR a page and return its mean word confidence.
+
+    Args:
+        page: Rendered page
+        lang: Tesseract language string to OCR with
+
+    Returns:
+        Mean word confidence (0-100), or None if no words were recognized
+    """
+    image = page.to_pil()
+    image.format = 'PPM'
+    data = pytesseract.image_to_data(image, config=DEFAULT_TESSERACT_CONFIG, lang=lang,
+                                     output_type=pytesseract.Output.DICT)
+    return page_result_from_data(data).confidence
+
+
+def select_languages(
+        first_page: Optional[PageImage],
+        source_language: Optional[str] = None,
+        min_confidence: float = MIN_SCRIPT_CONFIDENCE,
+        min_word_confidence: float = MIN_WORD_CONFIDENCE) -> str:
+    """
+    Choose the Tesseract languages to OCR a document with.
+
+    Models chosen by script detection are only used if the first page,
+    OCR'd with them, reaches ``min_word_confidence``; a confidently
+    detected script doesn't mean the document's language has a model in
+    the narrowed set.
+
+    Args:
+        first_page: Rendered first page, used for script detection
+        source_language: Drive source_language property, if set
+        min_confidence: Minimum OSD script confidence to trust detection
+        min_word_confidence: Minimum mean word confidence of the first
+            page OCR'd with the narrowed models
+
+    Returns:
+        Tesseract language string (e.g. 'rus+eng')
+    """
+    lang = languages_for_source_language(source_language)
+    if lang:
+        logger.info("OCR languages from source language '%s': %s",
+                    source_language, lang)
+        return lang
+
+    if first_page is None:
+        return ALL_LANGUAGES
+
+    osd = detect_script(first_page)
+    if osd is None:
+        logger.info("Script not detected - using all OCR languages: %s",
+                    ALL_LANGUAGES)
+        return ALL_LANGUAGES
+
+    script, confidence = osd['script'], osd['script_conf']
+    lang = SCRIPT_LANGUAGES.get(script)
+    if lang is None or confidence < min_confidence:
+        logger.info("Script %s detected with low confidence %.2f or unsupported "
+                    "- using all OCR languages: %s", script, confidence, ALL_LANGUAGES)
+        return ALL_LANGUAGES
+
+    words = word_confidence(first_page, lang)
+    if words is not None and words < min_word_confidence:
+        logger.info("Detected %s script, but first page word confidence with %s is "
+                    "low (%.1f) - using all OCR languages: %s",
+                    script, lang, words, ALL_LANGUAGES)
+        return ALL_LANGUAGES
+
+    logger.info("Detected %s script (confidence %.2f) - OCR languages: %s",
+                script, confidence, lang)
+    return lang
@@ -0,0 +1,457 @@
+"""
+OCR Result Cache
+
+Persistent on-disk cache of extracted OCR results, so retries, duplicate
+uploads and reprocessing after downstream failures don't pay for OCR again.
+
+Entries are keyed by the SHA-256 of the input file bytes plus the provider
+name and the settings that affect its output (model, DPI, languages), and
+hold the extracted page text and, where available, grounding chunks. The
+cache is bounded by total size and entry age; the least recently used
+entries are evicted first.
+
+Page results can be written and read one page at a time (open_entry(),
+get_pages()), so caching doesn't require a document's text in memory.
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# Optional incremental JSON parser for reading cached pages one at a time
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+    _PARSE_ERRORS: Tuple[type, ...] = (ValueError, KeyError, TypeError, ijson.JSONError)
+except ImportError:
+    IJSON_AVAILABLE = False
+    _PARSE_ERRORS = (ValueError, KeyError, TypeError)
+
+from src.utils.spool import Spool
+
+logger = logging.getLogger('EmailReader.OCR.Cache')
+
+DEFAULT_CACHE_DIR = os.path.join('data', 'ocr_cache')
+DEFAULT_MAX_SIZE_MB = 500
+DEFAULT_MAX_AGE_DAYS = 30
+
+# Read files in 1 MB blocks when hashing
+_HASH_BLOCK_SIZE = 1024 * 1024
+
+
+def hash_file(file_path: str) -> str:
+    """
+    Compute the SHA-256 of a file's contents.
+
+    Args:
+        file_path: Path to file
+
+    Returns:
+        Hex digest
+    """
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(_HASH_BLOCK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class OCRCache:
+    """
+    Size- and age-bounded LRU cache of OCR results stored as JSON files.
+
+    Every entry is one file in the cache directory. A hit refreshes the
+    file's modification time, which is the LRU order used for eviction.
+    """
+
+    def __init__(
+            self,
+            cache_dir: str = DEFAULT_CACHE_DIR,
+            max_size_mb: float = DEFAULT_MAX_SIZE_MB,
+            max_age_days: float = DEFAULT_MAX_AGE_DAYS):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Directory holding cache entries
+            max_size_mb: Maximum total size of all entries
+            max_age_days: Entries not used for this long are discarded
+        """
+        self.cache_dir = cache_dir
+        self.max_size = int(max_size_mb * 1024 * 1024)
+        self.max_age = max_age_days * 24 * 60 * 60
+        os.makedirs(self.cache_dir, exist_ok=True)
+        logger.debug("OCRCache: dir=%s, max_size=%.0f MB, max_age=%.0f days",
+                     cache_dir, max_size_mb, max_age_days)
+
+    @classmethod
+    def from_config(cls, cache_config: Dict[str, Any]) -> Optional['OCRCache']:
+        """
+        Create a cache from the 'ocr.cache' configuration section.
+
+        Args:
+            cache_config: Dictionary with 'enabled', 'directory',
+                'max_size_mb' and 'max_age_days'
+
+        Returns:
+            OCRCache instance, or None if caching is disabled
+        """
+        if not cache_config.get('enabled', False):
+            return None
+        return cls(
+            cache_dir=cache_config.get('directory', DEFAULT_CACHE_DIR),
+            max_size_mb=cache_config.get('max_size_mb', DEFAULT_MAX_SIZE_MB),
+            max_age_days=cache_config.get('max_age_days', DEFAULT_MAX_AGE_DAYS))
+
+    @staticmethod
+    def make_key(file_hash: str, provider: str, settings: Dict[str, Any]) -> str:
+        """
+        Build the cache key for a file processed by a provider.
+
+        Args:
+            file_hash: SHA-256 of the input file
+            provider: Provider name
+            settings: Provider settings that affect the OCR output
+
+        Returns:
+            Hex key
+        """
+        material = json.dumps(
+            {'file': file_hash, 'provider': provider, 'settings': settings},
+            sort_keys=True, default=str)
+        return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached OCR result.
+
+        Args:
+            key: Cache key from make_key()
+
+        Returns:
+            Cached payload, or None on a miss
+        """
+        path = self._entry_path(key)
+        try:
+            if time.time() - os.path.getmtime(path) > self.max_age:
+                logger.debug("Cache entry expired: %s", key)
+                self._remove(path)
+                return None
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            # Mark as recently used
+            os.utime(path, None)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning("Discarding unreadable cache entry %s: %s", key, e)
+            self._remove(path)
+            return None
+
+        logger.debug("Cache hit: %s (%s)", key, entry.get('provider'))
+        return entry.get('payload')
+
+    def get_pages(self, key: str) -> Optional[Iterator[Any]]:
+        """
+        Look up a cached page result and read its pages one at a time.
+
+        The entry is checked once before any page is returned, so a
+        damaged entry is a miss rather than a failure part way through.
+        Without ijson, the entry is loaded in full.
+
+        Args:
+            key: Cache key from make_key()
+
+        Returns:
+            Iterator over payload['pages'], or None on a miss
+        """
+        path = self._entry_path(key)
+        try:
+            if time.time() - os.path.getmtime(path) > self.max_age:
+                logger.debug("Cache entry expired: %s", key)
+                self._remove(path)
+                return None
+            if not IJSON_AVAILABLE:
+                with open(path, 'r', encoding='utf-8') as f:
+                    pages = json.load(f)['payload']['pages']
+            else:
+                pages = None
+                with open(path, 'rb') as f:
+                    has_pages = False
+                    for prefix, event, _ in ijson.parse(f):
+                        has_pages |= prefix == 'payload.pages' and event == 'start_array'
+                if not has_pages:
+                    raise ValueError("entry has no pages")
+            # Mark as recently used
+            os.utime(path, None)
+        except FileNotFoundError:
+            return None
+        except (OSError,) + _PARSE_ERRORS as e:
+            logger.warning("Discarding unreadable cache entry %s: %s", key, e)
+            self._remove(path)
+            return None
+
+        logger.debug("Cache hit: %s (pages)", key)
+        if pages is not None:
+            return iter(pages)
+        return self._read_pages(path)
+
+    @staticmethod
+    def _read_pages(path: str) -> Iterator[Any]:
+        """Yield the pages of an entry, parsing one page at a time."""
+        with open(path, 'rb') as f:
+            yield from ijson.items(f, 'payload.pages.item')
+
+    def open_entry(
+            self,
+            key: str,
+            provider: str = '',
+            settings: Optional[Dict[str, Any]] = None) -> 'CacheEntryWriter':
+        """
+        Start a page result that is written one page at a time.
+
+        Args:
+            key: Cache key from make_key()
+            provider: Provider name, stored for inspection
+            settings: Provider settings, stored for inspection
+
+        Returns:
+            CacheEntryWriter; the entry appears in the cache on commit()
+        """
+        return CacheEntryWriter(self, key, provider, settings)
+
+    def put(
+            self,
+            key: str,
+            payload: Dict[str, Any],
+            provider: str = '',
+            settings: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Store an OCR result and evict old entries if over budget.
+
+        Args:
+            key: Cache key from make_key()
+            payload: JSON-serializable result, e.g. {'pages': [...]}
+            provider: Provider name, stored for inspection
+            settings: Provider settings, stored for inspection
+        """
+        path = self._entry_path(key)
+        # Unique per thread, so concurrent writers of a key never share it
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        entry = {
+            'provider': provider,
+            'settings': settings or {},
+            'created': time.time(),
+            'payload': payload,
+        }
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(entry, f, ensure_ascii=False, default=str)
+            # Atomic so concurrent readers never see a partial entry
+            os.replace(temp_path, path)
+        except Exception:
+            self._remove(temp_path)
+            raise
+        logger.debug("Cached OCR result: %s (%d bytes)", key, os.path.getsize(path))
+        self.evict()
+
+    def evict(self) -> int:
+        """
+        Remove expired entries, then least recently used ones until the
+        cache fits its size budget.
+
+        Returns:
+            Number of entries removed
+        """
+        entries: List[Tuple[float, int, str]] = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith('.json'):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        entries.sort()
+        now = time.time()
+        total_size = sum(size for _, size, _ in entries)
+        removed = 0
+
+        for mtime, size, path in entries:
+            if now - mtime <= self.max_age and total_size <= self.max_size:
+                break
+            self._remove(path)
+            total_size -= size
+            removed += 1
+
+        if removed:
+            logger.info("Evicted %d OCR cache entries (%.2f MB remaining)",
+                        removed, total_size / (1024 * 1024))
+        return removed
+
+    def clear(self) -> None:
+        """Remove all cache entries."""
+        for name in os.listdir(self.cache_dir):
+            if name.endswith('.json'):
+                self._remove(os.path.join(self.cache_dir, name))
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+class CacheEntryWriter:
+    """
+    Write an OCR cache entry one page at a time.
+
+    Pages are appended to a temporary buffer as they are added, so the
+    document's text is never held in memory; like DocxPageWriter, a page
+    can hold its place with reserve_page() until fill_page() supplies it.
+    commit() completes the entry - the same JSON as OCRCache.put() writes,
+    with the pages in payload['pages'] - and moves it into place
+    atomically; discard() drops it. As a context manager the entry is
+    committed on a clean exit and discarded if an exception is raised.
+    """
+
+    def __init__(
+            self,
+            cache: OCRCache,
+            key: str,
+            provider: str = '',
+            settings: Optional[Dict[str, Any]] = None):
+        """
+        Start the entry.
+
+        Args:
+            cache: Cache the entry belongs to
+            key: Cache key from make_key()
+            provider: Provider name, stored for inspection
+            settings: Provider settings, stored for inspection
+        """
+        self.cache = cache
+        self.key = key
+        self.pages = 0
+        # Reserved page number -> Spool slot
+        self._reserved: Dict[int, int] = {}
+        header = json.dumps({
+            'provider': provider,
+            'settings': settings or {},
+            'created': time.time(),
+        }, ensure_ascii=False, default=str)
+        self._spool: Optional[Spool] = Spool()
+        # The payload is written after the header's fields, pages first
+        self._spool.write((header[:-1] + ', "payload": {"pages": [').encode('utf-8'))
+
+    def add_page(self, page: Any) -> None:
+        """
+        Append a page to the entry.
+
+        Args:
+            page: JSON-serializable page, e.g. its text
+
+        Raises:
+            ValueError: If the entry is already committed or discarded
+        """
+        self._start_page()
+        self._spool.write(self._dumps(page))
+
+    def reserve_page(self) -> int:
+        """
+        Hold the place of a page added later with fill_page().
+
+        Returns:
+            Page number (1-based) to pass to fill_page()
+        """
+        self._start_page()
+        self._reserved[self.pages] = self._spool.reserve()
+        return self.pages
+
+    def fill_page(self, number: int, page: Any) -> None:
+        """
+        Supply a reserved page.
+
+        Args:
+            number: Page number from reserve_page()
+            page: JSON-serializable page
+
+        Raises:
+            ValueError: If the page isn't reserved or the entry is closed
+        """
+        if self._spool is None:
+            raise ValueError("CacheEntryWriter is closed")
+        if number not in self._reserved:
+            raise ValueError(f"Page {number} is not reserved")
+        self._spool.fill(self._reserved.pop(number), self._dumps(page))
+
+    def _start_page(self) -> None:
+        """Count a new page, separating it from the previous one."""
+        if self._spool is None:
+            raise ValueError("CacheEntryWriter is closed")
+        if self.pages:
+            self._spool.write(b', ')
+        self.pages += 1
+
+    @staticmethod
+    def _dumps(value: Any) -> bytes:
+        return json.dumps(value, ensure_ascii=False, default=str).encode('utf-8')
+
+    def commit(self, **fields: Any) -> None:
+        """
+        Complete the entry and add it to the cache.
+
+        Args:
+            **fields: JSON-serializable values stored in the payload
+                next to the pages (e.g. quality=...)
+
+        Raises:
+            ValueError: If a reserved page hasn't been filled; the entry
+                is discarded
+        """
+        if self._spool is None:
+            return
+        path = self.cache._entry_path(self.key)
+        temp_path = f"{path}.{os.getpid()}.{id(self)}.tmp"
+        try:
+            self._spool.write(b']')
+            for name, value in fields.items():
+                self._spool.write(f', {json.dumps(name)}: '.encode('utf-8') + self._dumps(value))
+            self._spool.write(b'}}')
+            with open(temp_path, 'wb') as f:
+                self._spool.copy_to(f)
+            # Atomic so concurrent readers never see a partial entry
+            os.replace(temp_path, path)
+        except Exception:
+            OCRCache._remove(temp_path)
+            raise
+        finally:
+            self.discard()
+        logger.debug("Cached OCR result: %s (%d pages, %d bytes)",
+                     self.key, self.pages, os.path.getsize(path))
+        self.cache.evict()
+
+    def discard(self) -> None:
+        """Drop the entry without adding it to the cache."""
+        if self._spool is not None:
+            self._spool.close()
+            self._spool = None
+
+    def __enter__(self) -> 'CacheEntryWriter':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.commit()
+        else:
+            self.discard()
@@ -2,12 +2,23 @@
 OCR Provider Factory
 
 Factory class for creating OCR provider instances based on configuration.
+
+Providers are cached per (provider type, configuration) and reused across
+files, so clients, HTTP connection pools and parsed settings survive
+between documents. All providers are safe to share between threads.
+Instances dropped from the cache, by clear_cache() or because their
+provider's configuration changed, are closed.
 """
 
-from typing import Dict, Any
+from typing import Dict, Any, List, Tuple
+import json
+import hashlib
 import logging
+import threading
 
 from src.ocr.base_provider import BaseOCRProvider
+from src.ocr.ocr_cache import OCRCache
+from src.ocr.sidecar import SidecarStore
 
 logger = logging.getLogger('EmailReader.OCR')
 
@@ -22,15 +33,25 @@ class OCRProviderFactory:
 
     VALID_PROVIDERS = {'azure', 'landing_ai', 'default'}
 
+    # Provider instances keyed by (provider type, config hash)
+    _instances: Dict[Tuple[str, str], BaseOCRProvider] = {}
+    _stats: Dict[str, Dict[str, int]] = {}
+    _lock = threading.Lock()
+
     @staticmethod
     def get_provider(
             config: Dict[str, Any],
             translation_mode: str = 'default') -> BaseOCRProvider:
         """
-        Create an OCR provider instance based on configuration.
+        Get the OCR provider for a translation mode.
+
+        Returns the cached instance when one was already created for the
+        same provider configuration.
 
         Args:
             config: Application configuration dictionary
+            translation_mode: Translation mode from file metadata
+                ('human', 'formats', 'default')
 
         Returns:
             BaseOCRProvider instance
@@ -38,23 +59,229 @@ class OCRProviderFactory:
         Raises:
             ValueError: If provider type is invalid or not configured
         """
-        provider_type = 'default'
+        return OCRProviderFactory._get_or_create(
+            OCRProviderFactory.provider_type_for_mode(translation_mode),
+            config.get('ocr', {}))
+
+    @staticmethod
+    def provider_type_for_mode(translation_mode: str = 'default') -> str:
+        """
+        Map a translation mode to the OCR provider type that serves it.
+
+        Args:
+            translation_mode: Translation mode from file metadata
+                ('human', 'formats', 'default')
+
+        Returns:
+            'azure', 'landing_ai' or 'default'
+        """
         if translation_mode == 'human':
-            provider_type = 'azure'
-        elif translation_mode == 'formats':
-            provider_type = 'landing_ai'
+            return 'azure'
+        if translation_mode == 'formats':
+            return 'landing_ai'
+        return 'default'
+
+    @staticmethod
+    def get_fallback_provider(config: Dict[str, Any]) -> BaseOCRProvider:
+        """
+        Get the default (Tesseract) provider used when a primary provider fails.
+
+        Args:
+            config: Application configuration dictionary
+
+        Returns:
+            BaseOCRProvider instance
+        """
+        return OCRProviderFactory.get_provider_by_type(config, 'default')
+
+    @staticmethod
+    def get_provider_by_type(
+            config: Dict[str, Any],
+            provider_type: str) -> BaseOCRProvider:
+        """
+        Get a provider by type rather than by translation mode.
 
+        Args:
+            config: Application configuration dictionary
+            provider_type: 'azure', 'landing_ai' or 'default'
+
+        Returns:
+            BaseOCRProvider instance
+
+        Raises:
+            ValueError: If provider type is invalid or not configured
+        """
+        return OCRProviderFactory._get_or_create(
+            provider_type, config.get('ocr', {}))
+
+    @staticmethod
+    def warm_up(config: Dict[str, Any]) -> List[str]:
+        """
+        Create every configured provider and open its connections ahead of
+        the first document.
+
+        Failures are logged and never raised; the provider is created
+        again on first use.
+
+        Args:
+            config: Application configuration dictionary
+
+        Returns:
+            Provider types that were warmed up
+        """
         ocr_config = config.get('ocr', {})
-        # provider_type = ocr_config.get('provider', 'default')
 
-        logger.info("Creating OCR provider: %s", provider_type)
+        warmed = []
+        for provider_type in ('default', 'azure', 'landing_ai'):
+            if not OCRProviderFactory.is_configured(config, provider_type):
+                continue
+            try:
+                provider = OCRProviderFactory._get_or_create(
+                    provider_type, ocr_config)
+                provider.warm_up()
+                warmed.append(provider_type)
+            except Exception as e:
+                logger.warning("Failed to warm up %s OCR provider: %s",
+                               provider_type, e)
+
+        logger.info("Warmed up OCR providers: %s", ', '.join(warmed) or 'none')
+        return warmed
+
+    @staticmethod
+    def is_configured(config: Dict[str, Any], provider_type: str) -> bool:
+        """
+        Check whether a provider has the configuration it needs.
+
+        Args:
+            config: Application configuration dictionary
+            provider_type: 'azure', 'landing_ai' or 'default'
+
+        Returns:
+            True if the provider can be created
+        """
+        ocr_config = config.get('ocr', {})
+        if provider_type == 'azure':
+            azure_config = ocr_config.get('azure', {})
+            return bool(azure_config.get('endpoint') and azure_config.get('api_key'))
+        if provider_type == 'landing_ai':
+            return bool(ocr_config.get('landing_ai', {}).get('api_key'))
+        return provider_type == 'default'
+
+    @staticmethod
+    def get_stats() -> Dict[str, Dict[str, int]]:
+        """
+        Report how often provider instances were created and reused.
+
+        Returns:
+            Mapping of provider type to {'created': n, 'reused': n}
+        """
+        with OCRProviderFactory._lock:
+            return {provider_type: dict(counts)
+                    for provider_type, counts in OCRProviderFactory._stats.items()}
+
+    @staticmethod
+    def clear_cache() -> None:
+        """Close and drop all cached provider instances and reset the statistics."""
+        with OCRProviderFactory._lock:
+            providers = list(OCRProviderFactory._instances.values())
+            OCRProviderFactory._instances.clear()
+            OCRProviderFactory._stats.clear()
+        for provider in providers:
+            OCRProviderFactory._close_provider(provider)
+
+    @staticmethod
+    def _close_provider(provider: BaseOCRProvider) -> None:
+        """Close a provider dropped from the cache; failures are only logged."""
+        try:
+            provider.close()
+        except Exception as e:
+            logger.warning("Failed to close OCR provider %s: %s",
+                           provider.__class__.__name__, e)
+
+    @staticmethod
+    def _config_hash(provider_type: str, ocr_config: Dict[str, Any]) -> str:
+        """Hash the configuration sections a provider instance depends on."""
+        material = json.dumps(
+            {'provider': ocr_config.get(provider_type, {}),
+             'cache': ocr_config.get('cache', {}),
+             'sidecars': ocr_config.get('sidecars', {})},
+            sort_keys=True, default=str)
+        return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def _get_or_create(
+            provider_type: str,
+            ocr_config: Dict[str, Any]) -> BaseOCRProvider:
+        """
+        Return the cached provider for a configuration, creating it once.
+
+        Only the instance for a provider type's latest configuration is
+        kept: when the configuration changes, the previous one is closed.
+
+        Args:
+            provider_type: 'azure', 'landing_ai' or 'default'
+            ocr_config: The 'ocr' configuration section
 
+        Returns:
+            BaseOCRProvider instance
+
+        Raises:
+            ValueError: If provider type is invalid or not configured
+        """
         if provider_type not in OCRProviderFactory.VALID_PROVIDERS:
             raise ValueError(
                 f"Invalid OCR provider: {provider_type}. "
                 f"Valid providers: {OCRProviderFactory.VALID_PROVIDERS}"
             )
 
+        key = (provider_type,
+               OCRProviderFactory._config_hash(provider_type, ocr_config))
+
+        with OCRProviderFactory._lock:
+            counts = OCRProviderFactory._stats.setdefault(
+                provider_type, {'created': 0, 'reused': 0})
+
+            provider = OCRProviderFactory._instances.get(key)
+            if provider is not None:
+                counts['reused'] += 1
+                logger.debug("Reusing OCR provider: %s (%s)",
+                             provider_type, provider.__class__.__name__)
+                return provider
+
+            provider = OCRProviderFactory._create_provider(
+                provider_type, ocr_config)
+            stale = [OCRProviderFactory._instances.pop(old_key)
+                     for old_key in list(OCRProviderFactory._instances)
+                     if old_key[0] == provider_type]
+            OCRProviderFactory._instances[key] = provider
+            counts['created'] += 1
+
+        # Outside the lock, as closing can wait on the provider's connections
+        for old_provider in stale:
+            logger.info("Closing OCR provider replaced by a new configuration: %s",
+                        old_provider.__class__.__name__)
+            OCRProviderFactory._close_provider(old_provider)
+        return provider
+
+    @staticmethod
+    def _create_provider(
+            provider_type: str,
+            ocr_config: Dict[str, Any]) -> BaseOCRProvider:
+        """
+        Create an OCR provider instance based on configuration.
+
+        Args:
+            provider_type: 'azure', 'landing_ai' or 'default'
+            ocr_config: The 'ocr' configuration section
+
+        Returns:
+            BaseOCRProvider instance
+
+        Raises:
+            ValueError: If the provider is not configured
+        """
+        logger.info("Creating OCR provider: %s", provider_type)
+
         if provider_type == 'azure':
             azure_config = ocr_config.get('azure', {})
             if not azure_config.get('endpoint') or not azure_config.get(
@@ -63,8 +290,12 @@ class OCRProviderFactory:
                     ("Azure OCR provider requires "
                      "'endpoint' and 'api_key' in configuration")
                 )
-            from src.ocr.azure_provider import AzureOCRProvider
-            return AzureOCRProvider(azure_config)
+            if azure_config.get('use_async', False):
+                from src.ocr.azure_async_provider import AsyncAzureOCRProvider
+                provider = AsyncAzureOCRProvider(azure_config)
+            else:
+                from src.ocr.azure_provider import AzureOCRProvider
+                provider = AzureOCRProvider(azure_config)
 
         elif provider_type == 'landing_ai':
             landing_ai_config = ocr_config.get('landing_ai', {})
@@ -74,9 +305,17 @@ class OCRProviderFactory:
                      "requires 'api_key' in configuration")
                 )
             from src.ocr.landing_ai_provider import LandingAIOCRProvider
-            return LandingAIOCRProvider(landing_ai_config)
+            provider = LandingAIOCRProvider(landing_ai_config)
 
         else:  # default
             default_config = ocr_config.get('default', {})
             from src.ocr.default_provider import DefaultOCRProvider
-            return DefaultOCRProvider(default_config)
+            provider = DefaultOCRProvider(default_config)
+
+        provider.cache = OCRCache.from_config(ocr_config.get('cache', {}))
+        if provider.cache is not None:
+            logger.debug("OCR result cache enabled: %s", provider.cache.cache_dir)
+        provider.sidecars = SidecarStore.from_config(ocr_config.get('sidecars', {}))
+        if provider.sidecars is not None:
+            logger.debug("OCR sidecars enabled: %s", provider.sidecars.directory)
+        return provider
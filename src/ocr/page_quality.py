@@ -0,0 +1,308 @@
+"""
+OCR Page Quality
+
+Uses Tesseract's per-word confidences to find pages that came out badly
+instead of treating every page the same:
+
+    - pages whose mean word confidence is below ``min_confidence`` are
+      flagged as weak
+    - weak pages are OCR'd again with stronger settings (higher DPI and a
+      different page segmentation mode); the better result is kept
+    - pages still weak afterwards can be escalated to a cloud provider
+      that supports page-level OCR (e.g. Azure)
+
+A word-weighted confidence is computed for each document and appended,
+with the per-page results, to a JSONL quality log.
+"""
+
+import os
+import json
+import time
+import logging
+import threading
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+from src.ocr.base_provider import BaseOCRProvider
+from src.ocr.circuit_breaker import get_circuit_breaker
+from src.ocr.ocr_factory import OCRProviderFactory
+from src.ocr.rasterizer import get_rasterizer
+from src.ocr.tesseract_engine import (DEFAULT_TESSERACT_CONFIG, PageResult,
+                                      ParallelTesseractEngine)
+
+logger = logging.getLogger('EmailReader.OCR.Quality')
+
+DEFAULT_MIN_CONFIDENCE = 60.0
+DEFAULT_RETRY_DPI = 400
+# Single uniform block of text; copes with pages where automatic layout
+# analysis (the default PSM 3) split the text badly
+DEFAULT_RETRY_PSM = 6
+DEFAULT_QUALITY_LOG = os.path.join('logs', 'ocr_quality.jsonl')
+
+# Page actions recorded in the quality report
+ACCEPTED = 'accepted'
+RETRIED = 'retried'
+ESCALATED = 'escalated'
+WEAK = 'weak'
+
+_log_lock = threading.Lock()
+
+
+@dataclass
+class PageQuality:
+    """Confidence of one page and what was done about it."""
+    page: int
+    confidence: Optional[float]
+    words: int
+    action: str = ACCEPTED
+
+
+@dataclass
+class QualityReport:
+    """OCR confidence of a document and its pages."""
+    document: str
+    min_confidence: float
+    confidence: Optional[float]
+    pages: List[PageQuality] = field(default_factory=list)
+    timestamp: str = field(
+        default_factory=lambda: datetime.now().isoformat(timespec='seconds'))
+
+    def pages_with(self, action: str) -> List[int]:
+        """Page numbers with the given action."""
+        return [page.page for page in self.pages if page.action == action]
+
+
+def min_confidence(quality_config: Dict[str, Any]) -> float:
+    """Confidence below which a page is weak, from the quality config."""
+    return float(quality_config.get('min_confidence', DEFAULT_MIN_CONFIDENCE))
+
+
+def is_weak(result: PageResult, threshold: float) -> bool:
+    """
+    Check whether a page was recognized poorly.
+
+    Pages without any recognized words are treated as blank, not weak.
+
+    Args:
+        result: OCR result of the page
+        threshold: Minimum acceptable mean word confidence
+
+    Returns:
+        True if the page's confidence is below the threshold
+    """
+    return result.confidence is not None and result.confidence < threshold
+
+
+def document_confidence(results: Sequence[PageResult]) -> Optional[float]:
+    """
+    Word-weighted mean confidence of a document.
+
+    Args:
+        results: OCR results of the document's pages
+
+    Returns:
+        Confidence (0-100), or None if no words were recognized
+    """
+    words = sum(r.words for r in results if r.confidence is not None)
+    if not words:
+        return None
+    total = sum(r.confidence * r.words for r in results if r.confidence is not None)
+    return total / words
+
+
+def retry_weak_pages(
+        pdf_path: str,
+        results: List[PageResult],
+        lang: str,
+        quality_config: Dict[str, Any],
+        rasterizer: Optional[str] = None,
+        max_workers: Optional[int] = None,
+        tesseract_backend: Optional[str] = None,
+        cancel: Optional[threading.Event] = None) -> List[int]:
+    """
+    OCR weak pages again with stronger settings.
+
+    Each weak page is rendered again at ``retry_dpi`` and recognized with
+    ``retry_psm``; the retry replaces the original result in ``results``
+    only if its confidence is higher.
+
+    Args:
+        pdf_path: Path to the PDF file
+        results: Page results in page order (page N at index N-1);
+            updated in place
+        lang: Tesseract language string used for the first pass
+        quality_config: The 'ocr.default.quality' configuration section
+            ('min_confidence', 'retry_dpi', 'retry_psm')
+        rasterizer: Rasterizer backend
+        max_workers: Number of OCR worker processes
+        tesseract_backend: 'pytesseract' or 'tesserocr'
+        cancel: Optional event that stops the retries once set
+
+    Returns:
+        Page numbers that were retried
+    """
+    threshold = min_confidence(quality_config)
+    weak = [num for num, result in enumerate(results, 1) if is_weak(result, threshold)]
+    if not weak:
+        return []
+
+    dpi = int(quality_config.get('retry_dpi', DEFAULT_RETRY_DPI))
+    psm = int(quality_config.get('retry_psm', DEFAULT_RETRY_PSM))
+    logger.info("Retrying %d weak pages (confidence < %.0f) at DPI=%d, PSM=%d: %s",
+                len(weak), threshold, dpi, psm, weak)
+
+    backend = get_rasterizer(rasterizer)
+    engine = ParallelTesseractEngine(
+        lang=lang, config=f"{DEFAULT_TESSERACT_CONFIG} --psm {psm}",
+        max_workers=min(max_workers or os.cpu_count() or 1, len(weak)),
+        backend=tesseract_backend, cancel=cancel)
+    pages = ((num, backend.render_page(pdf_path, num, dpi=dpi)) for num in weak)
+
+    for num, retry in engine.ocr_stream_scored(pages):
+        original = results[num - 1]
+        if (retry.confidence or 0.0) > (original.confidence or 0.0):
+            logger.debug("Page %d improved from %.1f to %.1f",
+                         num, original.confidence, retry.confidence)
+            results[num - 1] = retry
+    return weak
+
+
+def escalate_weak_pages(
+        pdf_path: str,
+        results: List[PageResult],
+        quality_config: Dict[str, Any],
+        config: Dict[str, Any]) -> List[int]:
+    """
+    Send pages that are still weak to a cloud OCR provider.
+
+    Escalation respects the provider's circuit breaker; if the provider is
+    unavailable or fails, the Tesseract text is kept.
+
+    Args:
+        pdf_path: Path to the PDF file
+        results: Page results in page order; escalated pages are replaced
+            with the provider's text (confidence None)
+        quality_config: The 'ocr.default.quality' configuration section
+            ('min_confidence', 'escalate_to')
+        config: Application configuration, used to create the provider
+
+    Returns:
+        Page numbers that were escalated
+    """
+    provider_type = quality_config.get('escalate_to')
+    threshold = min_confidence(quality_config)
+    weak = [num for num, result in enumerate(results, 1) if is_weak(result, threshold)]
+    if not provider_type or not weak:
+        return []
+
+    try:
+        provider = OCRProviderFactory.get_provider_by_type(config, provider_type)
+    except Exception as e:
+        logger.warning("Cannot escalate weak pages to %s: %s", provider_type, e)
+        return []
+    if type(provider).ocr_pages is BaseOCRProvider.ocr_pages:
+        logger.warning("Cannot escalate weak pages: %s has no page-level OCR",
+                       provider.__class__.__name__)
+        return []
+
+    breaker_config = config.get('ocr', {}).get('circuit_breaker', {})
+    breaker = None
+    if breaker_config.get('enabled', True):
+        breaker = get_circuit_breaker(provider_type, breaker_config)
+        if not breaker.allow_request():
+            logger.warning("Circuit open for %s - keeping Tesseract text for pages %s",
+                           provider_type, weak)
+            return []
+
+    logger.info("Escalating %d weak pages to %s: %s", len(weak), provider_type, weak)
+    start_time = time.monotonic()
+    try:
+        texts = provider.ocr_pages(pdf_path, weak)
+    except Exception as e:
+        if breaker is not None:
+            breaker.record_failure()
+        logger.warning("Escalating weak pages to %s failed: %s", provider_type, e)
+        return []
+
+    if breaker is not None:
+        breaker.record_success(time.monotonic() - start_time)
+    for num, text in zip(weak, texts):
+        # End pages like Tesseract does, so pages stay separated when joined
+        results[num - 1] = PageResult(text.rstrip('\n') + '\n\f', None, 0)
+    return weak
+
+
+def build_report(
+        document: str,
+        results: Sequence[PageResult],
+        retried: Sequence[int],
+        escalated: Sequence[int],
+        threshold: float) -> QualityReport:
+    """
+    Summarize the quality of a document's OCR.
+
+    Args:
+        document: Path or name of the document
+        results: Tesseract page results after retries, before escalation
+        retried: Pages that were OCR'd again
+        escalated: Pages that were sent to a cloud provider
+        threshold: Minimum acceptable page confidence
+
+    Returns:
+        QualityReport with the word-weighted document confidence
+    """
+    pages = []
+    for num, result in enumerate(results, 1):
+        if num in escalated:
+            action = ESCALATED
+        elif is_weak(result, threshold):
+            action = WEAK
+        elif num in retried:
+            action = RETRIED
+        else:
+            action = ACCEPTED
+        pages.append(PageQuality(
+            page=num,
+            confidence=_round(result.confidence),
+            words=result.words,
+            action=action))
+
+    return QualityReport(
+        document=os.path.basename(document),
+        min_confidence=threshold,
+        confidence=_round(document_confidence(results)),
+        pages=pages)
+
+
+def _round(confidence: Optional[float]) -> Optional[float]:
+    """Round a confidence for reporting."""
+    return round(confidence, 2) if confidence is not None else None
+
+
+def record_report(report: QualityReport, log_path: str = DEFAULT_QUALITY_LOG) -> None:
+    """
+    Log a quality report and append it to the quality log.
+
+    Logging failures are reported and never raised.
+
+    Args:
+        report: Report from build_report()
+        log_path: JSONL file the report is appended to
+    """
+    logger.info(
+        "QUALITY | document=%s | confidence=%s | pages=%d | weak=%s | "
+        "retried=%s | escalated=%s",
+        report.document,
+        f"{report.confidence:.1f}" if report.confidence is not None else 'n/a',
+        len(report.pages), report.pages_with(WEAK),
+        report.pages_with(RETRIED), report.pages_with(ESCALATED))
+    try:
+        directory = os.path.dirname(log_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        line = json.dumps(asdict(report), ensure_ascii=False)
+        with _log_lock, open(log_path, 'a', encoding='utf-8') as f:
+            f.write(line + '\n')
+    except OSError as e:
+        logger.warning("Failed to record OCR quality: %s", e)
@@ -0,0 +1,164 @@
+"""
+OCR Provider Statistics
+
+Rolling per-provider latency and error statistics, collected from every
+OCR call in the process. Used to derive hedging deadlines from latency
+percentiles and reported for monitoring.
+"""
+
+import math
+import logging
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+logger = logging.getLogger('EmailReader.OCR.Stats')
+
+# Calls kept in the rolling window
+DEFAULT_WINDOW = 200
+
+
+class ProviderStats:
+    """
+    Thread-safe rolling window of one provider's call outcomes.
+
+    Latency percentiles are computed over successful calls only; the
+    error rate over all calls in the window.
+    """
+
+    def __init__(self, name: str, window: int = DEFAULT_WINDOW):
+        """
+        Args:
+            name: Provider name
+            window: Number of recent calls kept
+        """
+        self.name = name
+        self._lock = threading.Lock()
+        self._latencies: Deque[float] = deque(maxlen=window)
+        self._outcomes: Deque[bool] = deque(maxlen=window)
+
+        self.calls = 0
+        self.failures = 0
+        self.hedges_fired = 0
+        self.hedges_won = 0
+
+    def record(self, duration: float, success: bool) -> None:
+        """
+        Record a completed call.
+
+        Args:
+            duration: Call duration in seconds
+            success: Whether the call succeeded
+        """
+        with self._lock:
+            self.calls += 1
+            self._outcomes.append(success)
+            if success:
+                self._latencies.append(duration)
+            else:
+                self.failures += 1
+
+    def record_hedge(self, won: bool) -> None:
+        """
+        Record a hedge fired against this provider.
+
+        Args:
+            won: True if the hedged request finished first
+        """
+        with self._lock:
+            self.hedges_fired += 1
+            self.hedges_won += won
+
+    @property
+    def sample_count(self) -> int:
+        """Number of successful calls in the window."""
+        with self._lock:
+            return len(self._latencies)
+
+    def percentile(self, p: float) -> Optional[float]:
+        """
+        Latency percentile of successful calls (nearest rank).
+
+        Args:
+            p: Percentile between 0 and 100
+
+        Returns:
+            Latency in seconds, or None without samples
+        """
+        with self._lock:
+            latencies = sorted(self._latencies)
+        if not latencies:
+            return None
+        rank = max(1, math.ceil(p / 100 * len(latencies)))
+        return latencies[min(rank, len(latencies)) - 1]
+
+    def error_rate(self) -> float:
+        """Fraction of failed calls in the window."""
+        with self._lock:
+            if not self._outcomes:
+                return 0.0
+            return self._outcomes.count(False) / len(self._outcomes)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Current statistics.
+
+        Returns:
+            Dictionary of counters, error rate and latency percentiles
+        """
+        p50, p95 = self.percentile(50), self.percentile(95)
+        with self._lock:
+            counters = {
+                'calls': self.calls,
+                'failures': self.failures,
+                'hedges_fired': self.hedges_fired,
+                'hedges_won': self.hedges_won,
+                'samples': len(self._latencies),
+            }
+        return {
+            'provider': self.name,
+            **counters,
+            'error_rate': round(self.error_rate(), 4),
+            'p50_seconds': round(p50, 3) if p50 is not None else None,
+            'p95_seconds': round(p95, 3) if p95 is not None else None,
+        }
+
+
+_stats: Dict[str, ProviderStats] = {}
+_stats_lock = threading.Lock()
+
+
+def get_provider_stats(name: str) -> ProviderStats:
+    """
+    Get the shared statistics for a provider, creating them on first use.
+
+    Args:
+        name: Provider name (e.g. 'azure')
+
+    Returns:
+        ProviderStats instance
+    """
+    with _stats_lock:
+        stats = _stats.get(name)
+        if stats is None:
+            stats = ProviderStats(name)
+            _stats[name] = stats
+        return stats
+
+
+def get_all_provider_stats() -> Dict[str, Dict[str, Any]]:
+    """
+    Statistics of every provider seen so far.
+
+    Returns:
+        Mapping of provider name to its snapshot
+    """
+    with _stats_lock:
+        stats = list(_stats.values())
+    return {s.name: s.snapshot() for s in stats}
+
+
+def reset_provider_stats() -> None:
+    """Discard all collected statistics."""
+    with _stats_lock:
+        _stats.clear()
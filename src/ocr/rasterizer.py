@@ -0,0 +1,269 @@
+"""
+PDF Rasterizers
+
+Pluggable backends that render PDF pages to 8-bit grayscale buffers one
+page at a time. Pages are produced lazily, so OCR can start on the first
+page while later pages are still unrendered and peak memory does not grow
+with document length.
+
+Backends:
+    - pdfium: pypdfium2, renders in-process (default)
+    - pymupdf: PyMuPDF, renders in-process
+    - poppler: pdf2image, shells out to poppler's pdftoppm
+"""
+
+import logging
+from abc import ABC, abstractmethod
+from typing import Dict, Iterator, NamedTuple, Optional, Type
+
+from PIL import Image
+from pdf2image import convert_from_path, pdfinfo_from_path  # type: ignore
+
+logger = logging.getLogger('EmailReader.OCR.Rasterizer')
+
+DEFAULT_RASTERIZER = 'pdfium'
+
+
+class PageImage(NamedTuple):
+    """A rendered page as a raw 8-bit grayscale buffer (row-major, no padding)."""
+    page_number: int
+    width: int
+    height: int
+    data: bytes
+
+    def to_pil(self) -> Image.Image:
+        """Wrap the buffer in a PIL image without copying or decoding."""
+        return Image.frombuffer('L', (self.width, self.height), self.data,
+                                'raw', 'L', 0, 1)
+
+
+def _pack_rows(buffer, width: int, height: int, stride: int) -> bytes:
+    """Copy a strided grayscale buffer into tightly packed rows."""
+    view = memoryview(buffer)
+    if stride == width:
+        return bytes(view[:width * height])
+    return b''.join(view[row * stride:row * stride + width]
+                    for row in range(height))
+
+
+class PdfRasterizer(ABC):
+    """Abstract base class for PDF rasterizer backends."""
+
+    name: str = ''
+
+    @abstractmethod
+    def iter_pages(
+            self,
+            pdf_path: str,
+            dpi: int = 300,
+            page_count: Optional[int] = None) -> Iterator[PageImage]:
+        """
+        Lazily render PDF pages to grayscale buffers in page order.
+
+        Args:
+            pdf_path: Path to PDF file
+            dpi: Rendering resolution
+            page_count: Number of pages, if already known
+
+        Yields:
+            PageImage for each page
+        """
+
+    def render_page(self, pdf_path: str, page_number: int, dpi: int = 300) -> PageImage:
+        """
+        Render a single page, e.g. again at a higher resolution.
+
+        Backends override this to avoid rendering the preceding pages.
+
+        Args:
+            pdf_path: Path to PDF file
+            page_number: 1-based page number
+            dpi: Rendering resolution
+
+        Returns:
+            Rendered page
+
+        Raises:
+            IndexError: If the page does not exist
+        """
+        for page in self.iter_pages(pdf_path, dpi=dpi):
+            if page.page_number == page_number:
+                return page
+        raise IndexError(f"Page {page_number} not found in {pdf_path}")
+
+
+class PdfiumRasterizer(PdfRasterizer):
+    """In-process rendering with pypdfium2 (PDFium)."""
+
+    name = 'pdfium'
+
+    def iter_pages(self, pdf_path, dpi=300, page_count=None):
+        import pypdfium2 as pdfium
+
+        pdf = pdfium.PdfDocument(pdf_path)
+        try:
+            total = len(pdf)
+            logger.info("Rendering %d pages with pdfium at DPI=%d", total, dpi)
+            for index in range(total):
+                image = self._render(pdf, index, dpi)
+                logger.debug("Rendered page %d (%dx%d)",
+                             image.page_number, image.width, image.height)
+                yield image
+        finally:
+            pdf.close()
+
+    def render_page(self, pdf_path, page_number, dpi=300):
+        import pypdfium2 as pdfium
+
+        pdf = pdfium.PdfDocument(pdf_path)
+        try:
+            if not 1 <= page_number <= len(pdf):
+                raise IndexError(f"Page {page_number} not found in {pdf_path}")
+            return self._render(pdf, page_number - 1, dpi)
+        finally:
+            pdf.close()
+
+    @staticmethod
+    def _render(pdf, index: int, dpi: int) -> PageImage:
+        """Render one page of an open PdfDocument."""
+        page = pdf[index]
+        try:
+            bitmap = page.render(scale=dpi / 72, grayscale=True)
+            data = _pack_rows(bitmap.buffer, bitmap.width,
+                              bitmap.height, bitmap.stride)
+            image = PageImage(index + 1, bitmap.width, bitmap.height, data)
+            bitmap.close()
+        finally:
+            page.close()
+        return image
+
+
+class PyMuPDFRasterizer(PdfRasterizer):
+    """In-process rendering with PyMuPDF (MuPDF)."""
+
+    name = 'pymupdf'
+
+    def iter_pages(self, pdf_path, dpi=300, page_count=None):
+        pymupdf = _import_pymupdf()
+
+        with pymupdf.open(pdf_path) as doc:
+            logger.info("Rendering %d pages with PyMuPDF at DPI=%d",
+                        doc.page_count, dpi)
+            for index, page in enumerate(doc, 1):
+                image = self._render(pymupdf, page, index, dpi)
+                logger.debug("Rendered page %d (%dx%d)", index, image.width, image.height)
+                yield image
+
+    def render_page(self, pdf_path, page_number, dpi=300):
+        pymupdf = _import_pymupdf()
+
+        with pymupdf.open(pdf_path) as doc:
+            if not 1 <= page_number <= doc.page_count:
+                raise IndexError(f"Page {page_number} not found in {pdf_path}")
+            return self._render(pymupdf, doc[page_number - 1], page_number, dpi)
+
+    @staticmethod
+    def _render(pymupdf, page, page_number: int, dpi: int) -> PageImage:
+        """Render one PyMuPDF page."""
+        pix = page.get_pixmap(dpi=dpi, colorspace=pymupdf.csGRAY, alpha=False)
+        data = _pack_rows(pix.samples_mv, pix.width, pix.height, pix.stride)
+        return PageImage(page_number, pix.width, pix.height, data)
+
+
+def _import_pymupdf():
+    """Import PyMuPDF under its current or legacy module name."""
+    try:
+        import pymupdf
+    except ImportError:  # PyMuPDF < 1.24.3
+        import fitz as pymupdf
+    return pymupdf
+
+
+class PopplerRasterizer(PdfRasterizer):
+    """Rendering through poppler's pdftoppm via pdf2image."""
+
+    name = 'poppler'
+
+    def __init__(self, window: int = 1):
+        """
+        Args:
+            window: Number of pages rendered per pdftoppm call
+        """
+        self.window = max(1, window)
+
+    def iter_pages(self, pdf_path, dpi=300, page_count=None):
+        if page_count is None:
+            page_count = get_pdf_page_count(pdf_path)
+
+        logger.info("Rendering %d pages with poppler at DPI=%d (window=%d)",
+                    page_count, dpi, self.window)
+
+        for first_page in range(1, page_count + 1, self.window):
+            last_page = min(first_page + self.window - 1, page_count)
+            logger.debug("Rendering pages %d-%d", first_page, last_page)
+
+            images = convert_from_path(
+                pdf_path=pdf_path,
+                dpi=dpi,
+                grayscale=True,
+                first_page=first_page,
+                last_page=last_page,)
+
+            for page_num, image in enumerate(images, first_page):
+                image = image.convert('L')
+                yield PageImage(page_num, image.width, image.height, image.tobytes())
+
+    def render_page(self, pdf_path, page_number, dpi=300):
+        images = convert_from_path(
+            pdf_path=pdf_path,
+            dpi=dpi,
+            grayscale=True,
+            first_page=page_number,
+            last_page=page_number,)
+        if not images:
+            raise IndexError(f"Page {page_number} not found in {pdf_path}")
+        image = images[0].convert('L')
+        return PageImage(page_number, image.width, image.height, image.tobytes())
+
+
+RASTERIZER_BACKENDS: Dict[str, Type[PdfRasterizer]] = {
+    PdfiumRasterizer.name: PdfiumRasterizer,
+    PyMuPDFRasterizer.name: PyMuPDFRasterizer,
+    PopplerRasterizer.name: PopplerRasterizer,
+}
+
+
+def get_rasterizer(name: Optional[str] = None) -> PdfRasterizer:
+    """
+    Create a rasterizer backend by name.
+
+    Args:
+        name: 'pdfium', 'pymupdf' or 'poppler' (default: pdfium)
+
+    Returns:
+        PdfRasterizer instance
+
+    Raises:
+        ValueError: If the backend name is unknown
+    """
+    name = (name or DEFAULT_RASTERIZER).lower()
+    if name not in RASTERIZER_BACKENDS:
+        raise ValueError(
+            f"Invalid rasterizer: {name}. "
+            f"Valid rasterizers: {set(RASTERIZER_BACKENDS)}"
+        )
+    return RASTERIZER_BACKENDS[name]()
+
+
+def get_pdf_page_count(pdf_path: str) -> int:
+    """
+    Get the number of pages in a PDF using poppler's pdfinfo.
+
+    Args:
+        pdf_path: Path to PDF file
+
+    Returns:
+        Number of pages
+    """
+    info = pdfinfo_from_path(pdf_path)
+    return int(info['Pages'])
@@ -0,0 +1,276 @@
+"""
+OCR Routing Policy
+
+Chooses the OCR provider for each document instead of a fixed mapping
+from translation mode. Each mode has an ordered list of acceptable
+providers; the first one that passes all constraints is used:
+
+    - the provider is configured and its circuit is not open
+    - file size and page count are within the provider's limits
+    - the estimated cost (pages the provider bills for times its
+      per-page price) is within the per-document budget
+    - its recent error rate and p95 latency are within bounds
+
+Every decision, with the document features, rejected candidates and the
+final outcome, is appended to a JSONL log so the policy can be tuned
+from real traffic.
+"""
+
+import os
+import json
+import logging
+import threading
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from src.document_analyzer import PdfAnalysis
+from src.ocr.circuit_breaker import OPEN, get_circuit_metrics
+from src.ocr.ocr_factory import OCRProviderFactory
+from src.ocr.provider_stats import get_provider_stats
+
+logger = logging.getLogger('EmailReader.OCR.Routing')
+
+# Providers acceptable for each translation mode, in order of preference
+DEFAULT_MODE_PROVIDERS: Dict[str, List[str]] = {
+    'human': ['azure', 'landing_ai'],
+    'formats': ['landing_ai', 'azure'],
+    'default': ['default'],
+}
+
+# Providers that bill for every page rather than only the scanned ones
+WHOLE_DOCUMENT_PROVIDERS = {'landing_ai'}
+
+DEFAULT_DECISION_LOG = os.path.join('logs', 'ocr_routing.jsonl')
+DEFAULT_MAX_ERROR_RATE = 0.5
+DEFAULT_MIN_SAMPLES = 5
+
+_log_lock = threading.Lock()
+
+
+@dataclass
+class RoutingDecision:
+    """A provider choice for one document and the data it was based on."""
+    document: str
+    translation_mode: str
+    provider: str
+    reason: str
+    features: Dict[str, Any] = field(default_factory=dict)
+    rejected: Dict[str, str] = field(default_factory=dict)
+    stats: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    timestamp: str = field(
+        default_factory=lambda: datetime.now().isoformat(timespec='seconds'))
+
+
+class RoutingPolicy:
+    """
+    Per-document OCR provider selection.
+    """
+
+    def __init__(self, config: Dict[str, Any]):
+        """
+        Initialize the policy.
+
+        Args:
+            config: Application configuration dictionary; the policy reads
+                'ocr.routing' with optional 'modes' (mode to ordered
+                provider list), 'cost_per_page', 'max_cost_per_document',
+                'max_file_size_mb' and 'max_pages' (per provider),
+                'max_error_rate', 'max_p95_seconds', 'min_samples' and
+                'decision_log'
+        """
+        self.config = config
+        routing = config.get('ocr', {}).get('routing', {})
+        self.mode_providers = {**DEFAULT_MODE_PROVIDERS, **routing.get('modes', {})}
+        self.cost_per_page: Dict[str, float] = routing.get('cost_per_page', {})
+        self.max_cost = routing.get('max_cost_per_document')
+        self.max_file_size_mb: Dict[str, float] = routing.get('max_file_size_mb', {})
+        self.max_pages: Dict[str, int] = routing.get('max_pages', {})
+        self.max_error_rate = float(routing.get('max_error_rate', DEFAULT_MAX_ERROR_RATE))
+        self.max_p95 = routing.get('max_p95_seconds')
+        self.min_samples = int(routing.get('min_samples', DEFAULT_MIN_SAMPLES))
+        self.decision_log = routing.get('decision_log', DEFAULT_DECISION_LOG)
+
+    def decide(
+            self,
+            translation_mode: str,
+            input_file: str,
+            analysis: Optional[PdfAnalysis] = None) -> RoutingDecision:
+        """
+        Choose the OCR provider for a document.
+
+        Args:
+            translation_mode: Translation mode from file metadata
+            input_file: Path to the document
+            analysis: Optional precomputed PdfAnalysis for PDFs
+
+        Returns:
+            RoutingDecision; when no candidate passes, the mode's first
+            provider is used and the fallback chain handles failures
+        """
+        candidates = self.mode_providers.get(
+            translation_mode,
+            [OCRProviderFactory.provider_type_for_mode(translation_mode)])
+        features = document_features(input_file, analysis)
+        circuits = get_circuit_metrics()
+
+        rejected: Dict[str, str] = {}
+        stats: Dict[str, Dict[str, Any]] = {}
+        provider, reason = None, ''
+
+        for candidate in candidates:
+            stats[candidate] = get_provider_stats(candidate).snapshot()
+            rejection = self._check(candidate, features, stats[candidate],
+                                    circuits.get(candidate, {}))
+            if rejection:
+                rejected[candidate] = rejection
+                continue
+            provider = candidate
+            reason = 'preferred' if not rejected else 'constraints'
+            break
+
+        if provider is None:
+            provider = candidates[0]
+            reason = 'no candidate met constraints'
+
+        decision = RoutingDecision(
+            document=os.path.basename(input_file),
+            translation_mode=translation_mode,
+            provider=provider,
+            reason=reason,
+            features=features,
+            rejected=rejected,
+            stats=stats)
+
+        logger.info("Routing %s (mode=%s) to %s: %s%s",
+                    decision.document, translation_mode, provider, reason,
+                    f" (rejected: {rejected})" if rejected else '')
+        return decision
+
+    def _check(
+            self,
+            provider: str,
+            features: Dict[str, Any],
+            stats: Dict[str, Any],
+            circuit: Dict[str, Any]) -> Optional[str]:
+        """
+        Check one candidate against the constraints.
+
+        Returns:
+            Reason the candidate is rejected, or None if it is acceptable
+        """
+        if not OCRProviderFactory.is_configured(self.config, provider):
+            return 'not configured'
+
+        if circuit.get('state') == OPEN:
+            return 'circuit open'
+
+        max_size = self.max_file_size_mb.get(provider)
+        if max_size is not None and features['file_size_mb'] > max_size:
+            return f"file size {features['file_size_mb']} MB > {max_size} MB"
+
+        max_pages = self.max_pages.get(provider)
+        page_count = features.get('page_count')
+        if max_pages is not None and page_count is not None and page_count > max_pages:
+            return f"{page_count} pages > {max_pages}"
+
+        cost = self.estimate_cost(provider, features)
+        if self.max_cost is not None and cost > self.max_cost:
+            return f"estimated cost {cost:.2f} > {self.max_cost}"
+
+        if stats['samples'] + stats['failures'] >= self.min_samples:
+            if stats['error_rate'] > self.max_error_rate:
+                return f"error rate {stats['error_rate']:.0%}"
+            if (self.max_p95 is not None and stats['p95_seconds'] is not None
+                    and stats['p95_seconds'] > self.max_p95):
+                return f"p95 latency {stats['p95_seconds']}s"
+
+        return None
+
+    def estimate_cost(self, provider: str, features: Dict[str, Any]) -> float:
+        """
+        Estimate what OCR of a document costs with a provider.
+
+        Args:
+            provider: Provider type
+            features: Output of document_features()
+
+        Returns:
+            Estimated cost in the unit of 'cost_per_page'
+        """
+        price = float(self.cost_per_page.get(provider, 0.0))
+        if provider in WHOLE_DOCUMENT_PROVIDERS:
+            pages = features.get('page_count') or 1
+        else:
+            pages = features.get('scanned_pages') or 1
+        return pages * price
+
+    def record(
+            self,
+            decision: RoutingDecision,
+            provider_used: Optional[str],
+            duration: float,
+            error: Optional[BaseException] = None) -> None:
+        """
+        Append a decision and its outcome to the decision log.
+
+        Logging failures are reported and never raised.
+
+        Args:
+            decision: Decision returned by decide()
+            provider_used: Provider that produced the output, or None if
+                all providers failed
+            duration: Total OCR time in seconds, including fallbacks
+            error: Error raised when all providers failed
+        """
+        entry = {
+            **asdict(decision),
+            'outcome': {
+                'provider_used': provider_used,
+                'fallback_used': provider_used not in (None, decision.provider),
+                'success': provider_used is not None,
+                'duration_seconds': round(duration, 3),
+                'error': str(error) if error else None,
+            },
+        }
+        try:
+            directory = os.path.dirname(self.decision_log)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            line = json.dumps(entry, ensure_ascii=False, default=str)
+            with _log_lock, open(self.decision_log, 'a', encoding='utf-8') as f:
+                f.write(line + '\n')
+        except OSError as e:
+            logger.warning("Failed to record routing decision: %s", e)
+
+
+def document_features(
+        input_file: str,
+        analysis: Optional[PdfAnalysis] = None) -> Dict[str, Any]:
+    """
+    Collect the document properties routing decisions are based on.
+
+    Args:
+        input_file: Path to the document
+        analysis: Optional precomputed PdfAnalysis for PDFs
+
+    Returns:
+        Dictionary with 'file_size_mb', 'page_count', 'scanned_pages' and
+        'searchable_ratio' (page values are None for non-PDF inputs)
+    """
+    try:
+        size = os.path.getsize(input_file)
+    except OSError:
+        size = 0
+
+    features: Dict[str, Any] = {
+        'file_size_mb': round(size / (1024 * 1024), 3),
+        'page_count': None,
+        'scanned_pages': None,
+        'searchable_ratio': None,
+    }
+    if analysis is not None and analysis.is_valid:
+        features['page_count'] = analysis.page_count
+        features['scanned_pages'] = analysis.searchable_pages.count(False)
+        features['searchable_ratio'] = round(analysis.searchable_ratio, 3)
+    return features
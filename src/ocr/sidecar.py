@@ -0,0 +1,273 @@
+"""
+OCR Sidecars
+
+Raw OCR provider output (LandingAI chunks with grounding, Azure page lines
+with their polygons) saved next to the processing results as compressed
+JSON "sidecars". A sidecar holds everything a provider needs to build its
+DOCX again, so layout reconstruction and DOCX formatting can be re-run
+offline with rebuild_docx() - no API calls, no credentials - while tuning
+thresholds or formatting.
+
+Unlike the OCR cache, sidecars are never evicted and hold the provider's
+raw response rather than its final text. Output parsed incrementally can
+be saved the same way, one item at a time (SidecarStore.open()).
+"""
+
+import os
+import gzip
+import json
+import logging
+import importlib
+import threading
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+from src.ocr.ocr_cache import hash_file
+
+logger = logging.getLogger('EmailReader.OCR.Sidecar')
+
+DEFAULT_SIDECAR_DIR = os.path.join('data', 'ocr_sidecars')
+SIDECAR_SUFFIX = '.json.gz'
+SIDECAR_VERSION = 1
+
+# Providers whose output can be rebuilt from a sidecar, by class name
+SIDECAR_PROVIDERS = {
+    'AzureOCRProvider': 'src.ocr.azure_provider',
+    'AsyncAzureOCRProvider': 'src.ocr.azure_async_provider',
+    'LandingAIOCRProvider': 'src.ocr.landing_ai_provider',
+}
+
+
+class SidecarStore:
+    """
+    Directory of gzip-compressed JSON sidecars, one per document and
+    provider.
+
+    Sidecars are named after the input file, the provider and the start of
+    the file's SHA-256, so documents with the same name don't collide and
+    processing a document again replaces its sidecar.
+    """
+
+    def __init__(self, directory: str = DEFAULT_SIDECAR_DIR):
+        """
+        Initialize the store.
+
+        Args:
+            directory: Directory holding sidecars
+        """
+        self.directory = directory
+        os.makedirs(self.directory, exist_ok=True)
+        logger.debug("SidecarStore: dir=%s", directory)
+
+    @classmethod
+    def from_config(cls, sidecar_config: Dict[str, Any]) -> Optional['SidecarStore']:
+        """
+        Create a store from the 'ocr.sidecars' configuration section.
+
+        Args:
+            sidecar_config: Dictionary with 'enabled' and 'directory'
+
+        Returns:
+            SidecarStore instance, or None if sidecars are disabled
+        """
+        if not sidecar_config.get('enabled', False):
+            return None
+        return cls(sidecar_config.get('directory', DEFAULT_SIDECAR_DIR))
+
+    def save(
+            self,
+            input_path: str,
+            provider: str,
+            settings: Dict[str, Any],
+            payload: Dict[str, Any]) -> str:
+        """
+        Save a provider's raw output for a document.
+
+        Args:
+            input_path: Path to the processed input file
+            provider: Provider class name
+            settings: Provider settings that affected the output
+            payload: JSON-serializable raw output, e.g. {'chunks': [...]}
+
+        Returns:
+            Path of the sidecar
+        """
+        path, record = self._prepare(input_path, provider, settings)
+        record.update(payload)
+        # Unique per thread, so concurrent saves of a document never share it
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with gzip.open(temp_path, 'wt', encoding='utf-8', compresslevel=6) as f:
+                json.dump(record, f, ensure_ascii=False, default=str)
+            # Atomic so a reprocess run never reads a partial sidecar
+            os.replace(temp_path, path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+        logger.info("Saved %s sidecar: %s (%.2f KB)", provider,
+                    os.path.basename(path), os.path.getsize(path) / 1024)
+        return path
+
+    def open(
+            self,
+            input_path: str,
+            provider: str,
+            settings: Dict[str, Any],
+            items_key: str,
+            **fields: Any) -> 'SidecarWriter':
+        """
+        Start a sidecar whose main list is saved one item at a time.
+
+        Args:
+            input_path: Path to the processed input file
+            provider: Provider class name
+            settings: Provider settings that affected the output
+            items_key: Record key of the list, e.g. 'chunks'
+            **fields: Other JSON-serializable record fields
+
+        Returns:
+            SidecarWriter; the sidecar appears on commit()
+        """
+        path, record = self._prepare(input_path, provider, settings)
+        record.update(fields)
+        return SidecarWriter(path, record, items_key)
+
+    def _prepare(
+            self,
+            input_path: str,
+            provider: str,
+            settings: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+        """Path and common record fields of a document's sidecar."""
+        file_hash = hash_file(input_path)
+        stem = os.path.splitext(os.path.basename(input_path))[0]
+        path = os.path.join(
+            self.directory, f"{stem}.{provider}.{file_hash[:12]}{SIDECAR_SUFFIX}")
+        record = {
+            'version': SIDECAR_VERSION,
+            'provider': provider,
+            'document': os.path.basename(input_path),
+            'sha256': file_hash,
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'settings': settings,
+        }
+        return path, record
+
+
+class SidecarWriter:
+    """
+    Write a sidecar whose main list (e.g. LandingAI chunks) arrives one
+    item at a time.
+
+    Items are compressed into a temporary file as they are added; commit()
+    completes the record and moves it into place, discard() drops it.
+    """
+
+    def __init__(self, path: str, record: Dict[str, Any], items_key: str):
+        """
+        Start the sidecar.
+
+        Args:
+            path: Path of the finished sidecar
+            record: Record fields written before the list
+            items_key: Record key of the list
+        """
+        self.path = path
+        self.items = 0
+        self._temp_path = f"{path}.{os.getpid()}.{id(self)}.tmp"
+        header = json.dumps(record, ensure_ascii=False, default=str)
+        self._file = gzip.open(self._temp_path, 'wt', encoding='utf-8', compresslevel=6)
+        self._file.write(f'{header[:-1]}, {json.dumps(items_key)}: [')
+
+    def add(self, item: Any) -> None:
+        """
+        Append an item to the list.
+
+        Raises:
+            ValueError: If the sidecar is already committed or discarded
+        """
+        if self._file is None:
+            raise ValueError("SidecarWriter is closed")
+        if self.items:
+            self._file.write(', ')
+        json.dump(item, self._file, ensure_ascii=False, default=str)
+        self.items += 1
+
+    def commit(self) -> str:
+        """
+        Complete the sidecar.
+
+        Returns:
+            Path of the sidecar
+        """
+        try:
+            self._file.write(']}')
+            self._file.close()
+            self._file = None
+            # Atomic so a reprocess run never reads a partial sidecar
+            os.replace(self._temp_path, self.path)
+        except Exception:
+            self.discard()
+            raise
+        logger.info("Saved sidecar: %s (%d items, %.2f KB)", os.path.basename(self.path),
+                    self.items, os.path.getsize(self.path) / 1024)
+        return self.path
+
+    def discard(self) -> None:
+        """Drop the sidecar."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if os.path.exists(self._temp_path):
+            os.remove(self._temp_path)
+
+
+def load_sidecar(sidecar_path: str) -> Dict[str, Any]:
+    """
+    Read a sidecar.
+
+    Args:
+        sidecar_path: Path to a sidecar file
+
+    Returns:
+        The sidecar record
+
+    Raises:
+        ValueError: If the file is not a sidecar this version can read
+    """
+    with gzip.open(sidecar_path, 'rt', encoding='utf-8') as f:
+        record = json.load(f)
+    if record.get('version') != SIDECAR_VERSION or 'provider' not in record:
+        raise ValueError(f"Not a version {SIDECAR_VERSION} OCR sidecar: {sidecar_path}")
+    return record
+
+
+def rebuild_docx(sidecar_path: str, output_path: str) -> Dict[str, Any]:
+    """
+    Build a document's DOCX again from its sidecar, without calling the
+    OCR provider.
+
+    The provider's current layout reconstruction and DOCX formatting code
+    is used, so changes to either show up in the rebuilt document.
+
+    Args:
+        sidecar_path: Path to a sidecar file
+        output_path: Path to save the DOCX file
+
+    Returns:
+        The sidecar record
+
+    Raises:
+        ValueError: If the sidecar's provider doesn't support rebuilding
+    """
+    record = load_sidecar(sidecar_path)
+    provider = record['provider']
+    if provider not in SIDECAR_PROVIDERS:
+        raise ValueError(f"Cannot rebuild output of {provider} from a sidecar")
+
+    provider_class = getattr(importlib.import_module(SIDECAR_PROVIDERS[provider]), provider)
+    logger.info("Rebuilding %s from %s sidecar %s", os.path.basename(output_path),
+                provider, os.path.basename(sidecar_path))
+    provider_class.rebuild_from_sidecar(record, output_path)
+    return record
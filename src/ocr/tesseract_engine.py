@@ -0,0 +1,558 @@
+"""
+Parallel Tesseract OCR Engine
+
+Fans page images out to a process pool sized to the machine and
+reassembles the recognized text in page order.
+
+Backends:
+    - pytesseract: runs the tesseract CLI once per page, which loads the
+      language models again for every page (default)
+    - tesserocr: keeps one Tesseract API per worker process with the
+      models loaded once; worker pools are kept alive across documents
+      and pages are passed to them in memory
+
+ocr_stream_scored() also returns each page's mean word confidence, for
+finding pages that were recognized poorly (see page_quality).
+"""
+
+import os
+import atexit
+import shlex
+import logging
+import threading
+import importlib.util
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import (Any, Callable, Deque, Dict, Iterable, Iterator, List,
+                    NamedTuple, Optional, Tuple, Union)
+
+import pytesseract
+
+from src.ocr.cancellation import raise_if_cancelled, wait_for
+from src.ocr.rasterizer import PageImage
+
+logger = logging.getLogger('EmailReader.OCR.Tesseract')
+
+# Languages and options used for every page unless configured otherwise
+DEFAULT_LANGUAGES = "eng+rus+aze+uzb+deu"
+DEFAULT_TESSERACT_CONFIG = '-c preserve_interword_spaces=1'
+
+TESSERACT_BACKENDS = ('pytesseract', 'tesserocr')
+DEFAULT_TESSERACT_BACKEND = 'pytesseract'
+
+# tesserocr (Tesseract C API binding) is optional. It is imported lazily in
+# the workers because OpenMP reads OMP_THREAD_LIMIT when the library loads
+TESSEROCR_AVAILABLE = importlib.util.find_spec('tesserocr') is not None
+
+# Resident worker pools kept between documents, one per language set
+MAX_RESIDENT_POOLS = 2
+
+# A page is either an image file path or a rendered grayscale buffer
+PageSource = Union[str, PageImage]
+
+# Optional step applied to rendered pages in the worker before OCR
+Preprocess = Callable[[PageImage], PageImage]
+
+
+class PageResult(NamedTuple):
+    """Recognized text of a page with Tesseract's word confidences."""
+    text: str
+    # Mean word confidence (0-100), None if no words were recognized
+    confidence: Optional[float]
+    words: int
+
+
+def _init_worker() -> None:
+    """
+    Initialize an OCR worker process.
+
+    Tesseract uses OpenMP internally; with one page per process the
+    internal threads only oversubscribe the CPU, so limit them to one.
+    """
+    os.environ['OMP_THREAD_LIMIT'] = '1'
+
+
+def _ocr_page(
+        page: PageSource,
+        lang: str,
+        config: str,
+        preprocess: Optional[Preprocess] = None) -> str:
+    """
+    Run Tesseract on a single page image.
+
+    Module-level so it can be pickled into worker processes.
+
+    Args:
+        page: Path to the page image, or a rendered grayscale buffer
+        lang: Tesseract language string (e.g. 'eng+rus')
+        config: Extra Tesseract command line options
+        preprocess: Optional step applied to rendered buffers first
+
+    Returns:
+        Recognized text
+    """
+    if isinstance(page, PageImage):
+        if preprocess is not None:
+            page = preprocess(page)
+        image = page.to_pil()
+        # Hand the buffer to Tesseract as raw PGM instead of encoding a PNG
+        image.format = 'PPM'
+        return pytesseract.image_to_string(image, config=config, lang=lang)
+    return pytesseract.image_to_string(page, config=config, lang=lang)
+
+
+def _ocr_page_scored(
+        page: PageSource,
+        lang: str,
+        config: str,
+        preprocess: Optional[Preprocess] = None) -> PageResult:
+    """
+    Run Tesseract on a single page, keeping per-word confidences.
+
+    Uses a single image_to_data() call and rebuilds the page text from
+    its words, so collecting confidences costs no second OCR pass.
+
+    Args:
+        page: Path to the page image, or a rendered grayscale buffer
+        lang: Tesseract language string (e.g. 'eng+rus')
+        config: Extra Tesseract command line options
+        preprocess: Optional step applied to rendered buffers first
+
+    Returns:
+        PageResult with the text and mean word confidence
+    """
+    if isinstance(page, PageImage):
+        if preprocess is not None:
+            page = preprocess(page)
+        image = page.to_pil()
+        image.format = 'PPM'
+    else:
+        image = page
+    data = pytesseract.image_to_data(image, config=config, lang=lang,
+                                     output_type=pytesseract.Output.DICT)
+    return page_result_from_data(data)
+
+
+def page_result_from_data(data: Dict[str, List[Any]]) -> PageResult:
+    """
+    Build a PageResult from Tesseract's word-level TSV output.
+
+    Words are joined with spaces and lines with newlines, with a blank
+    line between paragraphs and a form feed at the end of the page, like
+    Tesseract's plain text output.
+
+    Args:
+        data: image_to_data() output as a dictionary of columns
+
+    Returns:
+        PageResult; words with confidence -1 (layout rows) are skipped
+    """
+    paragraphs: List[List[str]] = []
+    lines: Dict[Tuple[int, int, int], List[str]] = {}
+    paragraph_keys: List[Tuple[int, int]] = []
+    confidences: List[float] = []
+
+    for index, word in enumerate(data.get('text', [])):
+        confidence = float(data['conf'][index])
+        if confidence < 0 or not str(word).strip():
+            continue
+        confidences.append(confidence)
+        block, par, line = (data['block_num'][index], data['par_num'][index],
+                            data['line_num'][index])
+        if (block, par) not in paragraph_keys:
+            paragraph_keys.append((block, par))
+        lines.setdefault((block, par, line), []).append(str(word))
+
+    for block, par in paragraph_keys:
+        paragraphs.append([' '.join(words) for (b, p, _), words in lines.items()
+                           if (b, p) == (block, par)])
+
+    text = '\n\n'.join('\n'.join(paragraph) for paragraph in paragraphs)
+    if text:
+        text += '\n\f'
+    confidence = sum(confidences) / len(confidences) if confidences else None
+    return PageResult(text, confidence, len(confidences))
+
+
+# Tesseract API of this process, loaded once and reused for every page.
+# The API is not thread-safe; the lock matters for in-process (serial) use
+_resident_api = None
+_resident_key: Optional[Tuple[str, str]] = None
+_resident_api_lock = threading.Lock()
+
+
+def _parse_tesseract_config(config: str) -> Tuple[Optional[int], Dict[str, str]]:
+    """
+    Split Tesseract command line options into a page segmentation mode
+    and '-c name=value' variables.
+
+    Args:
+        config: Options as passed to the tesseract CLI
+
+    Returns:
+        Tuple of (PSM or None, variables)
+    """
+    psm: Optional[int] = None
+    variables: Dict[str, str] = {}
+    args = shlex.split(config)
+    for index, arg in enumerate(args[:-1]):
+        value = args[index + 1]
+        if arg == '--psm':
+            psm = int(value)
+        elif arg == '-c' and '=' in value:
+            name, _, setting = value.partition('=')
+            variables[name] = setting
+    return psm, variables
+
+
+def _get_resident_api(lang: str, config: str):
+    """Return this process's Tesseract API, creating it on first use."""
+    global _resident_api, _resident_key
+
+    if _resident_api is not None and _resident_key == (lang, config):
+        return _resident_api
+
+    import tesserocr
+
+    if _resident_api is not None:
+        _resident_api.End()
+
+    psm, variables = _parse_tesseract_config(config)
+    api = tesserocr.PyTessBaseAPI(
+        lang=lang, psm=psm if psm is not None else tesserocr.PSM.AUTO)
+    for name, value in variables.items():
+        api.SetVariable(name, value)
+
+    _resident_api, _resident_key = api, (lang, config)
+    logger.debug("Loaded resident Tesseract API (lang=%s) in process %d",
+                 lang, os.getpid())
+    return api
+
+
+def _init_resident_worker(lang: str, config: str) -> None:
+    """
+    Initialize a resident OCR worker process.
+
+    Loads the language models before the first page arrives.
+    """
+    _init_worker()
+    with _resident_api_lock:
+        _get_resident_api(lang, config)
+
+
+def _ocr_page_resident(
+        page: PageSource,
+        lang: str,
+        config: str,
+        preprocess: Optional[Preprocess] = None) -> str:
+    """
+    Run Tesseract on a single page with the process's resident API.
+
+    Module-level so it can be pickled into worker processes.
+
+    Args:
+        page: Path to the page image, or a rendered grayscale buffer
+        lang: Tesseract language string (e.g. 'eng+rus')
+        config: Extra Tesseract command line options
+        preprocess: Optional step applied to rendered buffers first
+
+    Returns:
+        Recognized text
+    """
+    if isinstance(page, PageImage) and preprocess is not None:
+        page = preprocess(page)
+    with _resident_api_lock:
+        api = _get_resident_api(lang, config)
+        _set_resident_image(api, page)
+        return api.GetUTF8Text()
+
+
+def _ocr_page_resident_scored(
+        page: PageSource,
+        lang: str,
+        config: str,
+        preprocess: Optional[Preprocess] = None) -> PageResult:
+    """
+    Run Tesseract on a single page with the resident API, keeping
+    per-word confidences.
+
+    Module-level so it can be pickled into worker processes.
+
+    Returns:
+        PageResult with the text and mean word confidence
+    """
+    if isinstance(page, PageImage) and preprocess is not None:
+        page = preprocess(page)
+    with _resident_api_lock:
+        api = _get_resident_api(lang, config)
+        _set_resident_image(api, page)
+        text = api.GetUTF8Text()
+        confidences = api.AllWordConfidences()
+    confidence = sum(confidences) / len(confidences) if confidences else None
+    return PageResult(text, confidence, len(confidences))
+
+
+def _set_resident_image(api, page: PageSource) -> None:
+    """Hand a page to the resident API."""
+    if isinstance(page, PageImage):
+        api.SetImage(page.to_pil())
+    else:
+        api.SetImageFile(page)
+
+
+_resident_pools: "OrderedDict[Tuple[str, str, int], ProcessPoolExecutor]" = OrderedDict()
+_resident_pools_lock = threading.Lock()
+
+
+def _get_resident_pool(lang: str, config: str, max_workers: int) -> ProcessPoolExecutor:
+    """
+    Return a live worker pool for a language set, creating it on first use.
+
+    The least recently used pool is shut down when more than
+    MAX_RESIDENT_POOLS are alive.
+    """
+    key = (lang, config, max_workers)
+    with _resident_pools_lock:
+        pool = _resident_pools.get(key)
+        if pool is not None:
+            _resident_pools.move_to_end(key)
+            return pool
+
+        logger.info("Starting %d resident Tesseract workers (lang=%s)",
+                    max_workers, lang)
+        pool = ProcessPoolExecutor(max_workers=max_workers,
+                                   initializer=_init_resident_worker,
+                                   initargs=(lang, config))
+        _resident_pools[key] = pool
+
+        while len(_resident_pools) > MAX_RESIDENT_POOLS:
+            _, old_pool = _resident_pools.popitem(last=False)
+            old_pool.shutdown(wait=False)
+        return pool
+
+
+def _discard_resident_pool(lang: str, config: str, max_workers: int) -> None:
+    """Forget a broken worker pool so the next document starts a new one."""
+    with _resident_pools_lock:
+        pool = _resident_pools.pop((lang, config, max_workers), None)
+    if pool is not None:
+        pool.shutdown(wait=False)
+
+
+def shutdown_resident_pools() -> None:
+    """Stop all resident Tesseract workers."""
+    with _resident_pools_lock:
+        pools = list(_resident_pools.values())
+        _resident_pools.clear()
+    for pool in pools:
+        pool.shutdown(wait=True)
+
+
+atexit.register(shutdown_resident_pools)
+
+
+class ParallelTesseractEngine:
+    """
+    Tesseract OCR engine that processes pages in parallel.
+
+    Each page is recognized in its own worker process with Tesseract's
+    internal threading disabled, so N cores OCR N pages at once.
+    """
+
+    def __init__(
+            self,
+            lang: str = DEFAULT_LANGUAGES,
+            config: str = DEFAULT_TESSERACT_CONFIG,
+            max_workers: Optional[int] = None,
+            backend: Optional[str] = None,
+            preprocess: Optional[Preprocess] = None,
+            cancel: Optional[threading.Event] = None):
+        """
+        Initialize the engine.
+
+        Args:
+            lang: Tesseract language string
+            config: Extra Tesseract command line options
+            max_workers: Number of worker processes (default: CPU count)
+            backend: 'pytesseract' (default) or 'tesserocr'; tesserocr
+                falls back to pytesseract when it is not installed
+            preprocess: Optional picklable callable applied to each
+                rendered page in the worker before OCR (e.g. a
+                PagePreprocessor); image file paths are OCR'd as they are
+            cancel: Optional event that stops OCR once set: no further
+                pages are submitted, queued pages are dropped and
+                OCRCancelledError is raised
+
+        Raises:
+            ValueError: If the backend name is unknown
+        """
+        backend = (backend or DEFAULT_TESSERACT_BACKEND).lower()
+        if backend not in TESSERACT_BACKENDS:
+            raise ValueError(
+                f"Invalid Tesseract backend: {backend}. "
+                f"Valid backends: {set(TESSERACT_BACKENDS)}"
+            )
+        if backend == 'tesserocr' and not TESSEROCR_AVAILABLE:
+            logger.warning("tesserocr is not installed - using pytesseract")
+            backend = 'pytesseract'
+
+        self.lang = lang
+        self.config = config
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.backend = backend
+        self.preprocess = preprocess
+        self.cancel = cancel
+        self._ocr_page: Callable[..., str] = (
+            _ocr_page_resident if backend == 'tesserocr' else _ocr_page)
+        self._ocr_page_scored: Callable[..., PageResult] = (
+            _ocr_page_resident_scored if backend == 'tesserocr' else _ocr_page_scored)
+        logger.debug("ParallelTesseractEngine: lang=%s, max_workers=%d, backend=%s",
+                     self.lang, self.max_workers, self.backend)
+
+    def ocr_images(self, image_paths: List[str]) -> List[str]:
+        """
+        OCR page images and return their text in page order.
+
+        Args:
+            image_paths: Page image paths in page order
+
+        Returns:
+            Recognized text for each page, in the same order
+        """
+        return [text for _, text in self.ocr_stream(enumerate(image_paths, 1))]
+
+    def ocr_stream(
+            self,
+            pages: Iterable[Tuple[int, PageSource]],
+            delete_after: bool = False) -> Iterator[Tuple[int, str]]:
+        """
+        OCR a stream of page images, yielding text in page order.
+
+        Pages are pulled from ``pages`` only as worker slots free up, so at
+        most ``2 * max_workers`` page images are pending at any time and a
+        lazy rasterizer upstream renders pages just ahead of OCR.
+
+        Args:
+            pages: Iterable of (page number, image path or PageImage)
+                in page order
+            delete_after: Delete each image file once it has been OCR'd
+
+        Yields:
+            Tuples of (page number, recognized text) in page order
+        """
+        return self._run(self._ocr_page, pages, delete_after)
+
+    def ocr_stream_scored(
+            self,
+            pages: Iterable[Tuple[int, PageSource]],
+            delete_after: bool = False) -> Iterator[Tuple[int, PageResult]]:
+        """
+        OCR a stream of page images like ocr_stream(), also collecting
+        Tesseract's per-word confidences.
+
+        Args:
+            pages: Iterable of (page number, image path or PageImage)
+                in page order
+            delete_after: Delete each image file once it has been OCR'd
+
+        Yields:
+            Tuples of (page number, PageResult) in page order
+        """
+        return self._run(self._ocr_page_scored, pages, delete_after)
+
+    def _run(
+            self,
+            ocr_page: Callable,
+            pages: Iterable[Tuple[int, PageSource]],
+            delete_after: bool) -> Iterator[Tuple[int, Any]]:
+        """OCR pages with a page function, serially or in worker processes."""
+        if self.max_workers <= 1:
+            logger.info("Running Tesseract OCR serially")
+            for page_num, page in pages:
+                raise_if_cancelled(self.cancel)
+                logger.debug("Running Tesseract OCR on page %d", page_num)
+                result = ocr_page(page, self.lang, self.config, self.preprocess)
+                _log_result(page_num, result)
+                if delete_after:
+                    _discard(page)
+                yield page_num, result
+            return
+
+        logger.info("Running Tesseract OCR with %d worker processes (%s)",
+                    self.max_workers, self.backend)
+
+        if self.backend == 'tesserocr':
+            pool = _get_resident_pool(self.lang, self.config, self.max_workers)
+            try:
+                yield from self._stream(pool, ocr_page, pages, delete_after)
+            except BrokenProcessPool:
+                _discard_resident_pool(self.lang, self.config, self.max_workers)
+                raise
+            return
+
+        with ProcessPoolExecutor(max_workers=self.max_workers,
+                                 initializer=_init_worker) as pool:
+            yield from self._stream(pool, ocr_page, pages, delete_after)
+
+    def _stream(
+            self,
+            pool: ProcessPoolExecutor,
+            ocr_page: Callable,
+            pages: Iterable[Tuple[int, PageSource]],
+            delete_after: bool) -> Iterator[Tuple[int, Any]]:
+        """Submit pages to a worker pool and yield their results in page order."""
+        max_in_flight = self.max_workers * 2
+        pending: Deque[Tuple[int, PageSource, Future]] = deque()
+
+        try:
+            for page_num, page in pages:
+                raise_if_cancelled(self.cancel)
+                logger.debug("Submitting page %d for OCR", page_num)
+                pending.append((page_num, page, pool.submit(
+                    ocr_page, page, self.lang, self.config, self.preprocess)))
+
+                # Results are collected first-in first-out, i.e. page order
+                if len(pending) >= max_in_flight:
+                    yield self._collect(pending.popleft(), delete_after)
+
+            while pending:
+                yield self._collect(pending.popleft(), delete_after)
+        finally:
+            # A resident pool outlives this document, and a cancelled
+            # document stops here: drop its queued pages
+            for _, _, future in pending:
+                future.cancel()
+
+    def _collect(
+            self,
+            item: Tuple[int, PageSource, Future],
+            delete_after: bool) -> Tuple[int, Any]:
+        """Wait for one submitted page and return its result."""
+        page_num, page, future = item
+        result = wait_for(future, self.cancel)
+        _log_result(page_num, result)
+        if delete_after:
+            _discard(page)
+        return page_num, result
+
+
+def _log_result(page_num: int, result: Union[str, PageResult]) -> None:
+    """Log the outcome of one page."""
+    if isinstance(result, PageResult):
+        logger.debug("OCR extracted %d characters from page %d (%d words, confidence %s)",
+                     len(result.text), page_num, result.words,
+                     f"{result.confidence:.1f}" if result.confidence is not None else 'n/a')
+    else:
+        logger.debug("OCR extracted %d characters from page %d",
+                     len(result), page_num)
+
+
+def _discard(page: PageSource) -> None:
+    """Delete a processed page image file; in-memory pages need nothing."""
+    if not isinstance(page, str):
+        return
+    try:
+        os.remove(page)
+    except OSError as e:
+        logger.debug("Could not delete page image %s: %s", page, e)
@@ -3,16 +3,22 @@ Process images pdf files
 """
 import os
 import logging
-import tempfile
+import threading
+from itertools import chain
 from sys import platform
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 
-import pytesseract
-from pdf2image import convert_from_path  # type: ignore
 from pdf2image.exceptions import (PDFInfoNotInstalledError, PDFPageCountError,
                                   PDFSyntaxError)
 from pypdf import PdfReader
 
-from src.convert_to_docx import convert_txt_to_docx
+from src.convert_to_docx import DocxPageWriter
+from src.ocr.image_frames import iter_image_frames
+from src.ocr.image_preprocessing import PagePreprocessor
+from src.ocr.language_selector import select_languages
+from src.ocr.page_quality import is_weak, min_confidence, retry_weak_pages
+from src.ocr.rasterizer import PageImage, get_rasterizer
+from src.ocr.tesseract_engine import PageResult, ParallelTesseractEngine
 
 # Get logger for this module
 logger = logging.getLogger('EmailReader.OCR')
@@ -145,59 +151,166 @@ def is_pdf_searchable_pypdf(pdf_path: str) -> bool:
         raise RuntimeError(f"Failed to read PDF file: {e}")
 
 
-def ocr_pdf_image_to_doc(ocr_file: str, out_doc_file_path: str) -> None:
+def stream_pdf_image_pages(
+        ocr_file: str,
+        on_page: Callable[[str], None],
+        max_workers: Optional[int] = None,
+        rasterizer: Optional[str] = None,
+        source_language: Optional[str] = None,
+        tesseract_backend: Optional[str] = None,
+        preprocessing: Optional[Dict[str, Any]] = None,
+        cancel: Optional[threading.Event] = None) -> int:
     """
-    Perform OCR on a PDF file and save the result as a DOCX file.
-    """
-    logger.info('Starting OCR process for PDF image: %s', os.path.basename(ocr_file))
-    logger.debug("Input file: %s", ocr_file)
-    logger.debug("Output DOCX: %s", out_doc_file_path)
+    Perform OCR on a PDF file, passing each page's text on as it is recognized.
 
-    if not os.path.exists(ocr_file):
-        logger.error("OCR input file not found: %s", ocr_file)
-        raise FileNotFoundError(f"File not found: {ocr_file}")
+    Pages are rendered one at a time by the configured rasterizer backend
+    straight to grayscale buffers and recognized in parallel by
+    ParallelTesseractEngine; their text is handed to ``on_page`` in page
+    order and not kept, so peak memory doesn't grow with page count.
 
-    ocr_str: str = ''
-    temp_dir = None
+    Only the Tesseract models relevant to the document are loaded: they are
+    chosen from ``source_language`` when given, otherwise from the script
+    detected on the first page (see language_selector).
 
-    try:
-        logger.debug("Creating temporary directory for image extraction")
-        temp_dir = tempfile.mkdtemp()
-        logger.debug("Temporary directory: %s", temp_dir)
+    With ``preprocessing``, pages are rendered at its base DPI instead of
+    300, then deskewed, binarized and re-rendered at a higher DPI only
+    where the text is small (see image_preprocessing).
 
-        logger.info("Converting PDF pages to images (DPI=300, format=PNG)")
-        images_from_path = convert_from_path(
-            pdf_path=ocr_file,
-            output_folder=temp_dir,
-            dpi=300,
-            fmt='png',)
+    Args:
+        ocr_file: Path to the PDF file
+        on_page: Receives each page's text, in page order, as soon as it
+            is recognized (e.g. DocxPageWriter.add_page)
+        max_workers: Number of OCR worker processes (default: CPU count)
+        rasterizer: Rasterizer backend: 'pdfium' (default), 'pymupdf'
+            or 'poppler'
+        source_language: Source language code from file metadata
+            (e.g. 'ru'), if known
+        tesseract_backend: 'pytesseract' (default) or 'tesserocr'
+            (resident workers with models loaded once)
+        preprocessing: Optional 'ocr.default.preprocessing' settings
+            ('base_dpi', 'max_dpi', 'min_text_height', 'deskew');
+            None renders at 300 DPI without preprocessing
+        cancel: Optional event that stops OCR once set: no further pages
+            are rendered or recognized and OCRCancelledError is raised
 
-        num_images = len(images_from_path)
-        logger.info("Extracted %d images from PDF", num_images)
+    Returns:
+        Number of pages recognized
+    """
+    pages, _ = _ocr_pdf(
+        ocr_file, max_workers, rasterizer, source_language,
+        tesseract_backend, preprocessing, scored=False, on_page=on_page,
+        cancel=cancel)
+    return pages
+
+
+def ocr_pdf_image_pages_scored(
+        ocr_file: str,
+        max_workers: Optional[int] = None,
+        rasterizer: Optional[str] = None,
+        source_language: Optional[str] = None,
+        tesseract_backend: Optional[str] = None,
+        preprocessing: Optional[Dict[str, Any]] = None,
+        quality: Optional[Dict[str, Any]] = None,
+        writer: Optional[Any] = None,
+        cancel: Optional[threading.Event] = None) -> Tuple[List[PageResult], List[int]]:
+    """
+    Perform OCR on a PDF file, keeping each page's word confidence.
 
-        for idx, image in enumerate(images_from_path, 1):
-            image_path = os.path.join(temp_dir, image.filename)
-            logger.debug("Processing image %d/%d: %s", idx, num_images, image.filename)
+    Works like stream_pdf_image_pages(); with ``quality``, pages whose
+    confidence is below its 'min_confidence' are OCR'd again with stronger
+    settings (see page_quality.retry_weak_pages()).
 
-            logger.debug("Running Tesseract OCR on image %d", idx)
-            text: str = pytesseract.image_to_string(
-                image_path,
-                config='-c preserve_interword_spaces=1',
-                lang="eng+rus+aze+uzb+deu")
+    With ``writer`` (e.g. a DocxPageWriter), pages that aren't weak are
+    added to it as soon as they are recognized and their text is dropped
+    from their result, so only weak pages are kept in memory. Weak pages
+    get a reserved place instead (writer.reserve_page()); the caller fills
+    them with fill_page() once it is done retrying or escalating them.
 
-            text_length = len(text)
-            logger.debug("OCR extracted %d characters from image %d", text_length, idx)
-            ocr_str += text
+    Args:
+        ocr_file: Path to the PDF file
+        max_workers: Number of OCR worker processes (default: CPU count)
+        rasterizer: Rasterizer backend
+        source_language: Source language code from file metadata, if known
+        tesseract_backend: 'pytesseract' (default) or 'tesserocr'
+        preprocessing: Optional 'ocr.default.preprocessing' settings
+        quality: Optional 'ocr.default.quality' settings
+        writer: Optional page writer receiving pages as they are recognized
+        cancel: Optional event that stops OCR and retries once set
 
-        total_chars = len(ocr_str)
-        logger.info("Total OCR text extracted: %d characters", total_chars)
+    Returns:
+        Tuple of (PageResult for each page in page order, page numbers
+        that were OCR'd again)
+    """
+    threshold = min_confidence(quality) if quality is not None else None
+    results: List[PageResult] = []
+
+    def on_page(result: PageResult) -> None:
+        if writer is not None:
+            if threshold is not None and is_weak(result, threshold):
+                writer.reserve_page()
+            else:
+                writer.add_page(result.text)
+                # The confidence is still needed for the quality report
+                result = result._replace(text='')
+        results.append(result)
+
+    _, lang = _ocr_pdf(
+        ocr_file, max_workers, rasterizer, source_language,
+        tesseract_backend, preprocessing, scored=True, on_page=on_page,
+        cancel=cancel)
+    retried: List[int] = []
+    if quality is not None:
+        retried = retry_weak_pages(
+            ocr_file, results, lang, quality, rasterizer=rasterizer,
+            max_workers=max_workers, tesseract_backend=tesseract_backend,
+            cancel=cancel)
+    return results, retried
+
+
+def _ocr_pdf(
+        ocr_file: str,
+        max_workers: Optional[int],
+        rasterizer: Optional[str],
+        source_language: Optional[str],
+        tesseract_backend: Optional[str],
+        preprocessing: Optional[Dict[str, Any]],
+        scored: bool,
+        on_page: Callable[[Any], None],
+        cancel: Optional[threading.Event] = None) -> Tuple[int, str]:
+    """
+    Render and OCR every page of a PDF, passing each result to ``on_page``.
 
-        if total_chars == 0:
-            logger.warning("No text extracted from PDF images - OCR may have failed")
+    Returns:
+        Tuple of (number of pages, Tesseract languages used)
+    """
+    logger.info('Starting OCR process for PDF image: %s', os.path.basename(ocr_file))
+    logger.debug("Input file: %s", ocr_file)
 
-        logger.info("Converting OCR text to DOCX: %s", out_doc_file_path)
-        convert_txt_to_docx(ocr_str, out_doc_file_path)
-        logger.info("OCR process completed successfully")
+    if not os.path.exists(ocr_file):
+        logger.error("OCR input file not found: %s", ocr_file)
+        raise FileNotFoundError(f"File not found: {ocr_file}")
+
+    try:
+        backend = get_rasterizer(rasterizer)
+
+        dpi = 300
+        preprocess = None
+        if preprocessing is not None:
+            preprocess = PagePreprocessor.from_config(
+                preprocessing, pdf_path=ocr_file, rasterizer=backend.name)
+            dpi = preprocess.base_dpi
+
+        # Pages are rendered one at a time and OCR'd as soon as they are
+        # ready; each buffer is released once its text has been passed on
+        logger.info("Streaming PDF pages to OCR (DPI=%d, rasterizer=%s, preprocessing=%s)",
+                    dpi, backend.name, preprocess is not None)
+        rendered = backend.iter_pages(ocr_file, dpi=dpi)
+
+        pages, lang = _ocr_rendered_pages(
+            rendered, source_language, max_workers, tesseract_backend,
+            preprocess, scored, on_page, cancel)
+        logger.info("OCR processed %d pages from PDF", pages)
+        return pages, lang
 
     except PDFInfoNotInstalledError as e:
         logger.error('PDFInfoNotInstalledError: Poppler utilities not installed')
@@ -219,16 +332,190 @@ def ocr_pdf_image_to_doc(ocr_file: str, out_doc_file_path: str) -> None:
         logger.error('Unexpected error during OCR process: %s', e, exc_info=True)
         raise
 
-    finally:
-        # Clean up temporary directory
-        if temp_dir and os.path.exists(temp_dir):
-            logger.debug("Cleaning up temporary directory: %s", temp_dir)
-            try:
-                import shutil
-                shutil.rmtree(temp_dir)
-                logger.debug("Temporary directory cleaned up")
-            except Exception as e:
-                logger.warning("Failed to clean up temp directory: %s", e)
+
+def _ocr_rendered_pages(
+        rendered: Iterator[PageImage],
+        source_language: Optional[str],
+        max_workers: Optional[int],
+        tesseract_backend: Optional[str],
+        preprocess: Optional[PagePreprocessor],
+        scored: bool,
+        on_page: Callable[[Any], None],
+        cancel: Optional[threading.Event] = None) -> Tuple[int, str]:
+    """
+    Select languages from the first page and OCR a stream of pages.
+
+    ``on_page`` is called with each text or PageResult, in page order, as
+    soon as it arrives; results are not kept.
+
+    Returns:
+        Tuple of (number of pages, Tesseract languages used)
+    """
+    # The first page is needed for script detection; put it back in
+    # front of the stream afterwards so it is rendered only once
+    first_page = next(rendered, None)
+    lang = select_languages(first_page, source_language=source_language)
+    if first_page is not None:
+        rendered = chain([first_page], rendered)
+    pages = ((page.page_number, page) for page in rendered)
+
+    engine = ParallelTesseractEngine(lang=lang, max_workers=max_workers,
+                                     backend=tesseract_backend,
+                                     preprocess=preprocess, cancel=cancel)
+    stream = engine.ocr_stream_scored(pages) if scored else engine.ocr_stream(pages)
+    count = 0
+    for page_num, result in stream:
+        logger.debug("Page %d OCR complete (%d characters)", page_num,
+                     len(result.text if scored else result))
+        on_page(result)
+        count += 1
+    return count, lang
+
+
+def stream_image_pages(
+        image_file: str,
+        on_page: Callable[[str], None],
+        max_workers: Optional[int] = None,
+        source_language: Optional[str] = None,
+        tesseract_backend: Optional[str] = None,
+        preprocessing: Optional[Dict[str, Any]] = None,
+        cancel: Optional[threading.Event] = None) -> int:
+    """
+    Perform OCR on an image file, passing each page's text on as it is recognized.
+
+    Single images are one page; multi-frame TIFFs are read frame by frame
+    from disk and the frames are recognized in parallel like PDF pages.
+
+    Args:
+        image_file: Path to the image (JPEG, PNG, TIFF, ...)
+        on_page: Receives each page's text, in page order, as soon as it
+            is recognized
+        max_workers: Number of OCR worker processes (default: CPU count)
+        source_language: Source language code from file metadata, if known
+        tesseract_backend: 'pytesseract' (default) or 'tesserocr'
+        preprocessing: Optional 'ocr.default.preprocessing' settings;
+            images are deskewed and binarized at their own resolution
+        cancel: Optional event that stops OCR once set
+
+    Returns:
+        Number of pages recognized
+
+    Raises:
+        FileNotFoundError: If the image doesn't exist
+    """
+    logger.info('Starting OCR process for image: %s', os.path.basename(image_file))
+
+    if not os.path.exists(image_file):
+        logger.error("OCR input file not found: %s", image_file)
+        raise FileNotFoundError(f"File not found: {image_file}")
+
+    # Images can't be re-rendered, so only deskew and binarization apply
+    preprocess = None
+    if preprocessing is not None:
+        preprocess = PagePreprocessor.from_config(preprocessing)
+
+    try:
+        pages, _ = _ocr_rendered_pages(
+            iter_image_frames(image_file), source_language, max_workers,
+            tesseract_backend, preprocess, scored=False, on_page=on_page,
+            cancel=cancel)
+    except Exception as e:
+        logger.error('Unexpected error during image OCR: %s', e, exc_info=True)
+        raise
+
+    logger.info("OCR processed %d pages from image", pages)
+    return pages
+
+
+def ocr_image_to_doc(
+        image_file: str,
+        out_doc_file_path: str,
+        max_workers: Optional[int] = None,
+        source_language: Optional[str] = None,
+        tesseract_backend: Optional[str] = None,
+        preprocessing: Optional[Dict[str, Any]] = None,
+        cancel: Optional[threading.Event] = None) -> int:
+    """
+    Perform OCR on an image file and save the result as a DOCX file.
+
+    See stream_image_pages() for how frames are read and recognized. Pages
+    are written to the DOCX as they are recognized.
+
+    Args:
+        image_file: Path to the image
+        out_doc_file_path: Path to save the output DOCX file
+        max_workers: Number of OCR worker processes (default: CPU count)
+        source_language: Source language code from file metadata, if known
+        tesseract_backend: 'pytesseract' (default) or 'tesserocr'
+        preprocessing: Optional 'ocr.default.preprocessing' settings
+        cancel: Optional event that stops OCR once set
+
+    Returns:
+        Number of pages written
+    """
+    logger.debug("Output DOCX: %s", out_doc_file_path)
+    with DocxPageWriter(out_doc_file_path) as writer:
+        stream_image_pages(
+            image_file, writer.add_page, max_workers=max_workers,
+            source_language=source_language, tesseract_backend=tesseract_backend,
+            preprocessing=preprocessing, cancel=cancel)
+    log_ocr_output(writer)
+    return writer.pages
+
+
+def log_ocr_output(writer: DocxPageWriter) -> None:
+    """
+    Log the amount of OCR text written to a DOCX file.
+
+    Args:
+        writer: Writer the OCR'd pages were added to
+    """
+    logger.info("Total OCR text extracted: %d characters", writer.characters)
+    if writer.characters == 0:
+        logger.warning("No text extracted from PDF images - OCR may have failed")
+    logger.info("OCR process completed successfully")
+
+
+def ocr_pdf_image_to_doc(
+        ocr_file: str,
+        out_doc_file_path: str,
+        max_workers: Optional[int] = None,
+        rasterizer: Optional[str] = None,
+        source_language: Optional[str] = None,
+        tesseract_backend: Optional[str] = None,
+        preprocessing: Optional[Dict[str, Any]] = None,
+        cancel: Optional[threading.Event] = None) -> int:
+    """
+    Perform OCR on a PDF file and save the result as a DOCX file.
+
+    See stream_pdf_image_pages() for how pages are rendered and recognized.
+    Each page is written to the DOCX as soon as it is recognized and not
+    kept, so memory is bounded by a page rather than the document.
+
+    Args:
+        ocr_file: Path to the PDF file
+        out_doc_file_path: Path to save the output DOCX file
+        max_workers: Number of OCR worker processes (default: CPU count)
+        rasterizer: Rasterizer backend: 'pdfium' (default), 'pymupdf'
+            or 'poppler'
+        source_language: Source language code from file metadata
+            (e.g. 'ru'), if known
+        tesseract_backend: 'pytesseract' (default) or 'tesserocr'
+        preprocessing: Optional 'ocr.default.preprocessing' settings
+        cancel: Optional event that stops OCR once set
+
+    Returns:
+        Number of pages written
+    """
+    logger.debug("Output DOCX: %s", out_doc_file_path)
+    with DocxPageWriter(out_doc_file_path) as writer:
+        stream_pdf_image_pages(
+            ocr_file, writer.add_page, max_workers=max_workers,
+            rasterizer=rasterizer, source_language=source_language,
+            tesseract_backend=tesseract_backend, preprocessing=preprocessing,
+            cancel=cancel)
+    log_ocr_output(writer)
+    return writer.pages
 
 
 if __name__ == '__main__':
@@ -7,8 +7,8 @@ import os
 import logging
 from docx import Document
 from langdetect import detect  # type: ignore
-from src.ocr import OCRProviderFactory
-from src.document_analyzer import requires_ocr
+from src.ocr.fallback import process_with_fallback
+from src.document_analyzer import PdfAnalysis, analyze_pdf, requires_ocr
 from src.convert_to_docx import convert_pdf_to_docx
 from src.file_utils import (
     delete_file,
@@ -16,8 +16,6 @@ from src.file_utils import (
     convert_rtx_to_text
 )
 from src.file_utils import rename_file
-from src.config import load_config
-from src.ocr.default_provider import DefaultOCRProvider
 
 # Get logger for this module
 logger = logging.getLogger('EmailReader.DocProcessor')
@@ -341,7 +339,8 @@ class DocProcessor:
             self,
             input_file: str,
             output_file: str,
-            metadata: dict[str, str] = {}
+            metadata: dict[str, str] = {},
+            analysis: PdfAnalysis | None = None
     ) -> None:
         """
         Process document with configured OCR provider, with automatic fallback.
@@ -349,38 +348,14 @@ class DocProcessor:
         Args:
             input_file: Path to input file (PDF or image)
             output_file: Path to save output DOCX file
+            analysis: Optional precomputed PdfAnalysis shared with providers
         """
 
-        try:
-            # Load config and get provider
-            config = load_config()
-            translation_mode: str = metadata.get(
-                'translation_mode', 'default')
-            logger.info(f"Using OCR provider: {translation_mode}")
-            ocr_provider = OCRProviderFactory.get_provider(
-                config=config,
-                translation_mode=translation_mode)
-            ocr_provider.process_document(input_file, output_file)
-            logger.info(
-                f"OCR completed successfully with {translation_mode} provider")
-
-        except Exception as e:
-            logger.warning(
-                (f"Primary OCR provider failed: {e}. "
-                 "Falling back to default Tesseract OCR")
-            )
-
-            # Fallback to default provider
-            try:
-                fallback_provider = DefaultOCRProvider({})
-                fallback_provider.process_document(input_file, output_file)
-                logger.info("Fallback OCR completed successfully")
-            except Exception as fallback_error:
-                logger.error(f"Fallback OCR also failed: {fallback_error}")
-                raise RuntimeError(
-                    f"Both primary and fallback OCR failed. "
-                    f"Primary: {e}, Fallback: {fallback_error}"
-                ) from fallback_error
+        translation_mode: str = metadata.get('translation_mode', 'default')
+        logger.info(f"Using OCR provider: {translation_mode}")
+        process_with_fallback(
+            input_file, output_file,
+            translation_mode=translation_mode, analysis=analysis)
 
     def convert_pdf_file_to_word(
             self,
@@ -433,7 +408,8 @@ class DocProcessor:
 
             # Determine if OCR is needed
             logger.info("Analyzing PDF to determine if OCR is required")
-            needs_ocr = requires_ocr(original_file_path)
+            analysis = analyze_pdf(original_file_path)
+            needs_ocr = requires_ocr(original_file_path, analysis=analysis)
             logger.info(
                 "PDF analysis complete: %s",
                 "OCR required" if needs_ocr else "Searchable text found")
@@ -443,13 +419,16 @@ class DocProcessor:
                 self._process_with_ocr_provider(
                     input_file=original_file_path,
                     output_file=docx_file_path,
-                    metadata=metadata)
+                    metadata=metadata,
+                    analysis=analysis)
 
                 logger.info("OCR processing completed")
             else:
                 logger.info(
                     "Converting searchable PDF to DOCX (no OCR needed)")
-                convert_pdf_to_docx(original_file_path, docx_file_path)
+                convert_pdf_to_docx(
+                    original_file_path, docx_file_path,
+                    page_texts=analysis.page_texts)
                 logger.info("PDF to DOCX conversion completed")
 
             # CHANGED: Removed {client}+ prefix
@@ -2,15 +2,15 @@
 
 import logging
 import os
-from typing import Dict, List
+from typing import Dict, List, Optional
 import asyncio
 import requests
 
 from src.google_drive import GoogleApi
 from src.config import load_config
 from src.file_utils import delete_file
-from src.ocr import OCRProviderFactory
-from src.document_analyzer import requires_ocr
+from src.ocr.fallback import process_with_fallback
+from src.document_analyzer import PdfAnalysis, analyze_pdf, requires_ocr
 from src.convert_to_docx import convert_pdf_to_docx
 
 logger = logging.getLogger('EmailReader.GoogleDrive')
@@ -38,7 +38,9 @@ def get_translate_folder_id() -> str:
 def _process_with_ocr_fallback(
         input_file: str,
         output_file: str,
-        translation_mode: str = 'default') -> None:
+        translation_mode: str = 'default',
+        analysis: Optional[PdfAnalysis] = None,
+        source_language: Optional[str] = None) -> None:
     """
     Process document with configured OCR provider, with automatic fallback.
 
@@ -46,41 +48,20 @@ def _process_with_ocr_fallback(
         input_file: Path to input file (PDF or image)
         output_file: Path to save output DOCX file
         translation_mode: Translation mode from file metadata ('human', 'formats', 'default')
+        analysis: Optional precomputed PdfAnalysis shared with the providers
+        source_language: Source language from file metadata, if known
     """
-    from src.ocr.default_provider import DefaultOCRProvider
-
-    try:
-        # Load config and get provider based on translation_mode
-        config = load_config()
-        ocr_provider = OCRProviderFactory.get_provider(
-            config, translation_mode=translation_mode)
-
-        logger.info(f"Using OCR provider based on translation_mode='{translation_mode}': {ocr_provider.__class__.__name__}")
-        ocr_provider.process_document(input_file, output_file)
-        logger.info(f"OCR completed successfully with {ocr_provider.__class__.__name__}")
-
-    except Exception as e:
-        logger.warning(
-            f"Primary OCR provider failed: {e}. Falling back to default Tesseract OCR"
-        )
-
-        # Fallback to default provider
-        try:
-            fallback_provider = DefaultOCRProvider({})
-            fallback_provider.process_document(input_file, output_file)
-            logger.info("Fallback OCR completed successfully")
-        except Exception as fallback_error:
-            logger.error(f"Fallback OCR also failed: {fallback_error}")
-            raise RuntimeError(
-                f"Both primary and fallback OCR failed. "
-                f"Primary: {e}, Fallback: {fallback_error}"
-            ) from fallback_error
+    process_with_fallback(
+        input_file, output_file,
+        translation_mode=translation_mode, analysis=analysis,
+        source_language=source_language)
 
 
 def convert_to_docx_for_translation(
         input_path: str,
         output_path: str,
-        translation_mode: str = 'default') -> None:
+        translation_mode: str = 'default',
+        source_language: Optional[str] = None) -> None:
     """
     Convert various file formats to DOCX for translation.
     Supports: PDF (searchable and scanned with OCR), images (JPEG, PNG, TIFF).
@@ -89,6 +70,8 @@ def convert_to_docx_for_translation(
         input_path: Path to input file (PDF, image, etc.)
         output_path: Path to output DOCX file
         translation_mode: Translation mode from file metadata ('human', 'formats', 'default')
+        source_language: Source language from file metadata, used to pick
+            OCR languages
 
     Raises:
         ValueError: If file type is not supported
@@ -104,14 +87,22 @@ def convert_to_docx_for_translation(
     _, extension = os.path.splitext(input_path)
     ext_lower = extension.lower()
 
+    # Analyze PDFs once and share the result with every consumer
+    analysis = analyze_pdf(input_path) if ext_lower == '.pdf' else None
+
     # Check if any file type needs OCR
-    if requires_ocr(input_path):
+    if requires_ocr(input_path, analysis=analysis):
         logger.info("Document requires OCR processing (translation_mode=%s)", translation_mode)
-        _process_with_ocr_fallback(input_path, output_path, translation_mode=translation_mode)
+        _process_with_ocr_fallback(
+            input_path, output_path,
+            translation_mode=translation_mode, analysis=analysis,
+            source_language=source_language)
         logger.info("OCR processing completed")
     elif ext_lower == '.pdf':
         logger.info("Converting searchable PDF to DOCX (no OCR needed)")
-        convert_pdf_to_docx(input_path, output_path)
+        convert_pdf_to_docx(
+            input_path, output_path,
+            page_texts=analysis.page_texts)
         logger.info("PDF to DOCX conversion completed")
 
     # DOCX files - just copy
@@ -260,7 +251,8 @@ async def translate_file(
         try:
             convert_to_docx_for_translation(
                 source_file_path, docx_for_translation,
-                translation_mode=translation_mode)
+                translation_mode=translation_mode,
+                source_language=source_language)
             translation_source = docx_for_translation
         except (ValueError, FileNotFoundError) as e:
             logger.error(
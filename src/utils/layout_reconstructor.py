@@ -1,9 +1,29 @@
-"""Layout reconstruction utilities using LandingAI grounding data."""
+"""
+Layout reconstruction utilities using LandingAI grounding data.
+
+Chunks are held as parallel NumPy arrays (ChunkArrays) while the layout is
+reconstructed, so sorting, page grouping, column detection and gap tests
+are vectorized instead of running Python lambdas over one object per
+chunk. TextChunk and BoundingBox remain the per-chunk view for callers
+that work with individual chunks.
+
+Columns are found from the gutters between chunks rather than from chunk
+centers, so full-width headings and tables split a page into sections
+instead of forming columns of their own (see src/utils/spatial_index.py).
+"""
 
 import logging
-from typing import List, Dict, Any, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
 from dataclasses import dataclass
 from collections import defaultdict
+from collections.abc import Sequence
+
+import numpy as np
+
+from src.utils.spatial_index import (PageIndex, count_overlapped_spans, group_overlapping,
+                                     merge_intervals)
 
 
 def get_logger(name: str) -> logging.Logger:
@@ -21,6 +41,33 @@ def get_logger(name: str) -> logging.Logger:
 
 logger = get_logger('EmailReader.LayoutReconstructor')
 
+# Separator placed between reconstructed pages
+PAGE_BREAK = '\n\n--- Page Break ---\n\n'
+
+# Separator placed between the columns of a multi-column page
+COLUMN_BREAK = '\n\n[Column Break]\n\n'
+
+# Separator placed between the cells of a table row
+CELL_BREAK = '\t'
+
+# Minimum width of an empty strip between two columns (2% of page width)
+COLUMN_GUTTER_WIDTH = 0.02
+
+# Chunks at least this wide (50% of page width) are not used to find
+# column gutters; they may span several columns
+SPANNING_CHUNK_WIDTH = 0.5
+
+# Threshold for paragraph break (5% of page height)
+PARAGRAPH_GAP_THRESHOLD = 0.05
+
+# Documents with fewer pages are reconstructed serially even when workers
+# are requested. This value is an unmeasured estimate, not a benchmark
+# result: the crossover has not been timed on a multi-core machine. Run
+# benchmark_layout.py --crossover on the deployment hardware and set
+# LandingAI's layout_parallel_pages from it before relying on parallel
+# reconstruction.
+PARALLEL_PAGE_THRESHOLD = 64
+
 
 @dataclass
 class BoundingBox:
@@ -59,7 +106,99 @@ class TextChunk:
     box: BoundingBox
 
 
-def reconstruct_layout(chunks: List[Dict[str, Any]]) -> str:
+@dataclass
+class ChunkArrays:
+    """
+    Text chunks stored column-wise: one list of texts and parallel arrays
+    of page numbers and bounding box coordinates (normalized 0-1).
+
+    Element ``i`` of every field describes chunk ``i``.
+    """
+    text: List[str]
+    page: np.ndarray
+    left: np.ndarray
+    top: np.ndarray
+    right: np.ndarray
+    bottom: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.text)
+
+    @property
+    def center_x(self) -> np.ndarray:
+        """Horizontal center of every chunk."""
+        return (self.left + self.right) / 2
+
+    @classmethod
+    def empty(cls) -> 'ChunkArrays':
+        """Arrays holding no chunks."""
+        return cls.from_lists([], [], [], [], [], [])
+
+    @classmethod
+    def from_lists(
+            cls,
+            text: List[str],
+            page: List[int],
+            left: List[float],
+            top: List[float],
+            right: List[float],
+            bottom: List[float]) -> 'ChunkArrays':
+        """Build arrays from per-field Python lists."""
+        return cls(
+            text=text,
+            page=np.array(page, dtype=np.int64),
+            left=np.array(left, dtype=np.float64),
+            top=np.array(top, dtype=np.float64),
+            right=np.array(right, dtype=np.float64),
+            bottom=np.array(bottom, dtype=np.float64))
+
+    @classmethod
+    def from_text_chunks(cls, chunks: List[TextChunk]) -> 'ChunkArrays':
+        """Build arrays from TextChunk objects, keeping their order."""
+        return cls.from_lists(
+            [c.text for c in chunks], [c.page for c in chunks],
+            [c.box.left for c in chunks], [c.box.top for c in chunks],
+            [c.box.right for c in chunks], [c.box.bottom for c in chunks])
+
+    def to_text_chunks(self) -> List[TextChunk]:
+        """Per-chunk TextChunk objects, in array order."""
+        return [
+            TextChunk(text=text, page=page,
+                      box=BoundingBox(left=left, top=top, right=right, bottom=bottom))
+            for text, page, left, top, right, bottom in zip(
+                self.text, self.page.tolist(), self.left.tolist(),
+                self.top.tolist(), self.right.tolist(), self.bottom.tolist())
+        ]
+
+    def spatial_index(self) -> PageIndex:
+        """Spatial index of these chunks; positions are indices into the arrays."""
+        return PageIndex(self.left, self.top, self.right, self.bottom)
+
+    def slice(self, start: int, stop: int) -> 'ChunkArrays':
+        """Chunks ``start`` to ``stop``, as views of these arrays."""
+        return ChunkArrays(
+            text=self.text[start:stop],
+            page=self.page[start:stop],
+            left=self.left[start:stop],
+            top=self.top[start:stop],
+            right=self.right[start:stop],
+            bottom=self.bottom[start:stop])
+
+    def take(self, indices: np.ndarray) -> 'ChunkArrays':
+        """Chunks at the given indices, in that order."""
+        return ChunkArrays(
+            text=[self.text[i] for i in indices.tolist()],
+            page=self.page[indices],
+            left=self.left[indices],
+            top=self.top[indices],
+            right=self.right[indices],
+            bottom=self.bottom[indices])
+
+
+def reconstruct_layout(
+        chunks: List[Dict[str, Any]],
+        workers: int = 1,
+        parallel_threshold: int = PARALLEL_PAGE_THRESHOLD) -> str:
     """
     Reconstruct document layout using grounding data.
 
@@ -68,6 +207,9 @@ def reconstruct_layout(chunks: List[Dict[str, Any]]) -> str:
 
     Args:
         chunks: List of chunks from LandingAI API response
+        workers: Worker processes reconstructing pages in parallel;
+            1 reconstructs serially
+        parallel_threshold: Minimum number of pages for using workers
 
     Returns:
         Text with preserved layout structure
@@ -78,72 +220,255 @@ def reconstruct_layout(chunks: List[Dict[str, Any]]) -> str:
 
     logger.info(f"Reconstructing layout from {len(chunks)} chunks")
 
-    # Parse chunks into structured data
-    text_chunks = _parse_chunks(chunks)
+    # Parse chunks into parallel arrays
+    arrays = _parse_chunk_arrays(chunks)
 
-    if not text_chunks:
+    if not len(arrays):
         logger.warning("No valid text chunks after parsing")
         return ""
 
-    # Group by page
-    pages = _group_by_page(text_chunks)
-
     # Reconstruct each page
-    page_texts = []
-    for page_num in sorted(pages.keys()):
-        page_chunks = pages[page_num]
-        logger.debug(f"Reconstructing page {page_num} with {len(page_chunks)} chunks")
-        page_text = _reconstruct_page(page_chunks)
-        page_texts.append(page_text)
+    page_texts = [text for _, text in _iter_array_pages(arrays, workers, parallel_threshold)]
 
     # Combine pages with page breaks
-    result = '\n\n--- Page Break ---\n\n'.join(page_texts)
+    result = PAGE_BREAK.join(page_texts)
 
-    logger.info(f"Layout reconstruction complete ({len(pages)} pages, {len(result)} characters)")
+    logger.info(f"Layout reconstruction complete ({len(page_texts)} pages, {len(result)} characters)")
     return result
 
 
-def _parse_chunks(chunks: List[Dict[str, Any]]) -> List[TextChunk]:
+def iter_reconstructed_pages(
+        chunks: Iterable[Dict[str, Any]],
+        workers: int = 1,
+        parallel_threshold: int = PARALLEL_PAGE_THRESHOLD) -> Iterator[Tuple[int, str]]:
     """
-    Parse API chunks into TextChunk objects.
+    Reconstruct document layout page by page.
+
+    Each page is yielded as soon as its chunks are complete, so callers can
+    write and sanitize a page while later pages are still being parsed or
+    fetched. Joining the texts with PAGE_BREAK gives reconstruct_layout().
+
+    A list of chunks is grouped by page first, like reconstruct_layout().
+    Any other iterable, such as chunks parsed from a streamed response, is
+    consumed lazily and must arrive page by page as the API returns them:
+    a page is complete when a chunk for another page arrives. Streamed
+    pages are always reconstructed serially, one at a time.
+
+    Args:
+        chunks: Chunks from LandingAI API response
+        workers: Worker processes reconstructing the pages of a list in
+            parallel; 1 reconstructs serially
+        parallel_threshold: Minimum number of pages for using workers
+
+    Yields:
+        Tuples of (page number, reconstructed text); pages without text
+        are skipped
+    """
+    if isinstance(chunks, Sequence):
+        arrays = _parse_chunk_arrays(chunks)
+        if len(arrays):
+            yield from _iter_array_pages(arrays, workers, parallel_threshold)
+        return
+
+    for page_num, page_chunks in _group_consecutive_pages(chunks):
+        logger.debug(f"Reconstructing streamed page {page_num} ({len(page_chunks)} chunks)")
+        page_text = reconstruct_page_chunks(page_chunks)
+        if page_text:
+            yield page_num, page_text
+
+
+def reconstruct_page_chunks(chunks: List[Dict[str, Any]]) -> str:
+    """
+    Reconstruct the layout of a single page.
+
+    Lets callers that receive chunks page by page reconstruct each page
+    without holding the whole document.
+
+    Args:
+        chunks: Raw chunks from LandingAI API, all on the same page
+
+    Returns:
+        Text with preserved layout, or an empty string if no chunk has text
+    """
+    arrays = _parse_chunk_arrays(chunks)
+    if not len(arrays):
+        return ""
+    return _reconstruct_page_arrays(arrays)
+
+
+def _iter_array_pages(
+        arrays: ChunkArrays,
+        workers: int = 1,
+        parallel_threshold: int = PARALLEL_PAGE_THRESHOLD) -> Iterator[Tuple[int, str]]:
+    """
+    Reconstruct parsed chunks page by page.
+
+    Pages are independent, so with more than one worker and at least
+    parallel_threshold pages they are reconstructed in a process pool.
+
+    Args:
+        arrays: Chunks of a document, at least one
+        workers: Worker processes; 1 reconstructs serially
+        parallel_threshold: Minimum number of pages for using workers
+
+    Yields:
+        Tuples of (page number, reconstructed text) in page order
+    """
+    pages = list(_sorted_pages(arrays))
+    if workers > 1 and len(pages) >= parallel_threshold:
+        yield from _reconstruct_pages_parallel(pages, workers)
+        return
+
+    for page_num, page_arrays in pages:
+        logger.debug("Reconstructing page %d with %d chunks", page_num, len(page_arrays))
+        yield page_num, _reconstruct_sorted_page(page_arrays)
+
+
+def _reconstruct_pages_parallel(
+        pages: List[Tuple[int, ChunkArrays]],
+        workers: int) -> Iterator[Tuple[int, str]]:
+    """
+    Reconstruct pages in a process pool, keeping page order.
+
+    If the pool can't be started or breaks, the remaining pages are
+    reconstructed serially.
+
+    Args:
+        pages: Tuples of (page number, sorted chunks on that page)
+        workers: Number of worker processes
+
+    Yields:
+        Tuples of (page number, reconstructed text) in page order
+    """
+    logger.info(f"Reconstructing {len(pages)} pages with {workers} workers")
+    done = 0
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            # Several pages per task keep the pickling overhead down
+            chunksize = max(1, len(pages) // (workers * 4))
+            for text in executor.map(_reconstruct_sorted_page,
+                                     [page for _, page in pages], chunksize=chunksize):
+                yield pages[done][0], text
+                done += 1
+    except (OSError, BrokenProcessPool) as e:
+        logger.warning(f"Parallel layout reconstruction failed ({e}), "
+                       f"reconstructing remaining {len(pages) - done} pages serially")
+        for page_num, page_arrays in pages[done:]:
+            yield page_num, _reconstruct_sorted_page(page_arrays)
+
+
+def _group_consecutive_pages(
+        chunks: Iterable[Dict[str, Any]]) -> Iterator[Tuple[int, List[Dict[str, Any]]]]:
+    """
+    Group consecutive chunks on the same page.
+
+    The API returns chunks in reading order, page by page, so a page is
+    complete as soon as a chunk for another page arrives. A page that
+    shows up again later is yielded again, as a separate group.
+
+    Args:
+        chunks: Chunks in response order
+
+    Yields:
+        Tuples of (page number, chunks on that page)
+    """
+    current_page: Optional[int] = None
+    page_chunks: List[Dict[str, Any]] = []
+    completed = set()
+
+    for chunk in chunks:
+        page = (chunk.get('grounding') or {}).get('page', 0)
+        if page != current_page and page_chunks:
+            yield current_page, page_chunks
+            completed.add(current_page)
+            page_chunks = []
+            if page in completed:
+                logger.warning(f"Chunks for page {page} arrived after the page was complete")
+        current_page = page
+        page_chunks.append(chunk)
+
+    if page_chunks:
+        yield current_page, page_chunks
+
+
+def _parse_chunk_arrays(chunks: List[Dict[str, Any]]) -> ChunkArrays:
+    """
+    Parse API chunks into parallel arrays.
+
+    Chunks without text are skipped; missing grounding data defaults to
+    page 0 and a full-page box.
 
     Args:
         chunks: Raw chunks from LandingAI API
 
     Returns:
-        List of parsed TextChunk objects
+        ChunkArrays of the chunks with text, in API order
     """
-    text_chunks = []
+    text: List[str] = []
+    rows: List[Tuple[int, float, float, float, float]] = []
 
     for idx, chunk in enumerate(chunks):
-        text = chunk.get('text', '').strip()
-        if not text:
-            logger.debug(f"Skipping empty chunk at index {idx}")
+        chunk_text = chunk.get('text', '').strip()
+        if not chunk_text:
+            logger.debug("Skipping empty chunk at index %d", idx)
             continue
 
-        grounding = chunk.get('grounding', {})
+        grounding = chunk.get('grounding') or {}
         if not grounding:
             logger.warning(f"Chunk {idx} missing grounding data, using defaults")
+        box = grounding.get('box') or {}
 
-        page = grounding.get('page', 0)
-        box_data = grounding.get('box', {})
+        text.append(chunk_text)
+        # Safe defaults cover the whole page
+        rows.append((grounding.get('page', 0),
+                     box.get('left', 0.0), box.get('top', 0.0),
+                     box.get('right', 1.0), box.get('bottom', 1.0)))
 
-        # Create bounding box with safe defaults
-        box = BoundingBox(
-            left=box_data.get('left', 0.0),
-            top=box_data.get('top', 0.0),
-            right=box_data.get('right', 1.0),
-            bottom=box_data.get('bottom', 1.0)
-        )
+    logger.info(f"Parsed {len(text)} valid chunks from {len(chunks)} total chunks")
+    if not rows:
+        return ChunkArrays.empty()
 
-        text_chunks.append(TextChunk(text=text, page=page, box=box))
-        logger.debug(
-            f"Parsed chunk {idx}: page={page}, "
-            f"box=({box.left:.2f},{box.top:.2f},{box.right:.2f},{box.bottom:.2f})"
-        )
+    # One conversion for all fields; columns are then split off as views
+    table = np.array(rows, dtype=np.float64)
+    return ChunkArrays(text=text, page=table[:, 0].astype(np.int64),
+                       left=table[:, 1], top=table[:, 2],
+                       right=table[:, 3], bottom=table[:, 4])
 
-    logger.info(f"Parsed {len(text_chunks)} valid chunks from {len(chunks)} total chunks")
-    return text_chunks
+
+def _parse_chunks(chunks: List[Dict[str, Any]]) -> List[TextChunk]:
+    """
+    Parse API chunks into TextChunk objects.
+
+    Args:
+        chunks: Raw chunks from LandingAI API
+
+    Returns:
+        List of parsed TextChunk objects
+    """
+    return _parse_chunk_arrays(chunks).to_text_chunks()
+
+
+def _sorted_pages(arrays: ChunkArrays) -> Iterator[Tuple[int, ChunkArrays]]:
+    """
+    Split chunks by page number, each page in reading order.
+
+    One stable sort by (page, top, left) over the whole document both
+    groups the pages and orders every page's chunks top to bottom, then
+    left to right.
+
+    Args:
+        arrays: Chunks of a document
+
+    Yields:
+        Tuples of (page number, sorted chunks on that page) in page order
+    """
+    sorted_arrays = arrays.take(np.lexsort((arrays.left, arrays.top, arrays.page)))
+    bounds = np.flatnonzero(np.diff(sorted_arrays.page)) + 1
+    starts = [0] + bounds.tolist()
+    stops = bounds.tolist() + [len(sorted_arrays)]
+    logger.debug("Grouped chunks into %d pages", len(starts))
+    for start, stop in zip(starts, stops):
+        yield int(sorted_arrays.page[start]), sorted_arrays.slice(start, stop)
 
 
 def _group_by_page(chunks: List[TextChunk]) -> Dict[int, List[TextChunk]]:
@@ -165,7 +490,7 @@ def _group_by_page(chunks: List[TextChunk]) -> Dict[int, List[TextChunk]]:
     return page_dict
 
 
-def _reconstruct_page(chunks: List[TextChunk]) -> str:
+def _reconstruct_page_arrays(arrays: ChunkArrays) -> str:
     """
     Reconstruct a single page's layout.
 
@@ -173,138 +498,292 @@ def _reconstruct_page(chunks: List[TextChunk]) -> str:
     then detects and handles multi-column layouts.
 
     Args:
-        chunks: List of TextChunk objects for a single page
+        arrays: Chunks of a single page
 
     Returns:
         Reconstructed text for the page
     """
-    if not chunks:
+    if not len(arrays):
         return ""
 
     # Sort by vertical position (top to bottom), then horizontal (left to right)
-    sorted_chunks = sorted(chunks, key=lambda c: (c.box.top, c.box.left))
+    return _reconstruct_sorted_page(arrays.take(np.lexsort((arrays.left, arrays.top))))
 
-    # Detect columns
-    columns = _detect_columns(sorted_chunks)
 
-    if len(columns) > 1:
-        logger.debug(f"Detected {len(columns)} columns on page")
-        return _reconstruct_multi_column(columns)
-    else:
-        logger.debug("Single column layout detected")
-        return _reconstruct_single_column(sorted_chunks)
+def _reconstruct_sorted_page(sorted_arrays: ChunkArrays) -> str:
+    """
+    Reconstruct a single page's layout from chunks in reading order.
 
+    The page is read section by section, top to bottom (see
+    _detect_sections); each section is read column by column, or row by
+    row if it is a table.
 
-def _detect_columns(chunks: List[TextChunk]) -> List[List[TextChunk]]:
+    Args:
+        sorted_arrays: Chunks of a single page sorted by (top, left)
+
+    Returns:
+        Reconstructed text for the page
     """
-    Detect column structure based on horizontal positioning.
+    sections = _detect_sections(sorted_arrays)
+    if len(sections) > 1:
+        logger.debug(f"Detected {len(sections)} sections on page")
+
+    section_texts = [_reconstruct_section(sorted_arrays, columns) for columns in sections]
+    # Sections are always separated by a blank line, so drop the one a
+    # section may start with
+    return '\n\n'.join(section_texts[:1] + [text.lstrip('\n') for text in section_texts[1:]])
 
-    Uses clustering of center_x positions to identify columns.
+
+def _reconstruct_section(arrays: ChunkArrays, columns: List[np.ndarray]) -> str:
+    """
+    Reconstruct one section of a page.
 
     Args:
-        chunks: List of TextChunk objects
+        arrays: Chunks of a single page sorted by (top, left)
+        columns: Indices into ``arrays`` for each column of the section
 
     Returns:
-        List of column lists, each containing chunks for that column
+        Reconstructed text for the section
     """
-    if not chunks:
-        return []
+    if len(columns) == 1:
+        logger.debug("Single column layout detected")
+        return _reconstruct_single_column_arrays(arrays.take(columns[0]))
+
+    rows = _detect_table_rows(arrays, columns)
+    if rows is not None:
+        logger.debug(f"Detected table with {len(rows)} rows and {len(columns)} columns")
+        return '\n'.join(CELL_BREAK.join(arrays.text[i] for i in row.tolist()) for row in rows)
+
+    logger.debug(f"Detected {len(columns)} columns on page")
+    return _reconstruct_multi_column_arrays(arrays, columns)
+
+
+def _reconstruct_page(chunks: List[TextChunk]) -> str:
+    """
+    Reconstruct a single page's layout.
+
+    Args:
+        chunks: List of TextChunk objects for a single page
+
+    Returns:
+        Reconstructed text for the page
+    """
+    return _reconstruct_page_arrays(ChunkArrays.from_text_chunks(chunks))
 
-    # Simple heuristic: chunks with similar horizontal positions are in same column
-    # Sort by horizontal position
-    h_sorted = sorted(chunks, key=lambda c: c.box.center_x)
 
-    columns = []
-    current_column = [h_sorted[0]]
+def _detect_sections(arrays: ChunkArrays) -> List[List[np.ndarray]]:
+    """
+    Detect the sections and columns of a page.
+
+    Column gutters are vertical strips at least COLUMN_GUTTER_WIDTH wide
+    that no chunk narrower than SPANNING_CHUNK_WIDTH crosses. Chunks that
+    do cross a gutter - full-width headings, tables, captions - span
+    several columns: each one starts a new section, so the columns above
+    it are read before it and the columns below it after it. Consecutive
+    single-column sections are merged.
 
-    # Column separation threshold (20% of page width)
-    COLUMN_GAP_THRESHOLD = 0.2
+    Args:
+        arrays: Chunks of a single page
 
-    for chunk in h_sorted[1:]:
-        prev_x = current_column[0].box.center_x
-        curr_x = chunk.box.center_x
+    Returns:
+        Sections top to bottom, each a list of columns left to right; a
+        column is an array of indices into ``arrays`` in array order
+    """
+    if not len(arrays):
+        return []
 
-        # If horizontal gap is large, start new column
-        if abs(curr_x - prev_x) > COLUMN_GAP_THRESHOLD:
-            logger.debug(
-                f"Column break detected: prev_x={prev_x:.2f}, curr_x={curr_x:.2f}, "
-                f"gap={abs(curr_x - prev_x):.2f}"
-            )
-            columns.append(current_column)
-            current_column = [chunk]
+    narrow = (arrays.right - arrays.left) < SPANNING_CHUNK_WIDTH
+    span_starts, span_ends = merge_intervals(
+        arrays.left[narrow], arrays.right[narrow], COLUMN_GUTTER_WIDTH)
+    if len(span_starts) < 2:
+        return [[np.arange(len(arrays))]]
+
+    spans, column = count_overlapped_spans(arrays.left, arrays.right, span_starts, span_ends)
+    spanning = spans > 1
+    # Chunks in a margin, outside every column, join the next column to
+    # their right (or the last column)
+    column = np.minimum(column, len(span_starts) - 1)
+    column[spanning] = 0
+
+    # Spanning chunks in reading order; every other chunk belongs to the
+    # section between the spanning chunks above and below it
+    spanners = np.flatnonzero(spanning)
+    spanners = spanners[np.argsort(arrays.top[spanners], kind='stable')]
+    section = 2 * np.searchsorted(arrays.top[spanners], arrays.top, side='right')
+    section[spanners] = 2 * np.arange(len(spanners)) + 1
+
+    order = np.lexsort((column, section))
+    sections: List[List[np.ndarray]] = []
+    for members in np.split(order, np.flatnonzero(np.diff(section[order])) + 1):
+        columns = np.split(members, np.flatnonzero(np.diff(column[members])) + 1)
+        if len(columns) == 1 and sections and len(sections[-1]) == 1:
+            sections[-1] = [np.concatenate((sections[-1][0], members))]
         else:
-            current_column.append(chunk)
+            sections.append(columns)
+
+    logger.debug("Layout detection complete: %d sections, %d gutters, %d spanning chunks",
+                 len(sections), max(len(span_starts) - 1, 0), len(spanners))
+    return sections
+
+
+def _detect_column_indices(arrays: ChunkArrays) -> List[np.ndarray]:
+    """
+    Detect column structure based on horizontal positioning.
 
-    if current_column:
-        columns.append(current_column)
+    Args:
+        arrays: Chunks of a single page
 
+    Returns:
+        Indices into ``arrays`` for each column in reading order; chunks
+        spanning several columns form columns of their own
+    """
+    columns = [column for section in _detect_sections(arrays) for column in section]
     logger.debug(f"Column detection complete: {len(columns)} columns identified")
     return columns
 
 
-def _reconstruct_single_column(chunks: List[TextChunk]) -> str:
+def _detect_table_rows(arrays: ChunkArrays, columns: List[np.ndarray]) -> Optional[List[np.ndarray]]:
+    """
+    Detect whether a multi-column section is a table.
+
+    A section is read as a table when its chunks form at least two lines
+    (see PageIndex.lines), every line has cells in at least two columns,
+    and no gap between lines is large enough to be a paragraph break -
+    side-by-side paragraphs of column text are further apart.
+
+    Args:
+        arrays: Chunks of a single page
+        columns: Indices into ``arrays`` for each column of the section
+
+    Returns:
+        Rows top to bottom, each an array of indices into ``arrays`` left
+        to right, or None if the section is not a table
+    """
+    members = np.concatenate(columns)
+    column = np.repeat(np.arange(len(columns)), [len(c) for c in columns])
+    top, bottom = arrays.top[members], arrays.bottom[members]
+
+    line = group_overlapping(top, bottom)
+    lines = int(line.max()) + 1
+    if lines < 2:
+        return None
+
+    cells = np.unique(line * len(columns) + column) // len(columns)
+    if np.bincount(cells, minlength=lines).min() < 2:
+        return None
+
+    line_top = np.full(lines, np.inf)
+    line_bottom = np.full(lines, -np.inf)
+    np.minimum.at(line_top, line, top)
+    np.maximum.at(line_bottom, line, bottom)
+    if np.any(line_top[1:] - line_bottom[:-1] > PARAGRAPH_GAP_THRESHOLD):
+        return None
+
+    order = np.lexsort((arrays.left[members], line))
+    return np.split(members[order], np.flatnonzero(np.diff(line[order])) + 1)
+
+
+def _detect_columns(chunks: List[TextChunk]) -> List[List[TextChunk]]:
+    """
+    Detect column structure based on horizontal positioning.
+
+    Args:
+        chunks: List of TextChunk objects
+
+    Returns:
+        List of column lists, each containing chunks for that column
+    """
+    columns = _detect_column_indices(ChunkArrays.from_text_chunks(chunks))
+    return [[chunks[i] for i in column.tolist()] for column in columns]
+
+
+def _reconstruct_single_column_arrays(arrays: ChunkArrays) -> str:
     """
     Reconstruct text from single column layout.
 
+    A blank line is inserted wherever the vertical gap to the previous
+    chunk exceeds PARAGRAPH_GAP_THRESHOLD.
+
     Args:
-        chunks: List of TextChunk objects in reading order
+        arrays: Chunks in reading order
 
     Returns:
         Reconstructed text with appropriate spacing
     """
-    if not chunks:
+    if not len(arrays):
         return ""
 
-    lines = []
-    prev_bottom = 0
+    # Vertical gap of every chunk to the one above it (the page top for
+    # the first chunk)
+    prev_bottom = np.concatenate(([0.0], arrays.bottom[:-1]))
+    paragraph_breaks = (arrays.top - prev_bottom) > PARAGRAPH_GAP_THRESHOLD
 
-    # Threshold for paragraph break (5% of page height)
-    PARAGRAPH_GAP_THRESHOLD = 0.05
+    result = '\n'.join(
+        '\n' + text if is_break else text
+        for text, is_break in zip(arrays.text, paragraph_breaks.tolist()))
+    logger.debug("Single column reconstruction: %d lines, %d paragraph breaks",
+                 len(arrays), int(paragraph_breaks.sum()))
+    return result
 
-    for chunk in chunks:
-        # Add vertical spacing if there's a gap
-        vertical_gap = chunk.box.top - prev_bottom
 
-        if vertical_gap > PARAGRAPH_GAP_THRESHOLD:
-            # Add blank line for paragraph break
-            lines.append("")
-            logger.debug(f"Paragraph break detected: gap={vertical_gap:.2f}")
+def _reconstruct_single_column(chunks: List[TextChunk]) -> str:
+    """
+    Reconstruct text from single column layout.
 
-        lines.append(chunk.text)
-        prev_bottom = chunk.box.bottom
+    Args:
+        chunks: List of TextChunk objects in reading order
 
-    result = '\n'.join(lines)
-    logger.debug(f"Single column reconstruction: {len(lines)} lines")
-    return result
+    Returns:
+        Reconstructed text with appropriate spacing
+    """
+    return _reconstruct_single_column_arrays(ChunkArrays.from_text_chunks(chunks))
 
 
-def _reconstruct_multi_column(columns: List[List[TextChunk]]) -> str:
+def _reconstruct_multi_column_arrays(
+        arrays: ChunkArrays,
+        columns: List[np.ndarray]) -> str:
     """
     Reconstruct text from multi-column layout.
 
     Processes each column top-to-bottom, combining at the end.
 
     Args:
-        columns: List of column chunk lists
+        arrays: Chunks of a single page
+        columns: Indices into ``arrays`` for each column
 
     Returns:
         Reconstructed text with column separators
     """
     column_texts = []
 
-    for col_idx, col_chunks in enumerate(columns):
-        logger.debug(f"Reconstructing column {col_idx + 1}/{len(columns)}")
+    for col_idx, column in enumerate(columns):
+        logger.debug("Reconstructing column %d/%d", col_idx + 1, len(columns))
         # Sort each column vertically
-        sorted_chunks = sorted(col_chunks, key=lambda c: c.box.top)
-        col_text = _reconstruct_single_column(sorted_chunks)
-        column_texts.append(col_text)
+        column = column[np.argsort(arrays.top[column], kind='stable')]
+        column_texts.append(_reconstruct_single_column_arrays(arrays.take(column)))
 
     # Combine columns with separator
-    result = '\n\n[Column Break]\n\n'.join(column_texts)
+    result = COLUMN_BREAK.join(column_texts)
     logger.debug(f"Multi-column reconstruction: {len(columns)} columns combined")
     return result
 
 
+def _reconstruct_multi_column(columns: List[List[TextChunk]]) -> str:
+    """
+    Reconstruct text from multi-column layout.
+
+    Args:
+        columns: List of column chunk lists
+
+    Returns:
+        Reconstructed text with column separators
+    """
+    arrays = ChunkArrays.from_text_chunks([chunk for column in columns for chunk in column])
+    bounds = np.cumsum([0] + [len(column) for column in columns])
+    return _reconstruct_multi_column_arrays(
+        arrays, [np.arange(start, end) for start, end in zip(bounds[:-1], bounds[1:])])
+
+
 def apply_grounding_to_output(chunks: List[Dict[str, Any]]) -> Dict[str, Any]:
     """
     Apply grounding data to enhance output structure.
@@ -319,22 +798,23 @@ def apply_grounding_to_output(chunks: List[Dict[str, Any]]) -> Dict[str, Any]:
     """
     logger.debug("Applying grounding data to extract structure metadata")
 
-    text_chunks = _parse_chunks(chunks)
-    pages = _group_by_page(text_chunks)
+    arrays = _parse_chunk_arrays(chunks)
 
     structure = {
-        'total_pages': len(pages),
-        'total_chunks': len(text_chunks),
+        'total_pages': 0,
+        'total_chunks': len(arrays),
         'pages': {}
     }
 
-    for page_num, page_chunks in pages.items():
-        columns = _detect_columns(page_chunks)
-        structure['pages'][page_num] = {
-            'chunks': len(page_chunks),
-            'columns': len(columns),
-            'has_multi_column': len(columns) > 1
-        }
+    if len(arrays):
+        for page_num, page_arrays in _sorted_pages(arrays):
+            columns = max(len(section) for section in _detect_sections(page_arrays))
+            structure['pages'][page_num] = {
+                'chunks': len(page_arrays),
+                'columns': columns,
+                'has_multi_column': columns > 1
+            }
+    structure['total_pages'] = len(structure['pages'])
 
     logger.info(
         f"Structure metadata: {structure['total_pages']} pages, "
@@ -0,0 +1,49 @@
+"""
+PDF page utilities.
+
+Helpers for splitting a PDF into smaller documents so large files can be
+sent to OCR services in parallel pieces.
+"""
+
+import io
+import logging
+from typing import List
+
+from pypdf import PdfReader, PdfWriter
+
+logger = logging.getLogger('EmailReader.Utils.PdfPages')
+
+
+def count_pdf_pages(pdf_bytes: bytes) -> int:
+    """
+    Count the pages of a PDF held in memory.
+
+    Args:
+        pdf_bytes: PDF file content as bytes
+
+    Returns:
+        Number of pages
+    """
+    return len(PdfReader(io.BytesIO(pdf_bytes)).pages)
+
+
+def extract_pdf_pages(pdf_bytes: bytes, pages: List[int]) -> bytes:
+    """
+    Build a PDF containing only the given pages.
+
+    Args:
+        pdf_bytes: PDF file content as bytes
+        pages: 1-based page numbers to keep, in order
+
+    Returns:
+        PDF bytes
+    """
+    reader = PdfReader(io.BytesIO(pdf_bytes))
+    writer = PdfWriter()
+    for page_num in pages:
+        writer.add_page(reader.pages[page_num - 1])
+    output = io.BytesIO()
+    writer.write(output)
+    logger.debug("Extracted %d of %d pages (%d bytes)",
+                 len(pages), len(reader.pages), output.tell())
+    return output.getvalue()
@@ -0,0 +1,246 @@
+"""
+Spatial index over the bounding boxes of text chunks on a page.
+
+Layout passes ask two kinds of questions about a page: which chunks
+overlap a band of the page ("everything crossing the gutter between these
+columns", "everything on this line"), and how chunks group into runs that
+overlap along one axis (columns along x, lines and table rows along y).
+Both are answered from sorted coordinate arrays: grouping is a sort plus a
+vectorized sweep, O(n log n), and a band query is a few binary searches,
+O(log n + k) for k results.
+
+Coordinates are plain floats (normalized 0-1 for LandingAI grounding);
+chunks are identified by their position in the arrays passed in.
+"""
+
+from functools import cached_property
+from typing import Tuple
+
+import numpy as np
+
+
+def group_overlapping(
+        starts: np.ndarray,
+        ends: np.ndarray,
+        tolerance: float = 0.0) -> np.ndarray:
+    """
+    Group intervals that overlap, directly or through other intervals.
+
+    As with band queries, intervals that only touch do not overlap.
+
+    Args:
+        starts: Interval starts
+        ends: Interval ends
+        tolerance: Intervals separated by a gap smaller than this are
+            grouped as if they overlapped
+
+    Returns:
+        Group number of every interval; groups are numbered 0, 1, ... in
+        order of position along the axis
+    """
+    if not len(starts):
+        return np.empty(0, dtype=np.int64)
+
+    order = np.argsort(starts, kind='stable')
+    sorted_starts = starts[order]
+    # Furthest end reached by any interval so far; an interval starting
+    # beyond it begins a new group
+    reach = np.maximum.accumulate(ends[order])
+
+    new_group = np.empty(len(order), dtype=bool)
+    new_group[0] = True
+    new_group[1:] = sorted_starts[1:] - reach[:-1] >= tolerance
+
+    groups = np.empty(len(order), dtype=np.int64)
+    groups[order] = np.cumsum(new_group) - 1
+    return groups
+
+
+def merge_intervals(
+        starts: np.ndarray,
+        ends: np.ndarray,
+        tolerance: float = 0.0) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Merge overlapping intervals into disjoint spans.
+
+    Args:
+        starts: Interval starts
+        ends: Interval ends
+        tolerance: Gaps smaller than this are closed
+
+    Returns:
+        Tuple of (span starts, span ends), sorted along the axis
+    """
+    groups = group_overlapping(starts, ends, tolerance)
+    count = int(groups.max()) + 1 if len(groups) else 0
+    span_starts = np.full(count, np.inf)
+    span_ends = np.full(count, -np.inf)
+    np.minimum.at(span_starts, groups, starts)
+    np.maximum.at(span_ends, groups, ends)
+    return span_starts, span_ends
+
+
+def count_overlapped_spans(
+        starts: np.ndarray,
+        ends: np.ndarray,
+        span_starts: np.ndarray,
+        span_ends: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Count the spans every interval overlaps.
+
+    Args:
+        starts: Interval starts
+        ends: Interval ends
+        span_starts: Starts of disjoint spans, sorted (see merge_intervals)
+        span_ends: Ends of the spans
+
+    Returns:
+        Tuple of (number of spans overlapped, position of the first span
+        overlapped) for every interval; intervals overlapping no span get
+        the position of the next span to their right
+    """
+    first = np.searchsorted(span_ends, starts, side='right')
+    last = np.searchsorted(span_starts, ends, side='left')
+    return last - first, first
+
+
+class IntervalIndex:
+    """
+    Static index of intervals answering "which intervals overlap [lo, hi]".
+
+    Intervals are binned by length (powers of two) and sorted by start
+    within each bin. An interval of length at most L that overlaps
+    [lo, hi] starts in (lo - L, hi), so each bin is searched with two
+    binary searches plus a filter over that range.
+    """
+
+    def __init__(self, starts: np.ndarray, ends: np.ndarray):
+        """
+        Build the index.
+
+        Args:
+            starts: Interval starts
+            ends: Interval ends
+        """
+        starts = np.asarray(starts, dtype=np.float64)
+        ends = np.asarray(ends, dtype=np.float64)
+        self._size = len(starts)
+
+        _, exponents = np.frexp(np.maximum(ends - starts, 0.0))
+        order = np.lexsort((starts, exponents))
+        bounds = np.flatnonzero(np.diff(exponents[order])) + 1
+
+        self._bins = []
+        for ids in np.split(order, bounds):
+            if len(ids):
+                self._bins.append((ids, starts[ids], ends[ids],
+                                   float((ends[ids] - starts[ids]).max())))
+
+    def __len__(self) -> int:
+        return self._size
+
+    def overlapping(self, lo: float, hi: float) -> np.ndarray:
+        """
+        Intervals that overlap [lo, hi].
+
+        Overlap is strict: an interval that only touches the query at an
+        endpoint is not included. A query with lo == hi returns the
+        intervals strictly containing that point.
+
+        Args:
+            lo: Query start
+            hi: Query end
+
+        Returns:
+            Sorted positions of the overlapping intervals
+        """
+        found = []
+        for ids, bin_starts, bin_ends, max_length in self._bins:
+            first = np.searchsorted(bin_starts, lo - max_length, side='right')
+            last = np.searchsorted(bin_starts, hi, side='left')
+            if first < last:
+                found.append(ids[first:last][bin_ends[first:last] > lo])
+        if not found:
+            return np.empty(0, dtype=np.int64)
+        return np.sort(np.concatenate(found))
+
+
+class PageIndex:
+    """
+    Spatial index of the chunk boxes on one page.
+
+    Other layout passes use it to find the chunks overlapping a band of
+    the page and to group chunks into lines. The index for each axis is
+    built on its first query.
+    """
+
+    def __init__(
+            self,
+            left: np.ndarray,
+            top: np.ndarray,
+            right: np.ndarray,
+            bottom: np.ndarray):
+        """
+        Build the index.
+
+        Args:
+            left: Left edge of every chunk
+            top: Top edge of every chunk
+            right: Right edge of every chunk
+            bottom: Bottom edge of every chunk
+        """
+        self.left = left
+        self.top = top
+        self.right = right
+        self.bottom = bottom
+
+    def __len__(self) -> int:
+        return len(self.left)
+
+    @cached_property
+    def _x(self) -> IntervalIndex:
+        return IntervalIndex(self.left, self.right)
+
+    @cached_property
+    def _y(self) -> IntervalIndex:
+        return IntervalIndex(self.top, self.bottom)
+
+    def in_vertical_band(self, left: float, right: float) -> np.ndarray:
+        """
+        Chunks whose horizontal extent overlaps the band from ``left`` to
+        ``right``, e.g. the gutter between two columns.
+
+        Returns:
+            Sorted chunk positions
+        """
+        return self._x.overlapping(left, right)
+
+    def in_horizontal_band(self, top: float, bottom: float) -> np.ndarray:
+        """
+        Chunks whose vertical extent overlaps the band from ``top`` to
+        ``bottom``, e.g. a line or table row.
+
+        Returns:
+            Sorted chunk positions
+        """
+        return self._y.overlapping(top, bottom)
+
+    def in_box(self, left: float, top: float, right: float, bottom: float) -> np.ndarray:
+        """
+        Chunks overlapping a rectangle.
+
+        Returns:
+            Sorted chunk positions
+        """
+        return np.intersect1d(self.in_vertical_band(left, right),
+                              self.in_horizontal_band(top, bottom), assume_unique=True)
+
+    def lines(self) -> np.ndarray:
+        """
+        Group chunks into lines: runs of chunks whose vertical extents
+        overlap. Cells of a table row form one line.
+
+        Returns:
+            Line number of every chunk, numbered top to bottom
+        """
+        return group_overlapping(self.top, self.bottom)
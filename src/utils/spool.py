@@ -0,0 +1,112 @@
+"""
+Append-only temporary buffer with placeholders filled in later.
+
+Output written in order (DOCX page bodies, cache entries) sometimes has
+parts that aren't ready when their turn comes, such as OCR pages waiting
+for a retry. A Spool lets everything before and after such a part be
+written as usual: reserve() marks its place, and fill() supplies it
+whenever it is ready. copy_to() then streams the whole buffer with every
+placeholder replaced by its content.
+
+Written data and filled placeholders live in temporary files, so memory
+doesn't grow with the size of the output.
+"""
+
+import tempfile
+from typing import BinaryIO, Dict, List, Tuple
+
+# Size of the blocks copied out of the temporary files
+COPY_BLOCK_SIZE = 1024 * 1024
+
+
+class Spool:
+    """
+    Append-only binary buffer with reserved places filled out of order.
+
+        spool = Spool()
+        spool.write(b'<page 1>')
+        slot = spool.reserve()
+        spool.write(b'<page 3>')
+        spool.fill(slot, b'<page 2>')
+        spool.copy_to(target)  # <page 1><page 2><page 3>
+    """
+
+    def __init__(self):
+        self._data = tempfile.TemporaryFile()
+        self._filled = tempfile.TemporaryFile()
+        # Offset in _data of every reserved place, in slot order
+        self._slots: List[int] = []
+        # Slot -> (offset, length) of its content in _filled
+        self._fills: Dict[int, Tuple[int, int]] = {}
+
+    @property
+    def pending(self) -> List[int]:
+        """Reserved slots that haven't been filled, in order."""
+        return [slot for slot in range(len(self._slots)) if slot not in self._fills]
+
+    def write(self, data: bytes) -> None:
+        """Append data after everything written or reserved so far."""
+        self._data.write(data)
+
+    def reserve(self) -> int:
+        """
+        Reserve a place for data supplied later with fill().
+
+        Returns:
+            Slot number for fill()
+        """
+        self._slots.append(self._data.tell())
+        return len(self._slots) - 1
+
+    def fill(self, slot: int, data: bytes) -> None:
+        """
+        Supply the data of a reserved place.
+
+        Args:
+            slot: Slot number from reserve()
+            data: Data for the place
+
+        Raises:
+            ValueError: If the slot doesn't exist or is already filled
+        """
+        if not 0 <= slot < len(self._slots) or slot in self._fills:
+            raise ValueError(f"Slot {slot} is not reserved or already filled")
+        self._filled.seek(0, 2)
+        self._fills[slot] = (self._filled.tell(), len(data))
+        self._filled.write(data)
+
+    def copy_to(self, target: BinaryIO) -> None:
+        """
+        Write the buffer, with placeholders replaced, to a file.
+
+        Args:
+            target: Binary file-like object to write to
+
+        Raises:
+            ValueError: If a reserved place hasn't been filled
+        """
+        if self.pending:
+            raise ValueError(f"Unfilled slots: {self.pending}")
+        end = self._data.tell()
+        self._data.seek(0)
+        for slot, offset in enumerate(self._slots):
+            self._copy(self._data, offset - self._data.tell(), target)
+            start, length = self._fills[slot]
+            self._filled.seek(start)
+            self._copy(self._filled, length, target)
+        self._copy(self._data, end - self._data.tell(), target)
+
+    @staticmethod
+    def _copy(source: BinaryIO, length: int, target: BinaryIO) -> None:
+        """Copy length bytes from the current position of source."""
+        while length > 0:
+            block = source.read(min(length, COPY_BLOCK_SIZE))
+            if not block:
+                break
+            target.write(block)
+            length -= len(block)
+
+    def close(self) -> None:
+        """Release the temporary files."""
+        self._data.close()
+        self._filled.close()
@@ -2,5 +2,22 @@
 import os
 import sys
 
+import pytest
+
 # Add src directory to path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+
+@pytest.fixture(autouse=True)
+def reset_ocr_provider_registry():
+    """Give every test fresh OCR providers, circuit breakers and statistics."""
+    from src.ocr.circuit_breaker import reset_circuit_breakers
+    from src.ocr.ocr_factory import OCRProviderFactory
+    from src.ocr.provider_stats import reset_provider_stats
+    OCRProviderFactory.clear_cache()
+    reset_circuit_breakers()
+    reset_provider_stats()
+    yield
+    OCRProviderFactory.clear_cache()
+    reset_circuit_breakers()
+    reset_provider_stats()
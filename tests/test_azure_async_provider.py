@@ -0,0 +1,238 @@
+"""Tests for the async Azure OCR provider."""
+import asyncio
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+from azure.core.exceptions import HttpResponseError
+
+from src.document_analyzer import PdfAnalysis
+from src.ocr.azure_async_provider import AsyncAzureOCRProvider, AsyncRateLimiter
+from src.ocr.ocr_factory import OCRProviderFactory
+
+AZURE_CONFIG = {
+    'endpoint': 'https://example.cognitiveservices.azure.com/',
+    'api_key': 'test_key',
+}
+
+
+def _parse_pages(pages):
+    """Expand an Azure pages expression such as '1-3,5'."""
+    numbers = []
+    for part in pages.split(','):
+        start, _, end = part.partition('-')
+        numbers.extend(range(int(start), int(end or start) + 1))
+    return numbers
+
+
+def _azure_result(page_numbers):
+    """Build a fake Azure result with one line per page."""
+    pages = []
+    for number in page_numbers:
+        page = Mock()
+        page.page_number = number
+        page.lines = [Mock(content=f'page {number}')]
+        pages.append(page)
+    return Mock(pages=pages)
+
+
+class FakeAsyncClient:
+    """Async client stand-in that records how many analyses overlap."""
+
+    def __init__(self, delay=0.02, failures=0):
+        self.delay = delay
+        self.failures = failures
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def begin_analyze_document(self, model, document, pages=None):
+        self.calls.append(pages)
+        if self.failures:
+            self.failures -= 1
+            raise HttpResponseError(message='429 Too Many Requests')
+        client = self
+
+        class Poller:
+            async def result(self):
+                client.in_flight += 1
+                client.max_in_flight = max(client.max_in_flight, client.in_flight)
+                await asyncio.sleep(client.delay)
+                client.in_flight -= 1
+                numbers = _parse_pages(pages) if pages else [1]
+                return _azure_result(numbers)
+
+        return Poller()
+
+
+@pytest.fixture
+def scanned_pdf(tmp_path):
+    """A two-page scanned PDF and its analysis."""
+    path = tmp_path / 'scan.pdf'
+    path.write_bytes(b'%PDF-1.4 fake')
+    return str(path), PdfAnalysis(path=str(path), is_valid=True, page_texts=['', ''])
+
+
+def _provider(client, **config):
+    provider = AsyncAzureOCRProvider({**AZURE_CONFIG, **config})
+    provider._create_async_client = lambda: client
+    provider._save_as_docx = lambda pages, out: open(out, 'w').write('\n'.join(pages))
+    return provider
+
+
+class TestAsyncRateLimiter:
+    """Test submission spacing."""
+
+    def test_spaces_calls(self):
+        """Test calls beyond the rate wait for their slot."""
+        async def run():
+            limiter = AsyncRateLimiter(rate=50)
+            start = time.monotonic()
+            for _ in range(4):
+                await limiter.acquire()
+            return time.monotonic() - start
+
+        assert asyncio.run(run()) >= 3 / 50 * 0.9
+
+    def test_unlimited(self):
+        """Test a rate of 0 disables limiting."""
+        async def run():
+            limiter = AsyncRateLimiter(rate=0)
+            for _ in range(100):
+                await limiter.acquire()
+
+        asyncio.run(run())
+
+
+class TestAsyncAzureOCRProvider:
+    """Test concurrent analyses and the awaitable API."""
+
+    def test_process_document_async(self, scanned_pdf, tmp_path):
+        """Test scanned pages are OCR'd and written in page order."""
+        path, analysis = scanned_pdf
+        client = FakeAsyncClient()
+        provider = _provider(client)
+        output = tmp_path / 'out.docx'
+
+        asyncio.run(provider.process_document_async(path, str(output), analysis=analysis))
+
+        assert client.calls == ['1-2']
+        assert output.read_text() == 'page 1\npage 2'
+
+    def test_concurrency_is_bounded(self, tmp_path):
+        """Test many documents overlap but never exceed max_concurrency."""
+        client = FakeAsyncClient()
+        provider = _provider(client, max_concurrency=2, max_tps=0)
+        jobs = []
+        for n in range(5):
+            path = tmp_path / f'scan{n}.pdf'
+            path.write_bytes(b'%PDF-1.4 fake')
+            jobs.append((str(path), str(tmp_path / f'out{n}.docx')))
+
+        with patch('src.ocr.azure_async_provider.analyze_pdf',
+                   side_effect=lambda p: PdfAnalysis(path=p, is_valid=True,
+                                                     page_texts=[''])):
+            errors = asyncio.run(provider.process_documents_async(jobs))
+
+        assert errors == [None] * 5
+        assert client.max_in_flight == 2
+
+    def test_failed_job_reported(self, tmp_path):
+        """Test one failing document doesn't fail the batch."""
+        provider = _provider(FakeAsyncClient())
+        errors = asyncio.run(provider.process_documents_async(
+            [(str(tmp_path / 'missing.pdf'), str(tmp_path / 'out.docx'))]))
+
+        assert isinstance(errors[0], FileNotFoundError)
+
+    @patch('src.ocr.azure_async_provider.asyncio.sleep')
+    def test_retries_http_errors(self, mock_sleep, scanned_pdf, tmp_path):
+        """Test throttled submissions are retried with backoff."""
+        async def no_wait(seconds):
+            return None
+        mock_sleep.side_effect = no_wait
+        path, analysis = scanned_pdf
+        client = FakeAsyncClient(delay=0, failures=1)
+        provider = _provider(client, max_tps=0)
+
+        asyncio.run(provider.process_document_async(
+            path, str(tmp_path / 'out.docx'), analysis=analysis))
+
+        assert len(client.calls) == 2
+        mock_sleep.assert_any_call(2)
+
+    def test_sync_wrapper_inside_running_loop(self, scanned_pdf, tmp_path):
+        """Test process_document works when called from async code."""
+        path, analysis = scanned_pdf
+        provider = _provider(FakeAsyncClient())
+        output = tmp_path / 'out.docx'
+
+        async def pipeline():
+            provider.process_document(path, str(output), analysis=analysis)
+
+        asyncio.run(pipeline())
+        assert output.read_text() == 'page 1\npage 2'
+
+    def test_sync_calls_share_limits(self, tmp_path):
+        """Test documents processed from separate threads share one limit."""
+        from concurrent.futures import ThreadPoolExecutor
+        client = FakeAsyncClient(delay=0.05)
+        provider = _provider(client, max_concurrency=1, max_tps=0)
+        jobs = []
+        for n in range(3):
+            path = tmp_path / f'scan{n}.pdf'
+            path.write_bytes(b'%PDF-1.4 fake')
+            analysis = PdfAnalysis(path=str(path), is_valid=True, page_texts=[''])
+            jobs.append((str(path), str(tmp_path / f'out{n}.docx'), analysis))
+
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            list(pool.map(lambda job: provider.process_document(
+                job[0], job[1], analysis=job[2]), jobs))
+
+        assert len(client.calls) == 3
+        assert client.max_in_flight == 1
+
+    def test_client_reused_across_documents(self, scanned_pdf, tmp_path):
+        """Test one client and loop serve every document until closed."""
+        path, analysis = scanned_pdf
+        created = []
+        provider = _provider(None)
+        provider._create_async_client = lambda: created.append(FakeAsyncClient()) or created[-1]
+
+        provider.warm_up()
+        provider.process_document(path, str(tmp_path / 'a.docx'), analysis=analysis)
+        asyncio.run(provider.process_document_async(
+            path, str(tmp_path / 'b.docx'), analysis=analysis))
+        provider.close()
+
+        assert len(created) == 1
+        assert created[0].calls == ['1-2', '1-2']
+
+    def test_factory_selects_async_provider(self):
+        """Test ocr.azure.use_async selects the async provider."""
+        config = {'ocr': {'azure': {**AZURE_CONFIG, 'use_async': True}}}
+        provider = OCRProviderFactory.get_provider(config, translation_mode='human')
+        assert isinstance(provider, AsyncAzureOCRProvider)
+
+    def test_large_documents_are_sharded(self, tmp_path):
+        """Test shards are analyzed concurrently and merged in page order."""
+        path = tmp_path / 'big.pdf'
+        path.write_bytes(b'%PDF-1.4 fake')
+        analysis = PdfAnalysis(path=str(path), is_valid=True, page_texts=[''] * 5)
+        client = FakeAsyncClient()
+        provider = _provider(client, shard_size=2, max_tps=0)
+        provider._extract_pdf_pages = lambda data, pages: data
+        output = tmp_path / 'out.docx'
+
+        asyncio.run(provider.process_document_async(str(path), str(output),
+                                                     analysis=analysis))
+
+        assert sorted(client.calls) == ['1', '1-2', '1-2']
+        assert client.max_in_flight == 3
+        assert output.read_text() == 'page 1\npage 2\npage 1\npage 2\npage 1'
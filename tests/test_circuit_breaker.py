@@ -0,0 +1,229 @@
+"""Unit tests for the OCR provider circuit breaker and fallback routing."""
+import pytest
+from unittest.mock import MagicMock, patch
+
+from src.ocr.circuit_breaker import (
+    CLOSED, HALF_OPEN, OPEN, CircuitBreaker, get_circuit_breaker,
+    get_circuit_metrics)
+from src.ocr.fallback import process_with_fallback
+
+
+class FakeClock:
+    """Controllable replacement for time.monotonic()."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    fake = FakeClock()
+    with patch('src.ocr.circuit_breaker.time.monotonic', fake):
+        yield fake
+
+
+class TestCircuitBreaker:
+    """Test circuit breaker state transitions."""
+
+    def test_opens_after_consecutive_failures(self, clock):
+        """Test the circuit opens once the failure threshold is reached."""
+        breaker = CircuitBreaker('azure', failure_threshold=3)
+
+        for _ in range(2):
+            assert breaker.allow_request()
+            breaker.record_failure()
+        assert breaker.state == CLOSED
+
+        breaker.record_failure()
+        assert breaker.state == OPEN
+        assert not breaker.allow_request()
+
+    def test_success_resets_failure_count(self, clock):
+        """Test a success in between failures keeps the circuit closed."""
+        breaker = CircuitBreaker('azure', failure_threshold=2)
+
+        breaker.record_failure()
+        breaker.record_success(1.0)
+        breaker.record_failure()
+
+        assert breaker.state == CLOSED
+
+    def test_slow_calls_count_as_failures(self, clock):
+        """Test calls over the latency threshold open the circuit."""
+        breaker = CircuitBreaker('landing_ai', failure_threshold=2,
+                                 latency_threshold=10.0)
+
+        breaker.record_success(5.0)
+        breaker.record_success(30.0)
+        breaker.record_success(30.0)
+
+        assert breaker.state == OPEN
+        assert breaker.get_metrics()['slow_calls'] == 2
+
+    def test_half_open_after_reset_timeout(self, clock):
+        """Test trial requests are allowed once the reset timeout passes."""
+        breaker = CircuitBreaker('azure', failure_threshold=1,
+                                 reset_timeout=60, half_open_max_calls=1)
+        breaker.record_failure()
+
+        clock.now += 59
+        assert not breaker.allow_request()
+
+        clock.now += 1
+        assert breaker.state == HALF_OPEN
+        assert breaker.allow_request()
+        # Only one trial request at a time
+        assert not breaker.allow_request()
+
+    def test_successful_trial_closes_circuit(self, clock):
+        """Test a successful half-open trial closes the circuit."""
+        breaker = CircuitBreaker('azure', failure_threshold=1, reset_timeout=60)
+        breaker.record_failure()
+        clock.now += 60
+
+        assert breaker.allow_request()
+        breaker.record_success(1.0)
+
+        assert breaker.state == CLOSED
+        assert breaker.allow_request()
+
+    def test_failed_trial_reopens_circuit(self, clock):
+        """Test a failed half-open trial opens the circuit again."""
+        breaker = CircuitBreaker('azure', failure_threshold=1, reset_timeout=60)
+        breaker.record_failure()
+        clock.now += 60
+
+        assert breaker.allow_request()
+        breaker.record_failure()
+
+        assert breaker.state == OPEN
+        assert not breaker.allow_request()
+        assert breaker.get_metrics()['times_opened'] == 2
+
+    def test_metrics(self, clock):
+        """Test the metrics snapshot counts calls and rejections."""
+        breaker = CircuitBreaker('azure', failure_threshold=1)
+        breaker.record_success(1.0)
+        breaker.record_failure()
+        breaker.allow_request()
+
+        metrics = breaker.get_metrics()
+        assert metrics['state'] == OPEN
+        assert metrics['calls'] == 2
+        assert metrics['failures'] == 1
+        assert metrics['rejected'] == 1
+
+    def test_transitions_are_logged(self, clock, caplog):
+        """Test state changes are logged as structured lines."""
+        breaker = CircuitBreaker('azure', failure_threshold=1)
+
+        with caplog.at_level('INFO', logger='EmailReader.OCR.CircuitBreaker'):
+            breaker.record_failure()
+
+        assert "CIRCUIT | provider=azure | state=open | previous=closed" in caplog.text
+
+    def test_from_config(self):
+        """Test the breaker reads the circuit_breaker config section."""
+        breaker = CircuitBreaker.from_config('azure', {
+            'failure_threshold': 5,
+            'latency_threshold_seconds': 120,
+            'reset_timeout_seconds': 30,
+            'half_open_max_calls': 2})
+
+        assert breaker.failure_threshold == 5
+        assert breaker.latency_threshold == 120.0
+        assert breaker.reset_timeout == 30.0
+        assert breaker.half_open_max_calls == 2
+
+    def test_registry_shares_breakers(self):
+        """Test breakers are shared per provider name."""
+        breaker = get_circuit_breaker('azure', {'failure_threshold': 1})
+
+        assert get_circuit_breaker('azure') is breaker
+        assert set(get_circuit_metrics()) == {'azure'}
+
+
+class TestProcessWithFallback:
+    """Test OCR fallback routing through the circuit breaker."""
+
+    CONFIG = {'ocr': {'circuit_breaker': {'failure_threshold': 2,
+                                          'reset_timeout_seconds': 60}}}
+
+    @pytest.fixture
+    def providers(self):
+        primary = MagicMock()
+        fallback = MagicMock()
+        with patch('src.ocr.fallback.load_config', return_value=self.CONFIG), \
+                patch('src.ocr.fallback.OCRProviderFactory.get_provider_by_type',
+                      return_value=primary), \
+                patch('src.ocr.fallback.OCRProviderFactory.get_fallback_provider',
+                      return_value=fallback):
+            yield primary, fallback
+
+    def test_primary_success(self, providers):
+        """Test the fallback is not used when the primary succeeds."""
+        primary, fallback = providers
+
+        process_with_fallback('in.pdf', 'out.docx', translation_mode='human')
+
+        primary.process_document.assert_called_once()
+        fallback.process_document.assert_not_called()
+        assert get_circuit_breaker('azure').state == CLOSED
+
+    def test_primary_failure_uses_fallback(self, providers):
+        """Test a failing primary falls back to the default provider."""
+        primary, fallback = providers
+        primary.process_document.side_effect = RuntimeError("Azure down")
+
+        process_with_fallback('in.pdf', 'out.docx', translation_mode='human',
+                              source_language='ru')
+
+        fallback.process_document.assert_called_once_with(
+            'in.pdf', 'out.docx', analysis=None, source_language='ru')
+
+    def test_open_circuit_skips_primary(self, providers):
+        """Test documents go straight to the fallback while the circuit is open."""
+        primary, fallback = providers
+        primary.process_document.side_effect = RuntimeError("Azure down")
+
+        for _ in range(3):
+            process_with_fallback('in.pdf', 'out.docx', translation_mode='human')
+
+        assert primary.process_document.call_count == 2
+        assert fallback.process_document.call_count == 3
+        assert get_circuit_breaker('azure').get_metrics()['rejected'] == 1
+
+    def test_default_mode_has_no_breaker(self, providers):
+        """Test the default provider is not guarded by a breaker."""
+        primary, _ = providers
+        primary.process_document.side_effect = RuntimeError("Tesseract failed")
+
+        for _ in range(3):
+            process_with_fallback('in.pdf', 'out.docx')
+
+        assert primary.process_document.call_count == 3
+        assert get_circuit_metrics() == {}
+
+    def test_both_fail(self, providers):
+        """Test an error is raised when the fallback fails too."""
+        primary, fallback = providers
+        primary.process_document.side_effect = RuntimeError("Azure down")
+        fallback.process_document.side_effect = RuntimeError("no tesseract")
+
+        with pytest.raises(RuntimeError, match="Both primary and fallback OCR failed"):
+            process_with_fallback('in.pdf', 'out.docx', translation_mode='human')
+
+    def test_breaker_disabled(self, providers):
+        """Test the breaker can be switched off in configuration."""
+        primary, _ = providers
+        primary.process_document.side_effect = RuntimeError("Azure down")
+        config = {'ocr': {'circuit_breaker': {'enabled': False}}}
+
+        with patch('src.ocr.fallback.load_config', return_value=config):
+            for _ in range(5):
+                process_with_fallback('in.pdf', 'out.docx', translation_mode='human')
+
+        assert primary.process_document.call_count == 5
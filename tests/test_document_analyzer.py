@@ -3,7 +3,10 @@ import os
 import pytest
 import tempfile
 from pathlib import Path
+from unittest.mock import patch
 from src.document_analyzer import (
+    PdfAnalysis,
+    analyze_pdf,
     requires_ocr,
     get_document_type,
     get_pdf_type,
@@ -263,3 +266,69 @@ class TestDocumentAnalyzer:
                 assert doc_type == 'image', f"Failed for extension {ext}"
             finally:
                 os.remove(temp_path)
+
+
+class TestAnalyzePdf:
+    """Test single-pass PDF analysis."""
+
+    @pytest.fixture
+    def test_docs_path(self):
+        """Get path to test documents."""
+        return os.path.join(os.path.dirname(__file__), '..', 'test_docs')
+
+    def test_analyze_searchable_pdf(self, test_docs_path):
+        """Test analysis of a searchable PDF collects per-page text."""
+        pdf_path = os.path.join(test_docs_path, 'file-sample-pdf.pdf')
+        if not os.path.exists(pdf_path):
+            pytest.skip(f"Test file not found: {pdf_path}")
+
+        analysis = analyze_pdf(pdf_path)
+
+        assert analysis.is_valid is True
+        assert analysis.is_encrypted is False
+        assert analysis.page_count == len(analysis.page_image_coverage)
+        assert analysis.is_searchable is True
+        assert any(analysis.searchable_pages)
+        assert get_pdf_type(pdf_path, analysis) == 'pdf_searchable'
+
+    def test_analyze_scanned_pdf(self, test_docs_path):
+        """Test analysis of a scanned PDF reports image-only pages."""
+        pdf_path = os.path.join(test_docs_path, 'PDF-scanned-rus-words.pdf')
+        if not os.path.exists(pdf_path):
+            pytest.skip(f"Test file not found: {pdf_path}")
+
+        analysis = analyze_pdf(pdf_path)
+
+        assert analysis.is_valid is True
+        assert analysis.page_count > 0
+        assert analysis.is_searchable is False
+        assert analysis.searchable_ratio == 0.0
+        assert all(coverage > 0.5 for coverage in analysis.page_image_coverage)
+        assert requires_ocr(pdf_path, analysis=analysis) is True
+
+    def test_analyze_invalid_pdf(self):
+        """Test invalid PDFs are reported instead of raising."""
+        with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as f:
+            f.write(b'This is not a PDF file' * 10)
+            temp_path = f.name
+        try:
+            analysis = analyze_pdf(temp_path)
+            assert analysis.is_valid is False
+            assert 'magic bytes' in analysis.error
+            assert get_pdf_type(temp_path, analysis) == 'pdf_scanned'
+        finally:
+            os.unlink(temp_path)
+
+    def test_requires_ocr_uses_analysis_without_reparsing(self):
+        """Test a precomputed analysis is used instead of re-reading the PDF."""
+        with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as f:
+            f.write(b'%PDF-1.4' + b' ' * 200)
+            temp_path = f.name
+        try:
+            analysis = PdfAnalysis(path=temp_path, is_valid=True,
+                                   page_texts=['searchable text'])
+            with patch('src.document_analyzer.is_pdf_searchable_pypdf') as mock_check:
+                assert requires_ocr(temp_path, analysis=analysis) is False
+            mock_check.assert_not_called()
+        finally:
+            os.unlink(temp_path)
@@ -0,0 +1,158 @@
+"""Unit tests for page-at-a-time DOCX writing."""
+import os
+from unittest.mock import patch
+
+import pytest
+from docx import Document
+from docx.shared import Pt
+
+from src.convert_to_docx import DocxPageWriter
+from src.ocr.rasterizer import PageImage
+
+
+def page_breaks(document):
+    """Number of page breaks in a document."""
+    return len(document.element.body.xpath('.//w:br[@w:type="page"]'))
+
+
+class TestDocxPageWriter:
+    """Test the incremental DOCX writer."""
+
+    def test_pages_separated_by_page_breaks(self, tmp_path):
+        """Test every page after the first starts on a new DOCX page."""
+        out = str(tmp_path / 'out.docx')
+
+        with DocxPageWriter(out) as writer:
+            for text in ('one\n\f', 'two\n\f', 'three\n\f'):
+                writer.add_page(text)
+
+        document = Document(out)
+        assert [p.text for p in document.paragraphs if p.text] == ['one', 'two', 'three']
+        assert page_breaks(document) == 2
+        assert (writer.pages, writer.characters) == (3, 11)
+
+    def test_paragraphs_and_line_breaks(self, tmp_path):
+        """Test blank lines start paragraphs and single newlines stay line breaks."""
+        out = str(tmp_path / 'out.docx')
+
+        with DocxPageWriter(out) as writer:
+            writer.add_page('Title\n\nfirst line\nsecond\tcolumn\n\n\nlast')
+
+        assert [p.text for p in Document(out).paragraphs] == [
+            'Title', 'first line\nsecond\tcolumn', 'last']
+
+    def test_text_sanitized_and_escaped(self, tmp_path):
+        """Test invalid XML characters are removed and markup is escaped."""
+        out = str(tmp_path / 'out.docx')
+
+        with DocxPageWriter(out) as writer:
+            writer.add_page('a < b & \x00c\ud800')
+
+        assert Document(out).paragraphs[0].text == 'a < b & c'
+
+    def test_blank_pages_kept(self, tmp_path):
+        """Test empty pages still take up a page."""
+        out = str(tmp_path / 'out.docx')
+
+        with DocxPageWriter(out) as writer:
+            writer.add_page('first')
+            writer.add_page('')
+            writer.add_page('third')
+
+        assert page_breaks(Document(out)) == 2
+
+    def test_font_size(self, tmp_path):
+        """Test an explicit font size is applied to every run."""
+        out = str(tmp_path / 'out.docx')
+
+        with DocxPageWriter(out, font_size=11) as writer:
+            writer.add_page('text')
+
+        assert Document(out).paragraphs[0].runs[0].font.size == Pt(11)
+
+    def test_nothing_written_on_error(self, tmp_path):
+        """Test a failed OCR run leaves no partial DOCX behind."""
+        out = tmp_path / 'out.docx'
+
+        with pytest.raises(RuntimeError):
+            with DocxPageWriter(str(out)) as writer:
+                writer.add_page('page')
+                raise RuntimeError('OCR failed')
+
+        assert os.listdir(tmp_path) == []
+
+    def test_reserved_pages_filled_later(self, tmp_path):
+        """Test a reserved page keeps its place while later pages are added."""
+        out = str(tmp_path / 'out.docx')
+
+        with DocxPageWriter(out) as writer:
+            writer.add_page('one')
+            number = writer.reserve_page()
+            writer.add_page('three')
+            assert writer.reserved_pages == [number] == [2]
+            writer.fill_page(number, 'two')
+
+        document = Document(out)
+        assert [p.text for p in document.paragraphs if p.text] == ['one', 'two', 'three']
+        assert page_breaks(document) == 2
+        assert (writer.pages, writer.characters) == (3, 11)
+
+    def test_unfilled_reservation_not_saved(self, tmp_path):
+        """Test a document with a page never filled isn't saved."""
+        writer = DocxPageWriter(str(tmp_path / 'out.docx'))
+        writer.reserve_page()
+
+        with pytest.raises(ValueError):
+            writer.close()
+        assert os.listdir(tmp_path) == []
+
+    def test_closed_writer_rejects_pages(self, tmp_path):
+        """Test pages can't be added after saving."""
+        writer = DocxPageWriter(str(tmp_path / 'out.docx'))
+        writer.close()
+
+        with pytest.raises(ValueError):
+            writer.add_page('late')
+
+
+class TestIncrementalOcrOutput:
+    """Test OCR pipelines push pages into the writer as they complete."""
+
+    @patch('src.pdf_image_ocr.ParallelTesseractEngine')
+    @patch('src.pdf_image_ocr.select_languages', return_value='eng')
+    @patch('src.pdf_image_ocr.get_rasterizer')
+    def test_pages_written_as_recognized(self, mock_get, mock_select, mock_engine,
+                                         tmp_path):
+        """Test each page reaches the DOCX before the next one is recognized."""
+        from src.pdf_image_ocr import ocr_pdf_image_to_doc
+        pdf = tmp_path / 'scan.pdf'
+        pdf.write_bytes(b'%PDF-1.4')
+        mock_get.return_value.iter_pages.return_value = iter(
+            [PageImage(n, 1, 1, b'\x00') for n in (1, 2, 3)])
+        written = []
+
+        def ocr_stream(stream):
+            for num, _ in stream:
+                # Every earlier page has been written before this one is yielded
+                assert written == [f'page {n}\n\f' for n in range(1, num)]
+                yield num, f'page {num}\n\f'
+        mock_engine.return_value.ocr_stream.side_effect = ocr_stream
+
+        with patch.object(DocxPageWriter, 'add_page', autospec=True,
+                          side_effect=lambda writer, text: written.append(text)):
+            ocr_pdf_image_to_doc(str(pdf), str(tmp_path / 'out.docx'))
+
+        assert written == [f'page {n}\n\f' for n in (1, 2, 3)]
+
+    def test_azure_pages_saved_with_page_breaks(self, tmp_path):
+        """Test Azure results are written page by page at 11pt."""
+        from src.ocr.azure_provider import AzureOCRProvider
+        provider = AzureOCRProvider.__new__(AzureOCRProvider)
+        out = str(tmp_path / 'out.docx')
+
+        provider._save_as_docx(['first page', '', 'third page'], out)
+
+        document = Document(out)
+        assert [p.text for p in document.paragraphs if p.text] == ['first page', 'third page']
+        assert page_breaks(document) == 2
+        assert document.paragraphs[0].runs[0].font.size == Pt(11)
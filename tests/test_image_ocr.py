@@ -0,0 +1,120 @@
+"""Tests for OCR of image uploads (single images and multi-frame TIFFs)."""
+from unittest.mock import MagicMock, patch
+
+import pytest
+from PIL import Image
+
+from src.ocr.image_frames import is_image_file, iter_image_frames
+
+
+@pytest.fixture
+def tiff(tmp_path):
+    """Three-page TIFF whose frames have distinct gray levels and sizes."""
+    path = tmp_path / 'scan.tiff'
+    frames = [Image.new('RGB', (4 + n, 3), color=(n * 50,) * 3) for n in range(3)]
+    frames[0].save(path, save_all=True, append_images=frames[1:])
+    return str(path)
+
+
+@pytest.fixture
+def png(tmp_path):
+    """Single-page RGB image."""
+    path = tmp_path / 'photo.png'
+    Image.new('RGB', (5, 2), color=(255, 255, 255)).save(path)
+    return str(path)
+
+
+class TestImageFrames:
+    """Test reading image files as OCR pages."""
+
+    @pytest.mark.parametrize('name,expected', [
+        ('scan.TIF', True), ('photo.jpeg', True), ('doc.pdf', False), ('a.docx', False)])
+    def test_is_image_file(self, name, expected):
+        """Test images are recognized by extension."""
+        assert is_image_file(name) is expected
+
+    def test_multi_frame_tiff(self, tiff):
+        """Test every TIFF frame becomes a grayscale page in order."""
+        pages = list(iter_image_frames(tiff))
+
+        assert [p.page_number for p in pages] == [1, 2, 3]
+        assert [p.width for p in pages] == [4, 5, 6]
+        assert pages[2].data == bytes([100] * 18)
+
+    def test_frames_are_read_lazily(self, tiff):
+        """Test later frames are not decoded before they are requested."""
+        convert = Image.Image.convert
+        with patch.object(Image.Image, 'convert', autospec=True,
+                          side_effect=convert) as mock_convert:
+            frames = iter_image_frames(tiff)
+            next(frames)
+
+        assert mock_convert.call_count == 1
+
+    def test_single_image(self, png):
+        """Test ordinary images are one grayscale page."""
+        [page] = iter_image_frames(png)
+
+        assert (page.page_number, page.width, page.height) == (1, 5, 2)
+        assert page.data == bytes([255] * 10)
+
+    def test_animated_gif_is_one_page(self, tmp_path):
+        """Test only the first frame of non-document formats is read."""
+        path = tmp_path / 'anim.gif'
+        frames = [Image.new('L', (2, 2), color=n * 100) for n in range(2)]
+        frames[0].save(path, save_all=True, append_images=frames[1:])
+
+        assert len(list(iter_image_frames(str(path)))) == 1
+
+
+class TestOcrImagePages:
+    """Test the image OCR pipeline."""
+
+    @patch('src.pdf_image_ocr.ParallelTesseractEngine')
+    @patch('src.pdf_image_ocr.select_languages', return_value='eng')
+    def test_frames_streamed_to_engine(self, mock_select, mock_engine, tiff):
+        """Test frames are OCR'd in page order with languages from the first frame."""
+        from src.pdf_image_ocr import stream_image_pages
+        mock_engine.return_value.ocr_stream.side_effect = lambda stream: (
+            (num, f'page {num}') for num, _ in stream)
+        texts = []
+
+        pages = stream_image_pages(tiff, texts.append, source_language='en')
+
+        assert pages == 3
+        assert texts == ['page 1', 'page 2', 'page 3']
+        assert mock_select.call_args.args[0].page_number == 1
+        assert mock_engine.call_args.kwargs['lang'] == 'eng'
+
+    def test_missing_image(self, tmp_path):
+        """Test a missing image raises FileNotFoundError."""
+        from src.pdf_image_ocr import stream_image_pages
+
+        with pytest.raises(FileNotFoundError):
+            stream_image_pages(str(tmp_path / 'missing.png'), lambda text: None)
+
+
+class TestDefaultProviderImages:
+    """Test the default provider's image path."""
+
+    @patch('src.ocr.default_provider.ocr_pdf_image_to_doc')
+    @patch('src.ocr.default_provider.ocr_image_to_doc')
+    def test_image_skips_pdf_checks(self, mock_image_ocr, mock_pdf_ocr, png, tmp_path):
+        """Test images are OCR'd directly without PDF validation."""
+        from src.ocr.default_provider import DefaultOCRProvider
+        provider = DefaultOCRProvider({'workers': 2})
+        provider.is_pdf_searchable = MagicMock()
+        output = str(tmp_path / 'out.docx')
+
+        def fake_ocr(input_path, output_path, **kwargs):
+            open(output_path, 'w').close()
+            return ['text']
+        mock_image_ocr.side_effect = fake_ocr
+
+        provider.process_document(png, output, source_language='ru')
+
+        provider.is_pdf_searchable.assert_not_called()
+        mock_pdf_ocr.assert_not_called()
+        kwargs = mock_image_ocr.call_args.kwargs
+        assert kwargs['max_workers'] == 2
+        assert kwargs['source_language'] == 'ru'
@@ -0,0 +1,188 @@
+"""Unit tests for page image preprocessing."""
+import pickle
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from src.ocr.image_preprocessing import (
+    PagePreprocessor, adaptive_dpi, array_to_page, binarize, estimate_skew,
+    estimate_text_height, otsu_threshold, page_to_array, rotate)
+from src.ocr.rasterizer import PageImage
+
+
+def text_page(line_height=16, spacing=40, lines=12, width=1000, angle=0.0):
+    """Synthetic page of dark text-line bars on a light gray background."""
+    pixels = np.full((lines * spacing + 200, width), 230, dtype=np.uint8)
+    for index in range(lines):
+        top = 100 + index * spacing
+        pixels[top:top + line_height, 100:width - 100] = 30
+    if angle:
+        pixels = np.asarray(Image.fromarray(pixels).rotate(angle, fillcolor=230))
+    return pixels
+
+
+class TestImageFunctions:
+    """Test the vectorized image operations."""
+
+    def test_page_round_trip(self):
+        """Test converting between PageImage and arrays keeps the pixels."""
+        pixels = np.arange(12, dtype=np.uint8).reshape(3, 4)
+
+        page = array_to_page(5, pixels)
+
+        assert (page.page_number, page.width, page.height) == (5, 4, 3)
+        assert np.array_equal(page_to_array(page), pixels)
+
+    def test_otsu_separates_ink_from_background(self):
+        """Test the threshold falls between the two intensity levels."""
+        threshold = otsu_threshold(text_page())
+
+        assert 30 <= threshold < 230
+
+    def test_binarize(self):
+        """Test binarized pages only contain black and white."""
+        binary = binarize(text_page())
+
+        assert set(np.unique(binary)) == {0, 255}
+        assert binary[110, 500] == 0
+        assert binary[10, 10] == 255
+
+    def test_text_height(self):
+        """Test the median line height is measured from the row profile."""
+        ink = text_page(line_height=16) < 128
+
+        assert estimate_text_height(ink) == 16
+
+    def test_text_height_blank_page(self):
+        """Test blank pages have no text height."""
+        assert estimate_text_height(np.zeros((100, 100), dtype=bool)) is None
+
+    @pytest.mark.parametrize('angle', [-3.0, -1.0, 2.0])
+    def test_skew_detected_and_corrected(self, angle):
+        """Test skew is found within one search step and rotating removes it."""
+        pixels = text_page(angle=angle)
+
+        skew = estimate_skew(pixels < 128)
+        assert skew == pytest.approx(-angle, abs=0.25)
+
+        straightened = rotate(pixels, skew)
+        assert estimate_skew(straightened < 128) == pytest.approx(0.0, abs=0.25)
+
+    def test_straight_page_has_no_skew(self):
+        """Test an unrotated page is not reported as skewed."""
+        assert estimate_skew(text_page() < 128) == 0.0
+
+    @pytest.mark.parametrize('height, expected', [
+        (None, 200),   # no text found
+        (30, 200),     # large enough
+        (20, 280),     # scaled up to reach the minimum height
+        (5, 400),      # capped at max_dpi
+    ])
+    def test_adaptive_dpi(self, height, expected):
+        """Test the re-render resolution for different text heights."""
+        assert adaptive_dpi(height, base_dpi=200, max_dpi=400,
+                            min_text_height=28) == expected
+
+
+class TestPagePreprocessor:
+    """Test the per-page preprocessing step."""
+
+    def test_large_text_not_re_rendered(self):
+        """Test pages with large enough text stay at the base DPI."""
+        page = array_to_page(1, text_page(line_height=32))
+        preprocess = PagePreprocessor(pdf_path='scan.pdf', min_text_height=28)
+
+        with patch('src.ocr.image_preprocessing.get_rasterizer') as mock_get:
+            result = preprocess(page)
+
+        mock_get.assert_not_called()
+        assert (result.width, result.height) == (page.width, page.height)
+        assert set(np.unique(page_to_array(result))) == {0, 255}
+
+    def test_small_text_re_rendered(self):
+        """Test pages with small glyphs are rendered again at a higher DPI."""
+        page = array_to_page(3, text_page(line_height=14))
+        hires = array_to_page(3, text_page(line_height=28, spacing=80))
+        rasterizer = MagicMock()
+        rasterizer.render_page.return_value = hires
+        preprocess = PagePreprocessor(pdf_path='scan.pdf', rasterizer='pymupdf',
+                                      base_dpi=200, max_dpi=400, min_text_height=28)
+
+        with patch('src.ocr.image_preprocessing.get_rasterizer',
+                   return_value=rasterizer) as mock_get:
+            result = preprocess(page)
+
+        mock_get.assert_called_once_with('pymupdf')
+        rasterizer.render_page.assert_called_once_with('scan.pdf', 3, dpi=400)
+        assert (result.page_number, result.height) == (3, hires.height)
+
+    def test_without_pdf_path_never_re_renders(self):
+        """Test pages are only cleaned up when the source PDF is unknown."""
+        page = array_to_page(1, text_page(line_height=8))
+
+        with patch('src.ocr.image_preprocessing.get_rasterizer') as mock_get:
+            PagePreprocessor()(page)
+
+        mock_get.assert_not_called()
+
+    def test_skewed_page_is_straightened(self):
+        """Test skewed pages are rotated before OCR."""
+        page = array_to_page(1, text_page(angle=2.0))
+
+        result = PagePreprocessor()(page)
+
+        assert estimate_skew(page_to_array(result) == 0) == pytest.approx(0.0, abs=0.25)
+
+    def test_from_config(self):
+        """Test settings are read from the preprocessing config section."""
+        preprocess = PagePreprocessor.from_config(
+            {'base_dpi': 150, 'max_dpi': 300, 'min_text_height': 20, 'deskew': False},
+            pdf_path='scan.pdf', rasterizer='pdfium')
+
+        assert (preprocess.base_dpi, preprocess.max_dpi) == (150, 300)
+        assert preprocess.min_text_height == 20
+        assert not preprocess.deskew
+
+    def test_picklable(self):
+        """Test the preprocessor can be sent to worker processes."""
+        preprocess = PagePreprocessor(pdf_path='scan.pdf')
+
+        assert pickle.loads(pickle.dumps(preprocess)).pdf_path == 'scan.pdf'
+
+    @patch('src.ocr.tesseract_engine.pytesseract.image_to_string', return_value='text')
+    def test_engine_applies_preprocess_to_pages(self, mock_ocr):
+        """Test the engine preprocesses rendered pages before OCR."""
+        from src.ocr.tesseract_engine import ParallelTesseractEngine
+        page = PageImage(1, 2, 1, b'\x10\xf0')
+        cleaned = PageImage(1, 2, 1, b'\x00\xff')
+        preprocess = MagicMock(return_value=cleaned)
+        engine = ParallelTesseractEngine(max_workers=1, preprocess=preprocess)
+
+        assert list(engine.ocr_stream([(1, page)])) == [(1, 'text')]
+
+        preprocess.assert_called_once_with(page)
+        assert mock_ocr.call_args.args[0].tobytes() == cleaned.data
+
+
+class TestDefaultProviderPreprocessing:
+    """Test the default provider's preprocessing settings."""
+
+    def test_disabled_by_default(self):
+        """Test preprocessing is off unless enabled in the config."""
+        from src.ocr.default_provider import DefaultOCRProvider
+        provider = DefaultOCRProvider({'preprocessing': {'base_dpi': 150}})
+
+        assert provider._preprocessing() is None
+        assert provider._cache_settings()['dpi'] == 300
+
+    def test_settings_part_of_cache_key(self):
+        """Test enabled preprocessing changes the cached OCR settings."""
+        from src.ocr.default_provider import DefaultOCRProvider
+        provider = DefaultOCRProvider({'preprocessing': {
+            'enabled': True, 'base_dpi': 150, '_comment': 'ignored'}})
+
+        settings = provider._cache_settings()
+        assert settings['dpi'] == 150
+        assert settings['preprocessing'] == {'enabled': True, 'base_dpi': 150}
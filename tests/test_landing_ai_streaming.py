@@ -0,0 +1,266 @@
+"""Tests for incremental parsing of LandingAI responses."""
+import io
+import json
+import threading
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+
+from docx import Document
+
+from src.ocr.landing_ai_provider import LandingAIOCRProvider
+from src.ocr.ocr_cache import OCRCache
+from src.utils.layout_reconstructor import (PAGE_BREAK, iter_reconstructed_pages,
+                                            reconstruct_layout)
+
+pytest.importorskip('ijson')
+
+
+def _chunk(text, page, top):
+    return {
+        'id': f'{page}-{top}',
+        'type': 'text',
+        'markdown': f'<p>{text}</p>',
+        'text': text,
+        'grounding': {'page': page,
+                      'box': {'left': 0.1, 'top': top, 'right': 0.9, 'bottom': top + 0.05}},
+    }
+
+
+CHUNKS = [
+    _chunk('Title', 0, 0.05),
+    _chunk('First paragraph', 0, 0.2),
+    _chunk('Second page text', 1, 0.1),
+    _chunk('', 1, 0.3),
+    _chunk('Third page', 2, 0.5),
+]
+
+
+class FakeRaw(io.BytesIO):
+    """urllib3-like raw stream."""
+    decode_content = False
+
+
+def _streamed_response(chunks):
+    body = json.dumps({'markdown': 'whole document ' * 100, 'chunks': chunks}).encode()
+    response = Mock(status_code=200)
+    response.raw = FakeRaw(body)
+    return response
+
+
+def docx_pages(path):
+    """Paragraph texts of each page of a DOCX, split at page breaks."""
+    pages = [[]]
+    for paragraph in Document(path).paragraphs:
+        if paragraph.text:
+            pages[-1].append(paragraph.text)
+        if paragraph._p.xpath('.//w:br[@w:type="page"]'):
+            pages.append([])
+    return pages
+
+
+@pytest.fixture
+def provider():
+    return LandingAIOCRProvider({'api_key': 'test_key'})
+
+
+class TestStreamingParse:
+    """Test chunks are parsed incrementally and page by page."""
+
+    def test_compact_chunk_keeps_layout_fields(self):
+        """Test only text and grounding page/box are kept."""
+        compact = LandingAIOCRProvider._compact_chunk(CHUNKS[0])
+        assert compact == {'text': 'Title', 'grounding': {
+            'page': 0, 'box': CHUNKS[0]['grounding']['box']}}
+        assert LandingAIOCRProvider._compact_chunk({'text': 'x'}) == {'text': 'x'}
+
+    @patch('src.ocr.landing_ai_provider.requests.Session.post')
+    def test_document_chunks_streamed(self, mock_post, provider, tmp_path):
+        """Test a streamed response yields compact chunks, not the full body."""
+        mock_post.return_value = _streamed_response(CHUNKS)
+        image = tmp_path / 'scan.png'
+        image.write_bytes(b'png')
+
+        chunks = list(provider._iter_document_chunks(str(image)))
+
+        assert mock_post.call_args.kwargs['stream'] is True
+        assert chunks == [LandingAIOCRProvider._compact_chunk(c) for c in CHUNKS]
+        mock_post.return_value.json.assert_not_called()
+        mock_post.return_value.close.assert_called_once()
+
+    @patch('src.ocr.landing_ai_provider.extract_pdf_pages', return_value=b'%PDF-')
+    @patch('src.ocr.landing_ai_provider.requests.Session.post')
+    def test_batches_streamed_with_document_pages(self, mock_post, mock_extract,
+                                                  provider, tmp_path):
+        """Test batch chunks form one stream numbered by document page."""
+        responses = {'scan_p1-2.pdf': _streamed_response(CHUNKS[:3]),
+                     'scan_p3-3.pdf': _streamed_response(CHUNKS[4:])}
+        mock_post.side_effect = lambda url, files, **kwargs: responses[
+            files['document'][0]]
+        pdf = tmp_path / 'scan.pdf'
+        pdf.write_bytes(b'%PDF-')
+        provider._make_page_batches = lambda document, filename: [[1, 2], [3]]
+
+        chunks = list(provider._iter_document_chunks(str(pdf)))
+
+        assert [c['grounding']['page'] for c in chunks] == [0, 0, 1, 4]
+
+    @patch('src.ocr.landing_ai_provider.extract_pdf_pages', return_value=b'%PDF-')
+    @patch('src.ocr.landing_ai_provider.requests.Session.post')
+    def test_batches_requested_concurrently(self, mock_post, mock_extract, tmp_path):
+        """Test batch_workers batches are in flight before the first is read."""
+        provider = LandingAIOCRProvider({'api_key': 'test_key', 'batch_workers': 2})
+        arrived = threading.Barrier(2, timeout=5)
+
+        def post(url, files, **kwargs):
+            # Both requests must be waiting for the server together
+            arrived.wait()
+            return _streamed_response(CHUNKS[:1])
+
+        mock_post.side_effect = post
+        pdf = tmp_path / 'scan.pdf'
+        pdf.write_bytes(b'%PDF-')
+        provider._make_page_batches = lambda document, filename: [[1], [2], [3], [4]]
+
+        chunks = list(provider._iter_document_chunks(str(pdf)))
+
+        assert [c['grounding']['page'] for c in chunks] == [0, 1, 2, 3]
+        assert mock_post.call_count == 4
+
+    @patch('src.ocr.landing_ai_provider.extract_pdf_pages', return_value=b'%PDF-')
+    @patch('src.ocr.landing_ai_provider.requests.Session.post')
+    def test_abandoned_stream_closes_unread_batches(self, mock_post, mock_extract,
+                                                    provider, tmp_path):
+        """Test responses fetched ahead are closed when the stream stops early."""
+        responses = [_streamed_response(CHUNKS[:1]) for _ in range(3)]
+        by_name = dict(zip(['scan_p1-1.pdf', 'scan_p2-2.pdf', 'scan_p3-3.pdf'], responses))
+        mock_post.side_effect = lambda url, files, **kwargs: by_name[files['document'][0]]
+        pdf = tmp_path / 'scan.pdf'
+        pdf.write_bytes(b'%PDF-')
+        provider._make_page_batches = lambda document, filename: [[1], [2], [3]]
+
+        stream = provider._iter_document_chunks(str(pdf))
+        next(stream)
+        stream.close()
+
+        # Requests still in flight close their response when they finish
+        deadline = time.monotonic() + 5
+        while (not all(r.close.called for r in responses)
+               and time.monotonic() < deadline):
+            time.sleep(0.01)
+        for response in responses:
+            response.close.assert_called_once()
+
+    @patch('src.ocr.landing_ai_provider.requests.Session.post')
+    def test_streaming_matches_full_reconstruction(self, mock_post, provider, tmp_path):
+        """Test page-by-page reconstruction gives the same text as the full pass."""
+        mock_post.return_value = _streamed_response(CHUNKS)
+        image = tmp_path / 'scan.png'
+        image.write_bytes(b'png')
+
+        pages = list(provider._iter_streamed_pages(str(image)))
+
+        assert PAGE_BREAK.join(pages) == reconstruct_layout(CHUNKS)
+
+    def test_process_document_streams_pages(self, provider, tmp_path):
+        """Test pages are written to the DOCX by default without a full parse."""
+        image = tmp_path / 'scan.png'
+        image.write_bytes(b'png')
+        out = str(tmp_path / 'out.docx')
+
+        with patch.object(provider, '_iter_streamed_pages',
+                          return_value=iter(['page one', 'page two'])) as mock_stream, \
+                patch.object(provider, '_call_api_with_retry') as mock_call:
+            provider.process_document(str(image), out)
+
+        mock_stream.assert_called_once_with(str(image), None)
+        mock_call.assert_not_called()
+        document = Document(out)
+        assert [p.text for p in document.paragraphs if p.text] == ['page one', 'page two']
+        assert len(document.element.body.xpath('.//w:br[@w:type="page"]')) == 1
+
+    def test_streamed_document_without_text(self, provider, tmp_path):
+        """Test a document without text still gets the placeholder page."""
+        image = tmp_path / 'scan.png'
+        image.write_bytes(b'png')
+        out = str(tmp_path / 'out.docx')
+
+        with patch.object(provider, '_iter_streamed_pages', return_value=iter([])):
+            provider.process_document(str(image), out)
+
+        assert Document(out).paragraphs[0].text.startswith('[No text')
+
+    def test_streamed_pages_cached(self, provider, tmp_path):
+        """Test reconstructed pages are cached and served without the API."""
+        provider.cache = OCRCache(cache_dir=str(tmp_path / 'cache'))
+        image = tmp_path / 'scan.png'
+        image.write_bytes(b'png')
+        out = str(tmp_path / 'out.docx')
+
+        with patch.object(provider, '_iter_streamed_pages',
+                          return_value=iter(['page one', 'page two'])):
+            provider.process_document(str(image), out)
+        with patch.object(provider, '_iter_streamed_pages',
+                          side_effect=AssertionError('API called')):
+            provider.process_document(str(image), out)
+
+        assert [p.text for p in Document(out).paragraphs if p.text] == [
+            'page one', 'page two']
+
+    @patch('src.ocr.landing_ai_provider.requests.Session.post')
+    def test_full_parse_writes_same_docx(self, mock_post, provider, tmp_path):
+        """Test performance settings don't change the written DOCX."""
+        mock_post.side_effect = lambda *args, **kwargs: _streamed_response(CHUNKS)
+        image = tmp_path / 'scan.png'
+        image.write_bytes(b'png')
+        streamed, parsed = str(tmp_path / 'streamed.docx'), str(tmp_path / 'parsed.docx')
+
+        provider.process_document(str(image), streamed)
+        provider.stream_response = False
+        mock_post.side_effect = lambda *args, **kwargs: Mock(
+            status_code=200, json=Mock(return_value={'chunks': CHUNKS}))
+        provider.process_document(str(image), parsed)
+
+        assert docx_pages(parsed) == docx_pages(streamed)
+        assert len(docx_pages(parsed)) == 3
+
+    def test_streaming_is_default(self, provider):
+        """Test streaming is used unless disabled or pages are reconstructed in parallel."""
+        provider.cache = Mock()
+        assert provider._can_stream_pages() is True
+        provider.layout_workers = 3
+        assert provider._can_stream_pages() is False
+        assert LandingAIOCRProvider({'api_key': 'test_key', 'stream_response': False}
+                                    )._can_stream_pages() is False
+
+
+class TestIterReconstructedPages:
+    """Test the page generator of the layout reconstructor."""
+
+    def test_list_matches_reconstruct_layout(self):
+        """Test joined pages equal the full reconstruction, empty pages skipped."""
+        pages = list(iter_reconstructed_pages(CHUNKS))
+
+        assert [page for page, _ in pages] == [0, 1, 2]
+        assert PAGE_BREAK.join(text for _, text in pages) == reconstruct_layout(CHUNKS)
+
+    def test_page_yielded_before_next_is_read(self):
+        """Test a streamed page is reconstructed once the next page's chunk arrives."""
+        consumed = []
+
+        def stream():
+            for chunk in CHUNKS:
+                consumed.append(chunk['text'])
+                yield chunk
+
+        pages = iter_reconstructed_pages(stream())
+
+        assert next(pages) == (0, 'Title\n\nFirst paragraph')
+        assert consumed == ['Title', 'First paragraph', 'Second page text']
+
+    def test_stream_grouped_by_consecutive_pages(self):
+        """Test chunks are grouped per page in stream order."""
+        pages = list(iter_reconstructed_pages(iter(CHUNKS)))
+
+        assert [page for page, _ in pages] == [0, 1, 2]
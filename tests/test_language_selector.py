@@ -0,0 +1,148 @@
+"""Tests for Tesseract language selection."""
+from unittest.mock import patch
+
+import pytest
+import pytesseract
+from docx import Document
+
+from src.ocr.language_selector import (
+    ALL_LANGUAGES,
+    detect_script,
+    languages_for_source_language,
+    select_languages,
+)
+from src.ocr.rasterizer import PageImage
+
+
+def _page(width=2480, height=3508):
+    """A blank rendered A4 page at 300 DPI."""
+    return PageImage(1, width, height, bytes(width * height))
+
+
+def _words(words, confidence):
+    """image_to_data() output with one line of words."""
+    count = len(words)
+    return {'text': words, 'conf': [confidence] * count, 'block_num': [1] * count,
+            'par_num': [1] * count, 'line_num': [1] * count}
+
+
+class TestSourceLanguage:
+    """Test mapping the Drive source_language property."""
+
+    @pytest.mark.parametrize('code,expected', [
+        ('ru', 'rus+eng'),
+        ('DE-de', 'deu+eng'),
+        ('az_AZ', 'aze+eng'),
+        ('uz', 'uzb+eng'),
+        ('en', 'eng'),
+    ])
+    def test_supported_codes(self, code, expected):
+        """Test codes map to their model plus English."""
+        assert languages_for_source_language(code) == expected
+
+    @pytest.mark.parametrize('code', [None, '', 'fr'])
+    def test_unsupported_codes(self, code):
+        """Test missing or unknown codes give no hint."""
+        assert languages_for_source_language(code) is None
+
+    @patch('src.ocr.language_selector.pytesseract.image_to_osd')
+    def test_source_language_skips_detection(self, mock_osd):
+        """Test script detection doesn't run when the language is known."""
+        assert select_languages(_page(), source_language='ru') == 'rus+eng'
+        mock_osd.assert_not_called()
+
+
+class TestScriptDetection:
+    """Test OSD-based script detection."""
+
+    @patch('src.ocr.language_selector.pytesseract.image_to_osd')
+    def test_page_is_downscaled(self, mock_osd):
+        """Test OSD runs on a reduced raw image, not the full render."""
+        mock_osd.return_value = {'script': 'Latin', 'script_conf': 5.0}
+
+        assert detect_script(_page()) == {'script': 'Latin', 'script_conf': 5.0}
+        image = mock_osd.call_args.args[0]
+        assert max(image.size) == 1200
+        assert image.format == 'PPM'
+
+    @pytest.mark.parametrize('script,expected', [
+        ('Cyrillic', 'rus+eng'),
+        ('Latin', 'eng+deu+aze+uzb'),
+    ])
+    @patch('src.ocr.language_selector.word_confidence', return_value=90.0)
+    @patch('src.ocr.language_selector.pytesseract.image_to_osd')
+    def test_script_selects_models(self, mock_osd, mock_words, script, expected):
+        """Test a confidently detected script narrows the models."""
+        mock_osd.return_value = {'script': script, 'script_conf': 8.5}
+        assert select_languages(_page()) == expected
+
+    @patch('src.ocr.language_selector.pytesseract.image_to_data')
+    @patch('src.ocr.language_selector.pytesseract.image_to_osd')
+    def test_azerbaijani_page_read_with_its_model(self, mock_osd, mock_data):
+        """Test a Latin-script Azerbaijani page keeps the aze model."""
+        mock_osd.return_value = {'script': 'Latin', 'script_conf': 9.0}
+        mock_data.return_value = _words(['Azərbaycan', 'Respublikası', 'şəhər'], 88)
+
+        lang = select_languages(_page(200, 100))
+
+        assert 'aze' in lang.split('+') and 'uzb' in lang.split('+')
+        assert mock_data.call_args.kwargs['lang'] == lang
+
+    @patch('src.ocr.language_selector.pytesseract.image_to_data')
+    @patch('src.ocr.language_selector.pytesseract.image_to_osd')
+    def test_low_word_confidence_uses_all_languages(self, mock_osd, mock_data):
+        """Test a script-narrowed pass that reads poorly falls back to the full set."""
+        mock_osd.return_value = {'script': 'Cyrillic', 'script_conf': 9.0}
+        mock_data.return_value = _words(['Ozbekiston', 'Respublikasi'], 31)
+
+        assert select_languages(_page(200, 100)) == ALL_LANGUAGES
+
+    @patch('src.ocr.language_selector.pytesseract.image_to_osd')
+    def test_low_confidence_uses_all_languages(self, mock_osd):
+        """Test an uncertain detection falls back to the full set."""
+        mock_osd.return_value = {'script': 'Cyrillic', 'script_conf': 0.4}
+        assert select_languages(_page()) == ALL_LANGUAGES
+
+    @patch('src.ocr.language_selector.pytesseract.image_to_osd')
+    def test_unsupported_script_uses_all_languages(self, mock_osd):
+        """Test scripts without a mapping fall back to the full set."""
+        mock_osd.return_value = {'script': 'Arabic', 'script_conf': 9.0}
+        assert select_languages(_page()) == ALL_LANGUAGES
+
+    @patch('src.ocr.language_selector.pytesseract.image_to_osd')
+    def test_osd_failure_uses_all_languages(self, mock_osd):
+        """Test pages OSD can't judge fall back to the full set."""
+        mock_osd.side_effect = pytesseract.TesseractError(1, 'Too few characters')
+        assert select_languages(_page()) == ALL_LANGUAGES
+
+    def test_empty_document_uses_all_languages(self):
+        """Test a document without pages falls back to the full set."""
+        assert select_languages(None) == ALL_LANGUAGES
+
+
+class TestOcrPdfLanguageSelection:
+    """Test language selection is wired into PDF OCR."""
+
+    @patch('src.pdf_image_ocr.ParallelTesseractEngine')
+    @patch('src.pdf_image_ocr.select_languages', return_value='rus+eng')
+    @patch('src.pdf_image_ocr.get_rasterizer')
+    def test_first_page_rendered_once(self, mock_get, mock_select, mock_engine,
+                                      tmp_path):
+        """Test the page used for detection is still OCR'd, and only rendered once."""
+        from src.pdf_image_ocr import ocr_pdf_image_to_doc
+
+        pdf = tmp_path / 'scan.pdf'
+        pdf.write_bytes(b'%PDF-1.4')
+        pages = [PageImage(n, 1, 1, b'\x00') for n in (1, 2)]
+        mock_get.return_value.iter_pages.return_value = iter(pages)
+        engine = mock_engine.return_value
+        engine.ocr_stream.side_effect = lambda stream: (
+            (num, f'text{num}') for num, _ in stream)
+
+        ocr_pdf_image_to_doc(str(pdf), str(tmp_path / 'out.docx'),
+                             source_language='ru')
+
+        mock_select.assert_called_once_with(pages[0], source_language='ru')
+        assert mock_engine.call_args.kwargs['lang'] == 'rus+eng'
+        document = Document(str(tmp_path / 'out.docx'))
+        assert [p.text for p in document.paragraphs if p.text] == ['text1', 'text2']
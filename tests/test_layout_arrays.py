@@ -0,0 +1,127 @@
+"""Tests for columnar layout reconstruction."""
+from concurrent.futures.process import BrokenProcessPool
+from unittest.mock import patch
+
+import numpy as np
+
+from benchmark_layout import chunk_texts, make_chunks, object_reconstruct_layout
+from src.utils.layout_reconstructor import (
+    ChunkArrays,
+    TextChunk,
+    BoundingBox,
+    iter_reconstructed_pages,
+    reconstruct_layout,
+    reconstruct_page_chunks,
+    _parse_chunk_arrays,
+    _sorted_pages,
+)
+
+
+def chunk(text, page, left, top, right, bottom):
+    """Raw API chunk."""
+    return {'text': text, 'grounding': {'page': page, 'box': {
+        'left': left, 'top': top, 'right': right, 'bottom': bottom}}}
+
+
+class TestChunkArrays:
+    """Test the parallel-array chunk representation."""
+
+    def test_parse_skips_empty_and_defaults_box(self):
+        """Test parsing drops chunks without text and fills missing grounding."""
+        arrays = _parse_chunk_arrays([
+            chunk(' A ', 2, 0.1, 0.2, 0.3, 0.4),
+            {'text': '   '},
+            {'text': 'B', 'grounding': None},
+        ])
+
+        assert arrays.text == ['A', 'B']
+        assert arrays.page.tolist() == [2, 0]
+        assert arrays.left.tolist() == [0.1, 0.0]
+        assert arrays.bottom.tolist() == [0.4, 1.0]
+
+    def test_round_trip_text_chunks(self):
+        """Test converting to TextChunk objects and back keeps every field."""
+        chunks = [TextChunk('A', 1, BoundingBox(0.1, 0.2, 0.3, 0.4)),
+                  TextChunk('B', 0, BoundingBox(0.5, 0.6, 0.7, 0.8))]
+
+        assert ChunkArrays.from_text_chunks(chunks).to_text_chunks() == chunks
+
+    def test_empty(self):
+        """Test documents without text produce no output."""
+        assert len(_parse_chunk_arrays([{'text': ''}])) == 0
+        assert reconstruct_page_chunks([]) == ""
+
+    def test_sorted_pages(self):
+        """Test pages come out in order with chunks top to bottom, left to right."""
+        arrays = _parse_chunk_arrays([
+            chunk('p1 low', 1, 0.1, 0.5, 0.9, 0.6),
+            chunk('p0', 0, 0.1, 0.1, 0.9, 0.2),
+            chunk('p1 right', 1, 0.5, 0.1, 0.9, 0.2),
+            chunk('p1 left', 1, 0.1, 0.1, 0.4, 0.2),
+        ])
+
+        pages = [(num, page.text) for num, page in _sorted_pages(arrays)]
+
+        assert pages == [(0, ['p0']), (1, ['p1 left', 'p1 right', 'p1 low'])]
+
+    def test_same_text_as_object_implementation(self):
+        """Test dense pages keep every chunk's text."""
+        chunks = make_chunks(pages=4, chunks_per_page=301, seed=7)
+        chunks.append({'text': 'no grounding', 'grounding': {'page': 2}})
+
+        assert chunk_texts(reconstruct_layout(chunks)) == chunk_texts(
+            object_reconstruct_layout(chunks))
+
+    def test_page_arrays_are_views(self):
+        """Test splitting a sorted document into pages copies no coordinates."""
+        arrays = _parse_chunk_arrays(make_chunks(pages=3, chunks_per_page=10))
+
+        for _, page in _sorted_pages(arrays):
+            assert not page.top.flags.owndata
+            assert np.all(np.diff(page.top) >= 0)
+
+
+class TestParallelReconstruction:
+    """Test pages reconstructed in a worker pool."""
+
+    def test_matches_serial_in_page_order(self):
+        """Test parallel output equals serial output, pages in order."""
+        chunks = make_chunks(pages=6, chunks_per_page=30)
+
+        parallel = list(iter_reconstructed_pages(chunks, workers=2, parallel_threshold=2))
+
+        assert [page for page, _ in parallel] == list(range(6))
+        assert parallel == list(iter_reconstructed_pages(chunks))
+
+    @patch('src.utils.layout_reconstructor.ProcessPoolExecutor')
+    def test_small_documents_stay_serial(self, mock_pool):
+        """Test no pool is started below the page threshold."""
+        chunks = make_chunks(pages=3, chunks_per_page=5)
+
+        reconstruct_layout(chunks, workers=4, parallel_threshold=4)
+        reconstruct_layout(chunks)
+
+        mock_pool.assert_not_called()
+
+    @patch('src.utils.layout_reconstructor.ProcessPoolExecutor')
+    def test_broken_pool_falls_back_to_serial(self, mock_pool):
+        """Test pages are still reconstructed if the workers die."""
+        mock_pool.return_value.__enter__.return_value.map.side_effect = BrokenProcessPool()
+        chunks = make_chunks(pages=3, chunks_per_page=5)
+
+        result = reconstruct_layout(chunks, workers=2, parallel_threshold=1)
+
+        assert result == reconstruct_layout(chunks)
+
+    def test_provider_passes_layout_workers(self):
+        """Test LandingAI's layout_workers settings reach the reconstructor."""
+        from src.ocr.landing_ai_provider import LandingAIOCRProvider
+        provider = LandingAIOCRProvider({'api_key': 'test_key', 'layout_workers': 3,
+                                         'layout_parallel_pages': 10})
+        chunks = [{'text': 'x'}]
+
+        with patch('src.utils.layout_reconstructor.iter_reconstructed_pages',
+                   return_value=iter([(0, 'x')])) as mock_reconstruct:
+            provider._extract_with_positions({'chunks': chunks})
+
+        mock_reconstruct.assert_called_once_with(chunks, workers=3, parallel_threshold=10)
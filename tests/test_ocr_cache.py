@@ -0,0 +1,315 @@
+"""Tests for the persistent OCR result cache."""
+import os
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.ocr.default_provider import DefaultOCRProvider
+from src.ocr.ocr_cache import OCRCache, hash_file
+from src.ocr.ocr_factory import OCRProviderFactory
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """Cache in a temporary directory."""
+    return OCRCache(cache_dir=str(tmp_path / 'cache'))
+
+
+@pytest.fixture
+def scan(tmp_path):
+    """A small input file."""
+    path = tmp_path / 'scan.pdf'
+    path.write_bytes(b'%PDF-1.4 scanned')
+    return str(path)
+
+
+def _age(cache, key, seconds):
+    """Make an entry look last used `seconds` ago."""
+    path = cache._entry_path(key)
+    past = time.time() - seconds
+    os.utime(path, (past, past))
+
+
+class TestOCRCache:
+    """Test cache storage, keys and eviction."""
+
+    def test_miss_then_hit(self, cache):
+        """Test a stored payload is returned on lookup."""
+        assert cache.get('k1') is None
+        cache.put('k1', {'pages': ['one', 'two']})
+        assert cache.get('k1') == {'pages': ['one', 'two']}
+
+    def test_concurrent_puts_use_own_temp_files(self, cache):
+        """Test threads writing the same key don't share a temporary file."""
+        import threading
+        temp_paths = []
+        replace = os.replace
+        # Both writers are mid-put before either moves its entry into place
+        both_written = threading.Barrier(2, timeout=5)
+
+        def record(src, dst):
+            temp_paths.append(src)
+            both_written.wait()
+            replace(src, dst)
+
+        with patch('src.ocr.ocr_cache.os.replace', side_effect=record):
+            threads = [threading.Thread(target=cache.put, args=('k1', {'pages': [n]}))
+                       for n in range(2)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        assert len(set(temp_paths)) == 2
+        assert cache.get('k1') in ({'pages': [0]}, {'pages': [1]})
+        assert os.listdir(cache.cache_dir) == [os.path.basename(cache._entry_path('k1'))]
+
+    def test_key_depends_on_provider_and_settings(self, scan):
+        """Test the same file under other providers or settings gets its own key."""
+        digest = hash_file(scan)
+        key = OCRCache.make_key(digest, 'Azure', {'model': 'a'})
+
+        assert key == OCRCache.make_key(digest, 'Azure', {'model': 'a'})
+        assert key != OCRCache.make_key(digest, 'Default', {'model': 'a'})
+        assert key != OCRCache.make_key(digest, 'Azure', {'model': 'b'})
+        assert key != OCRCache.make_key('0' * 64, 'Azure', {'model': 'a'})
+
+    def test_expired_entry_is_a_miss(self, cache):
+        """Test entries older than max_age are discarded."""
+        cache.put('old', {'pages': []})
+        _age(cache, 'old', cache.max_age + 60)
+
+        assert cache.get('old') is None
+        assert not os.path.exists(cache._entry_path('old'))
+
+    def test_evicts_least_recently_used_over_size(self, tmp_path):
+        """Test the least recently used entries go first when over budget."""
+        cache = OCRCache(cache_dir=str(tmp_path / 'cache'), max_size_mb=1)
+        payload = {'pages': ['x' * 400 * 1024]}
+        cache.put('a', payload)
+        cache.put('b', payload)
+        _age(cache, 'a', 120)
+        _age(cache, 'b', 60)
+        cache.get('a')  # 'a' is now the most recently used
+
+        cache.put('c', payload)
+
+        assert cache.get('b') is None
+        assert cache.get('a') == payload
+        assert cache.get('c') == payload
+
+    def test_corrupt_entry_is_discarded(self, cache):
+        """Test an unreadable entry is treated as a miss and removed."""
+        with open(cache._entry_path('bad'), 'w') as f:
+            f.write('{not json')
+
+        assert cache.get('bad') is None
+        assert not os.path.exists(cache._entry_path('bad'))
+
+    def test_entry_written_page_by_page(self, cache):
+        """Test a page entry reads back through get() and get_pages()."""
+        with cache.open_entry('k1', provider='Default') as entry:
+            entry.add_page('one')
+            entry.add_page({'text': 'two'})
+        cache.open_entry('k2').commit(quality={'mean': 80.0})
+
+        assert cache.get('k1') == {'pages': ['one', {'text': 'two'}]}
+        assert list(cache.get_pages('k1')) == ['one', {'text': 'two'}]
+        assert cache.get('k2') == {'pages': [], 'quality': {'mean': 80.0}}
+
+    def test_reserved_page_filled_in_order(self, cache):
+        """Test a page filled after later ones is stored in its place."""
+        with cache.open_entry('k1') as entry:
+            entry.add_page('one')
+            number = entry.reserve_page()
+            entry.add_page('three')
+            entry.fill_page(number, 'two')
+
+        assert list(cache.get_pages('k1')) == ['one', 'two', 'three']
+
+    def test_discarded_entry_leaves_nothing(self, cache):
+        """Test an entry abandoned by an error isn't cached."""
+        with pytest.raises(RuntimeError):
+            with cache.open_entry('k1') as entry:
+                entry.add_page('one')
+                raise RuntimeError('OCR failed')
+
+        assert cache.get_pages('k1') is None
+        assert os.listdir(cache.cache_dir) == []
+
+    def test_corrupt_page_entry_is_a_miss(self, cache):
+        """Test a damaged entry is discarded before any page is returned."""
+        with open(cache._entry_path('bad'), 'w') as f:
+            f.write('{"payload": {"pages": ["one", ')
+
+        assert cache.get_pages('bad') is None
+        assert not os.path.exists(cache._entry_path('bad'))
+
+    def test_from_config(self, tmp_path):
+        """Test the cache is only created when enabled."""
+        assert OCRCache.from_config({}) is None
+        cache = OCRCache.from_config({'enabled': True,
+                                      'directory': str(tmp_path / 'c'),
+                                      'max_size_mb': 2})
+        assert cache.max_size == 2 * 1024 * 1024
+
+
+class TestProviderCaching:
+    """Test providers reuse cached OCR results."""
+
+    def test_cached_ocr_runs_once(self, cache, scan):
+        """Test a second request for the same file doesn't run OCR."""
+        provider = DefaultOCRProvider({})
+        provider.cache = cache
+        run_ocr = MagicMock(return_value={'pages': ['text']})
+
+        first = provider._cached_ocr(scan, run_ocr, source_language='ru')
+        second = provider._cached_ocr(scan, run_ocr, source_language='ru')
+
+        assert first == second == {'pages': ['text']}
+        run_ocr.assert_called_once()
+
+    def test_per_call_settings_are_part_of_key(self, cache, scan):
+        """Test a different source language isn't served a cached result."""
+        provider = DefaultOCRProvider({})
+        provider.cache = cache
+        run_ocr = MagicMock(return_value={'pages': ['text']})
+
+        provider._cached_ocr(scan, run_ocr, source_language='ru')
+        provider._cached_ocr(scan, run_ocr, source_language='de')
+
+        assert run_ocr.call_count == 2
+
+    def test_tesseract_backend_is_part_of_key(self, cache, scan):
+        """Test switching Tesseract backends isn't served the other backend's text."""
+        run_ocr = MagicMock(return_value={'pages': ['text']})
+        for backend in ('pytesseract', 'tesserocr'):
+            provider = DefaultOCRProvider({'tesseract_backend': backend})
+            provider.cache = cache
+            with patch('src.ocr.default_provider.TESSEROCR_AVAILABLE', True):
+                provider._cached_ocr(scan, run_ocr)
+
+        assert run_ocr.call_count == 2
+
+    def test_language_detection_policy_in_settings(self):
+        """Test the script detection policy choosing languages is keyed."""
+        settings = DefaultOCRProvider({})._cache_settings()
+        assert settings['tesseract_backend'] == 'pytesseract'
+        assert settings['language_detection']['scripts']['Cyrillic'] == 'rus+eng'
+
+    def test_cache_errors_do_not_fail_ocr(self, cache, scan):
+        """Test OCR still runs when the cache can't be read or written."""
+        provider = DefaultOCRProvider({})
+        provider.cache = cache
+        run_ocr = MagicMock(return_value={'pages': ['text']})
+
+        with patch.object(cache, 'get', side_effect=OSError('disk')), \
+                patch.object(cache, 'put', side_effect=OSError('disk')):
+            assert provider._cached_ocr(scan, run_ocr) == {'pages': ['text']}
+
+    def test_pages_cached_as_written(self, cache, scan):
+        """Test pages written on a miss are served one by one on a hit."""
+        provider = DefaultOCRProvider({})
+        provider.cache = cache
+
+        def run_ocr(writer):
+            writer.add_page('p1')
+            writer.add_page('p2')
+            return {'quality': {'mean': 90}}
+
+        first, second = [], []
+        assert not provider._cached_pages(scan, run_ocr, MagicMock(add_page=first.append))
+        assert provider._cached_pages(scan, MagicMock(), MagicMock(add_page=second.append))
+
+        assert first == second == ['p1', 'p2']
+        key = provider._cache_key(scan, {})
+        assert cache.get(key) == {'pages': ['p1', 'p2'], 'quality': {'mean': 90}}
+
+    def test_reserved_pages_reach_writer_and_cache(self, cache, scan, tmp_path):
+        """Test pages held back during OCR are filled in the DOCX and cache."""
+        from docx import Document
+        from src.convert_to_docx import DocxPageWriter
+        provider = DefaultOCRProvider({})
+        provider.cache = cache
+
+        def run_ocr(writer):
+            number = writer.reserve_page()
+            writer.add_page('p2')
+            assert writer.reserved_pages == [number]
+            writer.fill_page(number, 'p1')
+
+        with DocxPageWriter(str(tmp_path / 'out.docx')) as writer:
+            provider._cached_pages(scan, run_ocr, writer)
+
+        assert [p.text for p in Document(writer.docx_file_path).paragraphs
+                if p.text] == ['p1', 'p2']
+        assert cache.get(provider._cache_key(scan, {})) == {'pages': ['p1', 'p2']}
+
+    def test_failed_ocr_is_not_cached(self, cache, scan):
+        """Test pages of an OCR run that fails part way aren't cached."""
+        provider = DefaultOCRProvider({})
+        provider.cache = cache
+
+        def run_ocr(writer):
+            writer.add_page('p1')
+            raise RuntimeError('OCR failed')
+
+        with pytest.raises(RuntimeError):
+            provider._cached_pages(scan, run_ocr, MagicMock())
+
+        assert os.listdir(cache.cache_dir) == []
+
+    @patch('src.ocr.default_provider.stream_pdf_image_pages')
+    def test_default_provider_serves_scans_from_cache(
+            self, mock_ocr, cache, scan, tmp_path):
+        """Test reprocessing a scanned PDF rebuilds the DOCX from the cache."""
+        from docx import Document
+        provider = DefaultOCRProvider({})
+        provider.cache = cache
+        provider.is_pdf_searchable = MagicMock(return_value=False)
+        output = str(tmp_path / 'out.docx')
+
+        def fake_ocr(input_path, on_page, **kwargs):
+            on_page('p1')
+            on_page('p2')
+            return 2
+        mock_ocr.side_effect = fake_ocr
+
+        provider.process_document(scan, output)
+        os.remove(output)
+        provider.process_document(scan, output)
+
+        mock_ocr.assert_called_once()
+        assert [p.text for p in Document(output).paragraphs if p.text] == ['p1', 'p2']
+
+    def test_azure_cache_skips_api_call(self, cache, scan, tmp_path):
+        """Test a cached Azure result is reused without calling Azure."""
+        from src.document_analyzer import PdfAnalysis
+        from src.ocr.azure_provider import AzureOCRProvider
+        provider = AzureOCRProvider({
+            'endpoint': 'https://example.cognitiveservices.azure.com/',
+            'api_key': 'test_key'
+        })
+        provider.cache = cache
+        analysis = PdfAnalysis(path=scan, is_valid=True, page_texts=['', ''])
+        output = str(tmp_path / 'out.docx')
+
+        with patch.object(provider, '_ocr_with_azure',
+                          return_value=['ocr 1', 'ocr 2']) as mock_ocr, \
+                patch.object(provider, '_save_as_docx') as mock_save:
+            mock_save.side_effect = lambda pages, out: open(out, 'wb').close()
+            provider.process_document(scan, output, analysis=analysis)
+            provider.process_document(scan, output, analysis=analysis)
+
+        mock_ocr.assert_called_once()
+        mock_save.assert_called_with(['ocr 1', 'ocr 2'], output)
+
+    def test_factory_attaches_cache(self, tmp_path):
+        """Test the factory attaches the configured cache to providers."""
+        config = {'ocr': {'cache': {'enabled': True,
+                                    'directory': str(tmp_path / 'c')}}}
+        provider = OCRProviderFactory.get_provider(config)
+        assert isinstance(provider.cache, OCRCache)
+
+        assert OCRProviderFactory.get_provider({'ocr': {}}).cache is None
@@ -0,0 +1,237 @@
+"""Unit tests for provider statistics and hedged OCR."""
+import os
+import threading
+import pytest
+from unittest.mock import patch
+
+from src.ocr.cancellation import raise_if_cancelled
+from src.ocr.fallback import hedge_deadline, process_with_fallback
+from src.ocr.provider_stats import ProviderStats, get_all_provider_stats, get_provider_stats
+
+
+class FakeProvider:
+    """Provider that writes its name to the output after an optional wait."""
+
+    def __init__(self, name, delay=0.0, error=None, release=None):
+        self.name = name
+        self.delay = delay
+        self.error = error
+        self.release = release
+        self.calls = []
+        self.cancel = None
+        self.finished = threading.Event()
+
+    def process_document(self, input_path, output_path, analysis=None,
+                         source_language=None, cancel=None):
+        self.calls.append(output_path)
+        self.cancel = cancel
+        try:
+            if self.release is not None:
+                # Stops waiting once cancelled, like a provider between pages
+                for _ in range(500):
+                    if self.release.wait(0.01):
+                        break
+                    raise_if_cancelled(cancel)
+            elif self.delay:
+                threading.Event().wait(self.delay)
+            if self.error:
+                raise self.error
+            with open(output_path, 'w') as f:
+                f.write(self.name)
+        finally:
+            self.finished.set()
+
+
+class TestProviderStats:
+    """Test rolling provider statistics."""
+
+    def test_percentiles(self):
+        """Test nearest-rank latency percentiles."""
+        stats = ProviderStats('azure')
+        for duration in range(1, 101):
+            stats.record(float(duration), success=True)
+
+        assert stats.percentile(50) == 50.0
+        assert stats.percentile(95) == 95.0
+        assert stats.percentile(100) == 100.0
+
+    def test_failures_excluded_from_latency(self):
+        """Test failed calls count for the error rate but not latency."""
+        stats = ProviderStats('azure')
+        stats.record(1.0, success=True)
+        stats.record(500.0, success=False)
+
+        assert stats.percentile(99) == 1.0
+        assert stats.error_rate() == 0.5
+
+    def test_window_is_rolling(self):
+        """Test only the most recent calls are kept."""
+        stats = ProviderStats('azure', window=3)
+        for duration in (100.0, 1.0, 2.0, 3.0):
+            stats.record(duration, success=True)
+
+        assert stats.sample_count == 3
+        assert stats.percentile(100) == 3.0
+
+    def test_empty(self):
+        """Test statistics without samples."""
+        stats = ProviderStats('azure')
+        assert stats.percentile(95) is None
+        assert stats.error_rate() == 0.0
+
+    def test_snapshot(self):
+        """Test the snapshot includes counters and percentiles."""
+        get_provider_stats('azure').record(2.0, success=True)
+        get_provider_stats('azure').record_hedge(won=True)
+
+        snapshot = get_all_provider_stats()['azure']
+        assert snapshot['calls'] == 1
+        assert snapshot['hedges_fired'] == 1
+        assert snapshot['hedges_won'] == 1
+        assert snapshot['p95_seconds'] == 2.0
+
+
+class TestHedgeDeadline:
+    """Test hedging deadline selection."""
+
+    def test_default_until_enough_samples(self):
+        """Test the fixed deadline is used with too few samples."""
+        stats = ProviderStats('azure')
+        stats.record(5.0, success=True)
+
+        assert hedge_deadline(stats, {'min_samples': 2,
+                                      'default_deadline_seconds': 60}) == 60.0
+
+    def test_percentile_deadline(self):
+        """Test the deadline follows the latency percentile."""
+        stats = ProviderStats('azure')
+        for duration in range(1, 21):
+            stats.record(float(duration), success=True)
+
+        assert hedge_deadline(stats, {'min_samples': 20, 'percentile': 90,
+                                      'min_deadline_seconds': 1}) == 18.0
+
+    def test_minimum_deadline(self):
+        """Test the deadline never drops below the configured minimum."""
+        stats = ProviderStats('azure')
+        stats.record(0.5, success=True)
+
+        assert hedge_deadline(stats, {'min_samples': 1,
+                                      'min_deadline_seconds': 10}) == 10.0
+
+
+class TestHedgedOCR:
+    """Test hedged OCR through process_with_fallback()."""
+
+    HEDGING = {'enabled': True, 'min_samples': 1000,
+               'default_deadline_seconds': 0.05}
+
+    def run(self, tmp_path, primary, secondary, hedging=None,
+            translation_mode='human'):
+        config = {'ocr': {'hedging': hedging or self.HEDGING}}
+        output = str(tmp_path / 'out.docx')
+        with patch('src.ocr.fallback.load_config', return_value=config), \
+                patch('src.ocr.fallback.OCRProviderFactory.get_provider_by_type',
+                      side_effect=lambda _, provider_type: (
+                          primary if provider_type == 'azure' else secondary)):
+            process_with_fallback('in.pdf', output,
+                                  translation_mode=translation_mode)
+        return output
+
+    def test_fast_primary_does_not_hedge(self, tmp_path):
+        """Test no hedge fires when the primary beats the deadline."""
+        primary = FakeProvider('azure')
+        secondary = FakeProvider('default')
+
+        output = self.run(tmp_path, primary, secondary,
+                          hedging={**self.HEDGING, 'default_deadline_seconds': 5})
+
+        assert open(output).read() == 'azure'
+        assert secondary.calls == []
+        assert os.listdir(tmp_path) == ['out.docx']
+        assert get_provider_stats('azure').hedges_fired == 0
+
+    def test_slow_primary_loses_to_hedge(self, tmp_path):
+        """Test the hedge result wins when the primary stalls."""
+        release = threading.Event()
+        primary = FakeProvider('azure', release=release)
+        secondary = FakeProvider('default')
+
+        output = self.run(tmp_path, primary, secondary)
+
+        assert open(output).read() == 'default'
+        stats = get_provider_stats('azure')
+        assert stats.hedges_fired == 1
+        assert stats.hedges_won == 1
+
+        # The abandoned primary's output is discarded when it finishes
+        release.set()
+        for _ in range(100):
+            if os.listdir(tmp_path) == ['out.docx']:
+                break
+            threading.Event().wait(0.01)
+        assert os.listdir(tmp_path) == ['out.docx']
+        assert open(output).read() == 'default'
+
+    def test_losing_provider_is_cancelled(self, tmp_path):
+        """Test the losing call is told to stop and its stop isn't a failure."""
+        primary = FakeProvider('azure', release=threading.Event())
+        secondary = FakeProvider('default')
+
+        output = self.run(tmp_path, primary, secondary)
+
+        assert open(output).read() == 'default'
+        assert primary.cancel.is_set()
+        assert primary.finished.wait(5)
+        stats = get_provider_stats('azure')
+        assert stats.sample_count == 0
+        assert stats.error_rate() == 0.0
+
+    def test_primary_wins_after_hedge_fires(self, tmp_path):
+        """Test the primary can still win once the hedge has started."""
+        primary = FakeProvider('azure', delay=0.1)
+        secondary = FakeProvider('default', delay=2.0)
+
+        output = self.run(tmp_path, primary, secondary)
+
+        assert open(output).read() == 'azure'
+        assert get_provider_stats('azure').hedges_won == 0
+
+    def test_hedge_used_when_primary_fails_late(self, tmp_path):
+        """Test a late primary failure waits for the hedge."""
+        primary = FakeProvider('azure', delay=0.1, error=RuntimeError("boom"))
+        secondary = FakeProvider('default', delay=0.2)
+
+        output = self.run(tmp_path, primary, secondary)
+
+        assert open(output).read() == 'default'
+
+    def test_both_fail_without_second_fallback(self, tmp_path):
+        """Test the Tesseract fallback is not run again after a failed hedge."""
+        primary = FakeProvider('azure', delay=0.1, error=RuntimeError("boom"))
+        secondary = FakeProvider('default', error=RuntimeError("no tesseract"))
+
+        with patch('src.ocr.fallback.OCRProviderFactory.get_fallback_provider') as fallback:
+            with pytest.raises(RuntimeError, match="Both primary and fallback OCR failed"):
+                self.run(tmp_path, primary, secondary)
+
+        fallback.assert_not_called()
+        assert secondary.calls != []
+
+    def test_hedging_limited_to_configured_modes(self, tmp_path):
+        """Test modes outside the hedging list are not hedged."""
+        primary = FakeProvider('azure', delay=0.2)
+        secondary = FakeProvider('default')
+
+        output = self.run(tmp_path, primary, secondary,
+                          hedging={**self.HEDGING, 'modes': ['formats']})
+
+        assert open(output).read() == 'azure'
+        assert secondary.calls == []
+
+    def test_calls_recorded_in_stats(self, tmp_path):
+        """Test every primary call updates the latency statistics."""
+        self.run(tmp_path, FakeProvider('azure'), FakeProvider('default'),
+                 hedging={'enabled': False})
+
+        assert get_provider_stats('azure').sample_count == 1
@@ -2,6 +2,7 @@
 import os
 import pytest
 from unittest.mock import Mock, patch, MagicMock
+from docx import Document
 from src.ocr import OCRProviderFactory, BaseOCRProvider
 from src.ocr.default_provider import DefaultOCRProvider
 from src.ocr.landing_ai_provider import LandingAIOCRProvider
@@ -215,7 +216,7 @@ class TestLandingAIProvider:
         assert provider.use_grounding is False
         assert provider.maintain_positions is False
 
-    @patch('src.ocr.landing_ai_provider.requests.post')
+    @patch('src.ocr.landing_ai_provider.requests.Session.post')
     def test_api_call_with_retry_success(self, mock_post):
         """Test API call succeeds on first attempt."""
         mock_response = Mock()
@@ -239,7 +240,7 @@ class TestLandingAIProvider:
         finally:
             os.remove(temp_path)
 
-    @patch('src.ocr.landing_ai_provider.requests.post')
+    @patch('src.ocr.landing_ai_provider.requests.Session.post')
     @patch('src.ocr.landing_ai_provider.time.sleep')
     def test_api_call_retries_on_server_error(self, mock_sleep, mock_post):
         """Test API call retries on 5xx errors."""
@@ -271,7 +272,7 @@ class TestLandingAIProvider:
         finally:
             os.remove(temp_path)
 
-    @patch('src.ocr.landing_ai_provider.requests.post')
+    @patch('src.ocr.landing_ai_provider.requests.Session.post')
     def test_api_call_fails_on_client_error(self, mock_post):
         """Test API call doesn't retry on 4xx errors."""
         mock_response = Mock()
@@ -295,7 +296,7 @@ class TestLandingAIProvider:
         finally:
             os.remove(temp_path)
 
-    @patch('src.ocr.landing_ai_provider.requests.post')
+    @patch('src.ocr.landing_ai_provider.requests.Session.post')
     @patch('src.ocr.landing_ai_provider.time.sleep')
     def test_api_call_fails_after_max_retries(self, mock_sleep, mock_post):
         """Test API call fails after exhausting retries."""
@@ -320,6 +321,55 @@ class TestLandingAIProvider:
         finally:
             os.remove(temp_path)
 
+    def test_session_is_pooled_and_authenticated(self):
+        """Test API calls share one keep-alive session with auth headers."""
+        provider = LandingAIOCRProvider({'api_key': 'test_key', 'batch_workers': 6})
+
+        assert provider.session.headers['Authorization'] == 'Bearer test_key'
+        adapter = provider.session.get_adapter('https://api.va.landing.ai/v1')
+        assert adapter._pool_maxsize == 6
+
+    def test_large_pdf_split_into_page_batches(self, tmp_path):
+        """Test large PDFs are parsed in batches with pages shifted back."""
+        pdf_path = os.path.join(os.path.dirname(__file__), '..', 'test_docs',
+                                'file-sample-pdf.pdf')
+        provider = LandingAIOCRProvider({'api_key': 'test_key', 'batch_pages': 3})
+
+        def fake_post(document, filename):
+            # Each batch reports its pages from 0, like the real API
+            from src.utils.pdf_pages import count_pdf_pages
+            return {'chunks': [
+                {'text': f'{filename} #{n}', 'grounding': {'page': n, 'box': {}}}
+                for n in range(count_pdf_pages(document))]}
+
+        with patch.object(provider, '_post_with_retry', side_effect=fake_post) as mock_post:
+            response = provider._call_api_with_retry(pdf_path)
+
+        assert mock_post.call_count == 2
+        assert [c['grounding']['page'] for c in response['chunks']] == [0, 1, 2, 3]
+        assert response['chunks'][3]['text'] == 'file-sample-pdf_p4-4.pdf #0'
+
+    def test_small_documents_sent_whole(self, tmp_path):
+        """Test documents within batch_pages are sent in one request."""
+        pdf_path = os.path.join(os.path.dirname(__file__), '..', 'test_docs',
+                                'file-sample-pdf.pdf')
+        provider = LandingAIOCRProvider({'api_key': 'test_key'})
+
+        with patch.object(provider, '_post_with_retry',
+                          return_value={'chunks': []}) as mock_post:
+            provider._call_api_with_retry(pdf_path)
+
+        with open(pdf_path, 'rb') as f:
+            mock_post.assert_called_once_with(f.read(), 'file-sample-pdf.pdf')
+
+    def test_offset_chunk_page_handles_missing_grounding(self):
+        """Test chunks without grounding still get the batch page."""
+        chunks = [{'text': 'a'}, {'text': 'b', 'grounding': {'page': 1}}]
+        shifted = [LandingAIOCRProvider._offset_chunk_page(c, 10) for c in chunks]
+
+        assert [c['grounding']['page'] for c in shifted] == [10, 11]
+        assert 'grounding' not in chunks[0]
+
     @patch('src.ocr.landing_ai_provider.is_pdf_searchable_pypdf')
     def test_is_pdf_searchable_delegates(self, mock_check):
         """Test is_pdf_searchable delegates to existing function."""
@@ -332,12 +382,12 @@ class TestLandingAIProvider:
         mock_check.assert_called_once_with('test.pdf')
 
     def test_extract_with_positions_empty_chunks(self):
-        """Test extracting text from empty chunks list."""
+        """Test extracting pages from empty chunks list."""
         config = {'api_key': 'test_key'}
         provider = LandingAIOCRProvider(config)
 
         result = provider._extract_with_positions({'chunks': []})
-        assert result == ""
+        assert result == []
 
     def test_extract_with_positions_simple_concatenation(self):
         """Test simple text extraction without grounding."""
@@ -357,59 +407,30 @@ class TestLandingAIProvider:
         ]
 
         result = provider._extract_with_positions({'chunks': chunks})
-        assert result == 'Line 1\nLine 2\nLine 3'
-
-    @patch('src.ocr.landing_ai_provider.convert_txt_to_docx')
-    def test_save_as_docx_creates_file(self, mock_convert):
-        """Test saving text as DOCX file."""
-        config = {'api_key': 'test_key'}
-        provider = LandingAIOCRProvider(config)
-
-        import tempfile
-        with tempfile.NamedTemporaryFile(suffix='.docx', delete=False) as f:
-            output_path = f.name
-
-        try:
-            # Mock the convert function to create the output file
-            def create_output(*args):
-                with open(output_path, 'wb') as f:
-                    f.write(b'Fake DOCX content')
-
-            mock_convert.side_effect = create_output
-
-            provider._save_as_docx('Test content', output_path)
-
-            mock_convert.assert_called_once()
-            assert os.path.exists(output_path)
-        finally:
-            if os.path.exists(output_path):
-                os.remove(output_path)
+        assert result == ['Line 1\nLine 2\nLine 3']
 
     @patch('src.ocr.landing_ai_provider.LandingAIOCRProvider._call_api_with_retry')
     @patch('src.ocr.landing_ai_provider.LandingAIOCRProvider._extract_with_positions')
-    @patch('src.ocr.landing_ai_provider.LandingAIOCRProvider._save_as_docx')
-    def test_process_document_integration(self, mock_save, mock_extract, mock_api):
+    def test_process_document_integration(self, mock_extract, mock_api, tmp_path):
         """Test full document processing flow."""
         mock_api.return_value = {'chunks': [{'text': 'Test', 'grounding': {}}]}
-        mock_extract.return_value = 'Extracted text'
+        mock_extract.return_value = ['Page one', 'Page two']
 
-        config = {'api_key': 'test_key'}
+        # Full parse; streaming is covered in test_landing_ai_streaming.py
+        config = {'api_key': 'test_key', 'stream_response': False}
         provider = LandingAIOCRProvider(config)
+        temp_path = tmp_path / 'scan.pdf'
+        temp_path.write_bytes(b'PDF content')
+        output_path = str(tmp_path / 'output.docx')
 
-        # Create a temporary test file
-        import tempfile
-        with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as f:
-            f.write(b'PDF content')
-            temp_path = f.name
-
-        try:
-            provider.process_document(temp_path, 'output.docx')
+        provider.process_document(str(temp_path), output_path)
 
-            mock_api.assert_called_once_with(temp_path)
-            mock_extract.assert_called_once()
-            mock_save.assert_called_once_with('Extracted text', 'output.docx')
-        finally:
-            os.remove(temp_path)
+        mock_api.assert_called_once_with(str(temp_path), None)
+        mock_extract.assert_called_once()
+        # Written page by page, like streamed documents
+        document = Document(output_path)
+        assert [p.text for p in document.paragraphs if p.text] == ['Page one', 'Page two']
+        assert len(document.element.body.xpath('.//w:br[@w:type="page"]')) == 1
 
     def test_process_document_file_not_found(self):
         """Test process_document raises error for missing file."""
@@ -420,37 +441,338 @@ class TestLandingAIProvider:
             provider.process_document('/nonexistent/file.pdf', 'output.docx')
 
     @patch('src.ocr.landing_ai_provider.LandingAIOCRProvider._call_api_with_retry')
-    def test_process_document_handles_empty_text(self, mock_api):
+    def test_process_document_handles_empty_text(self, mock_api, tmp_path):
         """Test process_document handles empty extracted text."""
         mock_api.return_value = {'chunks': []}
 
-        config = {'api_key': 'test_key'}
+        config = {'api_key': 'test_key', 'stream_response': False}
         provider = LandingAIOCRProvider(config)
+        temp_path = tmp_path / 'scan.pdf'
+        temp_path.write_bytes(b'PDF content')
+        output_path = str(tmp_path / 'output.docx')
+
+        provider.process_document(str(temp_path), output_path)
+
+        # Verify it used the "no content" message
+        assert [p.text for p in Document(output_path).paragraphs if p.text] == [
+            '[No text content extracted from document]']
+
+
+class TestAzureOCRProvider:
+    """Test Azure Document Intelligence OCR provider."""
+
+    @pytest.fixture
+    def provider(self):
+        """Create an Azure provider with a mocked client."""
+        from src.ocr.azure_provider import AzureOCRProvider
+        provider = AzureOCRProvider({
+            'endpoint': 'https://example.cognitiveservices.azure.com/',
+            'api_key': 'test_key'
+        })
+        provider.client = MagicMock()
+        return provider
+
+    @staticmethod
+    def _azure_result(page_texts):
+        """Build a fake Azure result from {page_number: text}."""
+        pages = []
+        for number, text in page_texts.items():
+            page = Mock()
+            page.page_number = number
+            page.lines = [Mock(content=line) for line in text.split('\n')]
+            pages.append(page)
+        return Mock(pages=pages)
+
+    def test_format_page_ranges(self, provider):
+        """Test consecutive pages are collapsed into ranges."""
+        assert provider._format_page_ranges([9, 1, 2, 3, 7, 10]) == '1-3,7,9-10'
+        assert provider._format_page_ranges([4]) == '4'
+
+    def test_ocr_with_azure_passes_page_subset(self, provider):
+        """Test only requested pages are analyzed and returned in order."""
+        poller = Mock()
+        poller.result.return_value = self._azure_result({5: 'five', 2: 'two'})
+        provider.client.begin_analyze_document.return_value = poller
+
+        result = provider._ocr_with_azure(b'%PDF-', pages=[2, 5])
+
+        assert result == ['two', 'five']
+        _, kwargs = provider.client.begin_analyze_document.call_args
+        assert kwargs['pages'] == '2,5'
+
+    def test_ocr_pages_for_escalation(self, provider, tmp_path):
+        """Test selected pages of a file are OCR'd for escalation."""
+        input_path = tmp_path / 'scan.pdf'
+        input_path.write_bytes(b'%PDF-1.4 fake')
+
+        with patch.object(provider, '_ocr_pages', return_value=['p3']) as mock_ocr:
+            assert provider.ocr_pages(str(input_path), [3]) == ['p3']
+
+        mock_ocr.assert_called_once_with(b'%PDF-1.4 fake', [3])
+
+    def test_process_document_ocrs_only_scanned_pages(self, provider, tmp_path):
+        """Test searchable pages are extracted locally and merged in order."""
+        from src.document_analyzer import PdfAnalysis
+        input_path = tmp_path / 'contract.pdf'
+        input_path.write_bytes(b'%PDF-1.4 fake')
+        analysis = PdfAnalysis(
+            path=str(input_path), is_valid=True,
+            page_texts=['local 1 ' * 10, '', 'local 3 ' * 10, ''])
+
+        with patch.object(provider, '_ocr_with_azure',
+                          return_value=['ocr 2', 'ocr 4']) as mock_ocr, \
+                patch.object(provider, '_save_as_docx') as mock_save:
+            mock_save.side_effect = lambda pages, out: open(out, 'wb').close()
+            provider.process_document(
+                str(input_path), str(tmp_path / 'out.docx'), analysis=analysis)
+
+        assert mock_ocr.call_args.kwargs['pages'] == [2, 4]
+        mock_save.assert_called_once_with(
+            ['local 1 ' * 10, 'ocr 2', 'local 3 ' * 10, 'ocr 4'],
+            str(tmp_path / 'out.docx'))
+
+    @patch('src.ocr.azure_provider.analyze_pdf')
+    def test_process_document_skips_azure_when_all_searchable(self, mock_analyze, provider, tmp_path):
+        """Test fully searchable PDFs never reach Azure."""
+        from src.document_analyzer import PdfAnalysis
+        input_path = tmp_path / 'text.pdf'
+        input_path.write_bytes(b'%PDF-1.4 fake')
+        mock_analyze.return_value = PdfAnalysis(
+            path=str(input_path), is_valid=True, page_texts=['text ' * 20])
+
+        with patch.object(provider, '_ocr_with_azure') as mock_ocr, \
+                patch.object(provider, '_save_as_docx') as mock_save:
+            provider.process_document(str(input_path), str(tmp_path / 'out.docx'))
+
+        mock_analyze.assert_called_once_with(str(input_path))
+        mock_ocr.assert_not_called()
+        mock_save.assert_called_once_with(['text ' * 20], str(tmp_path / 'out.docx'))
+
+    def test_process_document_rejects_invalid_analysis(self, provider, tmp_path):
+        """Test an invalid PDF analysis fails without calling Azure."""
+        from src.document_analyzer import PdfAnalysis
+        input_path = tmp_path / 'broken.pdf'
+        input_path.write_bytes(b'not a pdf')
+        analysis = PdfAnalysis(path=str(input_path), is_valid=False, error='bad header')
+
+        with patch.object(provider, '_ocr_with_azure') as mock_ocr:
+            with pytest.raises(RuntimeError, match='bad header'):
+                provider.process_document(
+                    str(input_path), str(tmp_path / 'out.docx'), analysis=analysis)
+
+        mock_ocr.assert_not_called()
+
+    def test_make_shards(self, provider):
+        """Test pages are split into consecutive shards of shard_size."""
+        assert provider._make_shards([1, 2, 3, 4, 5], 2) == [[1, 2], [3, 4], [5]]
+        assert provider._make_shards([1, 2, 3], 5) == [[1, 2, 3]]
+        assert provider._make_shards([1, 2, 3], 0) == [[1, 2, 3]]
+
+    def test_extract_pdf_pages(self, provider):
+        """Test a shard PDF holds only the requested pages."""
+        from pypdf import PdfReader
+        import io
+        pdf_path = os.path.join(os.path.dirname(__file__), '..', 'test_docs',
+                                'file-sample-pdf.pdf')
+        with open(pdf_path, 'rb') as f:
+            shard = provider._extract_pdf_pages(f.read(), [2, 4])
+
+        assert len(PdfReader(io.BytesIO(shard)).pages) == 2
+
+    def test_ocr_pages_shards_and_retries(self, provider):
+        """Test large page sets are sharded, failed shards retried, order kept."""
+        provider.shard_size = 2
+        attempts = {}
+
+        def fake_ocr(shard_bytes, pages=None, layout=None, cancel=None):
+            shard = shard_bytes.decode()
+            attempts[shard] = attempts.get(shard, 0) + 1
+            if shard == '3,4' and attempts[shard] == 1:
+                raise RuntimeError('Azure OCR failed: 503')
+            return [f'text {n}' for n in shard.split(',')]
+
+        with patch.object(provider, '_extract_pdf_pages',
+                          side_effect=lambda data, pages: ','.join(map(str, pages)).encode()), \
+                patch.object(provider, '_ocr_with_azure', side_effect=fake_ocr):
+            result = provider._ocr_pages(b'%PDF-', [1, 2, 3, 4, 5])
+
+        assert result == ['text 1', 'text 2', 'text 3', 'text 4', 'text 5']
+        assert attempts == {'1,2': 1, '3,4': 2, '5': 1}
+
+    def test_ocr_pages_fails_when_shard_retry_fails(self, provider):
+        """Test a shard failing twice fails the document, naming its pages."""
+        provider.shard_size = 2
+        with patch.object(provider, '_extract_pdf_pages', return_value=b'%PDF-'), \
+                patch.object(provider, '_ocr_with_azure',
+                             side_effect=RuntimeError('Azure OCR failed')):
+            with pytest.raises(RuntimeError, match='pages 1-2'):
+                provider._ocr_pages(b'%PDF-', [1, 2, 3])
+
+    def test_small_documents_are_not_sharded(self, provider):
+        """Test page sets within shard_size go to Azure in one analysis."""
+        with patch.object(provider, '_ocr_with_azure', return_value=['a', 'b']) as mock_ocr, \
+                patch.object(provider, '_extract_pdf_pages') as mock_extract:
+            assert provider._ocr_pages(b'%PDF-', [3, 7]) == ['a', 'b']
+
+        mock_ocr.assert_called_once_with(b'%PDF-', pages=[3, 7], layout=None, cancel=None)
+        mock_extract.assert_not_called()
+
+
+class TestOCRProviderRegistry:
+    """Test provider instance reuse in OCRProviderFactory."""
+
+    def test_same_config_reuses_instance(self):
+        """Test repeated calls with the same config return one instance."""
+        config = {'ocr': {'default': {'workers': 2}}}
+        first = OCRProviderFactory.get_provider(config)
+        second = OCRProviderFactory.get_provider(config)
+
+        assert first is second
+        assert OCRProviderFactory.get_stats() == {
+            'default': {'created': 1, 'reused': 1}}
+
+    def test_changed_config_creates_new_instance(self):
+        """Test a different provider or cache config gets its own instance."""
+        first = OCRProviderFactory.get_provider({'ocr': {'default': {'workers': 2}}})
+        second = OCRProviderFactory.get_provider({'ocr': {'default': {'workers': 4}}})
+        third = OCRProviderFactory.get_provider({'ocr': {
+            'default': {'workers': 4},
+            'cache': {'enabled': False, 'max_size_mb': 10}}})
+
+        assert first is not second
+        assert second is not third
+        assert OCRProviderFactory.get_stats()['default']['created'] == 3
+
+    def test_unrelated_sections_do_not_affect_key(self):
+        """Test changes to other providers' config keep the instance."""
+        first = OCRProviderFactory.get_provider({'ocr': {}})
+        second = OCRProviderFactory.get_provider(
+            {'ocr': {'landing_ai': {'api_key': 'k'}}})
+        assert first is second
+
+    def test_fallback_provider_shares_default_instance(self):
+        """Test the fallback provider is the registered default provider."""
+        config = {'ocr': {'default': {'rasterizer': 'pymupdf'}}}
+        fallback = OCRProviderFactory.get_fallback_provider(config)
+
+        assert isinstance(fallback, DefaultOCRProvider)
+        assert fallback.config == {'rasterizer': 'pymupdf'}
+        assert OCRProviderFactory.get_provider(config) is fallback
+
+    def test_failed_creation_is_not_cached(self):
+        """Test a misconfigured provider raises on every call."""
+        config = {'ocr': {'azure': {}}}
+        for _ in range(2):
+            with pytest.raises(ValueError, match="endpoint"):
+                OCRProviderFactory.get_provider(config, translation_mode='human')
+        assert OCRProviderFactory.get_stats()['azure']['created'] == 0
+
+    def test_concurrent_calls_create_one_instance(self):
+        """Test threads racing on an empty registry share one instance."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        config = {'ocr': {'landing_ai': {'api_key': 'test_key'}}}
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            providers = list(pool.map(
+                lambda _: OCRProviderFactory.get_provider(
+                    config, translation_mode='formats'),
+                range(32)))
+
+        assert all(p is providers[0] for p in providers)
+        assert OCRProviderFactory.get_stats()['landing_ai'] == {
+            'created': 1, 'reused': 31}
+
+    def test_clear_cache(self):
+        """Test clearing the registry drops instances and stats."""
+        first = OCRProviderFactory.get_provider({'ocr': {}})
+        OCRProviderFactory.clear_cache()
+
+        assert OCRProviderFactory.get_stats() == {}
+        assert OCRProviderFactory.get_provider({'ocr': {}}) is not first
+
+    def test_clear_cache_closes_providers(self):
+        """Test cleared instances release their connections."""
+        provider = OCRProviderFactory.get_provider(
+            {'ocr': {'landing_ai': {'api_key': 'test_key'}}},
+            translation_mode='formats')
+
+        with patch.object(provider.session, 'close') as mock_close:
+            OCRProviderFactory.clear_cache()
+
+        mock_close.assert_called_once()
+
+    def test_changed_config_closes_previous_instance(self):
+        """Test a provider replaced by a new configuration is closed."""
+        first = OCRProviderFactory.get_provider(
+            {'ocr': {'landing_ai': {'api_key': 'first_key'}}},
+            translation_mode='formats')
+        other = OCRProviderFactory.get_provider({'ocr': {}})
+
+        with patch.object(first.session, 'close') as mock_close:
+            second = OCRProviderFactory.get_provider(
+                {'ocr': {'landing_ai': {'api_key': 'second_key'}}},
+                translation_mode='formats')
+
+        assert second is not first
+        mock_close.assert_called_once()
+        assert OCRProviderFactory.get_provider({'ocr': {}}) is other
+
+    def test_close_failure_is_not_raised(self):
+        """Test a provider failing to close does not stop the others."""
+        OCRProviderFactory.get_provider({'ocr': {}})
+        with patch.object(DefaultOCRProvider, 'close',
+                          side_effect=RuntimeError("already closed")):
+            OCRProviderFactory.clear_cache()
+
+        assert OCRProviderFactory.get_stats() == {}
+
+    def test_warm_up_configured_providers(self):
+        """Test warm_up creates and warms only configured providers."""
+        config = {'ocr': {'landing_ai': {'api_key': 'test_key'},
+                          'azure': {'endpoint': ''}}}
+
+        with patch.object(LandingAIOCRProvider, 'warm_up') as mock_landing_warm, \
+                patch.object(DefaultOCRProvider, 'warm_up') as mock_default_warm:
+            warmed = OCRProviderFactory.warm_up(config)
+
+        assert warmed == ['default', 'landing_ai']
+        mock_landing_warm.assert_called_once()
+        mock_default_warm.assert_called_once()
+        provider = OCRProviderFactory.get_provider(config, translation_mode='formats')
+        assert OCRProviderFactory.get_stats()['landing_ai'] == {
+            'created': 1, 'reused': 1}
+        assert isinstance(provider, LandingAIOCRProvider)
 
-        # Create a temporary test file
-        import tempfile
-        with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as f:
-            f.write(b'PDF content')
-            temp_path = f.name
+    def test_warm_up_failure_is_not_raised(self):
+        """Test a provider failing to warm up does not stop the others."""
+        config = {'ocr': {'landing_ai': {'api_key': 'test_key'}}}
 
-        output_path = None
-        try:
-            with tempfile.NamedTemporaryFile(suffix='.docx', delete=False) as f:
-                output_path = f.name
+        with patch.object(LandingAIOCRProvider, 'warm_up',
+                          side_effect=RuntimeError("network down")):
+            warmed = OCRProviderFactory.warm_up(config)
 
-            # Mock convert_txt_to_docx to create the file
-            with patch('src.ocr.landing_ai_provider.convert_txt_to_docx') as mock_convert:
-                def create_file(*args):
-                    with open(output_path, 'wb') as f:
-                        f.write(b'Empty DOCX')
+        assert warmed == ['default']
 
-                mock_convert.side_effect = create_file
-                provider.process_document(temp_path, output_path)
+    def test_landing_ai_warm_up_opens_session_connection(self):
+        """Test LandingAI warm-up sends a HEAD request over its session."""
+        provider = LandingAIOCRProvider({'api_key': 'test_key'})
 
-                # Verify it used the "no content" message
-                call_args = mock_convert.call_args[0]
-                assert '[No text content extracted from document]' in call_args[0]
-        finally:
-            os.remove(temp_path)
-            if output_path and os.path.exists(output_path):
-                os.remove(output_path)
+        with patch.object(provider.session, 'head') as mock_head:
+            mock_head.return_value = Mock(status_code=200)
+            provider.warm_up()
+
+        mock_head.assert_called_once_with(provider.base_url, timeout=10)
+
+    def test_azure_warm_up_swallows_errors(self):
+        """Test Azure warm-up logs connection errors instead of raising."""
+        from src.ocr.azure_provider import AzureOCRProvider
+
+        provider = AzureOCRProvider({
+            'endpoint': 'https://example.cognitiveservices.azure.com/',
+            'api_key': 'test_key'})
+        provider.client = MagicMock()
+        provider.client.send_request.side_effect = ConnectionError("refused")
+
+        provider.warm_up()
+
+        provider.client.send_request.assert_called_once()
@@ -0,0 +1,273 @@
+"""Tests for OCR sidecars and rebuilding DOCX files from them offline."""
+import gzip
+import json
+import os
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+from docx import Document
+
+from src.ocr.ocr_factory import OCRProviderFactory
+from src.ocr.sidecar import SidecarStore, load_sidecar, rebuild_docx
+
+AZURE_CONFIG = {
+    'endpoint': 'https://example.cognitiveservices.azure.com/',
+    'api_key': 'test_key',
+}
+
+CHUNKS = [
+    {'text': 'Heading', 'grounding': {'page': 0, 'box': {
+        'left': 0.1, 'top': 0.05, 'right': 0.9, 'bottom': 0.1}}},
+    {'text': 'Body text', 'grounding': {'page': 0, 'box': {
+        'left': 0.1, 'top': 0.3, 'right': 0.9, 'bottom': 0.35}}},
+]
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Sidecar store in a temporary directory."""
+    return SidecarStore(str(tmp_path / 'sidecars'))
+
+
+@pytest.fixture
+def scan(tmp_path):
+    """A small input file."""
+    path = tmp_path / 'scan.pdf'
+    path.write_bytes(b'%PDF-1.4 scanned')
+    return str(path)
+
+
+def sidecar_files(store):
+    """Paths of the sidecars in a store."""
+    return [os.path.join(store.directory, name) for name in os.listdir(store.directory)]
+
+
+def docx_text(path):
+    """Non-empty paragraphs of a DOCX file."""
+    return [p.text for p in Document(path).paragraphs if p.text]
+
+
+def azure_page(number, lines):
+    """Fake Azure result page with one polygon per line."""
+    return SimpleNamespace(
+        page_number=number, width=8.5, height=11.0, unit='inch', angle=0.0,
+        lines=[SimpleNamespace(content=text, polygon=[
+            SimpleNamespace(x=1.0, y=row), SimpleNamespace(x=7.5, y=row + 0.2)])
+            for row, text in enumerate(lines, 1)])
+
+
+class TestSidecarStore:
+    """Test sidecar storage."""
+
+    def test_save_and_load(self, store, scan):
+        """Test a sidecar is compressed JSON holding the payload and metadata."""
+        path = store.save(scan, 'LandingAIOCRProvider', {'model': 'm'},
+                          {'chunks': CHUNKS})
+
+        assert os.path.basename(path).startswith('scan.LandingAIOCRProvider.')
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            assert json.load(f)['chunks'] == CHUNKS
+        record = load_sidecar(path)
+        assert record['document'] == 'scan.pdf'
+        assert record['settings'] == {'model': 'm'}
+        assert len(record['sha256']) == 64
+
+    def test_same_document_replaces_sidecar(self, store, scan):
+        """Test processing a document again overwrites its sidecar."""
+        store.save(scan, 'LandingAIOCRProvider', {}, {'chunks': []})
+        store.save(scan, 'LandingAIOCRProvider', {}, {'chunks': CHUNKS})
+
+        [path] = sidecar_files(store)
+        assert load_sidecar(path)['chunks'] == CHUNKS
+
+    def test_concurrent_saves_use_own_temp_files(self, store, scan):
+        """Test threads saving the same document don't share a temporary file."""
+        import threading
+        temp_paths = []
+        replace = os.replace
+        # Both writers are mid-save before either moves its sidecar into place
+        both_written = threading.Barrier(2, timeout=5)
+
+        def record(src, dst):
+            temp_paths.append(src)
+            both_written.wait()
+            replace(src, dst)
+
+        with patch('src.ocr.sidecar.os.replace', side_effect=record):
+            threads = [threading.Thread(target=store.save, args=(
+                scan, 'LandingAIOCRProvider', {}, {'chunks': CHUNKS})) for _ in range(2)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        assert len(set(temp_paths)) == 2
+        [path] = sidecar_files(store)
+        assert load_sidecar(path)['chunks'] == CHUNKS
+
+    def test_disabled_by_default(self):
+        """Test no store is created unless enabled."""
+        assert SidecarStore.from_config({}) is None
+
+    def test_rejects_other_files(self, tmp_path):
+        """Test files that are not sidecars are refused."""
+        path = tmp_path / 'other.json.gz'
+        with gzip.open(path, 'wt') as f:
+            json.dump({'pages': []}, f)
+
+        with pytest.raises(ValueError):
+            load_sidecar(str(path))
+
+    def test_unsupported_provider(self, store, scan, tmp_path):
+        """Test only providers that save sidecars can rebuild from them."""
+        path = store.save(scan, 'DefaultOCRProvider', {}, {})
+
+        with pytest.raises(ValueError, match='DefaultOCRProvider'):
+            rebuild_docx(path, str(tmp_path / 'out.docx'))
+
+    def test_factory_attaches_store(self, tmp_path):
+        """Test the factory attaches the configured store to providers."""
+        config = {'ocr': {'sidecars': {'enabled': True,
+                                       'directory': str(tmp_path / 's')}}}
+        provider = OCRProviderFactory.get_provider(config)
+        assert isinstance(provider.sidecars, SidecarStore)
+
+
+class TestLandingAISidecars:
+    """Test LandingAI chunks are saved and rebuilt offline."""
+
+    @pytest.fixture
+    def provider(self, store):
+        from src.ocr.landing_ai_provider import LandingAIOCRProvider
+        provider = LandingAIOCRProvider({'api_key': 'test_key', 'stream_response': False})
+        provider.sidecars = store
+        return provider
+
+    def test_chunks_saved_and_rebuilt_without_api(self, provider, store, scan, tmp_path):
+        """Test the rebuilt DOCX matches the original without calling the API."""
+        original = str(tmp_path / 'original.docx')
+        with patch.object(provider, '_call_api_with_retry',
+                          return_value={'chunks': CHUNKS, 'markdown': '...'}):
+            provider.process_document(scan, original)
+
+        [path] = sidecar_files(store)
+        assert load_sidecar(path)['chunks'] == CHUNKS
+
+        rebuilt = str(tmp_path / 'rebuilt.docx')
+        with patch('requests.Session.request',
+                   side_effect=AssertionError('network call')):
+            rebuild_docx(path, rebuilt)
+
+        assert docx_text(rebuilt) == docx_text(original)
+
+    def test_sidecar_failure_does_not_fail_ocr(self, provider, store, scan, tmp_path):
+        """Test a failing sidecar write is only logged."""
+        output = str(tmp_path / 'out.docx')
+        with patch.object(provider, '_call_api_with_retry', return_value={'chunks': CHUNKS}), \
+                patch.object(store, 'save', side_effect=OSError('disk full')):
+            provider.process_document(scan, output)
+
+        assert os.path.exists(output)
+
+    def test_streamed_chunks_saved_and_rebuilt(self, provider, store, scan, tmp_path):
+        """Test chunks are saved as they stream and rebuild the same pages."""
+        pytest.importorskip('ijson')
+        provider.stream_response = True
+        original = str(tmp_path / 'original.docx')
+        with patch.object(provider, '_iter_document_chunks', return_value=iter(CHUNKS)):
+            provider.process_document(scan, original)
+
+        [path] = sidecar_files(store)
+        record = load_sidecar(path)
+        assert (record['chunks'], record['use_layout']) == (CHUNKS, True)
+
+        rebuilt = str(tmp_path / 'rebuilt.docx')
+        rebuild_docx(path, rebuilt)
+
+        assert docx_text(rebuilt) == docx_text(original) == ['Heading', 'Body text']
+
+    def test_interrupted_stream_leaves_no_sidecar(self, provider, store, scan):
+        """Test a stream that fails part way doesn't save a partial sidecar."""
+        def chunks():
+            yield CHUNKS[0]
+            raise RuntimeError('connection reset')
+
+        with pytest.raises(RuntimeError):
+            list(provider._tee_to_sidecar(scan, chunks(), 'chunks'))
+
+        assert sidecar_files(store) == []
+
+
+class TestAzureSidecars:
+    """Test Azure page lines are saved and rebuilt offline."""
+
+    @pytest.fixture
+    def provider(self, store):
+        from src.ocr.azure_provider import AzureOCRProvider
+        provider = AzureOCRProvider(AZURE_CONFIG)
+        provider.client = MagicMock()
+        provider.sidecars = store
+        return provider
+
+    def test_extract_pages_collects_lines(self, provider):
+        """Test line polygons are kept when a layout is requested."""
+        layout = {}
+        result = SimpleNamespace(pages=[azure_page(4, ['first', 'second'])])
+
+        assert provider._extract_pages(result, [4], layout) == ['first\nsecond']
+        assert layout[4]['unit'] == 'inch'
+        assert layout[4]['lines'][1] == {'content': 'second',
+                                         'polygon': [1.0, 2.0, 7.5, 2.2]}
+
+    def test_shard_lines_use_document_pages(self, provider):
+        """Test lines from shard PDFs are filed under the document's page numbers."""
+        provider.shard_size = 1
+
+        def fake_ocr(shard_bytes, pages=None, layout=None, cancel=None):
+            layout[1] = {'lines': [{'content': shard_bytes.decode()}]}
+            return [shard_bytes.decode()]
+
+        layout = {}
+        with patch.object(provider, '_extract_pdf_pages',
+                          side_effect=lambda data, pages: str(pages[0]).encode()), \
+                patch.object(provider, '_ocr_with_azure', side_effect=fake_ocr):
+            provider._ocr_pages(b'%PDF-', [2, 5], layout)
+
+        assert {n: page['lines'][0]['content'] for n, page in layout.items()} == {
+            2: '2', 5: '5'}
+
+    def test_pages_saved_and_rebuilt_without_azure(self, provider, store, scan, tmp_path):
+        """Test local and OCR'd pages are rebuilt in order from the sidecar."""
+        from src.document_analyzer import PdfAnalysis
+        analysis = PdfAnalysis(path=scan, is_valid=True,
+                               page_texts=['local text ' * 10, ''])
+        poller = MagicMock()
+        poller.result.return_value = SimpleNamespace(
+            pages=[azure_page(2, ['scanned line one', 'scanned line two'])])
+        provider.client.begin_analyze_document.return_value = poller
+        original = str(tmp_path / 'original.docx')
+
+        provider.process_document(scan, original, analysis=analysis)
+
+        [path] = sidecar_files(store)
+        record = load_sidecar(path)
+        assert [page['page'] for page in record['layout']] == [2]
+
+        rebuilt = str(tmp_path / 'rebuilt.docx')
+        rebuild_docx(path, rebuilt)
+
+        assert docx_text(rebuilt) == docx_text(original)
+        assert provider.client.begin_analyze_document.call_count == 1
+
+    def test_no_sidecar_when_disabled(self, provider, scan, tmp_path):
+        """Test page lines are not collected without a sidecar store."""
+        from src.document_analyzer import PdfAnalysis
+        provider.sidecars = None
+
+        with patch.object(provider, '_ocr_pages', return_value=['text']) as mock_ocr:
+            provider.process_document(
+                scan, str(tmp_path / 'out.docx'),
+                analysis=PdfAnalysis(path=scan, is_valid=True, page_texts=['']))
+
+        assert mock_ocr.call_args.args[2] is None
@@ -0,0 +1,272 @@
+"""Unit tests for confidence-driven re-OCR of weak pages."""
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+from docx import Document
+
+from src.convert_to_docx import DocxPageWriter
+
+from src.ocr.base_provider import BaseOCRProvider
+from src.ocr.circuit_breaker import get_circuit_breaker
+from src.ocr.page_quality import (
+    ACCEPTED, ESCALATED, RETRIED, WEAK, build_report, document_confidence,
+    escalate_weak_pages, is_weak, record_report, retry_weak_pages)
+from src.ocr.rasterizer import PageImage
+from src.ocr.tesseract_engine import PageResult
+
+GOOD = PageResult('good\n\f', 92.0, 100)
+WEAK_PAGE = PageResult('w3ak\n\f', 35.0, 20)
+BLANK = PageResult('', None, 0)
+
+
+class TestConfidence:
+    """Test page and document confidence."""
+
+    def test_is_weak(self):
+        """Test pages below the threshold are weak, blank pages are not."""
+        assert is_weak(WEAK_PAGE, 60)
+        assert not is_weak(GOOD, 60)
+        assert not is_weak(BLANK, 60)
+
+    def test_document_confidence_weighted_by_words(self):
+        """Test pages with more words count more."""
+        confidence = document_confidence([GOOD, WEAK_PAGE, BLANK])
+
+        assert confidence == pytest.approx((92 * 100 + 35 * 20) / 120)
+
+    def test_document_without_words(self):
+        """Test a document without words has no confidence."""
+        assert document_confidence([BLANK]) is None
+
+
+class TestRetryWeakPages:
+    """Test re-OCR of weak pages with stronger settings."""
+
+    @pytest.fixture
+    def engine(self):
+        with patch('src.ocr.page_quality.get_rasterizer') as mock_get, \
+                patch('src.ocr.page_quality.ParallelTesseractEngine') as mock_engine:
+            mock_get.return_value.render_page.side_effect = (
+                lambda path, num, dpi: PageImage(num, 1, 1, b'\x00'))
+            yield mock_get.return_value, mock_engine
+
+    def test_only_weak_pages_retried(self, engine):
+        """Test strong pages are left alone and weak ones re-rendered."""
+        rasterizer, mock_engine = engine
+        better = PageResult('weak\n\f', 75.0, 20)
+        mock_engine.return_value.ocr_stream_scored.side_effect = lambda pages: [
+            (num, better) for num, _ in pages]
+        results = [GOOD, WEAK_PAGE, BLANK]
+
+        retried = retry_weak_pages('scan.pdf', results, 'rus+eng',
+                                   {'min_confidence': 60, 'retry_dpi': 450,
+                                    'retry_psm': 4})
+
+        assert retried == [2]
+        assert results == [GOOD, better, BLANK]
+        rasterizer.render_page.assert_called_once_with('scan.pdf', 2, dpi=450)
+        kwargs = mock_engine.call_args.kwargs
+        assert kwargs['lang'] == 'rus+eng'
+        assert kwargs['config'].endswith('--psm 4')
+
+    def test_worse_retry_discarded(self, engine):
+        """Test the original result is kept if the retry is not better."""
+        _, mock_engine = engine
+        mock_engine.return_value.ocr_stream_scored.side_effect = lambda pages: [
+            (num, PageResult('junk', 20.0, 5)) for num, _ in pages]
+        results = [WEAK_PAGE]
+
+        assert retry_weak_pages('scan.pdf', results, 'eng', {}) == [1]
+        assert results == [WEAK_PAGE]
+
+    def test_nothing_to_retry(self, engine):
+        """Test no engine is started when every page is fine."""
+        _, mock_engine = engine
+
+        assert retry_weak_pages('scan.pdf', [GOOD], 'eng', {}) == []
+        mock_engine.assert_not_called()
+
+
+class PageProvider(BaseOCRProvider):
+    """Provider with page-level OCR."""
+
+    def __init__(self, texts=None, error=None):
+        super().__init__({})
+        self.texts = texts
+        self.error = error
+
+    def process_document(self, input_path, output_path, analysis=None,
+                         source_language=None, cancel=None):
+        pass
+
+    def is_pdf_searchable(self, pdf_path):
+        return False
+
+    def ocr_pages(self, input_path, pages):
+        if self.error:
+            raise self.error
+        return self.texts[:len(pages)]
+
+
+class WholeDocumentProvider(PageProvider):
+    """Provider without page-level OCR."""
+    ocr_pages = BaseOCRProvider.ocr_pages
+
+
+class TestEscalateWeakPages:
+    """Test escalation of weak pages to a cloud provider."""
+
+    QUALITY = {'min_confidence': 60, 'escalate_to': 'azure'}
+    CONFIG = {'ocr': {'circuit_breaker': {'failure_threshold': 1}}}
+
+    def escalate(self, provider, results):
+        with patch('src.ocr.page_quality.OCRProviderFactory.get_provider_by_type',
+                   return_value=provider):
+            return escalate_weak_pages('scan.pdf', results, self.QUALITY, self.CONFIG)
+
+    def test_weak_pages_replaced(self):
+        """Test escalated pages get the provider's text."""
+        results = [GOOD, WEAK_PAGE]
+
+        assert self.escalate(PageProvider(texts=['weak']), results) == [2]
+        assert results == [GOOD, PageResult('weak\n\f', None, 0)]
+
+    def test_provider_failure_keeps_tesseract_text(self):
+        """Test a failing provider leaves the page as it was and trips the breaker."""
+        results = [WEAK_PAGE]
+
+        assert self.escalate(PageProvider(error=RuntimeError('down')), results) == []
+        assert results == [WEAK_PAGE]
+        assert get_circuit_breaker('azure').get_metrics()['failures'] == 1
+
+    def test_open_circuit_skips_escalation(self):
+        """Test nothing is sent while the provider's circuit is open."""
+        get_circuit_breaker('azure', self.CONFIG['ocr']['circuit_breaker']).record_failure()
+        provider = PageProvider(texts=['weak'])
+        provider.ocr_pages = MagicMock()
+
+        assert self.escalate(provider, [WEAK_PAGE]) == []
+        provider.ocr_pages.assert_not_called()
+
+    def test_provider_without_page_ocr(self):
+        """Test providers that only process whole documents are skipped."""
+        assert self.escalate(WholeDocumentProvider(), [WEAK_PAGE]) == []
+
+    def test_disabled_without_target(self):
+        """Test nothing is escalated unless 'escalate_to' is set."""
+        with patch('src.ocr.page_quality.OCRProviderFactory.get_provider_by_type') as mock_get:
+            assert escalate_weak_pages('scan.pdf', [WEAK_PAGE], {}, {}) == []
+        mock_get.assert_not_called()
+
+
+class TestQualityReport:
+    """Test per-document quality reports."""
+
+    def test_page_actions(self):
+        """Test each page is labeled with what was done about it."""
+        report = build_report('/tmp/scan.pdf', [GOOD, GOOD, WEAK_PAGE, WEAK_PAGE],
+                              retried=[2, 3, 4], escalated=[4], threshold=60)
+
+        assert report.document == 'scan.pdf'
+        assert [page.action for page in report.pages] == [
+            ACCEPTED, RETRIED, WEAK, ESCALATED]
+        assert report.confidence == pytest.approx((92 * 200 + 35 * 40) / 240, abs=0.01)
+
+    def test_record_appends_jsonl(self, tmp_path, caplog):
+        """Test reports are logged and appended to the quality log."""
+        log = tmp_path / 'logs' / 'quality.jsonl'
+        report = build_report('scan.pdf', [GOOD, WEAK_PAGE], [], [], 60)
+
+        with caplog.at_level('INFO', logger='EmailReader.OCR.Quality'):
+            record_report(report, str(log))
+            record_report(report, str(log))
+
+        entries = [json.loads(line) for line in log.read_text().splitlines()]
+        assert len(entries) == 2
+        assert entries[0]['pages'][1] == {'page': 2, 'confidence': 35.0,
+                                          'words': 20, 'action': WEAK}
+        assert "QUALITY | document=scan.pdf" in caplog.text
+
+
+class TestDefaultProviderQuality:
+    """Test the default provider's confidence-driven OCR path."""
+
+    @patch('src.ocr.default_provider.ocr_pdf_image_pages_scored')
+    def test_quality_recorded_with_result(self, mock_scored, tmp_path):
+        """Test the quality report is logged and kept with the OCR result."""
+        from src.ocr.default_provider import DefaultOCRProvider
+        log = tmp_path / 'quality.jsonl'
+        provider = DefaultOCRProvider({'quality': {
+            'enabled': True, 'min_confidence': 60, 'log': str(log)}})
+        writer = DocxPageWriter(str(tmp_path / 'out.docx'))
+
+        def scored(path, writer, **kwargs):
+            # The good page is written at once, the weak one held back
+            writer.add_page(GOOD.text)
+            writer.reserve_page()
+            return [GOOD._replace(text=''), WEAK_PAGE], [2]
+        mock_scored.side_effect = scored
+
+        result = provider._ocr_with_quality('scan.pdf', writer, provider._quality(), 'ru')
+        writer.close()
+
+        assert [p.text for p in Document(writer.docx_file_path).paragraphs if p.text] == [
+            'good', 'w3ak']
+        assert [p['action'] for p in result['quality']['pages']] == [ACCEPTED, WEAK]
+        assert mock_scored.call_args.kwargs['quality']['min_confidence'] == 60
+        assert json.loads(log.read_text())['document'] == 'scan.pdf'
+
+    @patch('src.ocr.default_provider.load_config', return_value={})
+    @patch('src.ocr.default_provider.escalate_weak_pages', return_value=[2])
+    @patch('src.ocr.default_provider.ocr_pdf_image_pages_scored')
+    def test_escalation(self, mock_scored, mock_escalate, mock_config,
+                        tmp_path):
+        """Test weak pages are escalated when a target provider is configured."""
+        from src.ocr.default_provider import DefaultOCRProvider
+        provider = DefaultOCRProvider({'quality': {
+            'enabled': True, 'escalate_to': 'azure',
+            'log': str(tmp_path / 'quality.jsonl')}})
+        mock_scored.return_value = ([GOOD, WEAK_PAGE], [2])
+
+        result = provider._ocr_with_quality('scan.pdf', MagicMock(reserved_pages=[]),
+                                            provider._quality(), None)
+
+        mock_escalate.assert_called_once()
+        assert result['quality']['pages'][1]['action'] == ESCALATED
+        # Tesseract's confidence is still reported for the escalated page
+        assert result['quality']['pages'][1]['confidence'] == 35.0
+
+    @patch('src.pdf_image_ocr.ParallelTesseractEngine')
+    @patch('src.pdf_image_ocr.select_languages', return_value='eng')
+    @patch('src.pdf_image_ocr.get_rasterizer')
+    @patch('src.pdf_image_ocr.retry_weak_pages', return_value=[2])
+    def test_only_weak_pages_held_back(self, mock_retry, mock_get, mock_select,
+                                       mock_engine, tmp_path):
+        """Test accepted pages are written at once and weak pages reserved."""
+        from src.pdf_image_ocr import ocr_pdf_image_pages_scored
+        mock_get.return_value.iter_pages.return_value = iter(
+            [PageImage(n, 1, 1, b'\x00') for n in (1, 2, 3)])
+        pages = {1: GOOD, 2: WEAK_PAGE, 3: BLANK}
+        mock_engine.return_value.ocr_stream_scored.side_effect = (
+            lambda stream: ((num, pages[num]) for num, _ in stream))
+        pdf = tmp_path / 'scan.pdf'
+        pdf.write_bytes(b'%PDF-1.4')
+        writer = MagicMock()
+
+        results, retried = ocr_pdf_image_pages_scored(
+            str(pdf), quality={'min_confidence': 60}, writer=writer)
+
+        assert [c.args[0] for c in writer.add_page.call_args_list] == [GOOD.text, '']
+        writer.reserve_page.assert_called_once()
+        assert results == [GOOD._replace(text=''), WEAK_PAGE, BLANK]
+        assert retried == [2]
+
+    def test_quality_settings_part_of_cache_key(self):
+        """Test enabled quality checks change the cached OCR settings."""
+        from src.ocr.default_provider import DefaultOCRProvider
+        provider = DefaultOCRProvider({'quality': {
+            'enabled': True, 'min_confidence': 70, 'log': 'x.jsonl'}})
+
+        assert provider._cache_settings()['quality'] == {
+            'enabled': True, 'min_confidence': 70}
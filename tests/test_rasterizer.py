@@ -0,0 +1,153 @@
+"""Tests for the pluggable PDF rasterizer backends."""
+import os
+from unittest.mock import patch
+
+import pytest
+from PIL import Image
+
+from src.ocr.rasterizer import (
+    PageImage,
+    PdfiumRasterizer,
+    PopplerRasterizer,
+    PyMuPDFRasterizer,
+    _pack_rows,
+    get_pdf_page_count,
+    get_rasterizer,
+)
+
+SCANNED_PDF = os.path.join(os.path.dirname(__file__), '..', 'test_docs',
+                           'PDF-scanned-rus-words.pdf')
+
+
+def _fake_convert(pdf_path, dpi, grayscale, first_page, last_page):
+    """Pretend to render pages first_page..last_page as 4x2 images."""
+    return [Image.new('L', (4, 2), color=n) for n in range(first_page, last_page + 1)]
+
+
+class TestPageImage:
+    """Test the raw grayscale page buffer."""
+
+    def test_to_pil_wraps_buffer(self):
+        """Test the buffer is exposed as an 8-bit grayscale PIL image."""
+        page = PageImage(1, 3, 2, bytes([0, 1, 2, 3, 4, 5]))
+        image = page.to_pil()
+
+        assert image.mode == 'L'
+        assert image.size == (3, 2)
+        assert image.getpixel((2, 1)) == 5
+
+    def test_pack_rows_drops_stride_padding(self):
+        """Test padding bytes at the end of each row are removed."""
+        buffer = bytes([1, 2, 0, 0, 3, 4, 0, 0])
+        assert _pack_rows(buffer, 2, 2, 4) == bytes([1, 2, 3, 4])
+
+    def test_pack_rows_without_padding(self):
+        """Test a tightly packed buffer is copied as-is."""
+        assert _pack_rows(bytearray(b'abcdef'), 3, 2, 3) == b'abcdef'
+
+
+class TestGetRasterizer:
+    """Test backend selection."""
+
+    def test_default_is_pdfium(self):
+        """Test pdfium is used when no backend is configured."""
+        assert isinstance(get_rasterizer(), PdfiumRasterizer)
+
+    @pytest.mark.parametrize('name,cls', [
+        ('pdfium', PdfiumRasterizer),
+        ('PyMuPDF', PyMuPDFRasterizer),
+        ('poppler', PopplerRasterizer),
+    ])
+    def test_backend_by_name(self, name, cls):
+        """Test backends are looked up case-insensitively."""
+        assert isinstance(get_rasterizer(name), cls)
+
+    def test_invalid_name(self):
+        """Test an unknown backend raises ValueError."""
+        with pytest.raises(ValueError, match='Invalid rasterizer'):
+            get_rasterizer('ghostscript')
+
+
+class TestInProcessRasterizers:
+    """Test in-process rendering of a real scanned PDF."""
+
+    @pytest.mark.parametrize('name', ['pdfium', 'pymupdf'])
+    def test_renders_all_pages(self, name):
+        """Test every page is rendered to a packed grayscale buffer."""
+        pages = list(get_rasterizer(name).iter_pages(SCANNED_PDF, dpi=72))
+
+        assert [p.page_number for p in pages] == [1, 2, 3, 4, 5, 6]
+        for page in pages:
+            assert len(page.data) == page.width * page.height
+            assert page.to_pil().mode == 'L'
+
+    @pytest.mark.parametrize('name', ['pdfium', 'pymupdf'])
+    def test_dpi_scales_output(self, name):
+        """Test doubling the DPI doubles the page dimensions."""
+        backend = get_rasterizer(name)
+        low = next(backend.iter_pages(SCANNED_PDF, dpi=72))
+        high = next(backend.iter_pages(SCANNED_PDF, dpi=144))
+
+        assert abs(high.width - 2 * low.width) <= 2
+        assert abs(high.height - 2 * low.height) <= 2
+
+    @pytest.mark.parametrize('name', ['pdfium', 'pymupdf'])
+    def test_render_single_page(self, name):
+        """Test one page is rendered on its own, identical to the stream."""
+        backend = get_rasterizer(name)
+        page = backend.render_page(SCANNED_PDF, 4, dpi=72)
+
+        assert page == list(backend.iter_pages(SCANNED_PDF, dpi=72))[3]
+
+    @pytest.mark.parametrize('name', ['pdfium', 'pymupdf'])
+    def test_render_missing_page(self, name):
+        """Test rendering a page past the end raises IndexError."""
+        with pytest.raises(IndexError):
+            get_rasterizer(name).render_page(SCANNED_PDF, 7, dpi=72)
+
+
+class TestPopplerRasterizer:
+    """Test page-window rendering through pdf2image."""
+
+    @patch('src.ocr.rasterizer.pdfinfo_from_path', return_value={'Pages': 3})
+    def test_page_count_from_pdfinfo(self, mock_info):
+        """Test page count comes from poppler's pdfinfo."""
+        assert get_pdf_page_count('doc.pdf') == 3
+
+    @patch('src.ocr.rasterizer.convert_from_path', side_effect=_fake_convert)
+    def test_renders_one_page_at_a_time(self, mock_convert):
+        """Test each page is rendered by its own first_page/last_page call."""
+        pages = list(PopplerRasterizer().iter_pages('doc.pdf', page_count=3))
+
+        assert [p.page_number for p in pages] == [1, 2, 3]
+        assert pages[2].data == bytes([3] * 8)
+        windows = [(c.kwargs['first_page'], c.kwargs['last_page'])
+                   for c in mock_convert.call_args_list]
+        assert windows == [(1, 1), (2, 2), (3, 3)]
+
+    @patch('src.ocr.rasterizer.convert_from_path', side_effect=_fake_convert)
+    def test_window_groups_pages(self, mock_convert):
+        """Test a window renders several pages per call, last one partial."""
+        pages = list(PopplerRasterizer(window=2).iter_pages('doc.pdf', page_count=5))
+
+        assert [p.page_number for p in pages] == [1, 2, 3, 4, 5]
+        windows = [(c.kwargs['first_page'], c.kwargs['last_page'])
+                   for c in mock_convert.call_args_list]
+        assert windows == [(1, 2), (3, 4), (5, 5)]
+
+    @patch('src.ocr.rasterizer.convert_from_path', side_effect=_fake_convert)
+    def test_render_single_page(self, mock_convert):
+        """Test a single page is rendered without its predecessors."""
+        page = PopplerRasterizer().render_page('doc.pdf', 4, dpi=400)
+
+        assert page.page_number == 4
+        assert page.data == bytes([4] * 8)
+        assert mock_convert.call_args.kwargs['dpi'] == 400
+
+    @patch('src.ocr.rasterizer.convert_from_path', side_effect=_fake_convert)
+    def test_rendering_is_lazy(self, mock_convert):
+        """Test later pages are not rendered until they are requested."""
+        pages = PopplerRasterizer().iter_pages('doc.pdf', page_count=100)
+
+        assert next(pages).page_number == 1
+        assert mock_convert.call_count == 1
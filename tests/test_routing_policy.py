@@ -0,0 +1,195 @@
+"""Unit tests for the OCR routing policy."""
+import json
+import pytest
+from unittest.mock import MagicMock, patch
+
+from src.document_analyzer import PdfAnalysis
+from src.ocr.circuit_breaker import get_circuit_breaker
+from src.ocr.fallback import process_with_fallback
+from src.ocr.provider_stats import get_provider_stats
+from src.ocr.routing_policy import RoutingPolicy, document_features
+
+SCANNED = ''
+TEXT = 'x' * 200
+
+
+def make_config(tmp_path, **routing):
+    return {'ocr': {
+        'azure': {'endpoint': 'https://example.azure.com/', 'api_key': 'k'},
+        'landing_ai': {'api_key': 'k'},
+        'routing': {'enabled': True,
+                    'decision_log': str(tmp_path / 'routing.jsonl'),
+                    **routing},
+    }}
+
+
+@pytest.fixture
+def document(tmp_path):
+    path = tmp_path / 'doc.pdf'
+    path.write_bytes(b'%PDF' + b'0' * 1024)
+    return str(path)
+
+
+def analysis_for(path, pages):
+    return PdfAnalysis(path=path, is_valid=True, page_texts=pages)
+
+
+class TestDocumentFeatures:
+    """Test document feature extraction."""
+
+    def test_pdf_features(self, document):
+        """Test page counts and searchable ratio come from the analysis."""
+        features = document_features(
+            document, analysis_for(document, [TEXT, SCANNED, SCANNED, TEXT]))
+
+        assert features['page_count'] == 4
+        assert features['scanned_pages'] == 2
+        assert features['searchable_ratio'] == 0.5
+        assert features['file_size_mb'] > 0
+
+    def test_image_features(self, document):
+        """Test inputs without an analysis only report the file size."""
+        features = document_features(document)
+
+        assert features['page_count'] is None
+        assert features['scanned_pages'] is None
+
+
+class TestRoutingPolicy:
+    """Test provider selection."""
+
+    def test_preferred_provider(self, tmp_path, document):
+        """Test the mode's first provider is used when it passes."""
+        decision = RoutingPolicy(make_config(tmp_path)).decide('human', document)
+
+        assert decision.provider == 'azure'
+        assert decision.reason == 'preferred'
+        assert decision.rejected == {}
+
+    def test_unconfigured_provider_skipped(self, tmp_path, document):
+        """Test providers without credentials are not chosen."""
+        config = make_config(tmp_path)
+        del config['ocr']['azure']
+
+        decision = RoutingPolicy(config).decide('human', document)
+
+        assert decision.provider == 'landing_ai'
+        assert decision.rejected == {'azure': 'not configured'}
+
+    def test_open_circuit_skipped(self, tmp_path, document):
+        """Test providers with an open circuit are not chosen."""
+        breaker = get_circuit_breaker('landing_ai', {'failure_threshold': 1})
+        breaker.record_failure()
+
+        decision = RoutingPolicy(make_config(tmp_path)).decide('formats', document)
+
+        assert decision.provider == 'azure'
+        assert decision.rejected == {'landing_ai': 'circuit open'}
+
+    def test_cost_counts_billed_pages(self, tmp_path, document):
+        """Test whole-document providers are billed for searchable pages too."""
+        policy = RoutingPolicy(make_config(
+            tmp_path,
+            cost_per_page={'landing_ai': 0.03, 'azure': 0.01},
+            max_cost_per_document=1.0))
+        analysis = analysis_for(document, [TEXT] * 49 + [SCANNED])
+
+        decision = policy.decide('formats', document, analysis)
+
+        assert policy.estimate_cost('landing_ai', decision.features) == pytest.approx(1.5)
+        assert policy.estimate_cost('azure', decision.features) == pytest.approx(0.01)
+        assert decision.provider == 'azure'
+        assert 'estimated cost' in decision.rejected['landing_ai']
+
+    def test_size_and_page_limits(self, tmp_path, document):
+        """Test per-provider file size and page limits."""
+        policy = RoutingPolicy(make_config(
+            tmp_path, max_file_size_mb={'azure': 0.0001}, max_pages={'landing_ai': 2}))
+        analysis = analysis_for(document, [SCANNED] * 3)
+
+        decision = policy.decide('human', document, analysis)
+
+        assert 'file size' in decision.rejected['azure']
+        assert decision.rejected['landing_ai'] == '3 pages > 2'
+        # Nothing passes: keep the mode's primary and let fallback handle it
+        assert decision.provider == 'azure'
+        assert decision.reason == 'no candidate met constraints'
+
+    def test_error_rate_and_latency(self, tmp_path, document):
+        """Test unhealthy providers are skipped once enough calls were seen."""
+        for _ in range(5):
+            get_provider_stats('azure').record(1.0, success=False)
+            get_provider_stats('landing_ai').record(600.0, success=True)
+        policy = RoutingPolicy(make_config(tmp_path, min_samples=5, max_p95_seconds=300))
+
+        decision = policy.decide('human', document)
+
+        assert decision.rejected['azure'] == 'error rate 100%'
+        assert decision.rejected['landing_ai'] == 'p95 latency 600.0s'
+
+    def test_too_few_samples_ignored(self, tmp_path, document):
+        """Test statistics are not trusted below min_samples."""
+        get_provider_stats('azure').record(1.0, success=False)
+
+        decision = RoutingPolicy(make_config(tmp_path, min_samples=5)).decide(
+            'human', document)
+
+        assert decision.provider == 'azure'
+
+    def test_custom_mode_providers(self, tmp_path, document):
+        """Test mode candidate lists can be configured."""
+        policy = RoutingPolicy(make_config(tmp_path, modes={'default': ['azure', 'default']}))
+
+        assert policy.decide('default', document).provider == 'azure'
+        assert policy.decide('human', document).provider == 'azure'
+
+
+class TestRoutingIntegration:
+    """Test routing inside process_with_fallback()."""
+
+    def test_decision_and_outcome_recorded(self, tmp_path, document):
+        """Test the chosen provider is used and the decision is logged."""
+        config = make_config(tmp_path)
+        del config['ocr']['azure']
+        providers = {'landing_ai': MagicMock(), 'default': MagicMock()}
+
+        with patch('src.ocr.fallback.load_config', return_value=config), \
+                patch('src.ocr.fallback.OCRProviderFactory.get_provider_by_type',
+                      side_effect=lambda _, provider_type: providers[provider_type]):
+            process_with_fallback(document, str(tmp_path / 'out.docx'),
+                                  translation_mode='human')
+
+        providers['landing_ai'].process_document.assert_called_once()
+        with open(tmp_path / 'routing.jsonl') as f:
+            entry = json.loads(f.readline())
+        assert entry['provider'] == 'landing_ai'
+        assert entry['rejected'] == {'azure': 'not configured'}
+        assert entry['outcome']['provider_used'] == 'landing_ai'
+        assert entry['outcome']['success'] is True
+        assert entry['outcome']['fallback_used'] is False
+
+    def test_failure_outcome_recorded(self, tmp_path, document):
+        """Test fallbacks and total failures are logged with the decision."""
+        config = make_config(tmp_path)
+        primary, fallback = MagicMock(), MagicMock()
+        primary.process_document.side_effect = RuntimeError("Azure down")
+        fallback.process_document.side_effect = RuntimeError("no tesseract")
+
+        with patch('src.ocr.fallback.load_config', return_value=config), \
+                patch('src.ocr.fallback.OCRProviderFactory.get_provider_by_type',
+                      return_value=primary), \
+                patch('src.ocr.fallback.OCRProviderFactory.get_fallback_provider',
+                      return_value=fallback):
+            with pytest.raises(RuntimeError):
+                process_with_fallback(document, str(tmp_path / 'out.docx'),
+                                      translation_mode='human')
+            fallback.process_document.side_effect = None
+            process_with_fallback(document, str(tmp_path / 'out.docx'),
+                                  translation_mode='human')
+
+        with open(tmp_path / 'routing.jsonl') as f:
+            failed, recovered = [json.loads(line)['outcome'] for line in f]
+        assert failed['success'] is False
+        assert 'no tesseract' in failed['error']
+        assert recovered['provider_used'] == 'default'
+        assert recovered['fallback_used'] is True
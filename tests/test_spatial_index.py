@@ -0,0 +1,157 @@
+"""Tests for the page spatial index and section-aware layout reconstruction."""
+import numpy as np
+import pytest
+
+from src.utils.layout_reconstructor import (
+    COLUMN_BREAK,
+    apply_grounding_to_output,
+    reconstruct_layout,
+    _detect_sections,
+    _parse_chunk_arrays,
+)
+from src.utils.spatial_index import (
+    IntervalIndex,
+    PageIndex,
+    count_overlapped_spans,
+    group_overlapping,
+    merge_intervals,
+)
+
+
+def chunk(text, left, top, right, bottom, page=0):
+    """Raw API chunk."""
+    return {'text': text, 'grounding': {'page': page, 'box': {
+        'left': left, 'top': top, 'right': right, 'bottom': bottom}}}
+
+
+def brute_force_overlapping(starts, ends, lo, hi):
+    """Positions of intervals strictly overlapping [lo, hi]."""
+    return [i for i, (s, e) in enumerate(zip(starts, ends)) if s < hi and e > lo]
+
+
+class TestIntervalGrouping:
+    """Test sweeps over sorted intervals."""
+
+    def test_group_overlapping(self):
+        """Test groups follow chains of overlaps and are numbered left to right."""
+        starts = np.array([0.5, 0.0, 0.15, 0.8])
+        ends = np.array([0.7, 0.2, 0.3, 0.9])
+
+        assert group_overlapping(starts, ends).tolist() == [1, 0, 0, 2]
+
+    def test_touching_intervals_are_separate(self):
+        """Test intervals sharing only an endpoint don't overlap."""
+        assert group_overlapping(np.array([0.0, 0.2]), np.array([0.2, 0.4])).tolist() == [0, 1]
+
+    def test_tolerance_closes_small_gaps(self):
+        """Test gaps narrower than the tolerance are bridged."""
+        starts, ends = merge_intervals(np.array([0.0, 0.21, 0.6]),
+                                       np.array([0.2, 0.4, 0.9]), tolerance=0.02)
+
+        assert starts.tolist() == [0.0, 0.6]
+        assert ends.tolist() == [0.4, 0.9]
+
+    def test_count_overlapped_spans(self):
+        """Test intervals are counted against the spans they cross."""
+        spans = (np.array([0.0, 0.5]), np.array([0.4, 0.9]))
+
+        counts, first = count_overlapped_spans(
+            np.array([0.1, 0.1, 0.42, 0.95]), np.array([0.3, 0.8, 0.48, 0.99]), *spans)
+
+        assert counts.tolist() == [1, 2, 0, 0]
+        assert first.tolist() == [0, 0, 1, 2]
+
+
+class TestPageIndex:
+    """Test band queries."""
+
+    def test_matches_brute_force(self):
+        """Test queries return exactly the intervals a linear scan finds."""
+        rng = np.random.default_rng(3)
+        starts = rng.uniform(0, 1, 500)
+        ends = starts + rng.choice([0.001, 0.01, 0.1, 0.9], 500)
+        index = IntervalIndex(starts, ends)
+
+        for lo in rng.uniform(0, 1, 50):
+            hi = lo + rng.uniform(0, 0.2)
+            assert index.overlapping(lo, hi).tolist() == brute_force_overlapping(
+                starts, ends, lo, hi)
+
+    def test_bands_and_boxes(self):
+        """Test horizontal, vertical and box queries over chunk boxes."""
+        index = PageIndex(left=np.array([0.1, 0.6, 0.1]), top=np.array([0.1, 0.1, 0.5]),
+                          right=np.array([0.4, 0.9, 0.9]), bottom=np.array([0.2, 0.2, 0.6]))
+
+        assert index.in_horizontal_band(0.15, 0.16).tolist() == [0, 1]
+        assert index.in_vertical_band(0.45, 0.55).tolist() == [2]
+        assert index.in_box(0.5, 0.0, 1.0, 0.3).tolist() == [1]
+        assert index.lines().tolist() == [0, 0, 1]
+        assert len(index) == 3
+
+    def test_empty(self):
+        """Test an empty page answers every query with nothing."""
+        index = PageIndex(*(np.empty(0),) * 4)
+
+        assert index.in_vertical_band(0.0, 1.0).tolist() == []
+
+
+class TestSectionLayout:
+    """Test headers and tables no longer fragment into columns."""
+
+    def test_full_width_header_read_first(self):
+        """Test a header above two columns is a section of its own."""
+        chunks = [
+            chunk('Left', 0.05, 0.2, 0.45, 0.5),
+            chunk('Right', 0.55, 0.2, 0.95, 0.5),
+            chunk('Header', 0.05, 0.05, 0.95, 0.1),
+            chunk('Footer', 0.05, 0.9, 0.95, 0.95),
+        ]
+
+        result = reconstruct_layout(chunks)
+
+        assert result.startswith('Header')
+        assert result.index('Left') < result.index(COLUMN_BREAK) < result.index('Right')
+        assert result.endswith('Footer')
+        sections = _detect_sections(_parse_chunk_arrays(chunks))
+        assert [len(section) for section in sections] == [1, 2, 1]
+
+    def test_full_width_table_between_columns(self):
+        """Test a table chunk spanning both columns splits them, not the page."""
+        chunks = [
+            chunk('Left top', 0.05, 0.05, 0.45, 0.3),
+            chunk('Right top', 0.55, 0.05, 0.95, 0.3),
+            chunk('| a | b |', 0.05, 0.4, 0.95, 0.5),
+            chunk('Left bottom', 0.05, 0.6, 0.45, 0.9),
+            chunk('Right bottom', 0.55, 0.6, 0.95, 0.9),
+        ]
+
+        order = [reconstruct_layout(chunks).index(c['text']) for c in chunks]
+
+        assert order == sorted(order)
+
+    def test_table_read_row_by_row(self):
+        """Test tightly packed aligned cells are read as table rows."""
+        chunks = [chunk(f'r{row}c{col}', 0.1 + 0.3 * col, 0.1 + 0.05 * row,
+                        0.3 + 0.3 * col, 0.14 + 0.05 * row)
+                  for row in range(3) for col in range(3)]
+
+        assert reconstruct_layout(chunks) == (
+            'r0c0\tr0c1\tr0c2\nr1c0\tr1c1\tr1c2\nr2c0\tr2c1\tr2c2')
+
+    def test_spaced_paragraphs_stay_columns(self):
+        """Test aligned paragraphs with paragraph gaps are still columns."""
+        chunks = [
+            chunk('L1', 0.05, 0.1, 0.45, 0.2), chunk('R1', 0.55, 0.1, 0.95, 0.2),
+            chunk('L2', 0.05, 0.3, 0.45, 0.4), chunk('R2', 0.55, 0.3, 0.95, 0.4),
+        ]
+
+        assert COLUMN_BREAK in reconstruct_layout(chunks)
+
+    @pytest.mark.parametrize('chunks,columns', [
+        ([chunk('Title', 0.1, 0.05, 0.9, 0.1), chunk('Body', 0.1, 0.2, 0.9, 0.8)], 1),
+        ([chunk('Header', 0.05, 0.05, 0.95, 0.1), chunk('Left', 0.05, 0.2, 0.45, 0.8),
+          chunk('Right', 0.55, 0.2, 0.95, 0.8)], 2),
+    ])
+    def test_structure_counts_columns_per_section(self, chunks, columns):
+        """Test structure metadata reports the widest section's columns."""
+        assert apply_grounding_to_output(chunks)['pages'][0]['columns'] == columns
@@ -0,0 +1,40 @@
+"""Unit tests for the spool buffer with out-of-order placeholders."""
+import io
+
+import pytest
+
+from src.utils.spool import Spool
+
+
+class TestSpool:
+    """Test writing, reserving and filling."""
+
+    def test_placeholders_filled_in_place(self):
+        """Test filled places appear where they were reserved."""
+        spool = Spool()
+        first = spool.reserve()
+        spool.write(b'b')
+        second = spool.reserve()
+        spool.write(b'd')
+        spool.fill(second, b'c')
+        spool.fill(first, b'a')
+
+        target = io.BytesIO()
+        spool.copy_to(target)
+        spool.close()
+
+        assert target.getvalue() == b'abcd'
+
+    def test_unfilled_places_rejected(self):
+        """Test a buffer with unfilled places can't be copied out."""
+        spool = Spool()
+        spool.write(b'a')
+        slot = spool.reserve()
+
+        assert spool.pending == [slot]
+        with pytest.raises(ValueError):
+            spool.copy_to(io.BytesIO())
+        spool.fill(slot, b'b')
+        with pytest.raises(ValueError):
+            spool.fill(slot, b'again')
+        assert spool.pending == []
@@ -0,0 +1,322 @@
+"""Tests for the parallel Tesseract OCR engine."""
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import pytest
+
+from src.ocr.cancellation import OCRCancelledError
+from src.ocr.rasterizer import PageImage
+from src.ocr.tesseract_engine import (
+    DEFAULT_LANGUAGES,
+    PageResult,
+    ParallelTesseractEngine,
+    _init_worker,
+    _parse_tesseract_config,
+    page_result_from_data,
+)
+
+
+class TestParallelTesseractEngine:
+    """Test page fan-out and ordering."""
+
+    def test_default_workers_sized_to_machine(self):
+        """Test worker count defaults to the CPU count."""
+        with patch('src.ocr.tesseract_engine.os.cpu_count', return_value=16):
+            engine = ParallelTesseractEngine()
+        assert engine.max_workers == 16
+        assert engine.lang == DEFAULT_LANGUAGES
+
+    @patch('src.ocr.tesseract_engine.pytesseract.image_to_string')
+    def test_serial_path_for_single_worker(self, mock_ocr):
+        """Test a single worker OCRs pages in-process."""
+        mock_ocr.side_effect = lambda path, **kwargs: f'text of {path}'
+        engine = ParallelTesseractEngine(max_workers=1)
+
+        result = engine.ocr_images(['p1.png', 'p2.png'])
+
+        assert result == ['text of p1.png', 'text of p2.png']
+        assert mock_ocr.call_count == 2
+
+    @patch('src.ocr.tesseract_engine.ProcessPoolExecutor', ThreadPoolExecutor)
+    @patch('src.ocr.tesseract_engine.pytesseract.image_to_string')
+    def test_parallel_results_in_page_order(self, mock_ocr):
+        """Test pages finishing out of order are reassembled in page order."""
+        import time
+
+        def slow_first(path, **kwargs):
+            if path == 'p1.png':
+                time.sleep(0.05)
+            return f'text of {path}'
+
+        mock_ocr.side_effect = slow_first
+        engine = ParallelTesseractEngine(max_workers=4)
+
+        result = engine.ocr_images(['p1.png', 'p2.png', 'p3.png'])
+
+        assert result == ['text of p1.png', 'text of p2.png', 'text of p3.png']
+        assert mock_ocr.call_args.kwargs['lang'] == DEFAULT_LANGUAGES
+
+    def test_empty_input(self):
+        """Test no pages produce no text."""
+        assert ParallelTesseractEngine(max_workers=4).ocr_images([]) == []
+
+    def test_init_worker_limits_tesseract_threads(self, monkeypatch):
+        """Test workers disable Tesseract's internal threading."""
+        import os
+        monkeypatch.setenv('OMP_THREAD_LIMIT', '4')
+        _init_worker()
+        assert os.environ['OMP_THREAD_LIMIT'] == '1'
+
+
+class TestOCRStream:
+    """Test streaming OCR of lazily rendered pages."""
+
+    @patch('src.ocr.tesseract_engine.ProcessPoolExecutor', ThreadPoolExecutor)
+    @patch('src.ocr.tesseract_engine.pytesseract.image_to_string')
+    def test_stream_deletes_processed_images(self, mock_ocr, tmp_path):
+        """Test page images are deleted once their text is collected."""
+        mock_ocr.side_effect = lambda path, **kwargs: 'text'
+        paths = []
+        for n in range(1, 4):
+            path = tmp_path / f'page-{n}.png'
+            path.write_bytes(b'png')
+            paths.append(str(path))
+
+        engine = ParallelTesseractEngine(max_workers=2)
+        result = list(engine.ocr_stream(enumerate(paths, 1), delete_after=True))
+
+        assert result == [(1, 'text'), (2, 'text'), (3, 'text')]
+        assert not any(tmp_path.iterdir())
+
+    @patch('src.ocr.tesseract_engine.ProcessPoolExecutor', ThreadPoolExecutor)
+    @patch('src.ocr.tesseract_engine.pytesseract.image_to_string')
+    def test_stream_bounds_pages_in_flight(self, mock_ocr):
+        """Test the page source is consumed only a few pages ahead of OCR."""
+        mock_ocr.side_effect = lambda path, **kwargs: path
+        pulled = []
+
+        def page_source():
+            for n in range(1, 101):
+                pulled.append(n)
+                yield n, f'p{n}'
+
+        engine = ParallelTesseractEngine(max_workers=2)
+        stream = engine.ocr_stream(page_source())
+
+        assert next(stream) == (1, 'p1')
+        assert len(pulled) <= 2 * engine.max_workers
+        stream.close()
+
+    @patch('src.ocr.tesseract_engine.ProcessPoolExecutor', ThreadPoolExecutor)
+    @patch('src.ocr.tesseract_engine.pytesseract.image_to_string')
+    def test_cancel_stops_submitting_pages(self, mock_ocr):
+        """Test no more pages are pulled or OCR'd once the job is cancelled."""
+        mock_ocr.side_effect = lambda path, **kwargs: path
+        cancel = threading.Event()
+        pulled = []
+
+        def page_source():
+            for n in range(1, 101):
+                pulled.append(n)
+                if n == 3:
+                    cancel.set()
+                yield n, f'p{n}'
+
+        engine = ParallelTesseractEngine(max_workers=2, cancel=cancel)
+
+        with pytest.raises(OCRCancelledError):
+            list(engine.ocr_stream(page_source()))
+        assert pulled == [1, 2, 3]
+        assert mock_ocr.call_count <= 2
+
+    @patch('src.ocr.tesseract_engine.pytesseract.image_to_string')
+    def test_page_buffer_passed_as_raw_pgm(self, mock_ocr):
+        """Test rendered pages reach Tesseract as uncompressed PGM images."""
+        seen = []
+        mock_ocr.side_effect = lambda image, **kwargs: seen.append(image) or 'text'
+        page = PageImage(1, 2, 2, bytes([0, 255, 255, 0]))
+
+        engine = ParallelTesseractEngine(max_workers=1)
+        result = list(engine.ocr_stream([(1, page)]))
+
+        assert result == [(1, 'text')]
+        assert seen[0].format == 'PPM'
+        assert seen[0].size == (2, 2)
+
+
+class FakeTessAPI:
+    """Stand-in for tesserocr.PyTessBaseAPI that counts model loads."""
+
+    instances = []
+
+    def __init__(self, lang, psm):
+        self.lang = lang
+        self.psm = psm
+        self.variables = {}
+        self.image = None
+        FakeTessAPI.instances.append(self)
+
+    def SetVariable(self, name, value):
+        self.variables[name] = value
+
+    def SetImage(self, image):
+        self.image = image
+
+    def SetImageFile(self, path):
+        self.image = path
+
+    def GetUTF8Text(self):
+        return f'text of {getattr(self.image, "size", self.image)}'
+
+    def AllWordConfidences(self):
+        return [90, 70]
+
+    def End(self):
+        pass
+
+
+@pytest.fixture
+def fake_tesserocr(monkeypatch):
+    """Install a fake tesserocr module and reset the resident state."""
+    import types
+    from src.ocr import tesseract_engine
+
+    module = types.SimpleNamespace(PyTessBaseAPI=FakeTessAPI,
+                                   PSM=types.SimpleNamespace(AUTO=3))
+    monkeypatch.setitem(sys.modules, 'tesserocr', module)
+    monkeypatch.setattr(tesseract_engine, 'TESSEROCR_AVAILABLE', True)
+    monkeypatch.setattr(tesseract_engine, '_resident_api', None)
+    monkeypatch.setattr(tesseract_engine, '_resident_key', None)
+    # Worker initializers set OMP_THREAD_LIMIT; restore it afterwards
+    monkeypatch.delenv('OMP_THREAD_LIMIT', raising=False)
+    FakeTessAPI.instances = []
+    yield module
+    tesseract_engine.shutdown_resident_pools()
+
+
+class TestResidentBackend:
+    """Test the tesserocr backend with resident workers."""
+
+    def test_parse_tesseract_config(self):
+        """Test CLI options are split into PSM and variables."""
+        assert _parse_tesseract_config(
+            '--psm 6 -c preserve_interword_spaces=1 -c tessedit_do_invert=0') == (
+            6, {'preserve_interword_spaces': '1', 'tessedit_do_invert': '0'})
+        assert _parse_tesseract_config('') == (None, {})
+
+    def test_invalid_backend(self):
+        """Test unknown backends are rejected."""
+        with pytest.raises(ValueError, match="Invalid Tesseract backend"):
+            ParallelTesseractEngine(backend='ocrmypdf')
+
+    def test_falls_back_without_tesserocr(self, monkeypatch):
+        """Test pytesseract is used when tesserocr is not installed."""
+        from src.ocr import tesseract_engine
+        monkeypatch.setattr(tesseract_engine, 'TESSEROCR_AVAILABLE', False)
+
+        engine = ParallelTesseractEngine(backend='tesserocr')
+
+        assert engine.backend == 'pytesseract'
+
+    def test_models_loaded_once_serially(self, fake_tesserocr):
+        """Test one API serves every page of every document in-process."""
+        page = PageImage(1, 2, 2, bytes([0, 255, 255, 0]))
+        engine = ParallelTesseractEngine(lang='rus+eng', max_workers=1,
+                                         backend='tesserocr')
+
+        first = list(engine.ocr_stream([(1, page), (2, page)]))
+        second = engine.ocr_images(['p1.png'])
+
+        assert first == [(1, 'text of (2, 2)'), (2, 'text of (2, 2)')]
+        assert second == ['text of p1.png']
+        assert len(FakeTessAPI.instances) == 1
+        api = FakeTessAPI.instances[0]
+        assert api.lang == 'rus+eng'
+        assert api.psm == 3
+        assert api.variables == {'preserve_interword_spaces': '1'}
+
+    def test_language_change_reloads_models(self, fake_tesserocr):
+        """Test a different language set creates a new API."""
+        ParallelTesseractEngine(lang='eng', max_workers=1,
+                                backend='tesserocr').ocr_images(['p1.png'])
+        ParallelTesseractEngine(lang='rus+eng', max_workers=1,
+                                backend='tesserocr').ocr_images(['p1.png'])
+
+        assert [api.lang for api in FakeTessAPI.instances] == ['eng', 'rus+eng']
+
+    @patch('src.ocr.tesseract_engine.ProcessPoolExecutor', ThreadPoolExecutor)
+    def test_worker_pool_reused_across_documents(self, fake_tesserocr):
+        """Test resident worker pools outlive a single document."""
+        from src.ocr import tesseract_engine
+
+        for _ in range(2):
+            engine = ParallelTesseractEngine(lang='eng', max_workers=2,
+                                             backend='tesserocr')
+            assert engine.ocr_images(['p1.png', 'p2.png']) == [
+                'text of p1.png', 'text of p2.png']
+
+        assert len(tesseract_engine._resident_pools) == 1
+
+    @patch('src.ocr.tesseract_engine.ProcessPoolExecutor', ThreadPoolExecutor)
+    def test_resident_pools_bounded(self, fake_tesserocr):
+        """Test only the most recently used language sets keep workers."""
+        from src.ocr import tesseract_engine
+
+        for lang in ('eng', 'rus+eng', 'deu+eng'):
+            ParallelTesseractEngine(lang=lang, max_workers=2,
+                                    backend='tesserocr').ocr_images(['p1.png'])
+
+        assert [key[0] for key in tesseract_engine._resident_pools] == [
+            'rus+eng', 'deu+eng']
+
+    def test_scored_results(self, fake_tesserocr):
+        """Test the resident backend reports word confidences."""
+        engine = ParallelTesseractEngine(max_workers=1, backend='tesserocr')
+
+        [(num, result)] = engine.ocr_stream_scored([(1, 'p1.png')])
+
+        assert num == 1
+        assert result == PageResult('text of p1.png', 80.0, 2)
+
+
+TSV_DATA = {
+    'block_num': [1, 1, 1, 1, 1, 2, 2],
+    'par_num':   [0, 1, 1, 1, 1, 1, 1],
+    'line_num':  [0, 1, 1, 2, 2, 1, 1],
+    'text':      ['', 'Hello', 'world', 'second', ' ', 'Next', 'block'],
+    'conf':      ['-1', '90', '80.5', '70', '-1', '95', 40],
+}
+
+
+class TestScoredOCR:
+    """Test OCR with per-word confidences."""
+
+    def test_page_result_from_data(self):
+        """Test text is rebuilt from words and confidences are averaged."""
+        result = page_result_from_data(TSV_DATA)
+
+        assert result.text == 'Hello world\nsecond\n\nNext block\n\f'
+        assert result.words == 5
+        assert result.confidence == pytest.approx((90 + 80.5 + 70 + 95 + 40) / 5)
+
+    def test_page_without_words(self):
+        """Test a blank page has no confidence."""
+        result = page_result_from_data({'text': [''], 'conf': [-1], 'block_num': [1],
+                                        'par_num': [0], 'line_num': [0]})
+
+        assert result == PageResult('', None, 0)
+
+    @patch('src.ocr.tesseract_engine.ProcessPoolExecutor', ThreadPoolExecutor)
+    @patch('src.ocr.tesseract_engine.pytesseract.image_to_data', return_value=TSV_DATA)
+    def test_scored_stream(self, mock_data):
+        """Test scored results come back in page order from one OCR call per page."""
+        page = PageImage(1, 2, 1, b'\x00\xff')
+        engine = ParallelTesseractEngine(max_workers=2)
+
+        results = list(engine.ocr_stream_scored([(1, page), (2, 'p2.png')]))
+
+        assert [num for num, _ in results] == [1, 2]
+        assert results[0][1].text.startswith('Hello world')
+        assert mock_data.call_count == 2